@@ -0,0 +1,62 @@
+# benchmarks/banco_bench.py
+import os
+import re
+import logging
+import mysql.connector
+from database import db_config, db_pool, importador_csv, cache_alunos
+from benchmarks.dados_sinteticos import gerar_alunos
+
+logger = logging.getLogger(__name__)
+
+# Banco descartável: NUNCA o mesmo do .env (a tabela é truncada a cada tamanho)
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "facsenac_bench")
+CAMINHO_SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "schema.sql")
+TAMANHO_LOTE_SEMEADURA = 1000
+
+def _comandos_schema(nome_banco):
+    """Comandos do schema.sql (sem comentários), com o nome do banco trocado pelo de benchmark."""
+    with open(CAMINHO_SCHEMA, encoding="utf-8") as arquivo:
+        linhas = [l for l in arquivo if not l.lstrip().startswith("--")]
+    sql = re.sub(r"\bfacsenac\b", nome_banco, "".join(linhas))
+    return [c.strip() for c in sql.split(";") if c.strip()]
+
+def preparar_banco(nome_banco=BENCH_DB_NAME):
+    """Cria o banco de benchmark a partir do schema.sql e aponta o pool da aplicação para ele."""
+    if nome_banco == db_config.DB_NAME:
+        raise SystemExit(f"BENCH_DB_NAME ('{nome_banco}') não pode ser o banco da aplicação: a tabela é apagada a cada rodada.")
+    conexao = mysql.connector.connect(host=db_config.DB_HOST, user=db_config.DB_USER, password=db_config.DB_PASSWORD)
+    try:
+        cursor = conexao.cursor()
+        for comando in _comandos_schema(nome_banco): cursor.execute(comando)
+        conexao.commit(); cursor.close()
+    finally:
+        conexao.close()
+    db_pool.fechar() # Conexões já abertas apontam para o banco anterior
+    db_config.DB_NAME = nome_banco
+    logger.info(f"Banco de benchmark '{nome_banco}' pronto.")
+
+def repopular(quantidade, semente=42):
+    """Esvazia a tabela e insere 'quantidade' alunos sintéticos em lotes. Retorna a lista inserida."""
+    alunos = list(gerar_alunos(quantidade, semente=semente))
+    with db_pool.conexao() as conexao:
+        if not conexao: raise SystemExit("Falha na conexão com o banco de benchmark.")
+        cursor = conexao.cursor()
+        try:
+            cursor.execute("TRUNCATE TABLE alunos"); cursor.execute("TRUNCATE TABLE alunos_arquivo")
+            for inicio in range(0, len(alunos), TAMANHO_LOTE_SEMEADURA):
+                cursor.executemany(importador_csv.SQL_INSERIR_ALUNO, alunos[inicio:inicio + TAMANHO_LOTE_SEMEADURA])
+                conexao.commit()
+            cursor.execute("ANALYZE TABLE alunos"); cursor.fetchall() # Estatísticas atualizadas para o otimizador
+        finally:
+            cursor.close()
+    cache_alunos.marcar_desatualizado()
+    return alunos
+
+def ids_existentes(limite):
+    with db_pool.conexao() as conexao:
+        cursor = conexao.cursor()
+        try:
+            cursor.execute("SELECT id FROM alunos ORDER BY id LIMIT %s", (limite,))
+            return [linha[0] for linha in cursor.fetchall()]
+        finally:
+            cursor.close()
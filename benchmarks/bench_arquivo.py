@@ -0,0 +1,114 @@
+# benchmarks/bench_arquivo.py
+import sys
+import time
+import logging
+import argparse
+from datetime import date
+from database import db_config, db_handler, db_pool, arquivamento
+from benchmarks import banco_bench
+from benchmarks.medicao import Resultados, medir
+from benchmarks.dados_sinteticos import termos_de_busca
+from benchmarks.bench_db import imprimir_resumo
+
+logger = logging.getLogger(__name__)
+
+# Listagens/buscas antes e depois de arquivar a maior parte dos alunos: tabela alunos com tudo,
+# só com os ativos, e ativos + alunos_arquivo (opção "Incluir arquivados").
+TOTAL_PADRAO = 1_000_000
+FRACAO_INATIVA_PADRAO = 0.8
+REPETICOES_PADRAO = 5
+CORTE_ARQUIVAMENTO = date(2024, 1, 1)
+CAMPOS_MEDIDOS = ("Nome", "Sobrenome", "Nome completo", "CPF", "Cidade")
+
+def envelhecer(fracao_inativa):
+    """Marca ~fracao_inativa dos alunos como sem alteração desde 2019-2023 (um ano por id, para ocupar várias partições)."""
+    decimos = max(0, min(10, round(fracao_inativa * 10)))
+    with db_pool.conexao() as conexao:
+        cursor = conexao.cursor()
+        try:
+            cursor.execute("UPDATE alunos SET atualizado_em = TIMESTAMP('2019-06-01') + INTERVAL MOD(id, 5) YEAR "
+                           "WHERE MOD(id, 10) < %s", (decimos,))
+            conexao.commit()
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+def analisar_tabelas():
+    with db_pool.conexao() as conexao:
+        cursor = conexao.cursor()
+        try:
+            cursor.execute(f"ANALYZE TABLE alunos, {db_handler.TABELA_ARQUIVO}"); cursor.fetchall()
+        finally:
+            cursor.close()
+
+def medir_consultas(resultados, cenario, total, repeticoes, colunas, termos, incluir_arquivados=False):
+    """Primeira página e busca (página) para cada ordenação; e a listagem completa de uma busca seletiva."""
+    for coluna in colunas:
+        def pagina(): db_handler.visualizar_alunos_pagina_db(sort_by_column=coluna, incluir_arquivados=incluir_arquivados)
+        pagina() # Aquecimento do buffer pool
+        resultados.registrar("primeira_pagina", medir(pagina, repeticoes), total, cenario=cenario, ordenacao=coluna)
+    for campo in CAMPOS_MEDIDOS:
+        termo = termos[campo]
+        def buscar():
+            pagina, msg = db_handler.visualizar_alunos_pagina_db(campo, termo, "nome", incluir_arquivados=incluir_arquivados)
+            if pagina is None: raise RuntimeError(f"Busca falhou no benchmark: {msg}")
+        buscar()
+        resultados.registrar("busca_pagina", medir(buscar, repeticoes), total, cenario=cenario, campo=campo)
+    def listar_cpf():
+        linhas, msg = db_handler.visualizar_alunos_db("CPF", termos["CPF"], incluir_arquivados=incluir_arquivados)
+        if linhas is None: raise RuntimeError(f"Consulta falhou no benchmark: {msg}")
+    resultados.registrar("visualizar_cpf", medir(listar_cpf, repeticoes), total, cenario=cenario)
+
+def executar(total, fracao_inativa, repeticoes, colunas, semente, lote):
+    resultados = Resultados(total=total, fracao_inativa=fracao_inativa, repeticoes=repeticoes, semente=semente,
+                            banco=banco_bench.BENCH_DB_NAME, host=db_config.DB_HOST)
+    banco_bench.preparar_banco()
+    logger.info(f"Semeando {total} alunos...")
+    alunos = banco_bench.repopular(total, semente)
+    logger.info(f"{envelhecer(fracao_inativa)} aluno(s) marcados como inativos.")
+    analisar_tabelas()
+    # Termos de um aluno do meio com id múltiplo de 10 (inativo se houver inativos): a busca precisa achá-lo no arquivo
+    termos = termos_de_busca(alunos[max(0, len(alunos) // 20 * 10 - 1)])
+
+    cache_original = db_config.CACHE_ALUNOS_ATIVO
+    db_config.CACHE_ALUNOS_ATIVO = False # Mede o servidor, não a cópia local
+    try:
+        medir_consultas(resultados, "sem_arquivo", total, repeticoes, colunas, termos)
+        inicio = time.perf_counter()
+        arquivados, msg = arquivamento.arquivar_inativos(CORTE_ARQUIVAMENTO, tamanho_lote=lote, pausa_s=0)
+        if not arquivados: raise RuntimeError(f"Arquivamento falhou no benchmark: {msg}")
+        resultados.registrar("arquivar_inativos", [time.perf_counter() - inicio], total, arquivados=arquivados, lote=lote)
+        analisar_tabelas()
+        medir_consultas(resultados, "so_ativos", total, repeticoes, colunas, termos)
+        medir_consultas(resultados, "ativos_e_arquivo", total, repeticoes, colunas, termos, incluir_arquivados=True)
+    finally:
+        db_config.CACHE_ALUNOS_ATIVO = cache_original
+    resultados.meta["pool"] = db_pool.estatisticas()
+    return resultados
+
+def main(argv=None):
+    """Uso: python -m benchmarks.bench_arquivo --total 1000000 --fracao-inativa 0.8 --saida arquivo.json"""
+    parser = argparse.ArgumentParser(description="Benchmark do arquivamento de inativos em um banco descartável (BENCH_DB_NAME).")
+    parser.add_argument("--total", type=int, default=TOTAL_PADRAO, help=f"Alunos semeados (padrão: {TOTAL_PADRAO})")
+    parser.add_argument("--fracao-inativa", type=float, default=FRACAO_INATIVA_PADRAO, help=f"Fração arquivada (padrão: {FRACAO_INATIVA_PADRAO})")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO, help=f"Repetições por operação (padrão: {REPETICOES_PADRAO})")
+    parser.add_argument("--ordenacoes", default="id,nome,data_nascimento", help="Colunas de ordenação medidas")
+    parser.add_argument("--lote", type=int, default=arquivamento.TAMANHO_LOTE_PADRAO, help="Alunos por transação do arquivamento")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="bench_arquivo.json", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    colunas = [c for c in args.ordenacoes.split(",") if c in db_handler.COLUNAS_ORDENACAO_PERMITIDAS]
+    try:
+        resultados = executar(max(1, args.total), args.fracao_inativa, max(1, args.repeticoes), colunas, args.semente, max(1, args.lote))
+    finally:
+        db_pool.fechar()
+    resultados.salvar(args.saida)
+    imprimir_resumo(resultados)
+    print(f"\nResultados gravados em {args.saida} (compare com: python -m benchmarks.comparar base.json {args.saida})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
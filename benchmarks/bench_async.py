@@ -0,0 +1,143 @@
+# benchmarks/bench_async.py
+import sys
+import time
+import random
+import asyncio
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from database import db_config, db_handler, db_handler_async, db_pool
+from benchmarks import banco_bench
+from benchmarks.medicao import Resultados
+from benchmarks.dados_sinteticos import gerar_aluno
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_PADRAO = 10000
+CONCORRENCIAS_PADRAO = (100, 200)
+RODADAS_PADRAO = 3
+OPERACOES = ("cadastrar", "visualizar", "atualizar", "deletar")
+
+# Cada tarefa faz um ciclo completo com um aluno novo: cadastra, busca pelo CPF (primeira página),
+# atualiza e deleta. A tabela volta ao tamanho inicial ao fim de cada rodada, e os índices dos
+# alunos novos ficam acima da semeadura, então os CPFs/e-mails nunca colidem.
+
+class _Contador:
+    """Índices únicos para alunos novos, compartilhados entre threads e rodadas."""
+    def __init__(self, inicio):
+        self._proximo = inicio; self._lock = threading.Lock()
+    def proximo(self):
+        with self._lock:
+            self._proximo += 1
+            return self._proximo
+
+def _conferir(operacao, resultado):
+    if not resultado[0]: raise RuntimeError(f"'{operacao}' falhou no benchmark: {resultado[1]}")
+
+async def _ciclo_async(indice, semente, tempos):
+    rng = random.Random(semente + indice); aluno = gerar_aluno(indice, rng)
+    inicio = time.perf_counter()
+    resultado = await db_handler_async.cadastrar_aluno_db(aluno, retornar_id=True); _conferir("cadastrar", resultado)
+    aluno_id = resultado[2]; tempos["cadastrar"].append(time.perf_counter() - inicio)
+    inicio = time.perf_counter()
+    _conferir("visualizar", await db_handler_async.visualizar_alunos_pagina_db("CPF", aluno[4]))
+    tempos["visualizar"].append(time.perf_counter() - inicio)
+    inicio = time.perf_counter()
+    _conferir("atualizar", await db_handler_async.atualizar_aluno_db(aluno_id, gerar_aluno(indice, rng)))
+    tempos["atualizar"].append(time.perf_counter() - inicio)
+    inicio = time.perf_counter()
+    _conferir("deletar", await db_handler_async.deletar_aluno_db(aluno_id))
+    tempos["deletar"].append(time.perf_counter() - inicio)
+
+def _ciclo_sync(indice, semente, tempos):
+    rng = random.Random(semente + indice); aluno = gerar_aluno(indice, rng)
+    inicio = time.perf_counter()
+    resultado = db_handler.cadastrar_aluno_db(aluno, retornar_id=True); _conferir("cadastrar", resultado)
+    aluno_id = resultado[2]; tempos["cadastrar"].append(time.perf_counter() - inicio) # list.append é atômico no CPython
+    inicio = time.perf_counter()
+    _conferir("visualizar", db_handler.visualizar_alunos_pagina_db("CPF", aluno[4]))
+    tempos["visualizar"].append(time.perf_counter() - inicio)
+    inicio = time.perf_counter()
+    _conferir("atualizar", db_handler.atualizar_aluno_db(aluno_id, gerar_aluno(indice, rng)))
+    tempos["atualizar"].append(time.perf_counter() - inicio)
+    inicio = time.perf_counter()
+    _conferir("deletar", db_handler.deletar_aluno_db(aluno_id))
+    tempos["deletar"].append(time.perf_counter() - inicio)
+
+async def _rodada_async(concorrencia, contador, semente, tempos):
+    await asyncio.gather(*(_ciclo_async(contador.proximo(), semente, tempos) for _ in range(concorrencia)))
+
+def _rodada_sync(executor, concorrencia, contador, semente, tempos):
+    futuros = [executor.submit(_ciclo_sync, contador.proximo(), semente, tempos) for _ in range(concorrencia)]
+    for futuro in futuros: futuro.result()
+
+def _registrar(resultados, modo, tamanho, concorrencia, tempos, duracoes):
+    total_ops = sum(len(t) for t in tempos.values())
+    vazao = total_ops / sum(duracoes) if duracoes else 0.0
+    for operacao in OPERACOES:
+        resultados.registrar(f"{modo}_{operacao}", tempos[operacao], tamanho, concorrencia=concorrencia)
+    resultados.registrar(f"{modo}_rodada", duracoes, tamanho, concorrencia=concorrencia)
+    resultados.meta.setdefault("vazao_ops_s", {})[f"{modo}/{concorrencia}"] = round(vazao, 1)
+    print(f"{modo:<6} concorrência={concorrencia:<5} {total_ops:>7} ops em {sum(duracoes):8.2f}s  ->  {vazao:9.1f} ops/s")
+
+def executar(tamanho, concorrencias, rodadas, semente, com_sync):
+    resultados = Resultados(tamanho=tamanho, concorrencias=list(concorrencias), rodadas=rodadas, semente=semente,
+                            banco=banco_bench.BENCH_DB_NAME, host=db_config.DB_HOST, pool=db_config.DB_POOL_SIZE)
+    banco_bench.preparar_banco()
+    logger.info(f"Semeando {tamanho} alunos...")
+    banco_bench.repopular(tamanho, semente)
+    contador = _Contador(tamanho + 10**6)
+
+    async def medir_async():
+        try:
+            for concorrencia in concorrencias:
+                tempos = {op: [] for op in OPERACOES}; duracoes = []
+                for _ in range(rodadas):
+                    inicio = time.perf_counter()
+                    await _rodada_async(concorrencia, contador, semente, tempos)
+                    duracoes.append(time.perf_counter() - inicio)
+                _registrar(resultados, "async", tamanho, concorrencia, tempos, duracoes)
+        finally:
+            await db_handler_async.fechar_pool()
+    asyncio.run(medir_async())
+
+    if com_sync: # Referência: mesmo ciclo com o db_handler síncrono, uma thread por tarefa
+        for concorrencia in concorrencias:
+            tempos = {op: [] for op in OPERACOES}; duracoes = []
+            with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+                for _ in range(rodadas):
+                    inicio = time.perf_counter()
+                    _rodada_sync(executor, concorrencia, contador, semente, tempos)
+                    duracoes.append(time.perf_counter() - inicio)
+            _registrar(resultados, "sync", tamanho, concorrencia, tempos, duracoes)
+    return resultados
+
+def main(argv=None):
+    """Uso: python -m benchmarks.bench_async --tamanho 10000 --concorrencias 100,200 --saida async.json"""
+    parser = argparse.ArgumentParser(description="Vazão do db_handler_async (aiomysql) sob muitas operações simultâneas.")
+    parser.add_argument("--tamanho", type=int, default=TAMANHO_PADRAO, help="Alunos semeados antes das medições")
+    parser.add_argument("--concorrencias", default=",".join(str(c) for c in CONCORRENCIAS_PADRAO), help="Tarefas simultâneas, separadas por vírgula")
+    parser.add_argument("--rodadas", type=int, default=RODADAS_PADRAO, help="Rodadas por nível de concorrência")
+    parser.add_argument("--sem-sync", action="store_true", help="Não mede o db_handler síncrono como referência")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="bench_resultados_async.json")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+    if db_handler_async.aiomysql is None: raise SystemExit("Instale o pacote 'aiomysql' para rodar este benchmark.")
+
+    cache_original = db_config.CACHE_ALUNOS_ATIVO
+    db_config.CACHE_ALUNOS_ATIVO = False # As duas versões vão ao servidor: comparação justa
+    try:
+        resultados = executar(args.tamanho, [int(c) for c in args.concorrencias.split(",") if c.strip()],
+                              max(1, args.rodadas), args.semente, not args.sem_sync)
+    finally:
+        db_config.CACHE_ALUNOS_ATIVO = cache_original
+        db_pool.fechar()
+    resultados.salvar(args.saida)
+    print(f"\nResultados gravados em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# benchmarks/bench_db.py
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from database import db_config, db_handler, db_pool, exportador_csv
+from benchmarks import banco_bench
+from benchmarks.medicao import Resultados, medir
+from benchmarks.dados_sinteticos import gerar_aluno, termos_de_busca
+
+logger = logging.getLogger(__name__)
+
+TAMANHOS_PADRAO = (1000, 10000, 50000)
+REPETICOES_PADRAO = 5
+DIRECOES = ('ASC', 'DESC')
+TIMEOUT_TABELA_S = 120
+
+# --- Operações do db_handler ---
+def medir_cadastro(resultados, tamanho, repeticoes, rng):
+    novos_ids = []; proximo = [tamanho + 1]
+    def cadastrar():
+        sucesso, msg, aluno_id = db_handler.cadastrar_aluno_db(gerar_aluno(proximo[0], rng), retornar_id=True)
+        if not sucesso: raise RuntimeError(f"Cadastro falhou no benchmark: {msg}")
+        novos_ids.append(aluno_id); proximo[0] += 1
+    resultados.registrar("cadastrar_aluno_db", medir(cadastrar, repeticoes), tamanho)
+    return novos_ids
+
+def medir_visualizacao(resultados, tamanho, repeticoes, termos, colunas):
+    filtros = [(None, None)] + list(termos.items())
+    for campo, termo in filtros:
+        for coluna in colunas:
+            for direcao in DIRECOES:
+                def visualizar():
+                    linhas, msg = db_handler.visualizar_alunos_db(campo, termo, coluna, direcao)
+                    if linhas is None: raise RuntimeError(f"Consulta falhou no benchmark: {msg}")
+                resultados.registrar("visualizar_alunos_db", medir(visualizar, repeticoes), tamanho,
+                                     campo=campo, termo=termo, ordenacao=coluna, direcao=direcao)
+
+def medir_primeira_pagina(resultados, tamanho, repeticoes, colunas):
+    """Primeira página (caminho da GUI), pelo servidor e pelo cache local de alunos."""
+    ativo_original = db_config.CACHE_ALUNOS_ATIVO
+    try:
+        for usar_cache in (False, True):
+            db_config.CACHE_ALUNOS_ATIVO = usar_cache
+            for coluna in colunas:
+                def pagina(): db_handler.visualizar_alunos_pagina_db(sort_by_column=coluna)
+                pagina() # Aquecimento: carga do cache local / cache do servidor
+                resultados.registrar("visualizar_alunos_pagina_db", medir(pagina, repeticoes), tamanho,
+                                     ordenacao=coluna, cache_local=usar_cache)
+    finally:
+        db_config.CACHE_ALUNOS_ATIVO = ativo_original
+
+def medir_atualizacao(resultados, tamanho, repeticoes, rng):
+    ids = banco_bench.ids_existentes(max(repeticoes, 1))
+    def atualizar():
+        id_aluno = rng.choice(ids)
+        sucesso, msg = db_handler.atualizar_aluno_db(id_aluno, gerar_aluno(id_aluno, rng))
+        if not sucesso: raise RuntimeError(f"Atualização falhou no benchmark: {msg}")
+    resultados.registrar("atualizar_aluno_db", medir(atualizar, repeticoes), tamanho)
+
+def medir_delecao(resultados, tamanho, ids):
+    pendentes = list(ids)
+    def deletar():
+        sucesso, msg = db_handler.deletar_aluno_db(pendentes.pop())
+        if not sucesso: raise RuntimeError(f"Deleção falhou no benchmark: {msg}")
+    resultados.registrar("deletar_aluno_db", medir(deletar, len(pendentes)), tamanho)
+
+def medir_exportacao(resultados, tamanho, repeticoes):
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "alunos.csv")
+        def exportar():
+            total, msg = exportador_csv.exportar_csv(caminho)
+            if total is None: raise RuntimeError(f"Exportação falhou no benchmark: {msg}")
+        resultados.registrar("exportar_csv", medir(exportar, repeticoes), tamanho)
+
+# --- Caminho da tabela na GUI (Treeview real, janela oculta) ---
+def criar_aplicacao_oculta():
+    """Cria AplicacaoAlunos com a janela oculta. Retorna (root, app) ou (None, None) sem display."""
+    import tkinter as tk
+    from gui.main_window import AplicacaoAlunos
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        logger.warning(f"Sem display para o Tk ({e}); benchmark da tabela ignorado. Use 'xvfb-run python -m benchmarks.bench_db'.")
+        return None, None
+    root.withdraw()
+    app = AplicacaoAlunos(root)
+    esperar_tabela(root, app)
+    return root, app
+
+def esperar_tabela(root, app):
+    """Processa eventos do Tk até a consulta terminar e o diff da tabela ser aplicado."""
+    limite = time.monotonic() + TIMEOUT_TABELA_S
+    while app.executor_db.ocupado or app._carregando_pagina or app.modelo_tabela._id_after_diff is not None:
+        if time.monotonic() > limite: raise RuntimeError("Tabela não terminou de carregar no tempo limite.")
+        root.update()
+        time.sleep(0.001)
+
+def medir_tabela_gui(resultados, tamanho, repeticoes, root, app):
+    def preparar(): app.modelo_tabela.limpar(); app.cache_buscas.invalidar() # Mede a carga completa, não um diff vazio
+    def carregar(): app.carregar_alunos_na_tabela(); esperar_tabela(root, app)
+    resultados.registrar("carregar_alunos_na_tabela", medir(carregar, repeticoes, preparar=preparar), tamanho,
+                         linhas=len(app.modelo_tabela))
+    def recarregar(): app.cache_buscas.invalidar(); carregar()
+    resultados.registrar("carregar_alunos_na_tabela_diff", medir(recarregar, repeticoes), tamanho,
+                         linhas=len(app.modelo_tabela))
+
+def executar(tamanhos, repeticoes, colunas, com_gui, semente):
+    resultados = Resultados(tamanhos=list(tamanhos), repeticoes=repeticoes, semente=semente,
+                            banco=banco_bench.BENCH_DB_NAME, host=db_config.DB_HOST,
+                            cache_local_gui=db_config.CACHE_ALUNOS_ATIVO)
+    banco_bench.preparar_banco()
+    root = app = None
+    for tamanho in tamanhos:
+        rng = random.Random(semente)
+        logger.info(f"Semeando {tamanho} alunos...")
+        inicio = time.perf_counter()
+        alunos = banco_bench.repopular(tamanho, semente)
+        resultados.registrar("semeadura", [time.perf_counter() - inicio], tamanho)
+        termos = termos_de_busca(alunos[len(alunos) // 2])
+
+        novos_ids = medir_cadastro(resultados, tamanho, repeticoes, rng)
+        medir_visualizacao(resultados, tamanho, repeticoes, termos, colunas)
+        medir_primeira_pagina(resultados, tamanho, repeticoes, colunas)
+        medir_atualizacao(resultados, tamanho, repeticoes, rng)
+        medir_exportacao(resultados, tamanho, max(1, min(repeticoes, 3)))
+        if com_gui:
+            if root is None: root, app = criar_aplicacao_oculta()
+            if root is not None: medir_tabela_gui(resultados, tamanho, repeticoes, root, app)
+        medir_delecao(resultados, tamanho, novos_ids)
+    if app is not None: app.ao_fechar_janela()
+    resultados.meta["pool"] = db_pool.estatisticas()
+    return resultados
+
+def imprimir_resumo(resultados):
+    print(f"{'operação':<34} {'n':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  parâmetros")
+    for m in resultados.medicoes:
+        parametros = ", ".join(f"{k}={v}" for k, v in m["parametros"].items() if v is not None)
+        print(f"{m['operacao']:<34} {m['tamanho']:>7} {m['p50']:>9.2f} {m['p95']:>9.2f} {m['p99']:>9.2f}  {parametros}")
+
+def main(argv=None):
+    """Uso: python -m benchmarks.bench_db --tamanhos 1000,10000 --repeticoes 5 --saida resultados.json"""
+    parser = argparse.ArgumentParser(description="Benchmark do db_handler e da tabela da GUI em um banco descartável (BENCH_DB_NAME).")
+    parser.add_argument("--tamanhos", default=",".join(str(t) for t in TAMANHOS_PADRAO), help="Quantidades de alunos, separadas por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO, help=f"Repetições por operação (padrão: {REPETICOES_PADRAO})")
+    parser.add_argument("--ordenacoes", default=",".join(db_handler.COLUNAS_ORDENACAO_PERMITIDAS), help="Colunas de ordenação medidas")
+    parser.add_argument("--sem-gui", action="store_true", help="Não mede o carregamento da tabela no Tk")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="bench_resultados.json", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    tamanhos = [int(t) for t in args.tamanhos.split(",") if t.strip()]
+    colunas = [c for c in args.ordenacoes.split(",") if c in db_handler.COLUNAS_ORDENACAO_PERMITIDAS]
+    try:
+        resultados = executar(tamanhos, max(1, args.repeticoes), colunas, not args.sem_gui, args.semente)
+    finally:
+        db_pool.fechar()
+    resultados.salvar(args.saida)
+    imprimir_resumo(resultados)
+    print(f"\nResultados gravados em {args.saida} (compare com: python -m benchmarks.comparar base.json {args.saida})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# benchmarks/bench_logging.py
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from utils import registro_log
+from benchmarks.medicao import Resultados
+
+TECLAS_PADRAO = 20000
+RODADAS_PADRAO = 3
+
+# Custo de logging por tecla no thread do Tk. Uma "tecla" reproduz o que a GUI loga ao digitar
+# no CPF com a busca automática ativa: o debug do CPF formatado, o debug do validador e a
+# atualização da barra de status. Três configurações são comparadas:
+#   sincrono  - como era: RotatingFileHandler no próprio thread, f-strings, status em INFO
+#   fila      - QueueHandler + QueueListener, formatação preguiçosa com %, arquivo em DEBUG
+#   fila_info - idem, com o módulo em INFO (LOG_NIVEIS): os debugs nem criam o registro
+
+logger = logging.getLogger("gui.main_window") # Mesmo nome do logger da janela principal
+
+def _tecla_antiga(i):
+    cpf = f"{i % 1000:03d}.{i % 997:03d}.{i % 991:03d}-{i % 97:02d}"
+    logger.debug(f"CPF formatado para: {cpf}, cursor em: {i % 14} (tentativa)")
+    logger.debug(f"Formato de máscara do CPF '{cpf}' é inválido.")
+    logger.info(f"Atualizando status: '{'Processando...'}' (Sucesso: {True})")
+
+def _tecla_nova(i):
+    cpf = f"{i % 1000:03d}.{i % 997:03d}.{i % 991:03d}-{i % 97:02d}"
+    logger.debug("CPF formatado para: %s, cursor em: %s (tentativa)", cpf, i % 14)
+    logger.debug("Formato de máscara do CPF '%s' é inválido.", cpf)
+    logger.debug("Atualizando status: '%s' (Sucesso: %s)", "Processando...", True)
+
+def _configurar(modo, pasta, console):
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers): raiz.removeHandler(handler); handler.close()
+    raiz.setLevel(logging.DEBUG); logger.setLevel(logging.NOTSET)
+    handlers = registro_log.criar_handlers(os.path.join(pasta, f"{modo}.log"), logging.DEBUG, logging.INFO, console)
+    if modo == "sincrono":
+        for handler in handlers: raiz.addHandler(handler)
+        return None
+    if modo == "fila_info": logger.setLevel(logging.INFO)
+    return registro_log.iniciar_fila(handlers, raiz)
+
+def _medir(modo, teclas, pasta, console):
+    ouvinte = _configurar(modo, pasta, console)
+    tecla = _tecla_antiga if modo == "sincrono" else _tecla_nova
+    amostras = []
+    inicio_total = time.perf_counter()
+    for i in range(teclas):
+        inicio = time.perf_counter(); tecla(i); amostras.append(time.perf_counter() - inicio)
+    no_thread_tk = time.perf_counter() - inicio_total
+    if ouvinte is not None: registro_log.encerrar() # Inclui o esvaziamento da fila no tempo total
+    return amostras, no_thread_tk, time.perf_counter() - inicio_total
+
+def main(argv=None):
+    """Uso: python -m benchmarks.bench_logging --teclas 20000 --rodadas 3"""
+    parser = argparse.ArgumentParser(description="Custo de logging por tecla: handler síncrono x fila com gravação em segundo plano.")
+    parser.add_argument("--teclas", type=int, default=TECLAS_PADRAO)
+    parser.add_argument("--rodadas", type=int, default=RODADAS_PADRAO)
+    parser.add_argument("--saida", default="bench_resultados_logging.json")
+    args = parser.parse_args(argv)
+    resultados = Resultados(teclas=args.teclas, rodadas=args.rodadas)
+    with tempfile.TemporaryDirectory() as pasta, open(os.devnull, "w") as console:
+        print(f"{'modo':<10} {'µs/tecla méd':>13} {'p99 µs':>9} {'thread Tk s':>12} {'total s':>9}")
+        for modo in ("sincrono", "fila", "fila_info"):
+            amostras = []; no_tk = total = 0.0
+            for _ in range(max(1, args.rodadas)):
+                a, t_tk, t_total = _medir(modo, args.teclas, pasta, console)
+                amostras.extend(a); no_tk += t_tk; total += t_total
+            r = resultados.registrar(modo, amostras, args.teclas)
+            resultados.meta.setdefault("segundos_thread_tk", {})[modo] = round(no_tk, 3)
+            print(f"{modo:<10} {r['media'] * 1000:>13.2f} {r['p99'] * 1000:>9.2f} {no_tk:>12.3f} {total:>9.3f}")
+    logging.getLogger().handlers.clear()
+    resultados.salvar(args.saida)
+    print(f"\nResultados gravados em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
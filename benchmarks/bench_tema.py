@@ -0,0 +1,81 @@
+# benchmarks/bench_tema.py
+import sys
+import time
+import argparse
+import tkinter as tk
+from tkinter import ttk
+from gui import temas
+from gui.recursos import GerenciadorRecursos
+from benchmarks.medicao import Resultados
+
+TROCAS_PADRAO = 20
+LINHAS_TABELA = 200
+TEMAS = ("arc", "equilux")
+
+# Tempo de troca de tema com uma janela parecida com a principal (8 campos, botões com ícone e
+# uma tabela com 200 linhas). Requer display e o pacote ttkthemes. Compara:
+#   anterior - set_theme, lookup do fundo do TEntry e reconfiguração dos estilos a cada troca,
+#              campo a campo, como o alternar_tema fazia
+#   recursos - GerenciadorRecursos.aplicar_tema: estilos em cache por tema, redesenho único
+# Cada troca termina com update_idletasks, para incluir o redesenho no tempo medido.
+
+def _montar_janela(root, icones):
+    campos = []
+    formulario = ttk.Frame(root); formulario.pack(fill="x")
+    for i in range(8):
+        ttk.Label(formulario, text=f"Campo {i}").grid(row=i // 4, column=(i % 4) * 2)
+        campo = ttk.Entry(formulario, style="Valid.TEntry" if i % 2 else "Normal.TEntry"); campo.grid(row=i // 4, column=(i % 4) * 2 + 1)
+        campos.append(campo)
+    botoes = ttk.Frame(root); botoes.pack(fill="x")
+    for nome, icone in icones.items(): ttk.Button(botoes, text=nome, image=icone, compound="left" if icone else "none").pack(side="left")
+    colunas = ("id", "nome", "sobrenome", "email", "cidade")
+    tabela = ttk.Treeview(root, columns=colunas, show="headings"); tabela.pack(fill="both", expand=True)
+    for coluna in colunas: tabela.heading(coluna, text=coluna)
+    for i in range(LINHAS_TABELA): tabela.insert("", "end", values=(i, f"Nome {i}", f"Sobrenome {i}", f"aluno{i}@x.com", "Brasília"))
+    return campos
+
+def _troca_anterior(root, tema, campos):
+    temas.aplicar_tema(root, tema)
+    estilo = ttk.Style()
+    estilo.configure("Valid.TEntry", fieldbackground="lightgreen"); estilo.configure("Invalid.TEntry", fieldbackground="#FFCDD2")
+    estilo.configure("Normal.TEntry", fieldbackground=estilo.lookup('TEntry', 'fieldbackground'))
+    for campo in campos: campo.configure(style="Normal.TEntry")
+    root.update_idletasks()
+
+def _medir(modo, trocas):
+    root = tk.Tk(); root.geometry("1000x600")
+    try:
+        recursos = GerenciadorRecursos(root)
+        temas.aplicar_tema(root, TEMAS[0]); recursos.configurar_estilos()
+        campos = _montar_janela(root, recursos.icones()); root.update()
+        if modo == "recursos": recursos.precarregar_tema(TEMAS[1])
+        amostras = []
+        for i in range(trocas):
+            tema = TEMAS[(i + 1) % 2]
+            inicio = time.perf_counter()
+            if modo == "anterior": _troca_anterior(root, tema, campos)
+            else: recursos.aplicar_tema(tema, campos)
+            amostras.append(time.perf_counter() - inicio)
+            if i % 2 == 0: campos[1].configure(style="Valid.TEntry") # Feedback de validação entre as trocas
+        return amostras
+    finally:
+        root.destroy()
+
+def main(argv=None):
+    """Uso: python -m benchmarks.bench_tema --trocas 20 (requer display e ttkthemes)"""
+    parser = argparse.ArgumentParser(description="Tempo de troca de tema: implementação anterior x gerenciador de recursos.")
+    parser.add_argument("--trocas", type=int, default=TROCAS_PADRAO)
+    parser.add_argument("--saida", default="bench_resultados_tema.json")
+    args = parser.parse_args(argv)
+    resultados = Resultados(trocas=args.trocas, temas=list(TEMAS), linhas_tabela=LINHAS_TABELA)
+    print(f"{'modo':<10} {'1ª troca ms':>12} {'demais p50 ms':>14} {'demais p95 ms':>14}")
+    for modo in ("anterior", "recursos"):
+        amostras = _medir(modo, max(2, args.trocas))
+        resultados.registrar(f"{modo}_primeira", amostras[:1]); r = resultados.registrar(modo, amostras[1:])
+        print(f"{modo:<10} {amostras[0] * 1000:>12.1f} {r['p50']:>14.1f} {r['p95']:>14.1f}")
+    resultados.salvar(args.saida)
+    print(f"\nResultados gravados em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# benchmarks/bench_unicidade.py
+import sys
+import random
+import logging
+import argparse
+import tracemalloc
+from database import indice_unicidade
+from benchmarks.medicao import Resultados, medir
+from benchmarks.dados_sinteticos import gerar_alunos
+
+logger = logging.getLogger(__name__)
+
+# Memória e tempo de consulta do índice de unicidade (database/indice_unicidade.py), sem banco:
+# arrays ordenados (CPF inteiro + hash do e-mail) x dicts com as strings, como viriam do cursor.
+TAMANHOS_PADRAO = (100_000, 1_000_000)
+REPETICOES_PADRAO = 5
+CONSULTAS_POR_REPETICAO = 10_000
+
+def gerar_linhas(quantidade, semente):
+    """(id, cpf, email) de alunos sintéticos, com CPF/e-mail únicos."""
+    return [(indice, aluno[4], aluno[3]) for indice, aluno in enumerate(gerar_alunos(quantidade, semente=semente), start=1)]
+
+def _medir_memoria(construir):
+    """Executa construir() sob tracemalloc. Retorna (objeto, bytes retidos, pico em bytes)."""
+    tracemalloc.start()
+    try:
+        objeto = construir()
+        retidos, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return objeto, retidos, pico
+
+def _dicts_de_strings(linhas):
+    """Alternativa ingênua: {cpf: id} e {email: id} com strings novas, como as lidas do banco."""
+    cpfs = {}; emails = {}
+    for id_aluno, cpf, email in linhas:
+        cpfs[cpf.encode().decode()] = id_aluno; emails[email.encode().decode().lower()] = id_aluno
+    return cpfs, emails
+
+def executar(tamanhos, repeticoes, semente):
+    resultados = Resultados(tamanhos=list(tamanhos), repeticoes=repeticoes, semente=semente)
+    memoria = []
+    for tamanho in tamanhos:
+        logger.info(f"Gerando {tamanho} alunos...")
+        linhas = gerar_linhas(tamanho, semente)
+        rng = random.Random(semente)
+
+        def construir():
+            indice = indice_unicidade.IndiceUnicidade(verificar_apos_s=0)
+            indice.carregar_linhas(linhas)
+            return indice
+        indice, retidos, pico = _medir_memoria(construir)
+        resultados.registrar("carregar_indice", medir(construir, 1), tamanho)
+        dicts, retidos_dicts, pico_dicts = _medir_memoria(lambda: _dicts_de_strings(linhas))
+        del dicts
+        chaves = 2 * tamanho # Um CPF e um e-mail por aluno
+        memoria.append({"tamanho": tamanho, "indice_bytes": retidos, "indice_pico_bytes": pico,
+                        "indice_bytes_por_chave": round(retidos / chaves, 1), "indice_mib_por_milhao_de_chaves": round(retidos / chaves * 1e6 / 2**20, 1),
+                        "dicts_bytes": retidos_dicts, "dicts_pico_bytes": pico_dicts,
+                        "dicts_bytes_por_chave": round(retidos_dicts / chaves, 1), "dicts_mib_por_milhao_de_chaves": round(retidos_dicts / chaves * 1e6 / 2**20, 1)})
+
+        amostra = rng.sample(linhas, min(CONSULTAS_POR_REPETICAO, tamanho))
+        ausentes = [(None, f"{c[:-1]}{(int(c[-1]) + 5) % 10}", f"x.{e}") for _, c, e in amostra] # Dígito final trocado: CPF livre
+        resultados.registrar("verificar_existentes", medir(lambda: [indice.verificar(c, e) for _, c, e in amostra], repeticoes), tamanho,
+                             consultas=len(amostra))
+        resultados.registrar("verificar_livres", medir(lambda: [indice.verificar(c, e) for _, c, e in ausentes], repeticoes), tamanho,
+                             consultas=len(ausentes))
+        duplicados = sum(1 for _, c, e in amostra if not indice.verificar(c, e)[0])
+        falsos = sum(1 for _, c, e in ausentes if not indice.verificar(c, e)[0])
+        if duplicados != len(amostra) or falsos: raise SystemExit(f"Índice inconsistente: {duplicados}/{len(amostra)} existentes, {falsos} falso(s) positivo(s).")
+
+        novos = [(tamanho + i, f"{c[:-1]}{(int(c[-1]) + 5) % 10}", f"novo.{e}") for i, (_, c, e) in enumerate(amostra, start=1)]
+        def registrar_novos():
+            for id_aluno, cpf, email in novos: indice.registrar(id_aluno, cpf, email)
+        resultados.registrar("registrar_alteracoes", medir(registrar_novos, 1), tamanho, alteracoes=len(novos))
+        del indice, linhas
+    resultados.meta["memoria"] = memoria
+    return resultados
+
+def main(argv=None):
+    """Uso: python -m benchmarks.bench_unicidade --tamanhos 100000,1000000 --saida unicidade.json"""
+    parser = argparse.ArgumentParser(description="Memória por chave e latência do índice de unicidade de CPF/Email (sem banco).")
+    parser.add_argument("--tamanhos", default=",".join(str(t) for t in TAMANHOS_PADRAO), help="Quantidades de alunos, separadas por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="bench_resultados_unicidade.json")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    resultados = executar([int(t) for t in args.tamanhos.split(",") if t.strip()], max(1, args.repeticoes), args.semente)
+    resultados.salvar(args.saida)
+    print(f"{'alunos':>9} {'índice MiB':>11} {'pico MiB':>9} {'B/chave':>8} {'MiB/1M chaves':>14} {'dicts MiB':>10} {'B/chave':>8}")
+    for m in resultados.meta["memoria"]:
+        print(f"{m['tamanho']:>9} {m['indice_bytes'] / 2**20:>11.1f} {m['indice_pico_bytes'] / 2**20:>9.1f} {m['indice_bytes_por_chave']:>8.1f} "
+              f"{m['indice_mib_por_milhao_de_chaves']:>14.1f} {m['dicts_bytes'] / 2**20:>10.1f} {m['dicts_bytes_por_chave']:>8.1f}")
+    print(f"\n{'operação':<24} {'n':>9} {'p50 ms':>9} {'por consulta µs':>16}")
+    for m in resultados.medicoes:
+        por_item = m["parametros"].get("consultas") or m["parametros"].get("alteracoes")
+        print(f"{m['operacao']:<24} {m['tamanho']:>9} {m['p50']:>9.2f} {(m['p50'] * 1000 / por_item) if por_item else 0:>16.2f}")
+    print(f"\nResultados gravados em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
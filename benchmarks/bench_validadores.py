@@ -0,0 +1,121 @@
+# benchmarks/bench_validadores.py
+import re
+import sys
+import random
+import logging
+import argparse
+from datetime import date, datetime
+from utils import validators
+from benchmarks.medicao import Resultados, medir
+from benchmarks.dados_sinteticos import gerar_alunos
+
+logger = logging.getLogger(__name__)
+
+try:
+    from validate_docbr import CPF as _CPFDocbr # Só para comparar com a implementação antiga
+except ImportError:
+    _CPFDocbr = None
+
+TAMANHOS_PADRAO = (1000, 10000)
+REPETICOES_PADRAO = 5
+FRACAO_INVALIDOS = 0.1
+
+# --- Implementação anterior (cópia fiel, para comparação) ---
+def _legado_cpf(cpf_string):
+    if not cpf_string: return True, ""
+    if not re.fullmatch(r"\d{3}\.\d{3}\.\d{3}-\d{2}", cpf_string):
+        logger.debug(f"Formato de máscara do CPF '{cpf_string}' é inválido.")
+        return False, "CPF: Formato inválido (esperado ###.###.###-##)."
+    if _CPFDocbr is None: return True, "" # Sem validate-docbr: mede só o restante do caminho antigo
+    if _CPFDocbr().validate(cpf_string):
+        logger.debug(f"CPF '{cpf_string}' validado com sucesso (validate-docbr).")
+        return True, ""
+    logger.debug(f"Validação de dígitos do CPF (validate-docbr) falhou para: '{cpf_string}'")
+    return False, "CPF inválido (dígitos verificadores não conferem)."
+
+def _legado_email(email_string):
+    if not email_string: return True, ""
+    if re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", email_string): return True, ""
+    logger.debug(f"Formato de e-mail inválido: '{email_string}'")
+    return False, "E-mail: Formato inválido."
+
+def _legado_telefone(telefone_string):
+    if not telefone_string: return True, ""
+    if re.fullmatch(r"^\(\d{2}\) (?:9\d{4}-\d{4}|\d{4}-\d{4})$", telefone_string.strip()): return True, ""
+    logger.debug(f"Formato de telefone inválido: '{telefone_string}'")
+    return False, "Telefone: Formato inválido. Use (XX) XXXXX-XXXX ou (XX) XXXX-XXXX."
+
+def _legado_data(data_str):
+    if not data_str: return True, ""
+    try: data_nasc = datetime.strptime(data_str, '%Y-%m-%d').date()
+    except ValueError: return False, "Data Nasc.: Formato inválido para processamento."
+    hoje = date.today()
+    if data_nasc > hoje: return False, "Data de nascimento não pode ser uma data futura."
+    idade = hoje.year - data_nasc.year - ((hoje.month, hoje.day) < (data_nasc.month, data_nasc.day))
+    logger.debug(f"Validação de Idade: DataNasc='{data_nasc}', Hoje='{hoje}', IdadeCalc='{idade}', Mínima='{validators.IDADE_MINIMA_ALUNO}'")
+    if idade < validators.IDADE_MINIMA_ALUNO: return False, f"Aluno deve ter pelo menos {validators.IDADE_MINIMA_ALUNO} anos. Idade calculada: {idade}."
+    return True, ""
+
+def _legado_aluno(dados_aluno):
+    nome, sobrenome, telefone, email, cpf, data_nasc, _, _, _ = dados_aluno
+    logger.debug(f"Backend validando dados para '{nome} {sobrenome}': CPF='{cpf}', Email='{email}', Tel='{telefone}', DataNasc='{data_nasc}'")
+    for valido, msg in (_legado_cpf(cpf), _legado_email(email), _legado_telefone(telefone), _legado_data(data_nasc)):
+        if not valido: return False, msg
+    return True, ""
+
+# --- Dados ---
+def gerar_lote(quantidade, semente):
+    """Alunos sintéticos com ~10% de registros inválidos (CPF, e-mail, telefone ou idade)."""
+    rng = random.Random(semente)
+    lote = []
+    for aluno in gerar_alunos(quantidade, semente=semente):
+        if rng.random() < FRACAO_INVALIDOS:
+            aluno = list(aluno); campo = rng.choice((2, 3, 4, 5))
+            aluno[campo] = {2: "61 9999-0000", 3: "sem-arroba.com", 4: aluno[4][:-1] + str((int(aluno[4][-1]) + 1) % 10),
+                            5: f"{date.today().year - 10}-01-01"}[campo]
+            aluno = tuple(aluno)
+        lote.append(aluno)
+    return lote
+
+def executar(tamanhos, repeticoes, semente):
+    resultados = Resultados(tamanhos=list(tamanhos), repeticoes=repeticoes, semente=semente,
+                            legado_com_validate_docbr=_CPFDocbr is not None)
+    for tamanho in tamanhos:
+        lote = gerar_lote(tamanho, semente)
+        esperado = [_legado_aluno(d)[0] for d in lote]
+        # As duas implementações precisam concordar antes de comparar tempos
+        divergentes = sum(1 for a, (b, _) in zip(esperado, validators.validar_lote(lote)) if a != b)
+        if divergentes and _CPFDocbr is not None: raise SystemExit(f"{divergentes} registro(s) com resultado diferente entre as implementações.")
+
+        resultados.registrar("legado_por_linha", medir(lambda: [_legado_aluno(d) for d in lote], repeticoes), tamanho)
+        resultados.registrar("validar_aluno_cache_frio", medir(lambda: [validators.validar_aluno(d) for d in lote], repeticoes,
+                                                               preparar=validators.limpar_caches), tamanho)
+        resultados.registrar("validar_aluno_cache_quente", medir(lambda: [validators.validar_aluno(d) for d in lote], repeticoes), tamanho)
+        resultados.registrar("validar_lote", medir(lambda: validators.validar_lote(lote), repeticoes,
+                                                   preparar=validators.limpar_caches), tamanho)
+        cpfs = [d[4] for d in lote]
+        resultados.registrar("cpf_legado", medir(lambda: [_legado_cpf(c) for c in cpfs], repeticoes), tamanho)
+        resultados.registrar("cpf_digitos_validos", medir(lambda: [validators.validar_cpf_completo.__wrapped__(c) for c in cpfs], repeticoes), tamanho)
+    return resultados
+
+def main(argv=None):
+    """Uso: python -m benchmarks.bench_validadores --tamanhos 1000,10000 --saida validadores.json"""
+    parser = argparse.ArgumentParser(description="Microbenchmark dos validadores: implementação anterior x atual.")
+    parser.add_argument("--tamanhos", default=",".join(str(t) for t in TAMANHOS_PADRAO))
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="bench_resultados_validadores.json")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    if _CPFDocbr is None: print("Aviso: validate-docbr não instalado; o caminho antigo é medido sem a checagem de dígitos do CPF.", file=sys.stderr)
+
+    resultados = executar([int(t) for t in args.tamanhos.split(",") if t.strip()], max(1, args.repeticoes), args.semente)
+    resultados.salvar(args.saida)
+    print(f"{'operação':<28} {'n':>7} {'p50 ms':>9} {'por registro µs':>16}")
+    for m in resultados.medicoes:
+        print(f"{m['operacao']:<28} {m['tamanho']:>7} {m['p50']:>9.2f} {m['p50'] * 1000 / m['tamanho']:>16.2f}")
+    print(f"\nResultados gravados em {args.saida}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# benchmarks/carga_api.py
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit, urlencode
+from benchmarks.medicao import Resultados, resumir
+from benchmarks.dados_sinteticos import gerar_aluno
+
+CLIENTES_PADRAO = 15 # Igual aos workers padrão do servidor (3 x DB_POOL_SIZE 5): cada cliente keep-alive ocupa um worker
+DURACAO_PADRAO_S = 30
+ORDENACOES = ("nome", "sobrenome", "cidade", "data_nascimento", "id")
+DIRECOES = ("ASC", "DESC")
+BUSCAS = (("nome", "Ana"), ("sobrenome", "Sil"), ("curso", "ADS"), ("uf", "DF"), ("cidade", "Bras"))
+
+# Teste de carga do servidor_api.py. Cada cliente (thread) mantém uma conexão keep-alive e sorteia
+# operações: listagem (com e sem busca), próxima página, GET por id, GET condicional (If-None-Match
+# com a ETag já vista) e, com --escritas > 0, ciclos de cadastro + deleção. Use um banco descartável
+# ou o BENCH_DB_NAME no servidor quando medir escritas.
+
+class Cliente(threading.Thread):
+    def __init__(self, numero, url, fim, fracao_escritas, fracao_condicional, ids, semente):
+        super().__init__(daemon=True)
+        partes = urlsplit(url)
+        self.host, self.porta = partes.hostname, partes.port or 80
+        self.numero = numero; self.fim = fim; self.ids = ids
+        self.fracao_escritas = fracao_escritas; self.fracao_condicional = fracao_condicional
+        self.rng = random.Random(semente + numero)
+        self.tempos = {}; self.status = {}; self.etags = {}; self.erros = 0
+        self.conexao = None; self._indice_aluno = 10**7 + numero * 10**5 # CPFs/e-mails únicos por cliente
+
+    def _requisitar(self, operacao, metodo, caminho, corpo=None, cabecalhos=None):
+        if self.conexao is None: self.conexao = http.client.HTTPConnection(self.host, self.porta, timeout=30)
+        cabecalhos = dict(cabecalhos or {})
+        if corpo is not None: corpo = json.dumps(corpo).encode(); cabecalhos["Content-Type"] = "application/json"
+        inicio = time.perf_counter()
+        try:
+            self.conexao.request(metodo, caminho, body=corpo, headers=cabecalhos)
+            resposta = self.conexao.getresponse(); dados = resposta.read()
+        except (OSError, http.client.HTTPException):
+            self.erros += 1; self.conexao.close(); self.conexao = None
+            return None, None, None
+        self.tempos.setdefault(operacao, []).append(time.perf_counter() - inicio)
+        self.status[resposta.status] = self.status.get(resposta.status, 0) + 1
+        return resposta.status, resposta.getheader("ETag"), dados
+
+    def _listar(self, operacao, parametros, condicional=False):
+        caminho = "/alunos?" + urlencode(parametros)
+        cabecalhos = {"If-None-Match": self.etags[caminho]} if condicional and caminho in self.etags else None
+        status, etag, dados = self._requisitar(operacao, "GET", caminho, cabecalhos=cabecalhos)
+        if etag: self.etags[caminho] = etag
+        return json.loads(dados) if status == 200 else None
+
+    def run(self):
+        while time.monotonic() < self.fim:
+            sorteio = self.rng.random()
+            if sorteio < self.fracao_escritas:
+                self._indice_aluno += 1
+                campos = ("nome", "sobrenome", "telefone", "email", "cpf", "data_nascimento", "cidade", "uf", "curso")
+                aluno = dict(zip(campos, gerar_aluno(self._indice_aluno, self.rng)))
+                status, _, dados = self._requisitar("cadastrar", "POST", "/alunos", aluno)
+                if status == 201: self._requisitar("deletar", "DELETE", f"/alunos/{json.loads(dados)['id']}")
+            elif sorteio < self.fracao_escritas + self.fracao_condicional and self.etags:
+                caminho = self.rng.choice(list(self.etags))
+                self._requisitar("listar_condicional", "GET", caminho, cabecalhos={"If-None-Match": self.etags[caminho]})
+            elif self.ids and sorteio < 0.5:
+                self._requisitar("obter", "GET", f"/alunos/{self.rng.choice(self.ids)}")
+            elif sorteio < 0.75:
+                parametros = {"ordem": self.rng.choice(ORDENACOES), "direcao": self.rng.choice(DIRECOES), "tamanho": 50}
+                pagina = self._listar("listar", parametros)
+                if pagina and pagina.get("proximo"): # O cursor só vale na mesma ordem/direção da página que o gerou
+                    self._listar("proxima_pagina", dict(parametros, apos=pagina["proximo"]))
+            else:
+                campo, termo = self.rng.choice(BUSCAS)
+                self._listar("buscar", {"campo": campo, "termo": termo, "tamanho": 50})
+        if self.conexao is not None: self.conexao.close()
+
+def descobrir_ids(url, quantidade=500):
+    partes = urlsplit(url)
+    conexao = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=30)
+    try:
+        conexao.request("GET", "/alunos?" + urlencode({"ordem": "id", "tamanho": quantidade}))
+        resposta = conexao.getresponse(); dados = resposta.read()
+        if resposta.status != 200: raise SystemExit(f"Servidor respondeu {resposta.status} a GET /alunos: {dados[:200]!r}")
+        return [aluno["id"] for aluno in json.loads(dados)["alunos"]]
+    finally:
+        conexao.close()
+
+def main(argv=None):
+    """Uso: python -m benchmarks.carga_api --url http://127.0.0.1:8080 --clientes 16 --duracao 30"""
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor_api.py: requisições/s e percentis de latência.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--clientes", type=int, default=CLIENTES_PADRAO, help="Conexões simultâneas (threads)")
+    parser.add_argument("--duracao", type=float, default=DURACAO_PADRAO_S, help="Segundos de carga")
+    parser.add_argument("--escritas", type=float, default=0.0, help="Fração de ciclos cadastro+deleção (0 a 1)")
+    parser.add_argument("--condicionais", type=float, default=0.1, help="Fração de GETs condicionais com ETag")
+    parser.add_argument("--meta-rps", type=float, help="Vazão mínima esperada; sai com código 1 se não for atingida")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="bench_resultados_api.json")
+    args = parser.parse_args(argv)
+
+    ids = descobrir_ids(args.url)
+    fim = time.monotonic() + args.duracao
+    clientes = [Cliente(n, args.url, fim, args.escritas, args.condicionais, ids, args.semente) for n in range(max(1, args.clientes))]
+    inicio = time.perf_counter()
+    for cliente in clientes: cliente.start()
+    for cliente in clientes: cliente.join()
+    decorrido = time.perf_counter() - inicio
+
+    tempos = {}; status = {}
+    for cliente in clientes:
+        for operacao, amostras in cliente.tempos.items(): tempos.setdefault(operacao, []).extend(amostras)
+        for codigo, total in cliente.status.items(): status[codigo] = status.get(codigo, 0) + total
+    todas = [a for amostras in tempos.values() for a in amostras]
+    erros = sum(c.erros for c in clientes)
+    resultados = Resultados(url=args.url, clientes=len(clientes), duracao_s=round(decorrido, 2), escritas=args.escritas,
+                            requisicoes=len(todas), requisicoes_por_segundo=round(len(todas) / decorrido, 1),
+                            status={str(k): v for k, v in sorted(status.items())}, erros_conexao=erros)
+    resultados.registrar("total", todas, None, clientes=len(clientes))
+    for operacao, amostras in sorted(tempos.items()): resultados.registrar(operacao, amostras, None, clientes=len(clientes))
+    resultados.salvar(args.saida)
+
+    print(f"{len(todas)} requisições em {decorrido:.1f}s com {len(clientes)} clientes: {len(todas) / decorrido:.1f} req/s "
+          f"(status: {dict(sorted(status.items()))}, erros de conexão: {erros})")
+    print(f"{'operação':<20} {'n':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for operacao, amostras in [("total", todas)] + sorted(tempos.items()):
+        r = resumir(amostras)
+        if r["n"]: print(f"{operacao:<20} {r['n']:>7} {r['p50']:>9.2f} {r['p95']:>9.2f} {r['p99']:>9.2f}")
+    print(f"\nResultados gravados em {args.saida}")
+    if args.meta_rps and len(todas) / decorrido < args.meta_rps:
+        print(f"Meta de {args.meta_rps:.0f} req/s NÃO atingida.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# benchmarks/comparar.py
+import sys
+import json
+import argparse
+from benchmarks.medicao import chave_medicao
+
+def comparar(base, atual, metrica="p50", tolerancia=0.2, piso_ms=0.5):
+    """
+    Compara duas execuções do benchmark. Retorna [(medicao_atual, valor_base, valor_atual, variacao)]
+    das medições que pioraram mais que 'tolerancia' (fração) e mais que 'piso_ms' em termos absolutos.
+    """
+    por_chave = {chave_medicao(m): m for m in base["medicoes"]}
+    regressoes = []
+    for medicao in atual["medicoes"]:
+        anterior = por_chave.get(chave_medicao(medicao))
+        if not anterior or metrica not in anterior or metrica not in medicao: continue
+        valor_base = anterior[metrica]; valor_atual = medicao[metrica]
+        if valor_atual - valor_base <= piso_ms: continue
+        variacao = (valor_atual - valor_base) / valor_base if valor_base > 0 else float("inf")
+        if variacao > tolerancia: regressoes.append((medicao, valor_base, valor_atual, variacao))
+    return regressoes
+
+def main(argv=None):
+    """Uso: python -m benchmarks.comparar base.json atual.json [--metrica p95] [--tolerancia 0.2]"""
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark e aponta regressões.")
+    parser.add_argument("base"); parser.add_argument("atual")
+    parser.add_argument("--metrica", default="p50", help="Estatística comparada (p50, p90, p95, p99, media...)")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora relativa aceita (padrão: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    with open(args.base, encoding="utf-8") as a: base = json.load(a)
+    with open(args.atual, encoding="utf-8") as a: atual = json.load(a)
+    regressoes = comparar(base, atual, args.metrica, args.tolerancia)
+    for medicao, antes, depois, variacao in regressoes:
+        print(f"REGRESSÃO {medicao['operacao']} n={medicao['tamanho']} {medicao['parametros']}: "
+              f"{args.metrica} {antes:.2f} ms -> {depois:.2f} ms (+{variacao:.0%})")
+    if not regressoes: print(f"Nenhuma regressão acima de {args.tolerancia:.0%} em {args.metrica}.")
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
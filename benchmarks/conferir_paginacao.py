@@ -0,0 +1,112 @@
+# benchmarks/conferir_paginacao.py
+import os
+import csv
+import sys
+import logging
+import argparse
+import tempfile
+from database import db_config, db_handler, db_pool, arquivamento, busca, exportador_csv
+from benchmarks import banco_bench
+from benchmarks.bench_arquivo import envelhecer, analisar_tabelas, CORTE_ARQUIVAMENTO
+
+logger = logging.getLogger(__name__)
+
+# Conferência (não é medição de tempo): percorre a listagem página a página, para frente e para
+# trás, em todas as ordenações e direções, e compara com a listagem completa da mesma ordem.
+# Uma divergência é um aluno pulado ou repetido pelo keyset (ex.: curso ordenado pela posição no
+# ENUM e comparado como texto). A exportação CSV também é comparada com a listagem completa.
+# Roda no banco descartável BENCH_DB_NAME, com parte dos alunos arquivada para cobrir também
+# "Incluir arquivados".
+TOTAL_PADRAO = 5_000
+FRACAO_INATIVA_PADRAO = 0.3
+TAMANHO_PAGINA_PADRAO = 97 # Primo: as páginas não coincidem com as fronteiras entre valores repetidos
+
+def paginar(coluna, direcao, tamanho_pagina, incluir_arquivados):
+    """Ids na ordem das páginas: para frente até o fim e, de lá, para trás até o início."""
+    def pagina(**cursor):
+        resultado, msg = db_handler.visualizar_alunos_pagina_db(sort_by_column=coluna, sort_direction=direcao, tamanho_pagina=tamanho_pagina,
+                                                                incluir_arquivados=incluir_arquivados, **cursor)
+        if resultado is None: raise RuntimeError(f"Página falhou na conferência: {msg}")
+        return resultado
+    atual = pagina(); frente = [linha[0] for linha in atual["linhas"]]
+    while atual["ha_mais"]:
+        atual = pagina(apos_cursor=atual["proximo_cursor"]); frente += [linha[0] for linha in atual["linhas"]]
+    tras = [linha[0] for linha in atual["linhas"]]
+    while atual["chaves"]:
+        atual = pagina(antes_cursor=atual["chaves"][0]); tras[:0] = [linha[0] for linha in atual["linhas"]]
+        if not atual["ha_mais"]: break
+    return frente, tras
+
+def conferir(coluna, direcao, tamanho_pagina, incluir_arquivados):
+    """Lista de divergências (textos) de uma ordenação; vazia se a paginação bate com a listagem completa."""
+    completa, msg = db_handler.visualizar_alunos_db(sort_by_column=coluna, sort_direction=direcao, incluir_arquivados=incluir_arquivados)
+    if completa is None: raise RuntimeError(f"Listagem falhou na conferência: {msg}")
+    esperado = [linha[0] for linha in completa]
+    cenario = f"{coluna} {direcao}{' + arquivados' if incluir_arquivados else ''}"
+    divergencias = []
+    for sentido, obtido in zip(("para frente", "para trás"), paginar(coluna, direcao, tamanho_pagina, incluir_arquivados)):
+        if obtido != esperado:
+            faltando = len(set(esperado) - set(obtido)); repetidos = len(obtido) - len(set(obtido))
+            divergencias.append(f"{cenario}, {sentido}: {len(obtido)} de {len(esperado)} aluno(s), {faltando} faltando, {repetidos} repetido(s).")
+    if coluna == "curso":
+        posicoes = [busca.posicao_curso(linha[9]) for linha in completa]
+        if posicoes != sorted(posicoes, reverse=direcao == "DESC"): divergencias.append(f"{cenario}: cursos fora da ordem do ENUM {busca.CURSOS_VALIDOS}.")
+    return divergencias
+
+def conferir_exportacao(pasta, incluir_arquivados):
+    """Divergências da exportação CSV: deve trazer os mesmos alunos, na mesma ordem, da listagem completa."""
+    completa, msg = db_handler.visualizar_alunos_db(incluir_arquivados=incluir_arquivados)
+    if completa is None: raise RuntimeError(f"Listagem falhou na conferência: {msg}")
+    caminho = os.path.join(pasta, f"exportacao{'_arquivados' if incluir_arquivados else ''}.csv")
+    total, msg = exportador_csv.exportar_csv(caminho, incluir_arquivados=incluir_arquivados)
+    if total is None: raise RuntimeError(f"Exportação falhou na conferência: {msg}")
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        exportados = [int(linha[0]) for linha in list(csv.reader(arquivo, delimiter=exportador_csv.DELIMITADOR_CSV))[1:]]
+    if exportados == [linha[0] for linha in completa]: return []
+    return [f"exportação{' + arquivados' if incluir_arquivados else ''}: {len(exportados)} de {len(completa)} aluno(s) no CSV, ou fora da ordem."]
+
+def executar(total, fracao_inativa, tamanho_pagina, semente):
+    banco_bench.preparar_banco()
+    logger.info(f"Semeando {total} alunos...")
+    banco_bench.repopular(total, semente)
+    if fracao_inativa > 0:
+        envelhecer(fracao_inativa)
+        arquivados, msg = arquivamento.arquivar_inativos(CORTE_ARQUIVAMENTO, pausa_s=0)
+        if not arquivados: raise RuntimeError(f"Arquivamento falhou na conferência: {msg}")
+        logger.info(f"{arquivados} aluno(s) arquivado(s).")
+    analisar_tabelas()
+    cache_original = db_config.CACHE_ALUNOS_ATIVO
+    db_config.CACHE_ALUNOS_ATIVO = False # Confere o SQL do servidor, não a cópia local
+    try:
+        divergencias = []
+        for coluna in db_handler.COLUNAS_ORDENACAO_PERMITIDAS:
+            for direcao in ("ASC", "DESC"):
+                for incluir_arquivados in (False, True):
+                    divergencias += conferir(coluna, direcao, tamanho_pagina, incluir_arquivados)
+        with tempfile.TemporaryDirectory() as pasta:
+            for incluir_arquivados in (False, True): divergencias += conferir_exportacao(pasta, incluir_arquivados)
+    finally:
+        db_config.CACHE_ALUNOS_ATIVO = cache_original
+    return divergencias
+
+def main(argv=None):
+    """Uso: python -m benchmarks.conferir_paginacao --total 5000"""
+    parser = argparse.ArgumentParser(description="Confere a paginação por keyset e a exportação CSV contra a listagem completa em um banco descartável (BENCH_DB_NAME).")
+    parser.add_argument("--total", type=int, default=TOTAL_PADRAO, help=f"Alunos semeados (padrão: {TOTAL_PADRAO})")
+    parser.add_argument("--fracao-inativa", type=float, default=FRACAO_INATIVA_PADRAO, help=f"Fração arquivada (padrão: {FRACAO_INATIVA_PADRAO})")
+    parser.add_argument("--tamanho-pagina", type=int, default=TAMANHO_PAGINA_PADRAO)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    try:
+        divergencias = executar(max(1, args.total), args.fracao_inativa, max(1, args.tamanho_pagina), args.semente)
+    finally:
+        db_pool.fechar()
+    for divergencia in divergencias: print(divergencia)
+    print(f"{len(divergencias)} divergência(s)." if divergencias else "Paginação e exportação conferem em todas as ordenações.")
+    return 1 if divergencias else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# benchmarks/dados_sinteticos.py
+import random
+from datetime import date, timedelta
+
+NOMES = ("Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor", "Isabela", "João",
+         "Júlia", "Lucas", "Mariana", "Nicolas", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória")
+SOBRENOMES = ("Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+              "Costa", "Ribeiro", "Martins", "Carvalho", "Araújo", "Melo", "Barbosa", "Rocha", "Dias", "Teixeira")
+CIDADES = (("Brasília", "DF"), ("Gama", "DF"), ("Taguatinga", "DF"), ("Goiânia", "GO"), ("Anápolis", "GO"),
+           ("São Paulo", "SP"), ("Campinas", "SP"), ("Belo Horizonte", "MG"), ("Salvador", "BA"), ("Recife", "PE"))
+CURSOS = ("ADS", "GTI", "CD", "IA", "BI", "SI")
+_SEM_ACENTO = str.maketrans("áâãéêíóôúç", "aaaeeioouc")
+
+def digitos_verificadores_cpf(base9):
+    """Calcula os dois dígitos verificadores de um CPF a partir dos 9 primeiros dígitos."""
+    digitos = [int(d) for d in base9]
+    for peso_inicial in (10, 11):
+        soma = sum(d * p for d, p in zip(digitos, range(peso_inicial, 1, -1)))
+        resto = (soma * 10) % 11
+        digitos.append(0 if resto == 10 else resto)
+    return "".join(str(d) for d in digitos[9:])
+
+def gerar_cpf(indice):
+    """CPF válido e único por índice (7919 é primo com 10^9, então a base não se repete)."""
+    base = f"{(indice * 7919) % 10**9:09d}"
+    if len(set(base)) == 1: base = base[:-1] + str((int(base[-1]) + 1) % 10) # Sequências repetidas são inválidas
+    cpf = base + digitos_verificadores_cpf(base)
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+def gerar_aluno(indice, rng):
+    """Tupla no formato de dados_aluno de db_handler (data em AAAA-MM-DD), válida para os validadores."""
+    nome = rng.choice(NOMES); sobrenome = rng.choice(SOBRENOMES); cidade, uf = rng.choice(CIDADES)
+    email = f"{nome}.{sobrenome}.{indice}@exemplo.com".lower().translate(_SEM_ACENTO)
+    telefone = f"(61) 9{rng.randrange(10000):04d}-{rng.randrange(10000):04d}" if rng.random() < 0.9 else None
+    nascimento = date(1970, 1, 1) + timedelta(days=rng.randrange(365 * 35)) # Até 2004: sempre acima da idade mínima
+    return (nome, sobrenome, telefone, email, gerar_cpf(indice), nascimento.strftime("%Y-%m-%d"), cidade, uf, rng.choice(CURSOS))
+
+def gerar_alunos(quantidade, inicio=1, semente=42):
+    rng = random.Random(semente + inicio)
+    for indice in range(inicio, inicio + quantidade): yield gerar_aluno(indice, rng)
+
+def termos_de_busca(aluno):
+    """Termo realista para cada campo de busca, tirado de um aluno existente."""
+    nome, sobrenome, _, email, cpf, _, cidade, uf, curso = aluno
+    return {"Nome": nome[:3], "Sobrenome": sobrenome[:3], "Nome completo": f"{nome} {sobrenome}", "CPF": cpf,
+            "Email": email, "Curso": curso, "Cidade": cidade[:4], "UF": uf}
@@ -0,0 +1,53 @@
+# benchmarks/medicao.py
+import json
+import time
+import platform
+import statistics
+from datetime import datetime
+
+PERCENTIS = (50, 90, 95, 99)
+
+def resumir(amostras_s):
+    """Resume tempos (em segundos) em milissegundos: n, min, média, percentis e max."""
+    ms = sorted(a * 1000 for a in amostras_s)
+    if not ms: return {"n": 0}
+    if len(ms) == 1: cortes = [ms[0]] * 99
+    else: cortes = statistics.quantiles(ms, n=100, method="inclusive")
+    resumo = {"n": len(ms), "min": round(ms[0], 3), "media": round(statistics.fmean(ms), 3)}
+    for p in PERCENTIS: resumo[f"p{p}"] = round(cortes[p - 1], 3)
+    resumo["max"] = round(ms[-1], 3)
+    return resumo
+
+def medir(funcao, repeticoes, preparar=None):
+    """
+    Executa funcao() 'repeticoes' vezes e retorna a lista de tempos em segundos.
+    'preparar()' (opcional) roda antes de cada repetição, fora da medição.
+    """
+    amostras = []
+    for _ in range(repeticoes):
+        if preparar: preparar()
+        inicio = time.perf_counter()
+        funcao()
+        amostras.append(time.perf_counter() - inicio)
+    return amostras
+
+class Resultados:
+    """Acumula medições e grava o JSON comparável entre execuções (ver benchmarks/comparar.py)."""
+
+    def __init__(self, **meta):
+        self.meta = {"inicio": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                     "plataforma": platform.platform(), **meta}
+        self.medicoes = []
+
+    def registrar(self, operacao, amostras_s, tamanho=None, **parametros):
+        medicao = {"operacao": operacao, "tamanho": tamanho, "parametros": parametros, **resumir(amostras_s)}
+        self.medicoes.append(medicao)
+        return medicao
+
+    def salvar(self, caminho):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"meta": self.meta, "medicoes": self.medicoes}, arquivo, ensure_ascii=False, indent=2)
+
+def chave_medicao(medicao):
+    """Identifica a mesma medição em execuções diferentes."""
+    return (medicao["operacao"], medicao.get("tamanho"), json.dumps(medicao.get("parametros", {}), sort_keys=True))
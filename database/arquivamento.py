@@ -0,0 +1,144 @@
+# database/arquivamento.py
+import sys
+import time
+import logging
+import argparse
+from datetime import date
+import mysql.connector
+from . import db_pool
+from . import db_handler
+from . import cache_alunos
+from . import indice_unicidade
+from . import instrucoes
+from . import roteamento
+from utils import instrumentacao
+
+logger = logging.getLogger(__name__)
+
+# Arquivamento de alunos inativos: move para alunos_arquivo (particionada por ano, ver schema.sql)
+# os alunos sem nenhuma alteração desde uma data, mantendo a tabela alunos pequena para as
+# listagens/buscas do dia a dia. A movimentação é feita em lotes pequenos, cada um numa
+# transação curta (SELECT ... FOR UPDATE SKIP LOCKED + INSERT ... SELECT + DELETE), com uma
+# pausa entre lotes: alunos sendo editados no momento são pulados, e nenhum lock fica preso
+# por mais que um lote. O id do aluno é mantido no arquivo.
+# Uso: python -m database.arquivamento --antes-de 2022-01-01
+
+TAMANHO_LOTE_PADRAO = 500
+PAUSA_ENTRE_LOTES_S = 0.05 # Folga para as transações da aplicação entre um lote e outro
+COLUNAS_ARQUIVADAS = "id, nome, sobrenome, telefone, email, cpf, data_nascimento, cidade, uf, curso, atualizado_em"
+
+SQL_SELECIONAR_INATIVOS = "SELECT id FROM alunos WHERE atualizado_em < %s ORDER BY atualizado_em, id LIMIT %s FOR UPDATE SKIP LOCKED"
+SQL_COPIAR_PARA_ARQUIVO = (f"INSERT INTO {db_handler.TABELA_ARQUIVO} ({COLUNAS_ARQUIVADAS}, ano_referencia) "
+                           f"SELECT {COLUNAS_ARQUIVADAS}, YEAR(atualizado_em) FROM alunos WHERE id IN ({{ids}})")
+SQL_REMOVER_ATIVOS = "DELETE FROM alunos WHERE id IN ({ids})"
+# Restaurado conta como alteração (atualizado_em = agora): não volta ao arquivo na próxima execução
+COLUNAS_RESTAURADAS = COLUNAS_ARQUIVADAS.replace(", atualizado_em", "")
+SQL_COPIAR_PARA_ATIVOS = (f"INSERT INTO alunos ({COLUNAS_RESTAURADAS}) "
+                          f"SELECT {COLUNAS_RESTAURADAS} FROM {db_handler.TABELA_ARQUIVO} WHERE id IN ({{ids}})")
+SQL_REMOVER_ARQUIVADOS = f"DELETE FROM {db_handler.TABELA_ARQUIVO} WHERE id IN ({{ids}})"
+
+def _mover_lote(conexao, antes_de, tamanho_lote):
+    """Move um lote numa transação. Retorna quantos alunos foram arquivados (0 = não há mais)."""
+    ids = [linha[0] for linha in instrucoes.executar(conexao, "arquivar_selecionar", SQL_SELECIONAR_INATIVOS,
+                                                     (antes_de, tamanho_lote), buscar=True).linhas]
+    if not ids: conexao.rollback(); return 0
+    instrucoes.executar(conexao, f"arquivar_copiar[{len(ids)}]", db_handler._sql_ids(SQL_COPIAR_PARA_ARQUIVO, len(ids)), ids)
+    instrucoes.executar(conexao, f"arquivar_remover[{len(ids)}]", db_handler._sql_ids(SQL_REMOVER_ATIVOS, len(ids)), ids)
+    instrucoes.confirmar(conexao)
+    return len(ids)
+
+@instrumentacao.cronometrado("db.arquivar_inativos")
+def arquivar_inativos(antes_de, tamanho_lote=TAMANHO_LOTE_PADRAO, pausa_s=PAUSA_ENTRE_LOTES_S, limite=None, ao_progresso=None):
+    """
+    Arquiva os alunos com atualizado_em anterior a 'antes_de' (date ou 'AAAA-MM-DD'), em lotes de
+    'tamanho_lote'. 'limite' para depois de N alunos; 'ao_progresso(total)' é chamado a cada lote.
+    Retorna (total_arquivado, msg); em erro, total é o que já foi arquivado até ali (lotes confirmados).
+    """
+    antes_de = antes_de if isinstance(antes_de, date) else date.fromisoformat(antes_de)
+    logger.info(f"Arquivando alunos sem alteração desde {antes_de:%d/%m/%Y} (lotes de {tamanho_lote}).")
+    total = 0; inicio = time.perf_counter()
+    while limite is None or total < limite:
+        lote = tamanho_lote if limite is None else min(tamanho_lote, limite - total)
+        with db_pool.conexao() as conexao:
+            if not conexao: return total, "Falha na conexão com o banco de dados."
+            try:
+                movidos = _mover_lote(conexao, antes_de, lote)
+            except mysql.connector.Error as err:
+                conexao.rollback()
+                logger.error(f"Erro SQL ao arquivar alunos (após {total} arquivado(s)): {err}", exc_info=True)
+                if err.errno == 1146: return total, f"Erro: Tabela '{db_handler.TABELA_ARQUIVO}' não existe (ver database/schema.sql)."
+                return total, f"Erro no BD ao arquivar (lotes anteriores já confirmados: {total} aluno(s)): {err.msg}"
+        if not movidos: break
+        total += movidos
+        cache_alunos.marcar_desatualizado(); indice_unicidade.marcar_desatualizado(); roteamento.marcar_escrita()
+        if ao_progresso: ao_progresso(total)
+        if movidos < lote: break
+        if pausa_s: time.sleep(pausa_s)
+    msg = f"{total} aluno(s) arquivado(s) em {time.perf_counter() - inicio:.1f}s."
+    logger.info(msg)
+    return total, msg
+
+@instrumentacao.cronometrado("db.restaurar_arquivados")
+def restaurar_arquivados(ids_alunos):
+    """
+    Devolve alunos arquivados à tabela alunos (mesmo id), numa transação. Cada aluno é copiado por
+    uma instrução: se o CPF/email dele já pertence a um aluno ativo, a chave duplicada desfaz só
+    essa cópia (InnoDB), o aluno fica no arquivo e o conflito é informado; os demais são restaurados.
+    Retorna (total_restaurado, msg, conflitos), com conflitos = [(id, motivo)]; total é None em falha.
+    """
+    try: ids = db_handler._normalizar_ids(ids_alunos)
+    except (TypeError, ValueError): return None, "Ids de alunos inválidos.", []
+    if not ids: return 0, "Nenhum aluno informado.", []
+    restaurados = []; conflitos = []
+    sql_copiar = db_handler._sql_ids(SQL_COPIAR_PARA_ATIVOS, 1)
+    with db_pool.conexao() as conexao:
+        if not conexao: return None, "Falha na conexão com o banco de dados.", []
+        try:
+            for id_aluno in ids:
+                try:
+                    copiados = instrucoes.executar(conexao, "restaurar_copiar[1]", sql_copiar, (id_aluno,)).rowcount
+                except mysql.connector.Error as err:
+                    if err.errno != 1062: raise
+                    campo = "CPF" if "cpf" in err.msg.lower() else "Email" if "email" in err.msg.lower() else "CPF/Email"
+                    conflitos.append((id_aluno, f"{campo} já pertence a um aluno ativo")); continue
+                if copiados: restaurados.append(id_aluno)
+                else: conflitos.append((id_aluno, "não encontrado no arquivo"))
+            if restaurados:
+                instrucoes.executar(conexao, f"restaurar_remover[{len(restaurados)}]", db_handler._sql_ids(SQL_REMOVER_ARQUIVADOS, len(restaurados)), restaurados)
+            instrucoes.confirmar(conexao); cache_alunos.marcar_desatualizado(); indice_unicidade.marcar_desatualizado(); roteamento.marcar_escrita()
+        except mysql.connector.Error as err:
+            conexao.rollback()
+            logger.error(f"Erro SQL ao restaurar {len(ids)} aluno(s) arquivado(s): {err}", exc_info=True)
+            return None, f"Erro no BD ao restaurar (nada foi restaurado): {err.msg}", []
+    msg = f"{len(restaurados)} de {len(ids)} aluno(s) restaurado(s) do arquivo."
+    if conflitos: msg += " Não restaurados: " + "; ".join(f"ID {id_aluno}: {motivo}" for id_aluno, motivo in conflitos) + "."
+    if conflitos: logger.warning(msg)
+    else: logger.info(msg)
+    return len(restaurados), msg, conflitos
+
+def main(argv=None):
+    """Ponto de entrada sem interface gráfica: python -m database.arquivamento --antes-de 2022-01-01"""
+    parser = argparse.ArgumentParser(description="Move alunos inativos para alunos_arquivo (ou os restaura).")
+    parser.add_argument("--antes-de", help="Arquiva alunos sem alteração desde esta data (AAAA-MM-DD)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help=f"Alunos por transação (padrão: {TAMANHO_LOTE_PADRAO})")
+    parser.add_argument("--pausa", type=float, default=PAUSA_ENTRE_LOTES_S, help=f"Segundos entre lotes (padrão: {PAUSA_ENTRE_LOTES_S})")
+    parser.add_argument("--limite", type=int, help="Máximo de alunos arquivados nesta execução")
+    parser.add_argument("--restaurar", help="Ids de alunos arquivados a restaurar, separados por vírgula")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not args.antes_de and not args.restaurar: parser.error("informe --antes-de ou --restaurar")
+
+    try:
+        if args.restaurar:
+            total, msg, conflitos = restaurar_arquivados(i for i in args.restaurar.split(",") if i.strip())
+            if total is not None and conflitos: total = None # Código de saída 1: nem todos voltaram
+        else:
+            total, msg = arquivar_inativos(args.antes_de, max(1, args.lote), max(0.0, args.pausa), args.limite,
+                                           ao_progresso=lambda total: print(f"  {total} arquivado(s)...", file=sys.stderr))
+    finally:
+        db_pool.fechar()
+    print(msg)
+    return 0 if total is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
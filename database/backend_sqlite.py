@@ -0,0 +1,356 @@
+# database/backend_sqlite.py
+import re
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+from . import db_config
+from . import db_handler # Importado pelo db_handler ao selecionar o backend: use sempre via db_handler
+from . import busca
+from utils import instrumentacao
+
+logger = logging.getLogger(__name__)
+
+# Backend embutido em SQLite (DB_BACKEND=sqlite no .env): mesmas funções públicas e mesmas
+# mensagens do db_handler/MySQL, num arquivo local. Útil para campus pequenos sem servidor e
+# como banco local realista nos testes de desempenho. O SQL é o mesmo montado pelo db_handler,
+# traduzido para o dialeto do SQLite (marcadores '?', strftime, LIKE com ESCAPE, sem FOR UPDATE).
+# Cada thread usa a própria conexão (o módulo sqlite3 não compartilha conexões entre threads);
+# em WAL, leitores não bloqueiam o escritor.
+
+# Mesmo esquema de database/schema.sql. Colunas de texto com COLLATE NOCASE se aproximam da
+# collation utf8mb4_unicode_ci (ordenação, comparação e unicidade do email sem distinção de maiúsculas).
+# curso usa a collation CURSO (ver _comparar_cursos): ordena pela posição, como o ENUM do MySQL.
+SQL_CRIAR_ESQUEMA = (
+    """CREATE TABLE IF NOT EXISTS alunos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL COLLATE NOCASE,
+        sobrenome TEXT NOT NULL COLLATE NOCASE,
+        telefone TEXT,
+        email TEXT COLLATE NOCASE UNIQUE,
+        cpf TEXT UNIQUE,
+        data_nascimento DATE,
+        cidade TEXT COLLATE NOCASE DEFAULT 'Brasília',
+        uf TEXT COLLATE NOCASE DEFAULT 'DF',
+        curso TEXT NOT NULL COLLATE CURSO CHECK (curso IN ('ADS', 'GTI', 'CD', 'IA', 'BI', 'SI')),
+        cpf_digitos TEXT GENERATED ALWAYS AS (replace(replace(cpf, '.', ''), '-', '')) STORED
+    )""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_alunos_cpf_digitos ON alunos (cpf_digitos)",
+    "CREATE INDEX IF NOT EXISTS idx_alunos_nome ON alunos (nome, id)",
+    "CREATE INDEX IF NOT EXISTS idx_alunos_sobrenome ON alunos (sobrenome, id)",
+    "CREATE INDEX IF NOT EXISTS idx_alunos_cidade ON alunos (cidade, id)",
+    "CREATE INDEX IF NOT EXISTS idx_alunos_uf ON alunos (uf, id)",
+    "CREATE INDEX IF NOT EXISTS idx_alunos_curso ON alunos (curso, id)",
+    "CREATE INDEX IF NOT EXISTS idx_alunos_data_nascimento ON alunos (data_nascimento, id)",
+)
+PRAGMAS_CONEXAO = (
+    "PRAGMA journal_mode = WAL", # Leitores e escritor em paralelo; commits só anexam ao log
+    "PRAGMA synchronous = NORMAL", # Em WAL, fsync só no checkpoint: seguro contra queda do processo
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000", # ms aguardando o lock de escrita de outra conexão
+)
+
+# data_nascimento volta como datetime.date, como no mysql.connector (chave de ordenação do keyset)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter("DATE", lambda valor: date.fromisoformat(valor.decode()))
+
+def _chave_curso(texto):
+    """Posição do curso. O keyset do db_handler compara curso com a posição (número), que o SQLite converte em texto."""
+    return int(texto) if texto.isdigit() else busca.posicao_curso(texto)
+
+def _comparar_cursos(a, b):
+    a, b = _chave_curso(a), _chave_curso(b)
+    return (a > b) - (a < b)
+
+_local = threading.local()
+_conexoes = [] # Todas as conexões abertas (uma por thread), para fechar no encerramento
+_lock = threading.Lock()
+_esquema_pronto = False
+
+def _abrir_conexao():
+    global _esquema_pronto
+    conexao = sqlite3.connect(db_config.DB_SQLITE_PATH, timeout=5, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+    conexao.create_collation("CURSO", _comparar_cursos) # Antes do esquema: a coluna curso depende dela
+    for pragma in PRAGMAS_CONEXAO: conexao.execute(pragma)
+    with _lock:
+        if not _esquema_pronto:
+            for sql in SQL_CRIAR_ESQUEMA: conexao.execute(sql)
+            conexao.commit(); _esquema_pronto = True
+            logger.info(f"Banco SQLite pronto em '{db_config.DB_SQLITE_PATH}' (WAL).")
+        _conexoes.append(conexao)
+    return conexao
+
+@contextmanager
+def conexao():
+    """Conexão SQLite do thread atual (aberta na primeira vez), ou None em falha: mesmo contrato de db_pool.conexao()."""
+    conexao_thread = getattr(_local, "conexao", None)
+    if conexao_thread is None:
+        try:
+            with instrumentacao.Medir("bd.conectar"): conexao_thread = _local.conexao = _abrir_conexao()
+        except sqlite3.Error as err:
+            logger.error(f"Falha ao abrir o banco SQLite '{db_config.DB_SQLITE_PATH}': {err}")
+            yield None
+            return
+    try:
+        yield conexao_thread
+    finally:
+        if conexao_thread.in_transaction: conexao_thread.rollback() # Nada fica pendente entre chamadas
+
+def fechar_conexoes():
+    """Fecha as conexões de todos os threads (chamar no encerramento da aplicação)."""
+    with _lock:
+        conexoes, _conexoes[:] = list(_conexoes), []
+    for conexao_aberta in conexoes:
+        try: conexao_aberta.close()
+        except sqlite3.Error: pass # noqa - conexão em uso por um thread que ainda não terminou
+    _local.__dict__.pop("conexao", None)
+    logger.info(f"Conexões SQLite fechadas ({len(conexoes)}).")
+
+def aquecer_pool():
+    """Abre a conexão do thread atual (criando o esquema se preciso). Retorna True se deu certo."""
+    with conexao() as conexao_thread: return conexao_thread is not None
+
+def estatisticas_pool():
+    return {"backend": "sqlite", "arquivo": db_config.DB_SQLITE_PATH, "conexoes": len(_conexoes)}
+
+def relatorio_instrucoes():
+    return [] # O sqlite3 já reaproveita instruções compiladas (cache por conexão)
+
+# --- Tradução do SQL do db_handler ---
+@lru_cache(maxsize=512)
+def _traduzir(sql):
+    """SQL no dialeto do MySQL (como montado pelo db_handler) -> SQLite. Cacheado: as formas são finitas."""
+    sql = sql.replace("DATE_FORMAT(data_nascimento, '%d/%m/%Y')", "strftime('%d/%m/%Y', data_nascimento)")
+    sql = sql.replace(" FOR UPDATE", "")
+    sql = sql.replace("LIKE %s", "LIKE %s ESCAPE '\\'") # busca._escapar_like usa '\' como escape
+    return sql.replace("%s", "?")
+
+def _busca_nome_completo(termo):
+    """Sem FULLTEXT no SQLite: cada palavra deve aparecer em nome + sobrenome (LIKE '%palavra%')."""
+    palavras = [p for p in re.split(r"\s+", termo) if p]
+    if not palavras: return None, []
+    condicao = " AND ".join(["(nome || ' ' || sobrenome) LIKE %s"] * len(palavras))
+    return f"({condicao})", ["%" + busca._escapar_like(p) + "%" for p in palavras]
+
+def _montar_filtro_busca(search_field, search_term):
+    if search_field == "Nome completo" and search_term and search_term.strip():
+        return _busca_nome_completo(search_term.strip())
+    return db_handler._montar_filtro_busca(search_field, search_term)
+
+def _executar(conexao, forma, sql, params=(), buscar=False):
+    """Executa o SQL traduzido. Retorna as linhas se buscar=True, senão o cursor (rowcount/lastrowid)."""
+    with instrumentacao.Medir("bd.buscar" if buscar else "bd.executar", forma):
+        cursor = conexao.execute(_traduzir(sql), tuple(params))
+        return cursor.fetchall() if buscar else cursor
+
+def _confirmar(conexao):
+    with instrumentacao.Medir("bd.commit"): conexao.commit()
+
+def _campo_duplicado(err):
+    """'cpf' ou 'email' se o IntegrityError for de unicidade nessas colunas (equivalente ao errno 1062)."""
+    msg = str(err).lower()
+    if "unique" not in msg: return None
+    return "cpf" if "cpf" in msg else "email" if "email" in msg else ""
+
+def _msg_erro(err, prefixo):
+    if "no such table" in str(err): return "Erro: Tabela 'alunos' não existe."
+    return f"{prefixo}: {err}"
+
+# --- Interface de armazenamento (mesmas assinaturas e retornos do db_handler) ---
+@instrumentacao.cronometrado("db.cadastrar_aluno_db")
+def cadastrar_aluno_db(dados_aluno, retornar_id=False):
+    resultado = _cadastrar_aluno(dados_aluno)
+    return resultado if retornar_id else resultado[:2]
+
+def _cadastrar_aluno(dados_aluno):
+    logger.info(f"Tentando cadastrar aluno: {dados_aluno[0]} {dados_aluno[1]}")
+    valido, msg_validacao = db_handler._validar_dados_aluno_backend(dados_aluno)
+    if not valido: return False, msg_validacao, None
+    with conexao() as conexao_bd:
+        if not conexao_bd: return False, "Falha na conexão com o banco de dados.", None
+        try:
+            cursor = _executar(conexao_bd, "cadastrar", db_handler.SQL_INSERT_ALUNO, dados_aluno)
+            _confirmar(conexao_bd)
+            logger.info(f"Aluno '{dados_aluno[0]} {dados_aluno[1]}' (ID: {cursor.lastrowid}) cadastrado com sucesso.")
+            return True, "Aluno cadastrado com sucesso!", cursor.lastrowid
+        except sqlite3.Error as err:
+            logger.error(f"Erro SQL ao cadastrar aluno '{dados_aluno[0]}': {err}", exc_info=True)
+            campo = _campo_duplicado(err)
+            if campo == "cpf": return False, "Erro: CPF já cadastrado.", None
+            if campo == "email": return False, "Erro: Email já cadastrado.", None
+            if campo is not None: return False, f"Erro: Dados duplicados não permitidos ({err}).", None
+            return False, _msg_erro(err, "Erro no BD ao cadastrar"), None
+
+@instrumentacao.cronometrado("db.atualizar_aluno_db")
+def atualizar_aluno_db(id_aluno, dados_aluno_atualizado):
+    logger.info(f"Tentando atualizar aluno ID: {id_aluno}")
+    valido, msg_validacao = db_handler._validar_dados_aluno_backend(dados_aluno_atualizado)
+    if not valido: return False, msg_validacao
+    with conexao() as conexao_bd:
+        if not conexao_bd: return False, "Falha na conexão com o banco de dados."
+        try:
+            cursor = _executar(conexao_bd, "atualizar", db_handler.SQL_UPDATE_ALUNO, tuple(dados_aluno_atualizado) + (id_aluno,))
+            _confirmar(conexao_bd)
+        except sqlite3.Error as err:
+            logger.error(f"Erro SQL ao atualizar aluno ID {id_aluno}: {err}", exc_info=True)
+            campo = _campo_duplicado(err)
+            if campo == "cpf": return False, "Erro: CPF já pertence a outro aluno."
+            if campo == "email": return False, "Erro: Email já pertence a outro aluno."
+            if campo is not None: return False, f"Erro: Dados duplicados não permitidos ({err})."
+            return False, _msg_erro(err, "Erro no BD ao atualizar")
+    if cursor.rowcount == 0: # No SQLite o rowcount conta linhas encontradas, não só as alteradas
+        logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para atualização.")
+        return False, "Nenhum aluno encontrado com o ID para atualizar ou dados idênticos."
+    logger.info(f"Aluno ID {id_aluno} atualizado com sucesso.")
+    return True, "Aluno atualizado com sucesso!"
+
+@instrumentacao.cronometrado("db.visualizar_alunos_db")
+def visualizar_alunos_db(search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC', incluir_arquivados=False):
+    # Sem alunos_arquivo no SQLite: incluir_arquivados não muda o resultado
+    condicao, params = _montar_filtro_busca(search_field, search_term)
+    coluna, direcao = db_handler._normalizar_ordenacao(sort_by_column, sort_direction)
+    query = db_handler._montar_sql_listagem(None, (condicao,) if condicao else (), coluna, direcao, False)
+    with conexao() as conexao_bd:
+        if not conexao_bd: return None, "Falha na conexão com o banco de dados."
+        try:
+            resultados = _executar(conexao_bd, "visualizar", query, params, buscar=True)
+        except sqlite3.Error as err:
+            logger.error(f"Erro SQL ao visualizar alunos: {err}", exc_info=True)
+            return None, _msg_erro(err, "Erro ao visualizar alunos")
+    msg = f"{len(resultados)} aluno(s) encontrado(s)."
+    logger.info(msg)
+    return resultados, msg
+
+@instrumentacao.cronometrado("db.visualizar_alunos_pagina_db")
+def visualizar_alunos_pagina_db(search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC',
+                                tamanho_pagina=db_handler.TAMANHO_PAGINA_PADRAO, apos_cursor=None, antes_cursor=None, incluir_arquivados=False):
+    # Sem cache_alunos: com o banco no mesmo processo, a consulta indexada já é local
+    coluna, direcao = db_handler._normalizar_ordenacao(sort_by_column, sort_direction)
+    query, params, forma = db_handler._montar_consulta_pagina(search_field, search_term, coluna, direcao, tamanho_pagina,
+                                                              apos_cursor, antes_cursor, montar_filtro=_montar_filtro_busca)
+    with conexao() as conexao_bd:
+        if not conexao_bd: return None, "Falha na conexão com o banco de dados."
+        try:
+            resultados = _executar(conexao_bd, forma, query, params, buscar=True)
+        except sqlite3.Error as err:
+            logger.error(f"Erro SQL ao visualizar página de alunos: {err}", exc_info=True)
+            return None, _msg_erro(err, "Erro ao visualizar alunos")
+    return db_handler._montar_pagina(resultados, tamanho_pagina, antes_cursor is not None)
+
+@instrumentacao.cronometrado("db.percorrer_alunos_db")
+def percorrer_alunos_db(processar_lote, search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC',
+                        tamanho_lote=db_handler.TAMANHO_LOTE_STREAMING, incluir_arquivados=False):
+    condicao, params = _montar_filtro_busca(search_field, search_term)
+    coluna, direcao = db_handler._normalizar_ordenacao(sort_by_column, sort_direction)
+    query = db_handler._montar_sql_listagem(None, (condicao,) if condicao else (), coluna, direcao, False)
+    with conexao() as conexao_bd:
+        if not conexao_bd: return None, "Falha na conexão com o banco de dados."
+        total = 0
+        try:
+            cursor = _executar(conexao_bd, "percorrer", query, params) # O SQLite produz as linhas sob demanda
+            while True:
+                linhas = cursor.fetchmany(tamanho_lote)
+                if not linhas: break
+                processar_lote(linhas)
+                total += len(linhas)
+        except sqlite3.Error as err:
+            logger.error(f"Erro SQL ao percorrer alunos: {err}", exc_info=True)
+            return None, _msg_erro(err, "Erro ao percorrer alunos")
+    msg = f"{total} aluno(s) percorrido(s)."
+    logger.info(msg)
+    return total, msg
+
+@instrumentacao.cronometrado("db.obter_aluno_db")
+def obter_aluno_db(id_aluno, search_field=None, search_term=None, sort_by_column=None):
+    query, params, forma = db_handler._montar_consulta_obter(id_aluno, search_field, search_term, sort_by_column,
+                                                             montar_filtro=_montar_filtro_busca)
+    with conexao() as conexao_bd:
+        if not conexao_bd: return None, "Falha na conexão com o banco de dados."
+        try:
+            linhas = _executar(conexao_bd, forma, query, params, buscar=True)
+        except sqlite3.Error as err:
+            logger.error(f"Erro SQL ao obter aluno ID {id_aluno}: {err}", exc_info=True)
+            return None, _msg_erro(err, "Erro ao obter aluno")
+    if not linhas: return None, f"Aluno ID {id_aluno} não encontrado (ou fora do filtro atual)."
+    return {"linha": linhas[0][:-1], "chave": (linhas[0][-1], linhas[0][0])}, "Aluno encontrado."
+
+@instrumentacao.cronometrado("db.deletar_aluno_db")
+def deletar_aluno_db(id_aluno):
+    logger.info(f"Tentando deletar aluno ID: {id_aluno}")
+    with conexao() as conexao_bd:
+        if not conexao_bd: return False, "Falha na conexão com o banco de dados."
+        try:
+            cursor = _executar(conexao_bd, "deletar", db_handler.SQL_DELETE_ALUNO, (id_aluno,))
+            _confirmar(conexao_bd)
+        except sqlite3.Error as err:
+            logger.error(f"Erro SQL ao deletar aluno ID {id_aluno}: {err}", exc_info=True)
+            return False, _msg_erro(err, "Erro no BD ao deletar")
+    if cursor.rowcount == 0:
+        logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para deleção.")
+        return False, "Nenhum aluno encontrado com o ID fornecido para deleção."
+    logger.info(f"Aluno ID {id_aluno} deletado com sucesso do BD.")
+    return True, "Aluno deletado com sucesso!"
+
+def _alterar_em_lote(operacao, ids, sql_alteracao, valores, tamanho_lote):
+    """
+    Roda 'sql_alteracao' (com '{ids}') nos ids existentes, em lotes, numa única transação.
+    BEGIN IMMEDIATE reserva a escrita já no início, no lugar do SELECT ... FOR UPDATE do MySQL.
+    Retorna o conjunto de ids existentes (None sem conexão); levanta sqlite3.Error (após rollback) em falha.
+    """
+    with conexao() as conexao_bd:
+        if not conexao_bd: return None
+        try:
+            conexao_bd.execute("BEGIN IMMEDIATE")
+            existentes = set()
+            for inicio in range(0, len(ids), tamanho_lote):
+                lote = ids[inicio:inicio + tamanho_lote]
+                linhas = _executar(conexao_bd, f"{operacao}_lote_bloquear[{len(lote)}]",
+                                   db_handler._sql_ids("SELECT id FROM alunos WHERE id IN ({ids})", len(lote)), lote, buscar=True)
+                encontrados = {linha[0] for linha in linhas}
+                if encontrados: _executar(conexao_bd, f"{operacao}_lote[{len(lote)}]", db_handler._sql_ids(sql_alteracao, len(lote)), list(valores) + lote)
+                existentes |= encontrados
+            _confirmar(conexao_bd)
+            return existentes
+        except sqlite3.Error:
+            conexao_bd.rollback()
+            raise
+
+@instrumentacao.cronometrado("db.deletar_alunos_db")
+def deletar_alunos_db(ids_alunos, tamanho_lote=db_handler.TAMANHO_LOTE_IDS):
+    try: ids = db_handler._normalizar_ids(ids_alunos)
+    except (TypeError, ValueError): return None, "Ids de alunos inválidos."
+    if not ids: return {}, "Nenhum aluno informado."
+    logger.info(f"Tentando deletar {len(ids)} aluno(s) em lote.")
+    try:
+        existentes = _alterar_em_lote("deletar", ids, "DELETE FROM alunos WHERE id IN ({ids})", (), tamanho_lote)
+    except sqlite3.Error as err:
+        logger.error(f"Erro SQL ao deletar {len(ids)} aluno(s) em lote: {err}", exc_info=True)
+        return None, _msg_erro(err, "Erro no BD ao deletar em lote (nenhum aluno foi deletado)")
+    if existentes is None: return None, "Falha na conexão com o banco de dados."
+    resultados = {id_aluno: (True, "Aluno deletado.") if id_aluno in existentes else (False, "Aluno não encontrado.") for id_aluno in ids}
+    msg = f"{len(existentes)} de {len(ids)} aluno(s) deletado(s)."
+    logger.info(msg)
+    return resultados, msg
+
+@instrumentacao.cronometrado("db.atualizar_campos_alunos_db")
+def atualizar_campos_alunos_db(ids_alunos, alteracoes, tamanho_lote=db_handler.TAMANHO_LOTE_IDS):
+    alteracoes, msg_validacao = db_handler._validar_alteracoes_lote(alteracoes)
+    if alteracoes is None: logger.warning(f"Alteração em lote recusada: {msg_validacao}"); return None, msg_validacao
+    try: ids = db_handler._normalizar_ids(ids_alunos)
+    except (TypeError, ValueError): return None, "Ids de alunos inválidos."
+    if not ids: return {}, "Nenhum aluno informado."
+    campos = tuple(sorted(alteracoes))
+    sql = "UPDATE alunos SET " + ", ".join(f"{campo} = %s" for campo in campos) + " WHERE id IN ({ids})"
+    logger.info(f"Tentando alterar {', '.join(campos)} de {len(ids)} aluno(s) em lote.")
+    try:
+        existentes = _alterar_em_lote("atualizar", ids, sql, [alteracoes[campo] for campo in campos], tamanho_lote)
+    except sqlite3.Error as err:
+        logger.error(f"Erro SQL ao alterar {len(ids)} aluno(s) em lote: {err}", exc_info=True)
+        return None, _msg_erro(err, "Erro no BD ao alterar em lote (nenhum aluno foi alterado)")
+    if existentes is None: return None, "Falha na conexão com o banco de dados."
+    resultados = {id_aluno: (True, "Aluno atualizado.") if id_aluno in existentes else (False, "Aluno não encontrado.") for id_aluno in ids}
+    msg = f"{len(existentes)} de {len(ids)} aluno(s) atualizado(s)."
+    logger.info(msg)
+    return resultados, msg
@@ -0,0 +1,203 @@
+# database/busca.py
+import re
+import sys
+import logging
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Estratégias de busca por campo. Cada uma gera uma condição que consegue usar um índice
+# (ver migração em database/schema.sql), em vez do antigo "LIKE '%termo%'" que varria a tabela.
+#   exata   -> col = %s                      (B-tree)
+#   prefixo -> col LIKE 'termo%'             (B-tree, range scan)
+#   texto   -> MATCH(...) AGAINST(...)       (FULLTEXT com parser ngram)
+
+TAMANHO_TOKEN_NGRAM = 2 # Deve ser igual ao ngram_token_size do servidor (padrão do MySQL: 2)
+CURSOS_VALIDOS = ('ADS', 'GTI', 'CD', 'IA', 'BI', 'SI')
+_RE_NAO_DIGITO = re.compile(r"\D")
+_RE_EMAIL_COMPLETO = re.compile(r"^[^@\s]+@[^@\s]+\.[a-zA-Z]{2,}$")
+
+def _escapar_like(termo):
+    """Escapa os curingas do LIKE para que o termo seja tratado literalmente."""
+    return termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _prefixo(coluna, termo):
+    return f"{coluna} LIKE %s", [_escapar_like(termo) + "%"]
+
+def _busca_cpf(termo):
+    """CPF: compara só os dígitos (coluna gerada cpf_digitos); 11 dígitos = busca exata."""
+    digitos = _RE_NAO_DIGITO.sub("", termo)[:11]
+    if not digitos: return None, []
+    if len(digitos) == 11: return "cpf_digitos = %s", [digitos]
+    return "cpf_digitos LIKE %s", [digitos + "%"]
+
+def _busca_email(termo):
+    termo = termo.lower()
+    if _RE_EMAIL_COMPLETO.match(termo): return "email = %s", [termo]
+    return _prefixo("email", termo)
+
+def _busca_uf(termo):
+    termo = termo.upper()
+    if len(termo) >= 2: return "uf = %s", [termo[:2]]
+    return _prefixo("uf", termo)
+
+def _busca_curso(termo):
+    termo = termo.upper()
+    if termo in CURSOS_VALIDOS: return "curso = %s", [termo]
+    return _prefixo("curso", termo)
+
+def _busca_nome_completo(termo):
+    """Texto livre em nome + sobrenome via FULLTEXT ngram (casa trechos no meio das palavras)."""
+    palavras = [p for p in re.split(r"\s+", termo) if p]
+    if not palavras: return None, []
+    if any(len(p) < TAMANHO_TOKEN_NGRAM for p in palavras):
+        # Termos menores que o token ngram não estão no índice: cai para prefixo no nome
+        return _prefixo("nome", palavras[0])
+    # Cada palavra vira uma frase obrigatória; aspas internas são removidas para não quebrar a sintaxe booleana
+    expressao = " ".join('+"' + p.replace('"', '') + '"' for p in palavras)
+    return "MATCH(nome, sobrenome) AGAINST (%s IN BOOLEAN MODE)", [expressao]
+
+# Rótulo exibido na GUI -> função que monta (condicao_sql, params)
+ESTRATEGIAS_BUSCA = {
+    "Nome": lambda termo: _prefixo("nome", termo),
+    "Sobrenome": lambda termo: _prefixo("sobrenome", termo),
+    "Nome completo": _busca_nome_completo,
+    "CPF": _busca_cpf,
+    "Email": _busca_email,
+    "Curso": _busca_curso,
+    "Cidade": lambda termo: _prefixo("cidade", termo),
+    "UF": _busca_uf,
+}
+CAMPOS_BUSCA = tuple(ESTRATEGIAS_BUSCA)
+
+def montar_filtro(search_field, search_term):
+    """Retorna (condicao_sql, params) para o campo/termo, ou (None, []) se não houver filtro aplicável."""
+    if not search_field or not search_term or search_field not in ESTRATEGIAS_BUSCA:
+        return None, []
+    termo = search_term.strip()
+    if not termo: return None, []
+    return ESTRATEGIAS_BUSCA[search_field](termo)
+
+# --- Filtragem em memória (refinamento de resultados já carregados) ---
+# Posição de cada coluna nas linhas de SQL_SELECT_ALUNOS (db_handler)
+INDICES_COLUNAS_LINHA = {"nome": 1, "sobrenome": 2, "email": 4, "cpf": 5, "cidade": 7, "uf": 8, "curso": 9}
+
+def posicao_curso(curso):
+    """Posição do curso no ENUM do schema (1 = 'ADS'): é a ordem do ORDER BY curso no MySQL. 0 se não for um curso válido."""
+    return CURSOS_VALIDOS.index(curso) + 1 if curso in CURSOS_VALIDOS else 0
+
+def normalizar_texto(valor):
+    """Aproxima a comparação da collation utf8mb4_unicode_ci: sem acentos e sem distinção de maiúsculas."""
+    sem_acentos = unicodedata.normalize("NFKD", str(valor)).encode("ascii", "ignore").decode("ascii")
+    return sem_acentos.casefold()
+
+def normalizar_valor_ordenacao(valor, coluna=None):
+    """
+    Aproxima em Python a ordem do MySQL (collation utf8mb4_unicode_ci: sem distinção de
+    maiúsculas/acentos; NULL antes de qualquer valor em ASC). Na coluna curso (ENUM) a ordem
+    é a posição em CURSOS_VALIDOS, como no ORDER BY e no keyset do db_handler.
+    """
+    if valor is None: return (0, "")
+    if coluna == "curso": return (1, posicao_curso(valor))
+    if isinstance(valor, str): return (1, normalizar_texto(valor))
+    return (1, valor)
+
+def _predicado_coluna(coluna, termo, exato):
+    indice = INDICES_COLUNAS_LINHA[coluna]; alvo = normalizar_texto(termo)
+    def predicado(linha):
+        valor = linha[indice]
+        if valor is None: return False
+        valor = normalizar_texto(valor)
+        return valor == alvo if exato else valor.startswith(alvo)
+    return predicado
+
+def _predicado_cpf(termo):
+    digitos = _RE_NAO_DIGITO.sub("", termo)[:11]
+    if not digitos: return None
+    indice = INDICES_COLUNAS_LINHA["cpf"]
+    def predicado(linha):
+        return linha[indice] is not None and _RE_NAO_DIGITO.sub("", linha[indice]).startswith(digitos)
+    return predicado
+
+def _predicado_email(termo):
+    termo = termo.lower()
+    return _predicado_coluna("email", termo, exato=bool(_RE_EMAIL_COMPLETO.match(termo)))
+
+def _predicado_uf(termo):
+    termo = termo.upper()
+    return _predicado_coluna("uf", termo[:2], exato=len(termo) >= 2)
+
+def _predicado_curso(termo):
+    termo = termo.upper()
+    return _predicado_coluna("curso", termo, exato=termo in CURSOS_VALIDOS)
+
+# Equivalente em Python de ESTRATEGIAS_BUSCA. "Nome completo" fica de fora: o casamento do
+# FULLTEXT ngram não é reproduzível fielmente em memória, então sempre vai ao banco.
+PREDICADOS_LOCAIS = {
+    "Nome": lambda termo: _predicado_coluna("nome", termo, exato=False),
+    "Sobrenome": lambda termo: _predicado_coluna("sobrenome", termo, exato=False),
+    "CPF": _predicado_cpf,
+    "Email": _predicado_email,
+    "Curso": _predicado_curso,
+    "Cidade": lambda termo: _predicado_coluna("cidade", termo, exato=False),
+    "UF": _predicado_uf,
+}
+
+def predicado_local(search_field, search_term):
+    """
+    Retorna uma função linha -> bool com o mesmo resultado de montar_filtro para linhas já
+    carregadas, ou None se o campo não puder ser filtrado em memória (ou não houver filtro).
+    """
+    if not search_field or not search_term or search_field not in PREDICADOS_LOCAIS: return None
+    termo = search_term.strip()
+    if not termo: return None
+    return PREDICADOS_LOCAIS[search_field](termo)
+
+def termo_refina(termo_anterior, termo_novo):
+    """True se o resultado de 'termo_novo' é um subconjunto do de 'termo_anterior' (novo estende o anterior)."""
+    if not termo_anterior or not termo_novo: return False
+    return normalizar_texto(termo_novo.strip()).startswith(normalizar_texto(termo_anterior.strip()))
+
+# --- Verificação dos planos de execução (EXPLAIN) ---
+# Termos de exemplo usados para conferir que cada estratégia usa índice.
+TERMOS_EXEMPLO = {
+    "Nome": "Ana", "Sobrenome": "Silva", "Nome completo": "ana silva", "CPF": "111.222.333-44",
+    "Email": "ana.silva@email.com", "Curso": "ADS", "Cidade": "Bras", "UF": "DF",
+}
+TIPOS_ACESSO_VARREDURA = ("ALL", "index") # Varredura completa da tabela ou de um índice inteiro
+
+def verificar_planos(conexao):
+    """
+    Executa EXPLAIN para a condição de cada campo de busca e retorna uma lista de
+    (campo, tipo_acesso, indice_usado, ok). ok=False indica varredura completa.
+    """
+    resultados = []
+    cursor = conexao.cursor(dictionary=True)
+    try:
+        for campo in CAMPOS_BUSCA:
+            condicao, params = montar_filtro(campo, TERMOS_EXEMPLO[campo])
+            cursor.execute(f"EXPLAIN SELECT id FROM alunos WHERE {condicao}", tuple(params))
+            plano = cursor.fetchall()
+            linha = next((l for l in plano if l.get("table") == "alunos"), plano[0] if plano else {})
+            tipo = linha.get("type"); indice = linha.get("key")
+            ok = tipo is not None and tipo not in TIPOS_ACESSO_VARREDURA
+            resultados.append((campo, tipo, indice, ok))
+            if ok: logger.info(f"Plano de busca '{campo}': type={tipo}, key={indice}.")
+            else: logger.warning(f"Plano de busca '{campo}' faz varredura completa: type={tipo}, key={indice}.")
+    finally:
+        cursor.close()
+    return resultados
+
+if __name__ == "__main__":
+    # Uso: python -m database.busca  -> confere via EXPLAIN que nenhuma estratégia faz full scan
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    from . import db_handler
+    conexao = db_handler.conectar_db()
+    if not conexao: sys.exit("Falha na conexão com o banco de dados.")
+    try:
+        planos = verificar_planos(conexao)
+    finally:
+        conexao.close()
+    for campo, tipo, indice, ok in planos:
+        print(f"{'OK   ' if ok else 'FALHA'} {campo:<14} type={tipo} key={indice}")
+    sys.exit(0 if all(ok for _, _, _, ok in planos) else 1)
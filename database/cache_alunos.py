@@ -0,0 +1,232 @@
+# database/cache_alunos.py
+import time
+import bisect
+import threading
+import logging
+from array import array
+from collections import OrderedDict
+import mysql.connector
+from . import db_config
+from . import db_pool
+from . import busca
+
+logger = logging.getLogger(__name__)
+
+# Cópia local (em colunas) da tabela alunos para servir ordenação e filtro sem ir ao servidor.
+# A cada consulta, no máximo a cada CACHE_ALUNOS_VERIFICAR_APOS segundos (ou logo após uma
+# escrita da própria aplicação), uma sonda barata compara a versão da tabela:
+#   COUNT(*), MAX(id), MAX(atualizado_em)
+# e só as linhas alteradas são buscadas de novo (atualizado_em >= último visto). Exclusões são
+# detectadas pela contagem e resolvidas com uma varredura só de ids (índice primário).
+
+COLUNAS_CACHE = ("id", "nome", "sobrenome", "telefone", "email", "cpf", "data_nascimento", "cidade", "uf", "curso")
+SQL_CARGA = f"SELECT {', '.join(COLUNAS_CACHE)}, atualizado_em FROM alunos"
+SQL_VERSAO = "SELECT COUNT(*), MAX(id), MAX(atualizado_em) FROM alunos"
+TAMANHO_LOTE_CARGA = 1000
+MAX_ORDENACOES_EM_CACHE = 16 # Combinações (filtro, coluna) com a ordem já calculada
+RECARGA_COMPLETA_APOS_S = 300 # Recarga completa periódica: cobre commits fora da ordem de atualizado_em
+
+class CacheAlunos:
+    """
+    Cache read-through da tabela alunos. consultar_pagina() devolve a mesma página que
+    db_handler.visualizar_alunos_pagina_db, ou None quando a consulta deve ir ao servidor
+    (tabela acima de 'max_linhas', busca sem equivalente local, coluna atualizado_em ausente
+    ou falha na sincronização).
+    """
+
+    def __init__(self, max_linhas, verificar_apos_s):
+        self.max_linhas = max_linhas
+        self.verificar_apos_s = verificar_apos_s
+        self._trava = threading.RLock()
+        self._limpar()
+        self._verificado_em = 0.0; self._carregado_em = 0.0
+        self._desatualizado = True
+        self._acima_do_limite = False
+        self.desativado_motivo = None # Preenchido quando o cache não pode funcionar neste banco
+        self.metricas = {"acertos": 0, "faltas": 0, "verificacoes": 0, "cargas_completas": 0,
+                         "cargas_incrementais": 0, "linhas_buscadas": 0, "acima_do_limite": 0}
+
+    def _limpar(self):
+        self._colunas = {coluna: [] for coluna in COLUNAS_CACHE}
+        self._colunas["id"] = array('q')
+        self._posicao_por_id = {}
+        self._versao = None # (contagem, max_id, max_atualizado_em) da última sincronização
+        self._max_atualizado = None
+        self._ordenacoes = OrderedDict() # (campo, termo, coluna) -> (posições em ordem ASC, chaves comparáveis)
+
+    def __len__(self):
+        return len(self._colunas["id"])
+
+    def marcar_desatualizado(self):
+        """Chamado após escritas da aplicação: a próxima consulta verifica a versão imediatamente."""
+        self._desatualizado = True
+
+    # --- Sincronização com o servidor ---
+    def _guardar_linha(self, linha):
+        id_aluno = linha[0]; atualizado_em = linha[-1]
+        posicao = self._posicao_por_id.get(id_aluno)
+        if posicao is None:
+            self._posicao_por_id[id_aluno] = len(self._colunas["id"])
+            for coluna, valor in zip(COLUNAS_CACHE, linha): self._colunas[coluna].append(valor)
+        else:
+            for coluna, valor in zip(COLUNAS_CACHE[1:], linha[1:]): self._colunas[coluna][posicao] = valor
+        if atualizado_em is not None and (self._max_atualizado is None or atualizado_em > self._max_atualizado):
+            self._max_atualizado = atualizado_em
+
+    def _buscar_linhas(self, cursor, query, params=()):
+        cursor.execute(query, params)
+        buscadas = 0
+        while True:
+            lote = cursor.fetchmany(TAMANHO_LOTE_CARGA)
+            if not lote: break
+            for linha in lote: self._guardar_linha(linha)
+            buscadas += len(lote)
+        self.metricas["linhas_buscadas"] += buscadas
+        return buscadas
+
+    def _carga_completa(self, cursor):
+        self._limpar()
+        buscadas = self._buscar_linhas(cursor, SQL_CARGA)
+        self.metricas["cargas_completas"] += 1; self._carregado_em = time.monotonic()
+        logger.info(f"Cache de alunos: carga completa com {buscadas} linha(s).")
+
+    def _remover_excluidos(self, cursor):
+        cursor.execute("SELECT id FROM alunos")
+        vivos = {linha[0] for linha in cursor.fetchall()}
+        manter = [p for p, id_aluno in enumerate(self._colunas["id"]) if id_aluno in vivos]
+        removidas = len(self) - len(manter)
+        if not removidas: return 0
+        for coluna in COLUNAS_CACHE:
+            valores = self._colunas[coluna]
+            novos = [valores[p] for p in manter]
+            self._colunas[coluna] = array('q', novos) if coluna == "id" else novos
+        self._posicao_por_id = {id_aluno: p for p, id_aluno in enumerate(self._colunas["id"])}
+        return removidas
+
+    def _carga_incremental(self, cursor, contagem_servidor):
+        if self._max_atualizado is None: self._carga_completa(cursor); return
+        # ">=" porque várias linhas podem compartilhar o mesmo instante de atualização
+        buscadas = self._buscar_linhas(cursor, SQL_CARGA + " WHERE atualizado_em >= %s", (self._max_atualizado,))
+        removidas = self._remover_excluidos(cursor) if len(self) != contagem_servidor else 0
+        if len(self) != contagem_servidor:
+            logger.warning(f"Cache de alunos divergente após carga incremental ({len(self)} != {contagem_servidor}); recarregando tudo.")
+            self._carga_completa(cursor); return
+        self.metricas["cargas_incrementais"] += 1
+        logger.debug("Cache de alunos: carga incremental (%s buscada(s), %s removida(s)).", buscadas, removidas)
+
+    def _sincronizar(self):
+        """Garante que a cópia local corresponde à versão atual da tabela. Retorna False se o cache não puder ser usado."""
+        if self.desativado_motivo: return False
+        agora = time.monotonic()
+        if not self._desatualizado and self._versao is not None and agora - self._verificado_em < self.verificar_apos_s:
+            return not self._acima_do_limite
+        with db_pool.conexao() as conexao:
+            if not conexao: return False
+            cursor = conexao.cursor()
+            try:
+                cursor.execute(SQL_VERSAO)
+                versao = tuple(cursor.fetchone())
+                self.metricas["verificacoes"] += 1
+                if versao[0] > self.max_linhas:
+                    if not self._acima_do_limite: logger.info(f"Cache de alunos: {versao[0]} linhas excede o limite de {self.max_linhas}; consultas vão ao servidor.")
+                    self._limpar(); self._acima_do_limite = True; self.metricas["acima_do_limite"] += 1
+                    self._versao = versao; self._verificado_em = agora; self._desatualizado = False
+                    return False
+                if self._versao is None or self._acima_do_limite or agora - self._carregado_em > RECARGA_COMPLETA_APOS_S:
+                    self._carga_completa(cursor); self._acima_do_limite = False
+                elif versao != self._versao: self._carga_incremental(cursor, versao[0])
+                else: self._versao = versao; self._verificado_em = agora; self._desatualizado = False; return True
+                self._ordenacoes.clear()
+            except mysql.connector.Error as err:
+                if err.errno == 1054: # Coluna desconhecida: banco sem a migração 002 (atualizado_em)
+                    self.desativado_motivo = "coluna atualizado_em ausente (ver migração 002 em database/schema.sql)"
+                    logger.warning(f"Cache de alunos desativado: {self.desativado_motivo}.")
+                else:
+                    logger.error(f"Erro SQL ao sincronizar cache de alunos: {err}", exc_info=True)
+                self._limpar()
+                return False
+            finally:
+                cursor.close()
+        self._versao = versao; self._verificado_em = agora; self._desatualizado = False
+        return True
+
+    # --- Consultas locais ---
+    def _linha(self, posicao):
+        """Linha no formato de SQL_SELECT_ALUNOS (data como DD/MM/AAAA)."""
+        c = self._colunas; data = c["data_nascimento"][posicao]
+        return (c["id"][posicao], c["nome"][posicao], c["sobrenome"][posicao], c["telefone"][posicao], c["email"][posicao],
+                c["cpf"][posicao], data.strftime('%d/%m/%Y') if data is not None else None,
+                c["cidade"][posicao], c["uf"][posicao], c["curso"][posicao])
+
+    def _ordenacao(self, search_field, search_term, coluna, predicado):
+        """Posições que passam no filtro, em ordem ASC de (coluna, id), e as chaves comparáveis correspondentes."""
+        chave = (search_field, busca.normalizar_texto(search_term.strip()), coluna) if predicado else (None, "", coluna)
+        if chave in self._ordenacoes:
+            self._ordenacoes.move_to_end(chave)
+            return self._ordenacoes[chave]
+        ids = self._colunas["id"]; valores = self._colunas[coluna]
+        posicoes = range(len(ids)) if predicado is None else [p for p in range(len(ids)) if predicado(self._linha(p))]
+        comparaveis = sorted(((busca.normalizar_valor_ordenacao(valores[p], coluna), ids[p]), p) for p in posicoes)
+        resultado = ([p for _, p in comparaveis], [c for c, _ in comparaveis])
+        self._ordenacoes[chave] = resultado
+        while len(self._ordenacoes) > MAX_ORDENACOES_EM_CACHE: self._ordenacoes.popitem(last=False)
+        return resultado
+
+    def consultar_pagina(self, coluna, direcao, search_field=None, search_term=None, tamanho_pagina=200,
+                         apos_cursor=None, antes_cursor=None):
+        """
+        Página por keyset servida da cópia local, com a mesma semântica (e o mesmo dict de
+        retorno) de db_handler.visualizar_alunos_pagina_db. 'coluna' e 'direcao' já validados.
+        """
+        predicado = None
+        if busca.montar_filtro(search_field, search_term)[0] is not None:
+            predicado = busca.predicado_local(search_field, search_term)
+            if predicado is None: self.metricas["faltas"] += 1; return None # Ex.: FULLTEXT
+        with self._trava:
+            if not self._sincronizar(): self.metricas["faltas"] += 1; return None
+            posicoes, chaves_comparaveis = self._ordenacao(search_field, search_term, coluna, predicado)
+            voltando = antes_cursor is not None
+            cursor = antes_cursor if voltando else apos_cursor
+            alvo = None if cursor is None else (busca.normalizar_valor_ordenacao(cursor[0], coluna), cursor[1])
+            # As posições estão em ordem ASC: avançar em ASC (ou voltar em DESC) anda para a direita
+            total = len(posicoes)
+            if (direcao == 'ASC') != voltando:
+                inicio = 0 if alvo is None else bisect.bisect_right(chaves_comparaveis, alvo)
+                fim = min(total, inicio + tamanho_pagina); ha_mais = fim < total
+            else:
+                fim = total if alvo is None else bisect.bisect_left(chaves_comparaveis, alvo)
+                inicio = max(0, fim - tamanho_pagina); ha_mais = inicio > 0
+            selecionadas = posicoes[inicio:fim]
+            if direcao == 'DESC': selecionadas = selecionadas[::-1]
+            valores = self._colunas[coluna]; ids = self._colunas["id"]
+            linhas = [self._linha(p) for p in selecionadas]
+            chaves = [(valores[p], ids[p]) for p in selecionadas]
+            self.metricas["acertos"] += 1
+        proximo_cursor = None
+        if ha_mais and chaves: proximo_cursor = chaves[0] if voltando else chaves[-1]
+        return {"linhas": linhas, "chaves": chaves, "ha_mais": ha_mais, "proximo_cursor": proximo_cursor}
+
+    def estatisticas(self):
+        consultas = self.metricas["acertos"] + self.metricas["faltas"]
+        return dict(self.metricas, linhas=len(self), taxa_acerto=(self.metricas["acertos"] / consultas) if consultas else 0.0,
+                    desativado=self.desativado_motivo)
+
+# --- Cache global da aplicação (criado sob demanda a partir do db_config) ---
+_cache = None
+_cache_lock = threading.Lock()
+
+def obter_cache():
+    """Retorna o cache global, ou None se desativado no .env (CACHE_ALUNOS_ATIVO=0)."""
+    global _cache
+    if not db_config.CACHE_ALUNOS_ATIVO: return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheAlunos(db_config.CACHE_ALUNOS_MAX_LINHAS, db_config.CACHE_ALUNOS_VERIFICAR_APOS)
+    return _cache
+
+def marcar_desatualizado():
+    if _cache is not None: _cache.marcar_desatualizado()
+
+def estatisticas():
+    return _cache.estatisticas() if _cache is not None else {}
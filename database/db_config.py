@@ -26,12 +26,69 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_USER = os.getenv("DB_USER") # Sem padrão para usuário e senha, para forçar configuração
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME", "facsenac")
+DB_PORT = int(os.getenv("DB_PORT", "3306"))
+
+def _ler_servidores(valor):
+    """'replica1:3307, 10.0.0.5' -> [('replica1', 3307), ('10.0.0.5', DB_PORT)]."""
+    servidores = []
+    for item in (valor or "").split(","):
+        host, _, porta = item.strip().partition(":")
+        if host: servidores.append((host, int(porta) if porta else DB_PORT))
+    return servidores
+
+# Réplicas de leitura (ver database/roteamento.py): mesmos usuário/senha/banco do primário.
+# Sem DB_REPLICAS, todas as consultas vão ao primário, como antes.
+DB_REPLICAS = _ler_servidores(os.getenv("DB_REPLICAS"))
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5")) # Atraso (s) acima do qual a réplica deixa de receber leituras
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5")) # Intervalo (s) entre verificações de saúde/atraso
+DB_REPLICA_POOL_SIZE = int(os.getenv("DB_REPLICA_POOL_SIZE", os.getenv("DB_POOL_SIZE", "5"))) # Conexões por réplica
+DB_READ_YOUR_WRITES = float(os.getenv("DB_READ_YOUR_WRITES", "5")) # Após uma escrita, leituras ficam no primário por N s
+
+# Backend de armazenamento (ver database/db_handler.py): "mysql" (servidor) ou "sqlite" (arquivo local, sem servidor)
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").strip().lower()
+if DB_BACKEND not in ("mysql", "sqlite"):
+    logger.warning(f"DB_BACKEND '{DB_BACKEND}' desconhecido; usando 'mysql'.")
+    DB_BACKEND = "mysql"
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", os.path.join(os.path.dirname(DOTENV_PATH), "alunos.sqlite3"))
+
+# Diário de escritas (write-behind, ver database/diario_escritas.py): cadastros/atualizações vão para um
+# arquivo local e são enviados ao MySQL em lotes por um thread de fundo
+DB_DIARIO_ATIVO = os.getenv("DB_DIARIO_ATIVO", "0").lower() not in ("0", "false", "nao", "não")
+DB_DIARIO_PATH = os.getenv("DB_DIARIO_PATH", os.path.join(os.path.dirname(DOTENV_PATH), "diario_escritas.jsonl"))
+DB_DIARIO_LOTE = int(os.getenv("DB_DIARIO_LOTE", "100")) # Operações por transação no envio
+DB_DIARIO_INTERVALO = float(os.getenv("DB_DIARIO_INTERVALO", "0.5")) # Segundos entre envios (imediato se houver fila)
+
+# Configurações do pool de conexões (ver database/db_pool.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5")) # Máximo de conexões abertas simultaneamente
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1")) # Conexões abertas no aquecimento (startup)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10")) # Segundos aguardando uma conexão livre
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800")) # Idade máxima (s) antes de reciclar a conexão
+DB_POOL_PING_AFTER = int(os.getenv("DB_POOL_PING_AFTER", "10")) # Ociosidade (s) a partir da qual a conexão é testada no checkout
+
+# Cache local da tabela alunos (ver database/cache_alunos.py)
+CACHE_ALUNOS_ATIVO = os.getenv("CACHE_ALUNOS_ATIVO", "1").lower() not in ("0", "false", "nao", "não")
+CACHE_ALUNOS_MAX_LINHAS = int(os.getenv("CACHE_ALUNOS_MAX_LINHAS", "50000")) # Acima disso, ordenação/filtro voltam ao servidor
+CACHE_ALUNOS_VERIFICAR_APOS = float(os.getenv("CACHE_ALUNOS_VERIFICAR_APOS", "2")) # Intervalo (s) mínimo entre verificações de versão
+
+# Índice em memória de CPFs/e-mails em uso (ver database/indice_unicidade.py): duplicidade acusada no FocusOut e na importação
+INDICE_UNICIDADE_ATIVO = os.getenv("INDICE_UNICIDADE_ATIVO", "1").lower() not in ("0", "false", "nao", "não")
+INDICE_UNICIDADE_VERIFICAR_APOS = float(os.getenv("INDICE_UNICIDADE_VERIFICAR_APOS", "5")) # Intervalo (s) mínimo entre verificações de versão
+
+# Instruções preparadas no servidor, reaproveitadas por conexão do pool (ver database/instrucoes.py)
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "1").lower() not in ("0", "false", "nao", "não")
 
 # Loga as configurações carregadas (sem a senha)
-logger.info(f"Configurações do DB: HOST={DB_HOST}, USER={DB_USER}, NAME={DB_NAME}, PASSWORD_SET={'Sim' if DB_PASSWORD else 'Não'}")
+logger.info(f"Backend de armazenamento: {DB_BACKEND}" + (f" ({DB_SQLITE_PATH})" if DB_BACKEND == "sqlite" else ""))
+logger.info(f"Configurações do DB: HOST={DB_HOST}:{DB_PORT}, USER={DB_USER}, NAME={DB_NAME}, PASSWORD_SET={'Sim' if DB_PASSWORD else 'Não'}")
+if DB_REPLICAS: logger.info(f"Réplicas de leitura: {', '.join(f'{h}:{p}' for h, p in DB_REPLICAS)} (MAX_LAG={DB_REPLICA_MAX_LAG}s, CHECK_INTERVAL={DB_REPLICA_CHECK_INTERVAL}s, READ_YOUR_WRITES={DB_READ_YOUR_WRITES}s)")
+logger.info(f"Configurações do pool: SIZE={DB_POOL_SIZE}, MIN={DB_POOL_MIN}, TIMEOUT={DB_POOL_TIMEOUT}s, RECYCLE={DB_POOL_RECYCLE}s, PING_AFTER={DB_POOL_PING_AFTER}s")
+logger.info(f"Configurações do cache de alunos: ATIVO={CACHE_ALUNOS_ATIVO}, MAX_LINHAS={CACHE_ALUNOS_MAX_LINHAS}, VERIFICAR_APOS={CACHE_ALUNOS_VERIFICAR_APOS}s")
+logger.info(f"Índice de unicidade (CPF/Email): ATIVO={INDICE_UNICIDADE_ATIVO}, VERIFICAR_APOS={INDICE_UNICIDADE_VERIFICAR_APOS}s")
+if DB_DIARIO_ATIVO: logger.info(f"Diário de escritas ativo: {DB_DIARIO_PATH} (LOTE={DB_DIARIO_LOTE}, INTERVALO={DB_DIARIO_INTERVALO}s)")
+logger.info(f"Instruções preparadas: {'Ativas' if DB_PREPARED_STATEMENTS else 'Desativadas'}")
 
 # Verifica se as credenciais essenciais foram carregadas
-if not DB_USER or not DB_PASSWORD:
+if DB_BACKEND == "mysql" and (not DB_USER or not DB_PASSWORD):
     logger.critical("DB_USER ou DB_PASSWORD não definidos no .env ou variáveis de ambiente. A aplicação pode falhar ao conectar ao banco.")
     # Em uma aplicação real, poderia levantar uma exceção ou sair aqui.
     # messagebox não deve ser usado em módulos de configuração/backend.
\ No newline at end of file
@@ -1,18 +1,64 @@
 # database/db_handler.py
 import mysql.connector
+from functools import lru_cache
 from . import db_config 
+from . import db_pool
+from . import busca
+from . import cache_alunos
+from . import indice_unicidade
+from . import instrucoes
+from . import roteamento
 from utils import validators 
+from utils import instrumentacao
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Campos de busca aceitos (rótulos da GUI); cada um tem sua estratégia indexada em busca.py
+CAMPOS_BUSCA_PERMITIDOS = busca.CAMPOS_BUSCA
+# Colunas permitidas para ordenação (nomes reais do DB)
+COLUNAS_ORDENACAO_PERMITIDAS = ["id", "nome", "sobrenome", "telefone", "email", "cpf", 
+                                "data_nascimento", "cidade", "uf", "curso"]
+# Colunas que aceitam NULL: precisam de tratamento especial na paginação por keyset
+COLUNAS_NULAVEIS = {"telefone", "email", "cpf", "data_nascimento", "cidade", "uf"}
+COLUNA_ORDENACAO_PADRAO = "nome"
+TAMANHO_PAGINA_PADRAO = 200
+TAMANHO_LOTE_STREAMING = 1000 # Linhas por fetchmany ao percorrer resultados grandes (ex.: exportação)
+TAMANHO_LOTE_IDS = 500 # Ids por "WHERE id IN (...)" nas operações em lote
+TABELA_ARQUIVO = "alunos_arquivo" # Alunos inativos movidos por database/arquivamento.py (mesmas colunas)
+# Campos que podem ser alterados em lote (atualizar_campos_alunos_db; valores conferidos em _validar_alteracoes_lote)
+CAMPOS_ALTERACAO_LOTE = ("curso", "cidade", "uf")
+
+# Query base com data formatada para exibição
+SQL_SELECT_ALUNOS = """
+    SELECT id, nome, sobrenome, telefone, email, cpf, 
+           DATE_FORMAT(data_nascimento, '%d/%m/%Y') as data_nascimento_formatada, 
+           cidade, uf, curso{colunas_extras} 
+    FROM {tabela}
+"""
+SQL_INSERT_ALUNO = """
+    INSERT INTO alunos (nome, sobrenome, telefone, email, cpf, data_nascimento, cidade, uf, curso)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+SQL_UPDATE_ALUNO = """
+    UPDATE alunos SET nome = %s, sobrenome = %s, telefone = %s, email = %s,
+        cpf = %s, data_nascimento = %s, cidade = %s, uf = %s, curso = %s
+    WHERE id = %s
+"""
+SQL_DELETE_ALUNO = "DELETE FROM alunos WHERE id = %s"
+# alunos_arquivo não tem chave única (ver schema.sql), então o CPF/email de um aluno arquivado é
+# conferido aqui antes de gravar. FOR SHARE: um arquivamento concorrente do mesmo CPF/email espera
+# (ou vira deadlock e é desfeito), em vez de deixar a chave duplicada entre ativos e arquivo.
+SQL_CONFLITO_ARQUIVO = (f"SELECT id, cpf_digitos = %s FROM {TABELA_ARQUIVO} "
+                        "WHERE (cpf_digitos = %s OR email = %s) AND id <> %s LIMIT 1 FOR SHARE")
+# Versão em lote (importação e sincronização): '{condicao}' é montada com IN (...) para CPFs e/ou emails
+SQL_CONFLITOS_ARQUIVO_LOTE = f"SELECT id, cpf_digitos, email FROM {TABELA_ARQUIVO} WHERE {{condicao}} FOR SHARE"
+
+@instrumentacao.cronometrado("db.conectar_db")
 def conectar_db():
-    """Estabelece conexão com o banco de dados MySQL."""
+    """Estabelece uma conexão avulsa (fora do pool) com o banco de dados MySQL."""
     try:
-        conexao = mysql.connector.connect(
-            host=db_config.DB_HOST, user=db_config.DB_USER,
-            password=db_config.DB_PASSWORD, database=db_config.DB_NAME
-        )
+        conexao = db_pool.criar_conexao()
         logger.debug(f"Conexão com BD ({db_config.DB_NAME}@{db_config.DB_HOST}) estabelecida.")
         return conexao
     except mysql.connector.Error as err:
@@ -21,60 +67,76 @@ def conectar_db():
         logger.error(f"Falha ao conectar ao BD ({db_config.DB_NAME}@{db_config.DB_HOST}): {err}", exc_info=False) 
         return None
 
+def aquecer_pool():
+    """
+    Abre as conexões iniciais do pool e verifica as réplicas de leitura (se houver). Retorna True
+    se ao menos uma conexão com o primário foi estabelecida (réplicas fora do ar não impedem o uso).
+    """
+    ok = db_pool.aquecer(max(1, db_config.DB_POOL_MIN)) > 0
+    if ok and db_config.DB_REPLICAS: logger.info(f"{roteamento.aquecer()} de {len(db_config.DB_REPLICAS)} réplica(s) de leitura disponível(is).")
+    return ok
+
+def estatisticas_pool():
+    """Contadores do pool (checkouts, esperas, recicladas...) e, com réplicas, o roteamento das leituras."""
+    stats = db_pool.estatisticas()
+    if db_config.DB_REPLICAS: stats["leituras"] = roteamento.estatisticas()
+    return stats
+
+def relatorio_instrucoes():
+    """Tempos de preparo/execução por forma de instrução (ver instrucoes.py), para logging."""
+    return instrucoes.relatorio()
+
+def fechar_conexoes():
+    """Fecha as conexões ociosas do pool (e das réplicas) e loga as estatísticas finais (chamar no encerramento)."""
+    if db_config.DB_REPLICAS: logger.info(f"Roteamento de leituras: {roteamento.estatisticas()}")
+    roteamento.fechar()
+    db_pool.fechar()
+
 def _validar_dados_aluno_backend(dados_aluno_desempacotados):
-    """Valida os dados do aluno no backend antes de operações DB."""
-    nome, sobrenome, telefone, email, cpf, data_nasc_db_format, _, _, _ = dados_aluno_desempacotados
-    logger.debug(f"Backend validando dados para '{nome} {sobrenome}': CPF='{cpf}', Email='{email}', Tel='{telefone}', DataNasc='{data_nasc_db_format}'")
-    
-    validacoes = [
-        validators.validar_cpf_completo(cpf),
-        validators.validar_email_formato(email),
-        validators.validar_telefone_formato(telefone),
-        validators.validar_data_nascimento_e_idade(data_nasc_db_format)
-    ]
-    
-    for valido, msg in validacoes:
-        if not valido:
-            logger.warning(f"Validação de backend falhou: {msg}")
-            return False, msg # Retorna a primeira falha de validação
-    
-    logger.debug("Todas as validações de backend passaram.")
-    return True, ""
+    """Valida os dados do aluno no backend antes de operações DB (validadores memorizados: o que a GUI já conferiu sai do cache)."""
+    valido, msg = validators.validar_aluno(dados_aluno_desempacotados)
+    if not valido: logger.warning(f"Validação de backend falhou: {msg}")
+    return valido, msg
 
-def cadastrar_aluno_db(dados_aluno):
-    """Cadastra um novo aluno após validação no backend."""
+@instrumentacao.cronometrado("db.cadastrar_aluno_db")
+def cadastrar_aluno_db(dados_aluno, retornar_id=False):
+    """
+    Cadastra um novo aluno após validação no backend.
+    Retorna (sucesso, msg), ou (sucesso, msg, aluno_id) se retornar_id=True (aluno_id é None em falha).
+    """
+    resultado = _cadastrar_aluno(dados_aluno)
+    return resultado if retornar_id else resultado[:2]
+
+def _cadastrar_aluno(dados_aluno):
+    """Implementação de cadastrar_aluno_db; retorna sempre (sucesso, msg, aluno_id)."""
     # dados_aluno = (nome, sobrenome, telefone, email, cpf, data_nasc_db_format, cidade, uf, curso)
     logger.info(f"Tentando cadastrar aluno: {dados_aluno[0]} {dados_aluno[1]}")
     
     valido, msg_validacao = _validar_dados_aluno_backend(dados_aluno)
     if not valido:
-        return False, msg_validacao # Retorna mensagem da validação que falhou
+        return False, msg_validacao, None # Retorna mensagem da validação que falhou
 
-    conexao = conectar_db()
-    if not conexao: return False, "Falha na conexão com o banco de dados."
-    
-    cursor = conexao.cursor()
-    sql = """
-        INSERT INTO alunos (nome, sobrenome, telefone, email, cpf, data_nascimento, cidade, uf, curso)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-    try:
-        cursor.execute(sql, dados_aluno)
-        conexao.commit()
-        aluno_id = cursor.lastrowid
-        logger.info(f"Aluno '{dados_aluno[0]} {dados_aluno[1]}' (ID: {aluno_id}) cadastrado com sucesso.")
-        return True, "Aluno cadastrado com sucesso!"
-    except mysql.connector.Error as err:
-        logger.error(f"Erro SQL ao cadastrar aluno '{dados_aluno[0]}': {err}", exc_info=True)
-        if err.errno == 1146: return False, "Erro: Tabela 'alunos' não existe."
-        if err.errno == 1062: # Violação de chave única
-            if 'cpf' in err.msg.lower(): return False, "Erro: CPF já cadastrado."
-            elif 'email' in err.msg.lower(): return False, "Erro: Email já cadastrado."
-            return False, f"Erro: Dados duplicados não permitidos ({err.msg})."
-        return False, f"Erro no BD ao cadastrar: {err.msg}" # Mensagem mais curta para GUI
-    finally:
-        if conexao and conexao.is_connected(): cursor.close(); conexao.close()
+    with db_pool.conexao() as conexao:
+        if not conexao: return False, "Falha na conexão com o banco de dados.", None
+        try:
+            conflito = _conflito_arquivo(conexao, dados_aluno[4], dados_aluno[3])
+            if conflito: return False, conflito, None
+            resultado = instrucoes.executar(conexao, "cadastrar", SQL_INSERT_ALUNO, dados_aluno)
+            instrucoes.confirmar(conexao); cache_alunos.marcar_desatualizado(); roteamento.marcar_escrita()
+            aluno_id = resultado.lastrowid
+            indice_unicidade.registrar(aluno_id, dados_aluno[4], dados_aluno[3])
+            logger.info(f"Aluno '{dados_aluno[0]} {dados_aluno[1]}' (ID: {aluno_id}) cadastrado com sucesso.")
+            return True, "Aluno cadastrado com sucesso!", aluno_id
+        except mysql.connector.Error as err:
+            logger.error(f"Erro SQL ao cadastrar aluno '{dados_aluno[0]}': {err}", exc_info=True)
+            if err.errno == 1146: return False, "Erro: Tabela 'alunos' não existe.", None
+            if err.errno == 1062: # Violação de chave única
+                if 'cpf' in err.msg.lower(): return False, "Erro: CPF já cadastrado.", None
+                elif 'email' in err.msg.lower(): return False, "Erro: Email já cadastrado.", None
+                return False, f"Erro: Dados duplicados não permitidos ({err.msg}).", None
+            return False, f"Erro no BD ao cadastrar: {err.msg}", None # Mensagem mais curta para GUI
 
+@instrumentacao.cronometrado("db.atualizar_aluno_db")
 def atualizar_aluno_db(id_aluno, dados_aluno_atualizado):
     """Atualiza dados de um aluno existente após validação no backend."""
     logger.info(f"Tentando atualizar aluno ID: {id_aluno}")
@@ -83,107 +145,466 @@ def atualizar_aluno_db(id_aluno, dados_aluno_atualizado):
     if not valido:
         return False, msg_validacao
 
-    conexao = conectar_db()
-    if not conexao: return False, "Falha na conexão com o banco de dados."
-    
-    cursor = conexao.cursor()
-    sql = """
-        UPDATE alunos SET nome = %s, sobrenome = %s, telefone = %s, email = %s,
-            cpf = %s, data_nascimento = %s, cidade = %s, uf = %s, curso = %s
-        WHERE id = %s
-    """
-    valores = dados_aluno_atualizado + (id_aluno,)
+    valores = tuple(dados_aluno_atualizado) + (id_aluno,)
+    with db_pool.conexao() as conexao:
+        if not conexao: return False, "Falha na conexão com o banco de dados."
+        try:
+            conflito = _conflito_arquivo(conexao, dados_aluno_atualizado[4], dados_aluno_atualizado[3], ignorar_id=id_aluno, atualizacao=True)
+            if conflito: return False, conflito
+            resultado = instrucoes.executar(conexao, "atualizar", SQL_UPDATE_ALUNO, valores)
+            instrucoes.confirmar(conexao); cache_alunos.marcar_desatualizado(); roteamento.marcar_escrita()
+            if resultado.rowcount == 0:
+                logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para atualização (ou dados eram iguais).")
+                # Considerar se isso é um erro ou um "nada a fazer"
+                return False, "Nenhum aluno encontrado com o ID para atualizar ou dados idênticos."
+            indice_unicidade.registrar(id_aluno, dados_aluno_atualizado[4], dados_aluno_atualizado[3])
+            logger.info(f"Aluno ID {id_aluno} atualizado com sucesso.")
+            return True, "Aluno atualizado com sucesso!"
+        except mysql.connector.Error as err:
+            logger.error(f"Erro SQL ao atualizar aluno ID {id_aluno}: {err}", exc_info=True)
+            if err.errno == 1146: return False, "Erro: Tabela 'alunos' não existe."
+            if err.errno == 1062:
+                if 'cpf' in err.msg.lower(): return False, "Erro: CPF já pertence a outro aluno."
+                elif 'email' in err.msg.lower(): return False, "Erro: Email já pertence a outro aluno."
+                return False, f"Erro: Dados duplicados não permitidos ({err.msg})."
+            return False, f"Erro no BD ao atualizar: {err.msg}"
+
+def _params_conflito_arquivo(cpf, email, ignorar_id=None):
+    """Parâmetros de SQL_CONFLITO_ARQUIVO, ou None se não houver CPF nem email a conferir."""
+    digitos = "".join(c for c in cpf if c.isdigit()) if cpf else None
+    if not digitos and not email: return None
+    return digitos, digitos, email or None, ignorar_id or 0
+
+def _msg_conflito_arquivo(linha, atualizacao=False):
+    """Mensagem para a linha (id, casou_pelo_cpf) encontrada em alunos_arquivo."""
+    id_arquivado, pelo_cpf = linha
+    campo = "CPF" if pelo_cpf else "Email"
+    if atualizacao: return f"Erro: {campo} já pertence a um aluno arquivado (ID {id_arquivado})."
+    return f"Erro: {campo} já cadastrado (aluno arquivado ID {id_arquivado})."
+
+def _conflito_arquivo(conexao, cpf, email, ignorar_id=None, atualizacao=False):
+    """Mensagem de erro se o CPF/email já pertence a um aluno arquivado; None se estiver livre. Usa a transação de 'conexao'."""
+    params = _params_conflito_arquivo(cpf, email, ignorar_id)
+    if params is None: return None
     try:
-        cursor.execute(sql, valores)
-        conexao.commit()
-        if cursor.rowcount == 0:
-            logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para atualização (ou dados eram iguais).")
-            # Considerar se isso é um erro ou um "nada a fazer"
-            return False, "Nenhum aluno encontrado com o ID para atualizar ou dados idênticos."
-        logger.info(f"Aluno ID {id_aluno} atualizado com sucesso.")
-        return True, "Aluno atualizado com sucesso!"
+        linhas = instrucoes.executar(conexao, "conflito_arquivo", SQL_CONFLITO_ARQUIVO, params, buscar=True).linhas
     except mysql.connector.Error as err:
-        logger.error(f"Erro SQL ao atualizar aluno ID {id_aluno}: {err}", exc_info=True)
-        if err.errno == 1146: return False, "Erro: Tabela 'alunos' não existe."
-        if err.errno == 1062:
-            if 'cpf' in err.msg.lower(): return False, "Erro: CPF já pertence a outro aluno."
-            elif 'email' in err.msg.lower(): return False, "Erro: Email já pertence a outro aluno."
-            return False, f"Erro: Dados duplicados não permitidos ({err.msg})."
-        return False, f"Erro no BD ao atualizar: {err.msg}"
-    finally:
-        if conexao and conexao.is_connected(): cursor.close(); conexao.close()
-
-def visualizar_alunos_db(search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC'):
-    """Busca alunos no BD com opções de filtro e ordenação."""
-    logger.debug(f"Buscando alunos: filtro='{search_field}':'{search_term}', ordem='{sort_by_column} {sort_direction}'")
-    conexao = conectar_db()
-    if not conexao: return None, "Falha na conexão com o banco de dados."
-    
-    cursor = conexao.cursor()
-    # Mapeamento seguro de campos de busca para colunas do DB
-    allowed_search_fields_map = {
-        "Nome": "nome", "Sobrenome": "sobrenome", "CPF": "cpf", 
-        "Email": "email", "Curso": "curso", "Cidade": "cidade", "UF": "uf"
-    }
-    # Colunas permitidas para ordenação (nomes reais do DB)
-    allowed_sort_columns = ["id", "nome", "sobrenome", "telefone", "email", "cpf", 
-                            "data_nascimento", "cidade", "uf", "curso"]
-    params = []
-    # Query base com data formatada para exibição
-    query = """
-        SELECT id, nome, sobrenome, telefone, email, cpf, 
-               DATE_FORMAT(data_nascimento, '%d/%m/%Y') as data_nascimento_formatada, 
-               cidade, uf, curso 
-        FROM alunos
+        if err.errno == 1146: return None # Instalação sem alunos_arquivo (schema.sql anterior ao arquivamento)
+        raise
+    return _msg_conflito_arquivo(linhas[0], atualizacao) if linhas else None
+
+def _conflitos_arquivo_lote(conexao, lote_dados):
     """
-    
-    # Adiciona filtro WHERE se aplicável
-    if search_field and search_term and search_field in allowed_search_fields_map:
-        db_column_name = allowed_search_fields_map[search_field]
-        query += f" WHERE {db_column_name} LIKE %s" # Usa LIKE para busca parcial
-        params.append(f"%{search_term}%") # Adiciona % para o LIKE
-    
-    # Adiciona ordenação ORDER BY se aplicável
-    if sort_by_column and sort_by_column in allowed_sort_columns:
-        # Valida direção da ordenação
-        sort_direction_safe = 'ASC' if sort_direction.upper() == 'ASC' else 'DESC'
-        query += f" ORDER BY {sort_by_column} {sort_direction_safe}"
-    else:
-        query += " ORDER BY nome ASC" # Ordenação padrão se nenhuma for especificada
-    
+    Versão de _conflito_arquivo para um lote de tuplas de dados (email e CPF nas posições 3 e 4), numa
+    consulta só. Retorna, por tupla, a linha (id, casou_pelo_cpf) do aluno arquivado dono do CPF/email
+    (para _msg_conflito_arquivo), ou None. FOR SHARE: o arquivo fica travado até o commit do lote.
+    """
+    chaves = [("".join(c for c in dados[4] if c.isdigit()) if dados[4] else None, (dados[3] or "").lower() or None) for dados in lote_dados]
+    cpfs = sorted({cpf for cpf, _ in chaves if cpf}); emails = sorted({email for _, email in chaves if email})
+    if not cpfs and not emails: return [None] * len(lote_dados)
+    condicoes = ([f"cpf_digitos IN ({', '.join(['%s'] * len(cpfs))})"] if cpfs else []) + \
+                ([f"email IN ({', '.join(['%s'] * len(emails))})"] if emails else [])
     try:
-        logger.debug(f"Executando SQL: {query} com params: {params}")
-        cursor.execute(query, tuple(params))
-        resultados = cursor.fetchall()
-        msg = f"{len(resultados)} aluno(s) encontrado(s)."
-        logger.info(msg)
-        return resultados, msg
+        linhas = instrucoes.executar(conexao, f"conflitos_arquivo_lote[{len(cpfs)},{len(emails)}]",
+                                     SQL_CONFLITOS_ARQUIVO_LOTE.format(condicao=" OR ".join(condicoes)), cpfs + emails, buscar=True).linhas
     except mysql.connector.Error as err:
-        logger.error(f"Erro SQL ao visualizar alunos: {err}", exc_info=True)
-        if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe." # Tabela não existe
-        return None, f"Erro ao visualizar alunos: {err.msg}"
-    finally:
-        if conexao and conexao.is_connected(): cursor.close(); conexao.close()
+        if err.errno == 1146: return [None] * len(lote_dados) # Instalação sem alunos_arquivo
+        raise
+    dono_cpf = {cpf: id_arquivado for id_arquivado, cpf, _ in linhas if cpf}
+    dono_email = {email.lower(): id_arquivado for id_arquivado, _, email in linhas if email}
+    return [(dono_cpf[cpf], True) if cpf in dono_cpf else (dono_email[email], False) if email in dono_email else None
+            for cpf, email in chaves]
+
+def _montar_filtro_busca(search_field, search_term):
+    """Retorna (condicao_sql, params) para o filtro de busca, ou (None, []) se não houver filtro válido."""
+    return busca.montar_filtro(search_field, search_term)
 
+def _normalizar_ordenacao(sort_by_column, sort_direction):
+    """Valida coluna e direção de ordenação contra a whitelist. Retorna (coluna, 'ASC'|'DESC')."""
+    if not sort_by_column or sort_by_column not in COLUNAS_ORDENACAO_PERMITIDAS:
+        return COLUNA_ORDENACAO_PADRAO, 'ASC' # Ordenação padrão se nenhuma for especificada
+    return sort_by_column, 'ASC' if (sort_direction or 'ASC').upper() == 'ASC' else 'DESC'
+
+def _montar_condicao_keyset(coluna, direcao, cursor):
+    """
+    Monta a condição "linhas depois do cursor" para ORDER BY <coluna> <direcao>, id <direcao>.
+    O cursor é a tupla (valor_da_coluna, id) da última linha já lida. No MySQL os NULLs vêm
+    primeiro em ASC e por último em DESC, por isso colunas nuláveis precisam de ramos extras.
+    """
+    valor, id_cursor = cursor
+    if coluna == "id":
+        return ("id > %s" if direcao == 'ASC' else "id < %s"), [id_cursor]
+    op, op_id = (">", ">") if direcao == 'ASC' else ("<", "<")
+    # curso é ENUM: o ORDER BY segue a posição no ENUM, não o texto. Comparado a um número, o MySQL
+    # também usa a posição (e o índice), então o cursor vai como posição para o keyset seguir a mesma ordem
+    if coluna == "curso": valor = busca.posicao_curso(valor)
+    if coluna not in COLUNAS_NULAVEIS:
+        return f"({coluna} {op} %s OR ({coluna} = %s AND id {op_id} %s))", [valor, valor, id_cursor]
+    if valor is None:
+        if direcao == 'ASC': # Ainda na região dos NULLs: resto dos NULLs e depois todos os não-nulos
+            return f"(({coluna} IS NULL AND id > %s) OR {coluna} IS NOT NULL)", [id_cursor]
+        return f"({coluna} IS NULL AND id < %s)", [id_cursor] # DESC: NULLs são o fim da lista
+    if direcao == 'ASC':
+        return f"({coluna} > %s OR ({coluna} = %s AND id > %s))", [valor, valor, id_cursor]
+    return f"({coluna} < %s OR ({coluna} = %s AND id < %s) OR {coluna} IS NULL)", [valor, valor, id_cursor]
+
+@lru_cache(maxsize=512)
+def _montar_sql_listagem(coluna_chave, condicoes, coluna, direcao, limitar, tabela="alunos"):
+    """
+    Texto SQL de uma forma de listagem. As formas são finitas (filtro x keyset x coluna x
+    direção), então o texto é montado uma vez e sempre idêntico: o que permite reaproveitar
+    a instrução preparada no servidor. 'coluna_chave' acrescenta a coluna de ordenação
+    como chave_ordenacao; 'condicoes' é uma tupla de condições unidas por AND.
+    """
+    query = SQL_SELECT_ALUNOS.format(colunas_extras=f", {coluna_chave} AS chave_ordenacao" if coluna_chave else "", tabela=tabela)
+    if condicoes: query += " WHERE " + " AND ".join(condicoes)
+    if coluna: query += f" ORDER BY {coluna} {direcao}, id {direcao}"
+    if limitar: query += " LIMIT %s"
+    return query
+
+@lru_cache(maxsize=512)
+def _montar_sql_listagem_com_arquivo(condicoes, condicoes_arquivo, coluna, direcao, limitar):
+    """
+    Listagem de alunos + alunos_arquivo: cada ramo lê a sua tabela já ordenado (e limitado, na
+    paginação) pelo próprio índice, e o UNION ALL externo intercala os dois na ordem pedida.
+    As linhas sempre trazem chave_ordenacao no fim. No UNION o ENUM curso vira texto, então a
+    ordem externa volta a ser a posição no ENUM (FIELD), a mesma dos ramos e do keyset.
+    """
+    ramos = []
+    for tabela, condicoes_ramo in (("alunos", condicoes), (TABELA_ARQUIVO, condicoes_arquivo)):
+        ramo = _montar_sql_listagem(coluna, condicoes_ramo, None, None, False, tabela)
+        if limitar: ramo += f" ORDER BY {coluna} {direcao}, id {direcao} LIMIT %s"
+        ramos.append(f"({ramo})")
+    chave = "FIELD(chave_ordenacao, " + ", ".join(f"'{curso}'" for curso in busca.CURSOS_VALIDOS) + ")" if coluna == "curso" else "chave_ordenacao"
+    query = " UNION ALL ".join(ramos) + f" ORDER BY {chave} {direcao}, id {direcao}"
+    if limitar: query += " LIMIT %s"
+    return query
+
+def _montar_filtro_arquivo(search_field, search_term):
+    """Filtro no ramo alunos_arquivo: tabela particionada não tem FULLTEXT, então "Nome completo" cai para prefixo no nome."""
+    if search_field == "Nome completo" and search_term and search_term.split():
+        return busca._prefixo("nome", search_term.split()[0])
+    return _montar_filtro_busca(search_field, search_term)
+
+def _montar_consulta_com_arquivo(search_field, search_term, coluna, direcao, tamanho_pagina=None, cursor_keyset=None):
+    """(query, params) da listagem incluindo arquivados; com tamanho_pagina, uma página por keyset (+1 linha)."""
+    condicoes = {}; params = []
+    limite = [tamanho_pagina + 1] if tamanho_pagina else []
+    for ramo, montar_filtro in (("ativos", _montar_filtro_busca), ("arquivo", _montar_filtro_arquivo)):
+        condicoes_ramo = []
+        condicao, params_busca = montar_filtro(search_field, search_term)
+        if condicao: condicoes_ramo.append(condicao); params.extend(params_busca)
+        if cursor_keyset is not None:
+            condicao_keyset, params_keyset = _montar_condicao_keyset(coluna, direcao, cursor_keyset)
+            condicoes_ramo.append(condicao_keyset); params.extend(params_keyset)
+        condicoes[ramo] = tuple(condicoes_ramo); params.extend(limite)
+    params.extend(limite)
+    return _montar_sql_listagem_com_arquivo(condicoes["ativos"], condicoes["arquivo"], coluna, direcao, bool(tamanho_pagina)), params
+
+def _forma_listagem(operacao, search_field, condicao_busca, coluna, direcao, keyset=False):
+    """Rótulo legível de uma forma de listagem, usado nas métricas de instrucoes.py."""
+    filtro = f"{search_field}({condicao_busca.split(' ', 1)[0]})" if condicao_busca else "sem filtro"
+    return f"{operacao}[{filtro}, {coluna} {direcao}{', keyset' if keyset else ''}]"
+
+@instrumentacao.cronometrado("db.visualizar_alunos_db")
+def visualizar_alunos_db(search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC', incluir_arquivados=False):
+    """
+    Busca alunos no BD com opções de filtro e ordenação (resultado completo, sem paginação).
+    Com incluir_arquivados=True, junta os alunos de alunos_arquivo na mesma ordem.
+    """
+    logger.debug("Buscando alunos: filtro='%s':'%s', ordem='%s %s', arquivados=%s", search_field, search_term, sort_by_column, sort_direction, incluir_arquivados)
+    # Filtro WHERE se aplicável e ORDER BY (id como desempate garante ordem estável)
+    condicao, params = _montar_filtro_busca(search_field, search_term)
+    coluna, direcao = _normalizar_ordenacao(sort_by_column, sort_direction)
+    if incluir_arquivados: query, params = _montar_consulta_com_arquivo(search_field, search_term, coluna, direcao)
+    else: query = _montar_sql_listagem(None, (condicao,) if condicao else (), coluna, direcao, False)
+    forma = _forma_listagem("visualizar_arquivo" if incluir_arquivados else "visualizar", search_field, condicao, coluna, direcao)
+    
+    with roteamento.conexao_leitura() as conexao:
+        if not conexao: return None, "Falha na conexão com o banco de dados."
+        try:
+            logger.debug("Executando SQL: %s com params: %s", query, params)
+            resultados = instrucoes.executar(conexao, forma, query, params, buscar=True).linhas
+            if incluir_arquivados: resultados = [linha[:-1] for linha in resultados] # Sem a chave_ordenacao do UNION
+            msg = f"{len(resultados)} aluno(s) encontrado(s)."
+            logger.info(msg)
+            return resultados, msg
+        except mysql.connector.Error as err:
+            logger.error(f"Erro SQL ao visualizar alunos: {err}", exc_info=True)
+            if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe." # Tabela não existe
+            return None, f"Erro ao visualizar alunos: {err.msg}"
+
+@instrumentacao.cronometrado("db.visualizar_alunos_pagina_db")
+def visualizar_alunos_pagina_db(search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC',
+                                tamanho_pagina=TAMANHO_PAGINA_PADRAO, apos_cursor=None, antes_cursor=None, incluir_arquivados=False):
+    """
+    Busca uma página de alunos usando paginação por keyset (seek) na coluna de ordenação + id.
+    'apos_cursor' avança a partir de uma linha; 'antes_cursor' volta a partir de uma linha.
+    'incluir_arquivados' intercala os alunos de alunos_arquivo (sempre no servidor, sem o cache local).
+    Retorna (pagina, msg), onde pagina é um dict com:
+      linhas: tuplas no mesmo formato de visualizar_alunos_db, já na ordem de exibição;
+      chaves: cursor (valor_ordenacao, id) de cada linha;
+      ha_mais: se existem mais linhas no sentido percorrido;
+      proximo_cursor: cursor para continuar nesse sentido (None se não houver mais).
+    """
+    logger.debug("Buscando página de alunos: filtro='%s':'%s', ordem='%s %s', tamanho=%s, apos=%s, antes=%s",
+                 search_field, search_term, sort_by_column, sort_direction, tamanho_pagina, apos_cursor, antes_cursor)
+    coluna, direcao = _normalizar_ordenacao(sort_by_column, sort_direction)
+    cache = cache_alunos.obter_cache() if not incluir_arquivados else None
+    if cache is not None: # Ordenação/filtro servidos da cópia local quando possível
+        pagina = cache.consultar_pagina(coluna, direcao, search_field, search_term, tamanho_pagina, apos_cursor, antes_cursor)
+        if pagina is not None:
+            msg = f"{len(pagina['linhas'])} aluno(s) carregado(s)" + (" (mais disponíveis)." if pagina["ha_mais"] else ".")
+            logger.debug("%s (cache local)", msg)
+            return pagina, msg
+    query, params, forma = _montar_consulta_pagina(search_field, search_term, coluna, direcao, tamanho_pagina, apos_cursor, antes_cursor,
+                                                   incluir_arquivados=incluir_arquivados)
+
+    with roteamento.conexao_leitura() as conexao:
+        if not conexao: return None, "Falha na conexão com o banco de dados."
+        try:
+            logger.debug("Executando SQL: %s com params: %s", query, params)
+            resultados = instrucoes.executar(conexao, forma, query, params, buscar=True).linhas
+        except mysql.connector.Error as err:
+            logger.error(f"Erro SQL ao visualizar página de alunos: {err}", exc_info=True)
+            if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro ao visualizar alunos: {err.msg}"
+    return _montar_pagina(resultados, tamanho_pagina, antes_cursor is not None)
+
+def _montar_consulta_pagina(search_field, search_term, coluna, direcao, tamanho_pagina, apos_cursor, antes_cursor,
+                            montar_filtro=_montar_filtro_busca, incluir_arquivados=False):
+    """(query, params, forma) de uma página por keyset; compartilhado com db_handler_async e backend_sqlite."""
+    voltando = antes_cursor is not None
+    # Voltar uma página = avançar na ordem inversa e depois reverter as linhas
+    direcao_query = direcao if not voltando else ('DESC' if direcao == 'ASC' else 'ASC')
+    cursor_keyset = antes_cursor if voltando else apos_cursor
+    if incluir_arquivados:
+        query, params = _montar_consulta_com_arquivo(search_field, search_term, coluna, direcao_query, tamanho_pagina, cursor_keyset)
+        condicao_busca, _ = montar_filtro(search_field, search_term)
+        return query, params, _forma_listagem("pagina_arquivo", search_field, condicao_busca, coluna, direcao_query, keyset=cursor_keyset is not None)
+
+    condicoes = []; params = []
+    condicao_busca, params_busca = montar_filtro(search_field, search_term)
+    if condicao_busca: condicoes.append(condicao_busca); params.extend(params_busca)
+    if cursor_keyset is not None:
+        condicao_keyset, params_keyset = _montar_condicao_keyset(coluna, direcao_query, cursor_keyset)
+        condicoes.append(condicao_keyset); params.extend(params_keyset)
+    params.append(tamanho_pagina + 1) # Uma linha a mais indica se há próxima página
+    query = _montar_sql_listagem(coluna, tuple(condicoes), coluna, direcao_query, True)
+    forma = _forma_listagem("pagina", search_field, condicao_busca, coluna, direcao_query, keyset=cursor_keyset is not None)
+    return query, params, forma
+
+def _montar_pagina(resultados, tamanho_pagina, voltando):
+    """Converte as linhas lidas (com chave_ordenacao no fim) no dict de página. Retorna (pagina, msg)."""
+    ha_mais = len(resultados) > tamanho_pagina
+    resultados = list(resultados[:tamanho_pagina])
+    if voltando: resultados.reverse()
+    linhas = [linha[:-1] for linha in resultados]
+    chaves = [(linha[-1], linha[0]) for linha in resultados]
+    proximo_cursor = None
+    if ha_mais and chaves: proximo_cursor = chaves[0] if voltando else chaves[-1]
+    msg = f"{len(linhas)} aluno(s) carregado(s)" + (" (mais disponíveis)." if ha_mais else ".")
+    logger.info(msg)
+    return {"linhas": linhas, "chaves": chaves, "ha_mais": ha_mais, "proximo_cursor": proximo_cursor}, msg
+
+@instrumentacao.cronometrado("db.percorrer_alunos_db")
+def percorrer_alunos_db(processar_lote, search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC',
+                        tamanho_lote=TAMANHO_LOTE_STREAMING, incluir_arquivados=False):
+    """
+    Percorre todos os alunos do filtro/ordem informados com um cursor não bufferizado,
+    chamando processar_lote(linhas) a cada fetchmany. A memória usada fica limitada a um
+    lote, independentemente do número de linhas. Retorna (total_linhas, msg); total é None em falha.
+    """
+    logger.debug("Percorrendo alunos (streaming): filtro='%s':'%s', ordem='%s %s', lote=%s", search_field, search_term, sort_by_column, sort_direction, tamanho_lote)
+    condicao, params = _montar_filtro_busca(search_field, search_term)
+    coluna, direcao = _normalizar_ordenacao(sort_by_column, sort_direction)
+    if incluir_arquivados: query, params = _montar_consulta_com_arquivo(search_field, search_term, coluna, direcao)
+    else: query = _montar_sql_listagem(None, (condicao,) if condicao else (), coluna, direcao, False)
+    forma = _forma_listagem("percorrer_arquivo" if incluir_arquivados else "percorrer", search_field, condicao, coluna, direcao)
+
+    with roteamento.conexao_leitura() as conexao:
+        if not conexao: return None, "Falha na conexão com o banco de dados."
+        # Linhas chegam do servidor conforme são lidas. Se processar_lote falhar (ex.: disco cheio),
+        # fechar o gerador descarta o restante do resultado e a conexão volta utilizável ao pool.
+        lotes = instrucoes.transmitir(conexao, forma, query, params, tamanho_lote)
+        total = 0
+        try:
+            logger.debug("Executando SQL (streaming): %s com params: %s", query, params)
+            for linhas in lotes:
+                if incluir_arquivados: linhas = [linha[:-1] for linha in linhas]
+                processar_lote(linhas)
+                total += len(linhas)
+            msg = f"{total} aluno(s) percorrido(s)."
+            logger.info(msg)
+            return total, msg
+        except mysql.connector.Error as err:
+            logger.error(f"Erro SQL ao percorrer alunos: {err}", exc_info=True)
+            if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro ao percorrer alunos: {err.msg}"
+        finally:
+            lotes.close()
+
+@instrumentacao.cronometrado("db.obter_aluno_db")
+def obter_aluno_db(id_aluno, search_field=None, search_term=None, sort_by_column=None):
+    """
+    Busca um aluno pelo ID no mesmo formato das páginas (linha + chave de ordenação), aplicando
+    o filtro de busca informado. Retorna ({"linha": ..., "chave": ...}, msg), ou (None, msg) se o
+    aluno não existir, não passar no filtro ou houver falha.
+    """
+    query, params, forma = _montar_consulta_obter(id_aluno, search_field, search_term, sort_by_column)
+    with roteamento.conexao_leitura() as conexao:
+        if not conexao: return None, "Falha na conexão com o banco de dados."
+        try:
+            linhas = instrucoes.executar(conexao, forma, query, params, buscar=True).linhas
+        except mysql.connector.Error as err:
+            logger.error(f"Erro SQL ao obter aluno ID {id_aluno}: {err}", exc_info=True)
+            if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro ao obter aluno: {err.msg}"
+    linha = linhas[0] if linhas else None
+    if linha is None: return None, f"Aluno ID {id_aluno} não encontrado (ou fora do filtro atual)."
+    return {"linha": linha[:-1], "chave": (linha[-1], linha[0])}, "Aluno encontrado."
+
+def _montar_consulta_obter(id_aluno, search_field, search_term, sort_by_column, montar_filtro=_montar_filtro_busca):
+    """(query, params, forma) de obter_aluno_db; compartilhado com db_handler_async e backend_sqlite."""
+    coluna, _ = _normalizar_ordenacao(sort_by_column, 'ASC')
+    params = [id_aluno]
+    condicao, params_busca = montar_filtro(search_field, search_term)
+    params.extend(params_busca)
+    query = _montar_sql_listagem(coluna, ("id = %s", condicao) if condicao else ("id = %s",), None, None, False)
+    return query, params, _forma_listagem("obter", search_field, condicao, coluna, "-")
+
+@instrumentacao.cronometrado("db.deletar_aluno_db")
 def deletar_aluno_db(id_aluno):
     """Deleta um aluno do banco de dados pelo ID."""
     logger.info(f"Tentando deletar aluno ID: {id_aluno}")
-    conexao = conectar_db()
-    if not conexao: return False, "Falha na conexão com o banco de dados."
-    
-    cursor = conexao.cursor()
-    sql = "DELETE FROM alunos WHERE id = %s"
-    try:
-        cursor.execute(sql, (id_aluno,))
-        conexao.commit()
-        if cursor.rowcount == 0: # Verifica se alguma linha foi realmente deletada
-            logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para deleção.")
-            return False, "Nenhum aluno encontrado com o ID fornecido para deleção."
-        logger.info(f"Aluno ID {id_aluno} deletado com sucesso do BD.")
-        return True, "Aluno deletado com sucesso!"
-    except mysql.connector.Error as err:
-        logger.error(f"Erro SQL ao deletar aluno ID {id_aluno}: {err}", exc_info=True)
-        if err.errno == 1146: return False, "Erro: Tabela 'alunos' não existe."
-        return False, f"Erro no BD ao deletar: {err.msg}"
-    finally:
-        if conexao and conexao.is_connected(): cursor.close(); conexao.close()
\ No newline at end of file
+    with db_pool.conexao() as conexao:
+        if not conexao: return False, "Falha na conexão com o banco de dados."
+        try:
+            resultado = instrucoes.executar(conexao, "deletar", SQL_DELETE_ALUNO, (id_aluno,))
+            instrucoes.confirmar(conexao); cache_alunos.marcar_desatualizado(); roteamento.marcar_escrita()
+            if resultado.rowcount == 0: # Verifica se alguma linha foi realmente deletada
+                logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para deleção.")
+                return False, "Nenhum aluno encontrado com o ID fornecido para deleção."
+            indice_unicidade.registrar_exclusao((id_aluno,))
+            logger.info(f"Aluno ID {id_aluno} deletado com sucesso do BD.")
+            return True, "Aluno deletado com sucesso!"
+        except mysql.connector.Error as err:
+            logger.error(f"Erro SQL ao deletar aluno ID {id_aluno}: {err}", exc_info=True)
+            if err.errno == 1146: return False, "Erro: Tabela 'alunos' não existe."
+            return False, f"Erro no BD ao deletar: {err.msg}"
+
+# --- Operações em lote ---
+def _normalizar_ids(ids_alunos):
+    """Ids inteiros, sem repetição e na ordem recebida. Levanta ValueError se algum não for inteiro."""
+    return list(dict.fromkeys(int(id_aluno) for id_aluno in ids_alunos))
+
+def _sql_ids(sql_base, quantidade):
+    """sql_base com '{ids}' trocado por 'quantidade' marcadores; lotes cheios repetem o mesmo texto (instrução reaproveitada)."""
+    return sql_base.format(ids=", ".join(["%s"] * quantidade))
+
+def _bloquear_existentes(conexao, operacao, lote):
+    """SELECT ... FOR UPDATE dos ids do lote: retorna os que existem, travados até o commit."""
+    linhas = instrucoes.executar(conexao, f"{operacao}_lote_bloquear[{len(lote)}]",
+                                 _sql_ids("SELECT id FROM alunos WHERE id IN ({ids}) FOR UPDATE", len(lote)), lote, buscar=True).linhas
+    return {linha[0] for linha in linhas}
+
+def _validar_alteracoes_lote(alteracoes):
+    """Confere campos e valores de uma alteração em lote. Retorna (alteracoes_normalizadas, "") ou (None, msg)."""
+    if not alteracoes: return None, "Nenhum campo informado para alteração."
+    normalizadas = {}
+    for campo, valor in alteracoes.items():
+        if campo not in CAMPOS_ALTERACAO_LOTE: return None, f"Campo '{campo}' não pode ser alterado em lote (permitidos: {', '.join(CAMPOS_ALTERACAO_LOTE)})."
+        valor = (valor or "").strip()
+        if campo == "curso":
+            valor = valor.upper()
+            if valor not in busca.CURSOS_VALIDOS: return None, f"Curso inválido '{valor}' (válidos: {', '.join(busca.CURSOS_VALIDOS)})."
+        elif campo == "uf":
+            valor = valor.upper()
+            if len(valor) != 2 or not valor.isalpha(): return None, "UF deve ter 2 letras."
+        elif not valor or len(valor) > 100: return None, "Cidade deve ter entre 1 e 100 caracteres."
+        normalizadas[campo] = valor
+    return normalizadas, ""
+
+@instrumentacao.cronometrado("db.deletar_alunos_db")
+def deletar_alunos_db(ids_alunos, tamanho_lote=TAMANHO_LOTE_IDS):
+    """
+    Deleta vários alunos em UMA transação, com "DELETE ... WHERE id IN (...)" em lotes de
+    'tamanho_lote' ids. Retorna (resultados, msg): resultados = {id: (sucesso, msg)} por id,
+    ou None se a operação falhar (nesse caso nada é deletado).
+    """
+    try: ids = _normalizar_ids(ids_alunos)
+    except (TypeError, ValueError): return None, "Ids de alunos inválidos."
+    if not ids: return {}, "Nenhum aluno informado."
+    logger.info(f"Tentando deletar {len(ids)} aluno(s) em lote.")
+    with db_pool.conexao() as conexao:
+        if not conexao: return None, "Falha na conexão com o banco de dados."
+        try:
+            existentes = set()
+            for inicio in range(0, len(ids), tamanho_lote):
+                lote = ids[inicio:inicio + tamanho_lote]
+                encontrados = _bloquear_existentes(conexao, "deletar", lote)
+                if encontrados:
+                    instrucoes.executar(conexao, f"deletar_lote[{len(lote)}]", _sql_ids("DELETE FROM alunos WHERE id IN ({ids})", len(lote)), lote)
+                existentes |= encontrados
+            instrucoes.confirmar(conexao); cache_alunos.marcar_desatualizado(); roteamento.marcar_escrita()
+        except mysql.connector.Error as err:
+            conexao.rollback()
+            logger.error(f"Erro SQL ao deletar {len(ids)} aluno(s) em lote: {err}", exc_info=True)
+            if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro no BD ao deletar em lote (nenhum aluno foi deletado): {err.msg}"
+    indice_unicidade.registrar_exclusao(existentes)
+    resultados = {id_aluno: (True, "Aluno deletado.") if id_aluno in existentes else (False, "Aluno não encontrado.") for id_aluno in ids}
+    msg = f"{len(existentes)} de {len(ids)} aluno(s) deletado(s)."
+    logger.info(msg)
+    return resultados, msg
+
+@instrumentacao.cronometrado("db.atualizar_campos_alunos_db")
+def atualizar_campos_alunos_db(ids_alunos, alteracoes, tamanho_lote=TAMANHO_LOTE_IDS):
+    """
+    Aplica a mesma alteração (ex.: {"curso": "ADS"} ou {"cidade": "Gama", "uf": "DF"}) a vários
+    alunos em UMA transação, com "UPDATE ... WHERE id IN (...)" em lotes. Só os campos de
+    CAMPOS_ALTERACAO_LOTE são aceitos. Retorna (resultados, msg) como deletar_alunos_db.
+    """
+    alteracoes, msg_validacao = _validar_alteracoes_lote(alteracoes)
+    if alteracoes is None: logger.warning(f"Alteração em lote recusada: {msg_validacao}"); return None, msg_validacao
+    try: ids = _normalizar_ids(ids_alunos)
+    except (TypeError, ValueError): return None, "Ids de alunos inválidos."
+    if not ids: return {}, "Nenhum aluno informado."
+    campos = tuple(sorted(alteracoes)) # Ordem fixa: mesmo texto SQL para a mesma combinação de campos
+    atribuicoes = ", ".join(f"{campo} = %s" for campo in campos)
+    valores = [alteracoes[campo] for campo in campos]
+    logger.info(f"Tentando alterar {', '.join(campos)} de {len(ids)} aluno(s) em lote.")
+    with db_pool.conexao() as conexao:
+        if not conexao: return None, "Falha na conexão com o banco de dados."
+        try:
+            existentes = set()
+            for inicio in range(0, len(ids), tamanho_lote):
+                lote = ids[inicio:inicio + tamanho_lote]
+                encontrados = _bloquear_existentes(conexao, "atualizar", lote)
+                if encontrados:
+                    sql = _sql_ids(f"UPDATE alunos SET {atribuicoes} WHERE id IN ({{ids}})", len(lote))
+                    instrucoes.executar(conexao, f"atualizar_lote[{'+'.join(campos)}, {len(lote)}]", sql, valores + lote)
+                existentes |= encontrados
+            instrucoes.confirmar(conexao); cache_alunos.marcar_desatualizado(); roteamento.marcar_escrita()
+        except mysql.connector.Error as err:
+            conexao.rollback()
+            logger.error(f"Erro SQL ao alterar {len(ids)} aluno(s) em lote: {err}", exc_info=True)
+            if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro no BD ao alterar em lote (nenhum aluno foi alterado): {err.msg}"
+    resultados = {id_aluno: (True, "Aluno atualizado.") if id_aluno in existentes else (False, "Aluno não encontrado.") for id_aluno in ids}
+    msg = f"{len(existentes)} de {len(ids)} aluno(s) atualizado(s)."
+    logger.info(msg)
+    return resultados, msg
+
+# --- Backend de armazenamento ---
+# As funções acima são a implementação MySQL. Com DB_BACKEND=sqlite (ver db_config), os mesmos
+# nomes passam a apontar para database/backend_sqlite.py, que tem as mesmas assinaturas, retornos
+# e mensagens de erro. Quem chama (GUI, servidor_api, exportador) usa sempre db_handler.<funcao>.
+FUNCOES_BACKEND = ("aquecer_pool", "estatisticas_pool", "relatorio_instrucoes", "fechar_conexoes",
+                   "cadastrar_aluno_db", "atualizar_aluno_db", "visualizar_alunos_db", "visualizar_alunos_pagina_db",
+                   "percorrer_alunos_db", "obter_aluno_db", "deletar_aluno_db", "deletar_alunos_db", "atualizar_campos_alunos_db")
+
+if db_config.DB_BACKEND == "sqlite":
+    from . import backend_sqlite
+    for _nome in FUNCOES_BACKEND: globals()[_nome] = getattr(backend_sqlite, _nome)
+    logger.info(f"Backend de armazenamento: SQLite ({db_config.DB_SQLITE_PATH}).")
@@ -0,0 +1,229 @@
+# database/db_handler_async.py
+import re
+import asyncio
+import logging
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from . import db_config
+from . import db_handler
+from . import cache_alunos
+
+try:
+    import aiomysql # Opcional: só necessário para o acesso assíncrono (pip install aiomysql)
+    from pymysql.err import MySQLError
+except ImportError:
+    aiomysql = None
+    MySQLError = Exception
+
+logger = logging.getLogger(__name__)
+
+# Contraparte assíncrona do db_handler para serviços sem interface (asyncio). Mesma API e mesmos
+# retornos (sucesso, msg) / (resultado, msg); validação, whitelists de busca/ordenação e o SQL de
+# cada forma de consulta vêm do db_handler, para que os dois caminhos nunca divirjam.
+
+CAMPOS_BUSCA_PERMITIDOS = db_handler.CAMPOS_BUSCA_PERMITIDOS
+COLUNAS_ORDENACAO_PERMITIDAS = db_handler.COLUNAS_ORDENACAO_PERMITIDAS
+TAMANHO_PAGINA_PADRAO = db_handler.TAMANHO_PAGINA_PADRAO
+
+_pool = None
+_pool_lock = None
+
+@lru_cache(maxsize=512)
+def _sql_pyformat(sql):
+    """O PyMySQL formata a query com '%': todo '%' que não seja marcador (ex.: DATE_FORMAT) vira '%%'."""
+    return re.sub(r"%(?!s)", "%%", sql)
+
+def _erro(err):
+    """(errno, mensagem) de um erro do PyMySQL/aiomysql, no formato usado pelo db_handler."""
+    errno = err.args[0] if err.args and isinstance(err.args[0], int) else None
+    msg = err.args[1] if len(err.args) > 1 else str(err)
+    return errno, msg
+
+async def abrir_pool():
+    """Cria o pool assíncrono (idempotente). Deve ser chamado dentro do event loop que vai usá-lo."""
+    global _pool, _pool_lock
+    if aiomysql is None: raise RuntimeError("Acesso assíncrono requer o pacote 'aiomysql' (pip install aiomysql).")
+    if _pool_lock is None: _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await aiomysql.create_pool(host=db_config.DB_HOST, port=db_config.DB_PORT, user=db_config.DB_USER, password=db_config.DB_PASSWORD,
+                                               db=db_config.DB_NAME, minsize=max(1, db_config.DB_POOL_MIN),
+                                               maxsize=max(1, db_config.DB_POOL_SIZE), pool_recycle=db_config.DB_POOL_RECYCLE,
+                                               autocommit=False, charset="utf8mb4")
+            logger.info(f"Pool assíncrono aberto ({db_config.DB_NAME}@{db_config.DB_HOST}:{db_config.DB_PORT}, máx. {db_config.DB_POOL_SIZE} conexões).")
+    return _pool
+
+async def fechar_pool():
+    """Fecha o pool assíncrono e aguarda o encerramento das conexões."""
+    global _pool
+    if _pool is None: return
+    pool, _pool = _pool, None
+    pool.close()
+    await pool.wait_closed()
+    logger.info("Pool assíncrono fechado.")
+
+@asynccontextmanager
+async def conexao():
+    """
+    Conexão do pool assíncrono, ou None em falha (mesmo contrato de db_pool.conexao()).
+    Espera no máximo DB_POOL_TIMEOUT por uma conexão livre; transações abertas são desfeitas na devolução.
+    """
+    conn = None
+    try:
+        pool = await abrir_pool()
+        conn = await asyncio.wait_for(pool.acquire(), timeout=db_config.DB_POOL_TIMEOUT)
+    except (MySQLError, OSError, asyncio.TimeoutError) as err:
+        logger.error(f"Falha ao obter conexão assíncrona ({db_config.DB_NAME}@{db_config.DB_HOST}): {err}")
+    if conn is None:
+        yield None
+        return
+    try:
+        yield conn
+    finally:
+        try: await conn.rollback() # Nada pendente fica para o próximo usuário da conexão
+        except MySQLError: conn.close() # Conexão quebrada: o pool a descarta
+        await pool.release(conn)
+
+async def _executar(conn, sql, params=(), buscar=False):
+    """Executa e retorna (linhas, rowcount, lastrowid); linhas só com buscar=True."""
+    async with conn.cursor() as cursor:
+        await cursor.execute(_sql_pyformat(sql), tuple(params))
+        linhas = await cursor.fetchall() if buscar else None
+        return linhas, cursor.rowcount, cursor.lastrowid
+
+async def _conflito_arquivo(conn, cpf, email, ignorar_id=None, atualizacao=False):
+    """Versão assíncrona de db_handler._conflito_arquivo (CPF/email de aluno arquivado)."""
+    params = db_handler._params_conflito_arquivo(cpf, email, ignorar_id)
+    if params is None: return None
+    try:
+        linhas, _, _ = await _executar(conn, db_handler.SQL_CONFLITO_ARQUIVO, params, buscar=True)
+    except MySQLError as err:
+        if _erro(err)[0] == 1146: return None # Instalação sem alunos_arquivo
+        raise
+    return db_handler._msg_conflito_arquivo(linhas[0], atualizacao) if linhas else None
+
+async def cadastrar_aluno_db(dados_aluno, retornar_id=False):
+    """Versão assíncrona de db_handler.cadastrar_aluno_db (mesmos retornos)."""
+    resultado = await _cadastrar_aluno(dados_aluno)
+    return resultado if retornar_id else resultado[:2]
+
+async def _cadastrar_aluno(dados_aluno):
+    logger.info(f"Tentando cadastrar aluno (async): {dados_aluno[0]} {dados_aluno[1]}")
+    valido, msg_validacao = db_handler._validar_dados_aluno_backend(dados_aluno)
+    if not valido: return False, msg_validacao, None
+    async with conexao() as conn:
+        if not conn: return False, "Falha na conexão com o banco de dados.", None
+        try:
+            conflito = await _conflito_arquivo(conn, dados_aluno[4], dados_aluno[3])
+            if conflito: return False, conflito, None
+            _, _, aluno_id = await _executar(conn, db_handler.SQL_INSERT_ALUNO, dados_aluno)
+            await conn.commit(); cache_alunos.marcar_desatualizado()
+            logger.info(f"Aluno '{dados_aluno[0]} {dados_aluno[1]}' (ID: {aluno_id}) cadastrado com sucesso.")
+            return True, "Aluno cadastrado com sucesso!", aluno_id
+        except MySQLError as err:
+            errno, msg = _erro(err)
+            logger.error(f"Erro SQL ao cadastrar aluno '{dados_aluno[0]}': {err}", exc_info=True)
+            if errno == 1146: return False, "Erro: Tabela 'alunos' não existe.", None
+            if errno == 1062:
+                if 'cpf' in msg.lower(): return False, "Erro: CPF já cadastrado.", None
+                elif 'email' in msg.lower(): return False, "Erro: Email já cadastrado.", None
+                return False, f"Erro: Dados duplicados não permitidos ({msg}).", None
+            return False, f"Erro no BD ao cadastrar: {msg}", None
+
+async def atualizar_aluno_db(id_aluno, dados_aluno_atualizado):
+    """Versão assíncrona de db_handler.atualizar_aluno_db."""
+    logger.info(f"Tentando atualizar aluno ID (async): {id_aluno}")
+    valido, msg_validacao = db_handler._validar_dados_aluno_backend(dados_aluno_atualizado)
+    if not valido: return False, msg_validacao
+    async with conexao() as conn:
+        if not conn: return False, "Falha na conexão com o banco de dados."
+        try:
+            conflito = await _conflito_arquivo(conn, dados_aluno_atualizado[4], dados_aluno_atualizado[3], ignorar_id=id_aluno, atualizacao=True)
+            if conflito: return False, conflito
+            _, rowcount, _ = await _executar(conn, db_handler.SQL_UPDATE_ALUNO, tuple(dados_aluno_atualizado) + (id_aluno,))
+            await conn.commit(); cache_alunos.marcar_desatualizado()
+            if rowcount == 0:
+                logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para atualização (ou dados eram iguais).")
+                return False, "Nenhum aluno encontrado com o ID para atualizar ou dados idênticos."
+            logger.info(f"Aluno ID {id_aluno} atualizado com sucesso.")
+            return True, "Aluno atualizado com sucesso!"
+        except MySQLError as err:
+            errno, msg = _erro(err)
+            logger.error(f"Erro SQL ao atualizar aluno ID {id_aluno}: {err}", exc_info=True)
+            if errno == 1146: return False, "Erro: Tabela 'alunos' não existe."
+            if errno == 1062:
+                if 'cpf' in msg.lower(): return False, "Erro: CPF já pertence a outro aluno."
+                elif 'email' in msg.lower(): return False, "Erro: Email já pertence a outro aluno."
+                return False, f"Erro: Dados duplicados não permitidos ({msg})."
+            return False, f"Erro no BD ao atualizar: {msg}"
+
+async def visualizar_alunos_db(search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC'):
+    """Versão assíncrona de db_handler.visualizar_alunos_db (resultado completo, sem paginação)."""
+    condicao, params = db_handler._montar_filtro_busca(search_field, search_term)
+    coluna, direcao = db_handler._normalizar_ordenacao(sort_by_column, sort_direction)
+    query = db_handler._montar_sql_listagem(None, (condicao,) if condicao else (), coluna, direcao, False)
+    async with conexao() as conn:
+        if not conn: return None, "Falha na conexão com o banco de dados."
+        try:
+            resultados, _, _ = await _executar(conn, query, params, buscar=True)
+        except MySQLError as err:
+            errno, msg = _erro(err)
+            logger.error(f"Erro SQL ao visualizar alunos: {err}", exc_info=True)
+            if errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro ao visualizar alunos: {msg}"
+    resultados = list(resultados)
+    msg = f"{len(resultados)} aluno(s) encontrado(s)."
+    logger.info(msg)
+    return resultados, msg
+
+async def visualizar_alunos_pagina_db(search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC',
+                                      tamanho_pagina=TAMANHO_PAGINA_PADRAO, apos_cursor=None, antes_cursor=None):
+    """Versão assíncrona de db_handler.visualizar_alunos_pagina_db (keyset; sempre no servidor, sem o cache local)."""
+    coluna, direcao = db_handler._normalizar_ordenacao(sort_by_column, sort_direction)
+    query, params, _ = db_handler._montar_consulta_pagina(search_field, search_term, coluna, direcao, tamanho_pagina,
+                                                          apos_cursor, antes_cursor)
+    async with conexao() as conn:
+        if not conn: return None, "Falha na conexão com o banco de dados."
+        try:
+            resultados, _, _ = await _executar(conn, query, params, buscar=True)
+        except MySQLError as err:
+            errno, msg = _erro(err)
+            logger.error(f"Erro SQL ao visualizar página de alunos: {err}", exc_info=True)
+            if errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro ao visualizar alunos: {msg}"
+    return db_handler._montar_pagina(resultados, tamanho_pagina, antes_cursor is not None)
+
+async def obter_aluno_db(id_aluno, search_field=None, search_term=None, sort_by_column=None):
+    """Versão assíncrona de db_handler.obter_aluno_db."""
+    query, params, _ = db_handler._montar_consulta_obter(id_aluno, search_field, search_term, sort_by_column)
+    async with conexao() as conn:
+        if not conn: return None, "Falha na conexão com o banco de dados."
+        try:
+            linhas, _, _ = await _executar(conn, query, params, buscar=True)
+        except MySQLError as err:
+            errno, msg = _erro(err)
+            logger.error(f"Erro SQL ao obter aluno ID {id_aluno}: {err}", exc_info=True)
+            if errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+            return None, f"Erro ao obter aluno: {msg}"
+    if not linhas: return None, f"Aluno ID {id_aluno} não encontrado (ou fora do filtro atual)."
+    linha = linhas[0]
+    return {"linha": linha[:-1], "chave": (linha[-1], linha[0])}, "Aluno encontrado."
+
+async def deletar_aluno_db(id_aluno):
+    """Versão assíncrona de db_handler.deletar_aluno_db."""
+    logger.info(f"Tentando deletar aluno ID (async): {id_aluno}")
+    async with conexao() as conn:
+        if not conn: return False, "Falha na conexão com o banco de dados."
+        try:
+            _, rowcount, _ = await _executar(conn, db_handler.SQL_DELETE_ALUNO, (id_aluno,))
+            await conn.commit(); cache_alunos.marcar_desatualizado()
+            if rowcount == 0:
+                logger.warning(f"Nenhum aluno encontrado com ID {id_aluno} para deleção.")
+                return False, "Nenhum aluno encontrado com o ID fornecido para deleção."
+            logger.info(f"Aluno ID {id_aluno} deletado com sucesso do BD.")
+            return True, "Aluno deletado com sucesso!"
+        except MySQLError as err:
+            errno, msg = _erro(err)
+            logger.error(f"Erro SQL ao deletar aluno ID {id_aluno}: {err}", exc_info=True)
+            if errno == 1146: return False, "Erro: Tabela 'alunos' não existe."
+            return False, f"Erro no BD ao deletar: {msg}"
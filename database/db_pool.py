@@ -0,0 +1,210 @@
+# database/db_pool.py
+import mysql.connector
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from . import db_config
+from utils import instrumentacao
+
+logger = logging.getLogger(__name__)
+
+def criar_conexao(host=None, porta=None):
+    """Abre uma nova conexão física com o MySQL (handshake TCP + autenticação). Padrão: o primário do .env."""
+    return mysql.connector.connect(
+        host=host or db_config.DB_HOST, port=porta or db_config.DB_PORT, user=db_config.DB_USER,
+        password=db_config.DB_PASSWORD, database=db_config.DB_NAME
+    )
+
+class _ConexaoOciosa:
+    """Conexão parada no pool, com os instantes de criação e de devolução."""
+    __slots__ = ("conexao", "criada_em", "devolvida_em")
+
+    def __init__(self, conexao, criada_em):
+        self.conexao = conexao
+        self.criada_em = criada_em
+        self.devolvida_em = time.monotonic()
+
+class PoolConexoes:
+    """
+    Pool de conexões thread-safe. Reaproveita conexões abertas, testa a saúde das
+    conexões ociosas no checkout e recicla conexões mais antigas que 'reciclar_apos_s'.
+    """
+
+    def __init__(self, tamanho, timeout, reciclar_apos_s, ping_apos_s, fabrica=criar_conexao, rotulo=None):
+        self.tamanho = max(1, tamanho)
+        self.rotulo = rotulo or f"{db_config.DB_NAME}@{db_config.DB_HOST}" # Servidor, nos logs (primário ou réplica)
+        self.timeout = timeout
+        self.reciclar_apos_s = reciclar_apos_s
+        self.ping_apos_s = ping_apos_s
+        self._fabrica = fabrica
+        self._ociosas = [] # Pilha LIFO: a conexão usada mais recentemente é a mais provável de estar viva
+        self._criadas_em = {} # id(conexao) -> instante de criação, para conexões em uso
+        self._total_abertas = 0
+        self._condicao = threading.Condition(threading.Lock())
+        self._fechado = False
+        self._stats = {"checkouts": 0, "esperas": 0, "timeouts": 0, "criadas": 0,
+                       "recicladas": 0, "descartadas": 0, "falhas_conexao": 0}
+
+    def _abrir(self):
+        """Abre uma conexão física. Chamado fora do lock; a vaga já foi reservada em _total_abertas."""
+        try:
+            conexao = self._fabrica()
+        except mysql.connector.Error as err:
+            with self._condicao:
+                self._total_abertas -= 1
+                self._stats["falhas_conexao"] += 1
+                self._condicao.notify()
+            logger.error(f"Falha ao conectar ao BD ({self.rotulo}): {err}", exc_info=False)
+            return None, None
+        with self._condicao: self._stats["criadas"] += 1
+        logger.debug(f"Nova conexão do pool com BD ({self.rotulo}) estabelecida.")
+        return conexao, time.monotonic()
+
+    def _fechar_silenciosamente(self, conexao):
+        try: conexao.close()
+        except Exception: pass # noqa - conexão já quebrada; só queremos liberar o recurso
+
+    def _conexao_saudavel(self, ociosa, agora):
+        """Retorna False se a conexão ociosa deve ser descartada/reciclada."""
+        if self.reciclar_apos_s > 0 and agora - ociosa.criada_em > self.reciclar_apos_s:
+            with self._condicao: self._stats["recicladas"] += 1
+            logger.debug("Reciclando conexão antiga do pool.")
+            return False
+        if agora - ociosa.devolvida_em >= self.ping_apos_s:
+            try:
+                ociosa.conexao.ping(reconnect=False)
+            except mysql.connector.Error as err:
+                with self._condicao: self._stats["descartadas"] += 1
+                logger.warning(f"Conexão ociosa do pool falhou no teste de saúde e será descartada: {err}")
+                return False
+        return True
+
+    def obter(self):
+        """Retira uma conexão do pool (ou abre uma nova). Retorna None em caso de falha ou timeout."""
+        limite = time.monotonic() + self.timeout
+        while True:
+            ociosa = None
+            with self._condicao:
+                if self._fechado: logger.error("Tentativa de obter conexão de um pool fechado."); return None
+                esperou = False
+                while not self._ociosas and self._total_abertas >= self.tamanho:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._stats["timeouts"] += 1
+                        logger.error(f"Timeout de {self.timeout}s aguardando conexão livre no pool (tamanho={self.tamanho}).")
+                        return None
+                    if not esperou: self._stats["esperas"] += 1; esperou = True
+                    self._condicao.wait(restante)
+                if self._ociosas: ociosa = self._ociosas.pop()
+                else: self._total_abertas += 1 # Reserva a vaga antes de abrir fora do lock
+                self._stats["checkouts"] += 1
+
+            if ociosa is None:
+                conexao, criada_em = self._abrir()
+                if conexao is None: return None
+                with self._condicao: self._criadas_em[id(conexao)] = criada_em
+                return conexao
+
+            if self._conexao_saudavel(ociosa, time.monotonic()):
+                with self._condicao: self._criadas_em[id(ociosa.conexao)] = ociosa.criada_em
+                return ociosa.conexao
+            # Conexão ruim ou velha: fecha, libera a vaga e tenta novamente
+            self._fechar_silenciosamente(ociosa.conexao)
+            with self._condicao:
+                self._total_abertas -= 1
+                self._stats["checkouts"] -= 1 # O checkout será contado na próxima tentativa
+                self._condicao.notify()
+
+    def devolver(self, conexao, descartar=False):
+        """Devolve a conexão ao pool. Transações pendentes são desfeitas antes de reutilizá-la."""
+        if conexao is None: return
+        if not descartar:
+            try:
+                if conexao.in_transaction: conexao.rollback()
+            except mysql.connector.Error as err:
+                logger.warning(f"Conexão devolvida ao pool em estado inválido, descartando: {err}")
+                descartar = True
+        with self._condicao:
+            criada_em = self._criadas_em.pop(id(conexao), time.monotonic())
+            if descartar or self._fechado:
+                self._total_abertas -= 1
+                if descartar: self._stats["descartadas"] += 1
+            else:
+                self._ociosas.append(_ConexaoOciosa(conexao, criada_em))
+            self._condicao.notify()
+        if descartar or self._fechado: self._fechar_silenciosamente(conexao)
+
+    @contextmanager
+    def conexao(self):
+        """Context manager: 'with pool.conexao() as conexao:'. Produz None se não houver conexão disponível."""
+        with instrumentacao.Medir("bd.conectar", lambda: f"pool {self.estatisticas()}"): conexao = self.obter() # Espera + handshake, se abriu uma nova
+        descartar = False
+        try:
+            yield conexao
+        except mysql.connector.Error:
+            descartar = conexao is not None and not conexao.is_connected()
+            raise
+        finally:
+            self.devolver(conexao, descartar=descartar)
+
+    def aquecer(self, quantidade):
+        """Abre 'quantidade' conexões antecipadamente. Retorna quantas ficaram disponíveis no pool."""
+        conexoes = []
+        for _ in range(min(quantidade, self.tamanho)):
+            conexao = self.obter()
+            if conexao is None: break
+            conexoes.append(conexao)
+        for conexao in conexoes: self.devolver(conexao)
+        logger.info(f"Pool ({self.rotulo}) aquecido com {len(conexoes)} conexão(ões) (solicitado: {quantidade}).")
+        return len(conexoes)
+
+    def estatisticas(self):
+        """Retorna um snapshot dos contadores do pool (para logging/diagnóstico)."""
+        with self._condicao:
+            stats = dict(self._stats)
+            stats["abertas"] = self._total_abertas
+            stats["ociosas"] = len(self._ociosas)
+            stats["em_uso"] = self._total_abertas - len(self._ociosas)
+            stats["tamanho"] = self.tamanho
+        return stats
+
+    def fechar(self):
+        """Fecha todas as conexões ociosas; as em uso são fechadas ao serem devolvidas."""
+        with self._condicao:
+            self._fechado = True
+            ociosas, self._ociosas = self._ociosas, []
+            self._total_abertas -= len(ociosas)
+            self._condicao.notify_all()
+        for ociosa in ociosas: self._fechar_silenciosamente(ociosa.conexao)
+        logger.info(f"Pool de conexões ({self.rotulo}) fechado. Estatísticas finais: {self.estatisticas()}")
+
+# --- Pool global da aplicação (criado sob demanda a partir do db_config) ---
+_pool = None
+_pool_lock = threading.Lock()
+
+def obter_pool():
+    """Retorna o pool global, criando-o na primeira chamada."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexoes(db_config.DB_POOL_SIZE, db_config.DB_POOL_TIMEOUT,
+                                     db_config.DB_POOL_RECYCLE, db_config.DB_POOL_PING_AFTER)
+    return _pool
+
+def conexao():
+    """Atalho para 'obter_pool().conexao()'."""
+    return obter_pool().conexao()
+
+def aquecer(quantidade=None):
+    """Aquece o pool global com DB_POOL_MIN conexões (ou 'quantidade')."""
+    return obter_pool().aquecer(db_config.DB_POOL_MIN if quantidade is None else quantidade)
+
+def estatisticas():
+    return obter_pool().estatisticas()
+
+def fechar():
+    global _pool
+    with _pool_lock:
+        if _pool is not None: _pool.fechar(); _pool = None
@@ -0,0 +1,336 @@
+# database/diario_escritas.py
+import os
+import json
+import time
+import threading
+import logging
+from datetime import date
+import mysql.connector
+from . import db_config
+from . import db_pool
+from . import db_handler
+from . import cache_alunos
+from . import indice_unicidade
+from . import instrucoes
+from . import roteamento
+from utils import instrumentacao
+
+logger = logging.getLogger(__name__)
+
+# Diário de escritas (write-behind), ativado com DB_DIARIO_ATIVO=1. Cadastros e atualizações
+# são validados e gravados num arquivo local só de acréscimo (uma linha JSON por operação), e o
+# clique termina aí: a GUI mostra o aluno na hora. Um thread de fundo envia as operações
+# pendentes ao MySQL em lotes, cada lote numa transação, e anota no diário o resultado de cada
+# uma ("ack"). Se o banco estiver lento ou fora do ar, as operações esperam no arquivo e são
+# reenviadas depois, inclusive após reiniciar a aplicação. O clique não espera o fsync: o thread de
+# envio sincroniza o arquivo antes de cada lote (um fsync cobre tudo o que foi escrito até ali) e só
+# envia ao MySQL operações que já estão em disco. Uma queda logo após o clique pode perder as
+# últimas operações (ainda no buffer do SO), mas nunca grava no banco algo ausente do diário.
+#   {"seq": 7, "op": "cadastrar", "dados": [...]}            operação
+#   {"seq": 9, "op": "atualizar", "id": -7, "dados": [...]}  id < 0: aluno do cadastro seq 7, ainda não enviado
+#   {"ack": 7, "id": 1523, "erro": null}                      resultado (erro: conflito de CPF/email etc.)
+# A entrega é "pelo menos uma vez": se o processo cair entre o COMMIT no MySQL e o ack no disco, o lote é reenviado e os
+# cadastros repetidos voltam como conflito de CPF/email.
+
+# Erros que recusam só a operação (o dado em si é inválido para o banco): viram conflito e o lote segue.
+# Qualquer outro (conexão perdida, deadlock 1213, lock wait timeout 1205...) desfaz o lote inteiro, que volta
+# a ficar pendente e é reenviado depois, sem ack.
+ERRNOS_RECUSA = {1062, 1048, 1264, 1265, 1292, 1366, 1406}
+
+def id_provisorio(seq):
+    """Id usado na GUI para um cadastro ainda não enviado (negativo: nunca colide com AUTO_INCREMENT)."""
+    return -seq
+
+def linha_tabela(id_aluno, dados):
+    """Linha no formato de SQL_SELECT_ALUNOS a partir dos dados de cadastro (data AAAA-MM-DD -> DD/MM/AAAA)."""
+    nome, sobrenome, telefone, email, cpf, data_nasc, cidade, uf, curso = dados
+    data_exibicao = date.fromisoformat(data_nasc).strftime('%d/%m/%Y') if data_nasc else None
+    return (id_aluno, nome, sobrenome, telefone, email, cpf, data_exibicao, cidade, uf, curso)
+
+class DiarioEscritas:
+    """Diário local de escritas com envio em lotes ao MySQL por um thread de fundo."""
+
+    def __init__(self, caminho, tamanho_lote=100, intervalo_s=0.5, espera_max_s=30.0):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_s = intervalo_s
+        self.espera_max_s = espera_max_s # Teto do recuo entre tentativas com o banco fora do ar
+        self._pendentes = [] # Operações ainda sem ack, em ordem de seq
+        self._ids = {} # seq de cadastro -> id real (ou None se o cadastro falhou)
+        self._entregues = set() # seqs de cadastro cujo resultado a GUI já aplicou (não usa mais o id provisório)
+        self._seq = 0
+        self._lock = threading.Lock() # Protege arquivo, seq e listas
+        self._lock_fsync = threading.Lock() # Um fsync por vez; _compactar também o pega (não trunca no meio de um fsync)
+        self._lock_envio = threading.Lock() # Um lote por vez (thread de fundo x envio final do encerrar)
+        self._gravado_ate = 0 # Bytes escritos no arquivo (buffer do SO)
+        self._sincronizado_ate = 0 # Bytes garantidos em disco
+        self._seq_em_disco = 0 # Maior seq garantido em disco (só operações até ele são enviadas)
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+        self._ao_gravar = None
+        self.conflitos = [] # (id_exibido, dados, msg) das operações recusadas pelo banco
+        self._stats = {"registradas": 0, "enviadas": 0, "conflitos": 0, "lotes": 0, "fsyncs": 0, "falhas_envio": 0}
+        self._recuperar()
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+        self._gravado_ate = self._sincronizado_ate = self._arquivo.tell()
+        self._seq_em_disco = self._seq # O que foi recuperado já estava no arquivo
+
+    # --- Arquivo ---
+    def _recuperar(self):
+        """Relê o diário: operações sem ack voltam a ficar pendentes. Uma última linha incompleta (queda no meio da gravação) é ignorada."""
+        if not os.path.exists(self.caminho): return
+        operacoes = {}; ignoradas = 0
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try: registro = json.loads(linha)
+                except ValueError: ignoradas += 1; continue
+                if "ack" in registro:
+                    operacao = operacoes.pop(registro["ack"], None)
+                    if operacao and operacao["op"] == "cadastrar": self._ids[registro["ack"]] = registro.get("id")
+                else:
+                    operacoes[registro["seq"]] = registro; self._seq = max(self._seq, registro["seq"])
+        self._pendentes = [operacoes[seq] for seq in sorted(operacoes)]
+        if self._pendentes or ignoradas:
+            logger.warning(f"Diário de escritas '{self.caminho}': {len(self._pendentes)} operação(ões) pendente(s) recuperada(s) ({ignoradas} linha(s) inválida(s) ignorada(s)).")
+        if not self._pendentes: open(self.caminho, "w").close() # Tudo confirmado: recomeça o arquivo vazio
+
+    def _acrescentar(self, registros):
+        """Escreve as linhas no arquivo (sem fsync). Chamado com self._lock. Retorna a posição final."""
+        self._arquivo.write("".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros))
+        self._arquivo.flush()
+        self._gravado_ate = self._arquivo.tell()
+        return self._gravado_ate
+
+    def _sincronizar_disco(self, posicao):
+        """
+        Garante em disco tudo até 'posicao'. O fsync cobre todas as linhas já escritas (commit em
+        grupo: as operações registradas desde o último lote saem num único fsync).
+        """
+        if self._sincronizado_ate >= posicao: return
+        with self._lock_fsync:
+            if self._sincronizado_ate >= posicao: return
+            with self._lock: alvo, seq_alvo = self._gravado_ate, self._seq
+            with instrumentacao.Medir("diario.fsync"): os.fsync(self._arquivo.fileno())
+            self._sincronizado_ate = alvo; self._seq_em_disco = seq_alvo; self._stats["fsyncs"] += 1
+
+    def _registrar(self, operacao):
+        """Escreve a operação (sem fsync: roda no thread do Tk) e acorda o thread de envio, que sincroniza o disco."""
+        with self._lock:
+            self._seq += 1
+            operacao["seq"] = self._seq
+            self._acrescentar([operacao])
+            self._pendentes.append(operacao); self._stats["registradas"] += 1
+        self._acordar.set()
+        return operacao["seq"]
+
+    # --- Operações (mesmos retornos do db_handler, com o id provisório no cadastro) ---
+    def registrar_cadastro(self, dados_aluno):
+        """Valida e grava o cadastro no diário. Retorna (sucesso, msg, id) com o id provisório (negativo)."""
+        valido, msg = db_handler._validar_dados_aluno_backend(dados_aluno)
+        if not valido: return False, msg, None
+        duplicado = self._duplicado_pendente(dados_aluno)
+        if duplicado: return False, duplicado, None
+        seq = self._registrar({"op": "cadastrar", "dados": list(dados_aluno)})
+        logger.info(f"Cadastro de '{dados_aluno[0]} {dados_aluno[1]}' registrado no diário (seq {seq}).")
+        return True, "Aluno cadastrado (gravação no banco em andamento).", id_provisorio(seq)
+
+    def registrar_atualizacao(self, id_aluno, dados_aluno):
+        """Valida e grava a atualização no diário. 'id_aluno' pode ser o id provisório de um cadastro pendente."""
+        valido, msg = db_handler._validar_dados_aluno_backend(dados_aluno)
+        if not valido: return False, msg
+        id_aluno = int(id_aluno)
+        if id_aluno < 0: # Cadastro já enviado: grava com o id real (o provisório não sobrevive a um reinício)
+            with self._lock: enviado, id_real = -id_aluno in self._ids, self._ids.get(-id_aluno)
+            if enviado and id_real is None: return False, "Erro: o cadastro deste aluno não foi gravado; atualização descartada."
+            if enviado: id_aluno = id_real
+        duplicado = self._duplicado_pendente(dados_aluno, ignorar_id=id_aluno)
+        if duplicado: return False, duplicado
+        seq = self._registrar({"op": "atualizar", "id": id_aluno, "dados": list(dados_aluno)})
+        logger.info(f"Atualização do aluno ID {id_aluno} registrada no diário (seq {seq}).")
+        return True, "Aluno atualizado (gravação no banco em andamento)."
+
+    def _duplicado_pendente(self, dados_aluno, ignorar_id=None):
+        """Conflito de CPF/email com outra operação ainda pendente (o banco só veria no envio)."""
+        email, cpf = (dados_aluno[3] or "").lower(), dados_aluno[4]
+        with self._lock: pendentes = list(self._pendentes)
+        for operacao in pendentes:
+            id_operacao = operacao.get("id", id_provisorio(operacao["seq"]))
+            if ignorar_id is not None and id_operacao == ignorar_id: continue
+            if cpf and operacao["dados"][4] == cpf: return "Erro: CPF já cadastrado (aguardando gravação)."
+            if email and (operacao["dados"][3] or "").lower() == email: return "Erro: Email já cadastrado (aguardando gravação)."
+        return None
+
+    def confirmar_entrega(self, id_exibido):
+        """A GUI aplicou o resultado de uma operação (trocou o id provisório): o mapeamento pode ser descartado."""
+        if id_exibido < 0:
+            with self._lock: self._entregues.add(-id_exibido)
+
+    def pendentes(self):
+        with self._lock: return len(self._pendentes)
+
+    def estatisticas(self):
+        with self._lock: stats = dict(self._stats); stats["pendentes"] = len(self._pendentes)
+        return stats
+
+    # --- Envio ao MySQL ---
+    def _resolver_id(self, id_aluno):
+        """Id real de uma atualização: ids provisórios são trocados pelo id gerado no envio do cadastro."""
+        if id_aluno > 0: return id_aluno
+        return self._ids.get(-id_aluno)
+
+    def _aplicar(self, conexao, operacao):
+        """Executa uma operação. Retorna (id_real, erro); erro é a mensagem de um conflito/recusa do banco."""
+        dados = tuple(operacao["dados"])
+        if operacao["op"] == "cadastrar":
+            try:
+                conflito = db_handler._conflito_arquivo(conexao, dados[4], dados[3])
+                if conflito: return None, conflito
+                return instrucoes.executar(conexao, "diario_cadastrar", db_handler.SQL_INSERT_ALUNO, dados).lastrowid, None
+            except mysql.connector.Error as err:
+                if err.errno not in ERRNOS_RECUSA: raise
+                if err.errno == 1062: return None, "Erro: CPF já cadastrado." if 'cpf' in err.msg.lower() else "Erro: Email já cadastrado." if 'email' in err.msg.lower() else f"Erro: Dados duplicados não permitidos ({err.msg})."
+                return None, f"Erro no BD ao cadastrar: {err.msg}"
+        id_real = self._resolver_id(operacao["id"])
+        if id_real is None: return None, "Erro: o cadastro deste aluno não foi gravado; atualização descartada."
+        try:
+            conflito = db_handler._conflito_arquivo(conexao, dados[4], dados[3], ignorar_id=id_real, atualizacao=True)
+            if conflito: return id_real, conflito
+            resultado = instrucoes.executar(conexao, "diario_atualizar", db_handler.SQL_UPDATE_ALUNO, dados + (id_real,))
+        except mysql.connector.Error as err:
+            if err.errno not in ERRNOS_RECUSA: raise
+            if err.errno == 1062: return id_real, "Erro: CPF já pertence a outro aluno." if 'cpf' in err.msg.lower() else "Erro: Email já pertence a outro aluno." if 'email' in err.msg.lower() else f"Erro: Dados duplicados não permitidos ({err.msg})."
+            return id_real, f"Erro no BD ao atualizar: {err.msg}"
+        if resultado.rowcount == 0 and not self._aluno_existe(conexao, id_real): return id_real, f"Erro: aluno ID {id_real} não existe mais."
+        return id_real, None
+
+    @staticmethod
+    def _aluno_existe(conexao, id_aluno):
+        return bool(instrucoes.executar(conexao, "diario_existe", "SELECT 1 FROM alunos WHERE id = %s", (id_aluno,), buscar=True).linhas)
+
+    def enviar_lote(self):
+        """
+        Envia até 'tamanho_lote' operações pendentes numa transação. No InnoDB, uma chave duplicada
+        ou um dado inválido desfaz só a instrução que falhou: o conflito é anotado e o resto do lote
+        segue. Outros erros (conexão, deadlock, timeout de lock) desfazem o lote todo. Retorna
+        quantas operações foram resolvidas, ou None se o lote não pôde ser gravado (nada muda).
+        """
+        with self._lock_envio: # Sem isso, dois envios simultâneos mandariam o mesmo lote duas vezes
+            if self._arquivo.closed: return None
+            return self._enviar_lote()
+
+    def _enviar_lote(self):
+        """Corpo do enviar_lote(); chamado com self._lock_envio."""
+        with self._lock: posicao = self._gravado_ate
+        self._sincronizar_disco(posicao) # Um fsync para tudo o que foi registrado desde o último lote
+        with self._lock: lote = [operacao for operacao in self._pendentes[:self.tamanho_lote] if operacao["seq"] <= self._seq_em_disco]
+        if not lote: return 0
+        resultados = []
+        with instrumentacao.Medir("diario.enviar_lote", lambda: f"{len(lote)} operação(ões)"), db_pool.conexao() as conexao:
+            if not conexao: return None
+            try:
+                ids_no_lote = {}
+                for operacao in lote:
+                    id_real, erro = self._aplicar(conexao, operacao)
+                    if operacao["op"] == "cadastrar":
+                        with self._lock: self._ids[operacao["seq"]] = id_real
+                        ids_no_lote[operacao["seq"]] = id_real
+                    resultados.append((operacao, id_real, erro))
+                instrucoes.confirmar(conexao)
+            except mysql.connector.Error as err:
+                with self._lock: # Rollback: os ids gerados neste lote não valem
+                    for seq in ids_no_lote: self._ids.pop(seq, None)
+                try: conexao.rollback()
+                except mysql.connector.Error: pass # noqa - conexão perdida; o pool a descarta
+                logger.warning(f"Envio do diário interrompido ({err}); {len(lote)} operação(ões) continuam pendentes.")
+                return None
+        cache_alunos.marcar_desatualizado(); indice_unicidade.marcar_desatualizado(); roteamento.marcar_escrita()
+        with self._lock:
+            posicao = self._acrescentar([{"ack": operacao["seq"], "id": id_real, "erro": erro} for operacao, id_real, erro in resultados])
+            del self._pendentes[:len(lote)]
+            self._stats["lotes"] += 1; self._stats["enviadas"] += len(lote)
+            self._stats["conflitos"] += sum(1 for _, _, erro in resultados if erro)
+        self._sincronizar_disco(posicao)
+        for operacao, id_real, erro in resultados:
+            id_exibido = id_provisorio(operacao["seq"]) if operacao["op"] == "cadastrar" else operacao["id"]
+            if erro:
+                self.conflitos.append((id_exibido, operacao["dados"], erro))
+                logger.error(f"Conflito ao gravar operação {operacao['seq']} ({operacao['op']}) do diário: {erro}")
+            if self._ao_gravar: self._ao_gravar(id_exibido, id_real, erro)
+        logger.info(f"Diário: {len(lote)} operação(ões) gravada(s) no banco ({self.pendentes()} pendente(s)).")
+        self._compactar()
+        return len(lote)
+
+    def _compactar(self):
+        """
+        Sem nada pendente, o arquivo recomeça vazio (os acks antigos não são mais necessários). Em
+        memória, só saem os ids já entregues à GUI: um cadastro cujo resultado ainda está na fila do
+        Tk pode receber uma atualização pelo id provisório, que precisa ser resolvida. Pega
+        _lock_fsync antes: um fsync em andamento gravaria em _sincronizado_ate a posição anterior ao
+        truncamento, e as linhas seguintes (abaixo dela) ficariam sem fsync.
+        """
+        with self._lock_fsync, self._lock:
+            if self._pendentes: return
+            self._arquivo.truncate(0); self._arquivo.seek(0)
+            self._gravado_ate = self._sincronizado_ate = 0
+            for seq in self._entregues: self._ids.pop(seq, None)
+            self._entregues.clear()
+
+    def _ciclo(self):
+        espera = self.intervalo_s
+        while not self._parar.is_set():
+            self._acordar.wait(espera); self._acordar.clear()
+            if self._parar.is_set(): break
+            try: enviados = self.enviar_lote()
+            except Exception: logger.exception("Erro inesperado no envio do diário de escritas."); enviados = None # noqa
+            if enviados is None:
+                self._stats["falhas_envio"] += 1
+                espera = min(self.espera_max_s, espera * 2) # Banco fora do ar: recua
+            else:
+                espera = self.intervalo_s
+                if enviados and self.pendentes(): self._acordar.set() # Ainda há fila: próximo lote já
+
+    def iniciar(self, ao_gravar=None):
+        """
+        Inicia o thread de envio. 'ao_gravar(id_exibido, id_real, erro)' é chamado (no thread de
+        envio) para cada operação resolvida; id_exibido é o id provisório no caso de cadastros.
+        """
+        self._ao_gravar = ao_gravar
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._ciclo, name="diario-escritas", daemon=True)
+            self._thread.start()
+            if self.pendentes(): self._acordar.set()
+
+    def encerrar(self, timeout_s=5.0):
+        """Para o thread, tenta um último envio e fecha o arquivo. O que não for enviado fica para a próxima execução."""
+        limite = time.monotonic() + timeout_s
+        self._parar.set(); self._acordar.set()
+        if self._thread is not None: self._thread.join(timeout_s); self._thread = None
+        # Se o thread ainda estiver no meio de um lote, espera ele terminar: enviar de novo daqui repetiria o lote
+        if not self._lock_envio.acquire(timeout=max(0.0, limite - time.monotonic())):
+            logger.warning(f"Envio do diário ainda em andamento após {timeout_s}s; o que não for confirmado será reenviado na próxima execução.")
+            return
+        try:
+            while self.pendentes() and time.monotonic() < limite:
+                if not self._enviar_lote(): break
+            with self._lock:
+                restantes = len(self._pendentes)
+                os.fsync(self._arquivo.fileno()); self._arquivo.close()
+        finally:
+            self._lock_envio.release()
+        if restantes: logger.warning(f"Diário encerrado com {restantes} operação(ões) pendente(s) em '{self.caminho}'; serão enviadas na próxima execução.")
+        logger.info(f"Diário de escritas encerrado. Estatísticas: {self.estatisticas()}")
+
+# --- Diário global da aplicação ---
+_diario = None
+
+def obter_diario():
+    """Diário da aplicação (criado na primeira chamada), ou None se DB_DIARIO_ATIVO estiver desligado."""
+    global _diario
+    if _diario is None and db_config.DB_DIARIO_ATIVO:
+        _diario = DiarioEscritas(db_config.DB_DIARIO_PATH, db_config.DB_DIARIO_LOTE, db_config.DB_DIARIO_INTERVALO)
+    return _diario
+
+def encerrar():
+    global _diario
+    if _diario is not None: _diario.encerrar(); _diario = None
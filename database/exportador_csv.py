@@ -0,0 +1,51 @@
+# database/exportador_csv.py
+import csv
+import os
+import time
+import logging
+from . import db_handler
+from .importador_csv import CABECALHOS_CSV, DELIMITADOR_CSV
+
+logger = logging.getLogger(__name__)
+
+def exportar_csv(caminho_arquivo, search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC',
+                 tamanho_lote=db_handler.TAMANHO_LOTE_STREAMING, ao_progresso=None, incluir_arquivados=False):
+    """
+    Exporta para CSV ';' os alunos do filtro/ordem informados, lendo direto do cursor do banco
+    em lotes (fetchmany) e gravando cada lote no arquivo. Com incluir_arquivados=True, junta os
+    alunos de alunos_arquivo na mesma ordem (como a tabela). 'ao_progresso(linhas_exportadas)' é
+    chamado a cada lote. Grava em um arquivo temporário e só o renomeia ao final, para não deixar
+    um CSV pela metade em caso de erro. Retorna (total, msg); total é None em falha.
+    """
+    logger.info(f"Exportando alunos para '{caminho_arquivo}': filtro='{search_field}':'{search_term}', ordem='{sort_by_column} {sort_direction}', arquivados={incluir_arquivados}")
+    caminho_temporario = caminho_arquivo + ".parcial"
+    inicio = time.perf_counter()
+    exportadas = 0
+    try:
+        with open(caminho_temporario, 'w', newline='', encoding='utf-8') as arquivo_csv:
+            escritor_csv = csv.writer(arquivo_csv, delimiter=DELIMITADOR_CSV)
+            escritor_csv.writerow(CABECALHOS_CSV)
+
+            def gravar_lote(linhas):
+                nonlocal exportadas
+                escritor_csv.writerows([["" if v is None else str(v) for v in linha] for linha in linhas])
+                exportadas += len(linhas)
+                if ao_progresso: ao_progresso(exportadas)
+
+            total, msg_db = db_handler.percorrer_alunos_db(gravar_lote, search_field=search_field, search_term=search_term,
+                                                           sort_by_column=sort_by_column, sort_direction=sort_direction,
+                                                           tamanho_lote=tamanho_lote, incluir_arquivados=incluir_arquivados)
+        if total is None:
+            os.remove(caminho_temporario)
+            return None, msg_db
+        os.replace(caminho_temporario, caminho_arquivo)
+    except IOError as e:
+        logger.error(f"Erro de E/S ao exportar CSV: {e}", exc_info=True)
+        try: os.remove(caminho_temporario)
+        except OSError: pass # noqa - o temporário pode nem ter sido criado
+        return None, f"Não foi possível salvar o arquivo CSV.\nDetalhe: {e}"
+
+    segundos = time.perf_counter() - inicio
+    msg = f"{total} aluno(s) exportado(s) em {segundos:.1f}s."
+    logger.info(f"{msg} Arquivo: {caminho_arquivo}")
+    return total, msg
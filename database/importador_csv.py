@@ -0,0 +1,256 @@
+# database/importador_csv.py
+import csv
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import date, datetime
+import mysql.connector
+from . import db_pool
+from . import db_handler
+from . import busca
+from . import cache_alunos
+from . import indice_unicidade
+from . import roteamento
+from utils import validators
+
+logger = logging.getLogger(__name__)
+
+# Mesmo layout (e delimitador ';') gerado por AplicacaoAlunos.exportar_para_csv
+CABECALHOS_CSV = ("ID", "Nome", "Sobrenome", "Telefone", "E-mail", "CPF", "Data Nasc.", "Cidade", "UF", "Curso")
+_CABECALHO_PARA_CAMPO = {"id": "id", "nome": "nome", "sobrenome": "sobrenome", "telefone": "telefone",
+                         "e-mail": "email", "email": "email", "cpf": "cpf", "data nasc.": "data_nascimento",
+                         "data_nascimento": "data_nascimento", "cidade": "cidade", "uf": "uf", "curso": "curso"}
+_CAMPOS_LAYOUT = tuple(_CABECALHO_PARA_CAMPO[c.lower()] for c in CABECALHOS_CSV)
+DELIMITADOR_CSV = ';'
+TAMANHO_LOTE_PADRAO = 1000
+
+SQL_INSERIR_ALUNO = """
+    INSERT INTO alunos (nome, sobrenome, telefone, email, cpf, data_nascimento, cidade, uf, curso)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+def _mapear_cabecalho(primeira_linha):
+    """Retorna a lista de campos por posição a partir do cabeçalho, ou None se a linha não for cabeçalho."""
+    campos = [_CABECALHO_PARA_CAMPO.get(c.strip().lower()) for c in primeira_linha]
+    if "nome" in campos and "sobrenome" in campos: return campos
+    return None
+
+def ler_linhas_csv(arquivo):
+    """
+    Gera (numero_linha, dict_campos, valores) lendo o CSV sob demanda (sem carregar tudo na memória).
+    'valores' são os textos originais no layout de CABECALHOS_CSV (colunas desconhecidas de fora, ausentes vazias),
+    para que o CSV de rejeitados tenha sempre as colunas do seu cabeçalho e possa ser corrigido e reimportado.
+    """
+    leitor = csv.reader(arquivo, delimiter=DELIMITADOR_CSV)
+    campos = None
+    for numero_linha, valores in enumerate(leitor, start=1):
+        if not valores or all(not v.strip() for v in valores): continue
+        if campos is None:
+            campos = _mapear_cabecalho(valores)
+            if campos is not None: continue # Era o cabeçalho
+            campos = list(_CAMPOS_LAYOUT) # Sem cabeçalho: layout da exportação
+        por_campo = {campo: valor for campo, valor in zip(campos, valores) if campo}
+        registro = {campo: valor.strip() for campo, valor in por_campo.items()}
+        yield numero_linha, registro, [por_campo.get(campo, "") for campo in _CAMPOS_LAYOUT]
+
+def _data_para_db(data_str):
+    """Converte DD/MM/AAAA (formato da exportação) ou AAAA-MM-DD para AAAA-MM-DD."""
+    if not data_str: return None, ""
+    for formato in ('%d/%m/%Y', '%Y-%m-%d'):
+        try: return datetime.strptime(data_str, formato).strftime('%Y-%m-%d'), ""
+        except ValueError: continue
+    return None, "Data Nasc.: Formato inválido (esperado DD/MM/AAAA)."
+
+def converter_registro(registro):
+    """
+    Converte um registro do CSV para a tupla usada em INSERT (mesmos padrões da GUI), conferindo
+    só os campos obrigatórios, o curso e a data. Os formatos (CPF, e-mail...) ficam para
+    validators.validar_lote. Retorna (dados_aluno, "") ou (None, "mensagem de erro").
+    """
+    nome = registro.get("nome", ""); sobrenome = registro.get("sobrenome", ""); curso = registro.get("curso", "").upper()
+    if not nome or not sobrenome or not curso: return None, "Nome, Sobrenome e Curso são obrigatórios."
+    if curso not in busca.CURSOS_VALIDOS: return None, f"Curso inválido '{curso}' (válidos: {', '.join(busca.CURSOS_VALIDOS)})."
+    data_db, msg = _data_para_db(registro.get("data_nascimento", ""))
+    if msg: return None, msg
+    dados_aluno = (nome, sobrenome, registro.get("telefone") or None, registro.get("email") or None,
+                   registro.get("cpf") or None, data_db, registro.get("cidade") or 'Brasília',
+                   (registro.get("uf") or 'DF').upper(), curso)
+    return dados_aluno, ""
+
+def converter_e_validar(registro):
+    """Converte e valida um único registro. Retorna (dados_aluno, "") ou (None, "mensagem de erro")."""
+    dados_aluno, msg = converter_registro(registro)
+    if dados_aluno is None: return None, msg
+    valido, msg = validators.validar_aluno(dados_aluno)
+    return (dados_aluno, "") if valido else (None, msg)
+
+def _mensagem_erro_insercao(err):
+    """Mensagem de erro por linha, no mesmo padrão de db_handler.cadastrar_aluno_db."""
+    if err.errno == 1062:
+        if 'cpf' in err.msg.lower(): return "Erro: CPF já cadastrado."
+        if 'email' in err.msg.lower(): return "Erro: Email já cadastrado."
+        return f"Erro: Dados duplicados não permitidos ({err.msg})."
+    return f"Erro no BD ao cadastrar: {err.msg}"
+
+def separar_arquivados(conexao, lote):
+    """
+    Separa do lote [(numero_linha, dados, valores)] as linhas cujo CPF/email pertence a um aluno
+    arquivado: a UNIQUE de alunos não as barra. Uma consulta por lote, na transação de 'conexao'
+    (travas até o commit). Retorna (demais, [(numero_linha, valores, erro)]).
+    """
+    donos = db_handler._conflitos_arquivo_lote(conexao, [dados for _, dados, _ in lote])
+    demais = [item for item, dono in zip(lote, donos) if dono is None]
+    rejeitadas = [(numero_linha, valores, db_handler._msg_conflito_arquivo(dono)) for (numero_linha, _, valores), dono in zip(lote, donos) if dono is not None]
+    return demais, rejeitadas
+
+def _inserir_lote(conexao, lote):
+    """
+    Insere um lote [(numero_linha, dados, valores)] em uma transação com executemany, depois de
+    separar as linhas com CPF/email de aluno arquivado. Se o lote falhar (ex.: CPF duplicado),
+    refaz linha a linha para identificar as rejeitadas. Retorna (inseridas, [(numero_linha, valores, erro)]).
+    """
+    cursor = conexao.cursor()
+    try:
+        try:
+            validos, rejeitadas = separar_arquivados(conexao, lote)
+            if validos: cursor.executemany(SQL_INSERIR_ALUNO, [dados for _, dados, _ in validos])
+            conexao.commit(); cache_alunos.marcar_desatualizado(); indice_unicidade.marcar_desatualizado(); roteamento.marcar_escrita()
+            return len(validos), rejeitadas
+        except mysql.connector.Error as err:
+            conexao.rollback()
+            if err.errno == 1146: raise # Tabela inexistente: não adianta tentar linha a linha
+            logger.info(f"Lote de {len(lote)} linhas falhou ({err.msg}); reprocessando linha a linha.")
+        validos, rejeitadas = separar_arquivados(conexao, lote) # O rollback soltou as travas: confere de novo
+        inseridas = 0
+        for numero_linha, dados, valores in validos:
+            try:
+                cursor.execute(SQL_INSERIR_ALUNO, dados)
+                inseridas += 1
+            except mysql.connector.Error as err:
+                rejeitadas.append((numero_linha, valores, _mensagem_erro_insercao(err)))
+        conexao.commit(); cache_alunos.marcar_desatualizado(); indice_unicidade.marcar_desatualizado(); roteamento.marcar_escrita()
+        return inseridas, rejeitadas
+    finally:
+        cursor.close()
+
+class _FiltroDuplicados:
+    """
+    Pré-filtro de CPF/Email já cadastrados (índice de unicidade, sem consulta por linha) ou repetidos
+    no próprio arquivo. É só um atalho: sem índice (ou com ele defasado), a UNIQUE do banco recusa
+    o que passar entre os ativos (o lote é então refeito linha a linha) e _inserir_lote confere os
+    arquivados por lote, na transação do INSERT.
+    """
+
+    def __init__(self, indice):
+        self.indice = indice if indice is not None and indice.sincronizar() else None
+        self.cpfs = {}; self.emails = {} # chave -> linha do arquivo já aceita com ela
+
+    def rejeitar(self, numero_linha, dados):
+        """Mensagem de erro se a linha duplica um aluno existente ou uma linha anterior; senão registra e retorna ""."""
+        email, cpf = dados[3], dados[4]
+        if self.indice is not None:
+            valido, msg = self.indice.verificar(cpf, email)
+            if not valido: return msg
+        chaves = ((self.cpfs, indice_unicidade.chave_cpf(cpf), "CPF"), (self.emails, indice_unicidade.chave_email(email), "Email"))
+        for vistos, chave, rotulo in chaves:
+            if chave is not None and chave in vistos: return f"Erro: {rotulo} repetido no arquivo (linha {vistos[chave]})."
+        for vistos, chave, _ in chaves:
+            if chave is not None: vistos[chave] = numero_linha
+        return ""
+
+def importar_csv(caminho_csv, caminho_rejeitados=None, tamanho_lote=TAMANHO_LOTE_PADRAO, ao_progresso=None):
+    """
+    Importa alunos de um CSV ';' em lotes: valida cada lote, descarta CPF/Email já cadastrados ou
+    repetidos no arquivo (índice de unicidade em memória, se ativo), confere no banco os de alunos
+    arquivados, insere com executemany em uma transação por lote e grava as linhas rejeitadas (com o motivo) em 'caminho_rejeitados'.
+    'ao_progresso(resumo)' é chamado após cada lote. Retorna (resumo, msg); resumo é None em falha.
+    """
+    if caminho_rejeitados is None:
+        base, _ = os.path.splitext(caminho_csv)
+        caminho_rejeitados = f"{base}_rejeitados.csv"
+    logger.info(f"Iniciando importação de '{caminho_csv}' (lote={tamanho_lote}, rejeitados='{caminho_rejeitados}').")
+    resumo = {"lidas": 0, "inseridas": 0, "rejeitadas": 0, "segundos": 0.0, "linhas_por_segundo": 0.0,
+              "caminho_rejeitados": caminho_rejeitados}
+    inicio = time.perf_counter()
+    hoje = date.today() # Uma vez por importação, não por linha
+
+    def atualizar_resumo():
+        resumo["segundos"] = time.perf_counter() - inicio
+        resumo["linhas_por_segundo"] = resumo["lidas"] / resumo["segundos"] if resumo["segundos"] > 0 else 0.0
+        if ao_progresso: ao_progresso(dict(resumo))
+
+    try:
+        with open(caminho_csv, newline='', encoding='utf-8-sig') as arquivo, \
+             open(caminho_rejeitados, 'w', newline='', encoding='utf-8') as arquivo_rejeitados, \
+             db_pool.conexao() as conexao:
+            if not conexao: return None, "Falha na conexão com o banco de dados."
+            escritor_rejeitados = csv.writer(arquivo_rejeitados, delimiter=DELIMITADOR_CSV)
+            escritor_rejeitados.writerow(("Linha",) + CABECALHOS_CSV + ("Erro",)) # "Linha" e "Erro" são ignoradas ao reimportar
+            filtro_duplicados = _FiltroDuplicados(indice_unicidade.obter_indice())
+
+            def rejeitar(numero_linha, valores, erro):
+                escritor_rejeitados.writerow([numero_linha] + list(valores) + [erro])
+                resumo["rejeitadas"] += 1
+
+            def processar(lote):
+                convertidos = []
+                for numero_linha, registro, valores in lote:
+                    dados, erro = converter_registro(registro)
+                    if dados is None: rejeitar(numero_linha, valores, erro)
+                    else: convertidos.append((numero_linha, dados, valores))
+                validos = []
+                resultados = validators.validar_lote([dados for _, dados, _ in convertidos], hoje)
+                for item, (valido, erro) in zip(convertidos, resultados):
+                    if valido: erro = filtro_duplicados.rejeitar(item[0], item[1])
+                    if valido and not erro: validos.append(item)
+                    else: rejeitar(item[0], item[2], erro)
+                if validos:
+                    inseridas, rejeitadas = _inserir_lote(conexao, validos)
+                    resumo["inseridas"] += inseridas
+                    for numero_linha, valores, erro in rejeitadas: rejeitar(numero_linha, valores, erro)
+                atualizar_resumo()
+
+            lote = []
+            for item in ler_linhas_csv(arquivo):
+                lote.append(item); resumo["lidas"] += 1
+                if len(lote) >= tamanho_lote: processar(lote); lote = []
+            if lote: processar(lote)
+    except (IOError, UnicodeDecodeError, csv.Error) as e:
+        logger.error(f"Erro ao ler/gravar arquivos da importação: {e}", exc_info=True)
+        return None, f"Erro ao ler o arquivo CSV: {e}"
+    except mysql.connector.Error as err:
+        logger.error(f"Erro SQL durante a importação: {err}", exc_info=True)
+        if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+        return None, f"Erro no BD durante a importação: {err.msg}"
+
+    atualizar_resumo()
+    msg = (f"Importação concluída: {resumo['inseridas']} inserido(s), {resumo['rejeitadas']} rejeitado(s) "
+           f"de {resumo['lidas']} linha(s) em {resumo['segundos']:.1f}s ({resumo['linhas_por_segundo']:.0f} linhas/s).")
+    logger.info(msg)
+    return resumo, msg
+
+def main(argv=None):
+    """Ponto de entrada sem interface gráfica: python -m database.importador_csv alunos.csv"""
+    parser = argparse.ArgumentParser(description="Importa alunos em lote a partir de um CSV delimitado por ';'.")
+    parser.add_argument("arquivo", help="CSV no layout da exportação (ID;Nome;Sobrenome;...;Curso)")
+    parser.add_argument("--rejeitados", help="CSV de saída com as linhas rejeitadas (padrão: <arquivo>_rejeitados.csv)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help=f"Linhas por transação (padrão: {TAMANHO_LOTE_PADRAO})")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    def mostrar_progresso(resumo):
+        print(f"  {resumo['lidas']} lidas, {resumo['inseridas']} inseridas, {resumo['rejeitadas']} rejeitadas "
+              f"({resumo['linhas_por_segundo']:.0f} linhas/s)", file=sys.stderr)
+
+    try:
+        resumo, msg = importar_csv(args.arquivo, args.rejeitados, max(1, args.lote), ao_progresso=mostrar_progresso)
+    finally:
+        db_pool.fechar()
+    print(msg)
+    if resumo and resumo["rejeitadas"]: print(f"Linhas rejeitadas gravadas em: {resumo['caminho_rejeitados']}")
+    return 0 if resumo is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+# database/indice_unicidade.py
+import re
+import sys
+import time
+import heapq
+import bisect
+import hashlib
+import threading
+import logging
+from array import array
+import mysql.connector
+from . import db_config
+from . import db_pool
+
+logger = logging.getLogger(__name__)
+
+# Índice em memória dos CPFs e e-mails em uso, para acusar duplicidade sem ir ao banco (FocusOut
+# do formulário, pré-filtro da importação CSV). O banco continua sendo a fonte da verdade: a
+# UNIQUE do MySQL ainda recusa o que escapar daqui (ex.: cadastro feito em outra máquina há
+# poucos segundos). Estrutura compacta: CPF como inteiro de 11 dígitos e e-mail como hash de
+# 64 bits (BLAKE2b do e-mail normalizado), cada um num array('q') ordenado com o id do dono ao
+# lado (16 bytes por chave, busca binária). Alterações posteriores à carga ficam em dicts pequenos
+# (_recentes) e são incorporadas aos arrays quando passam de LIMITE_ALTERACOES. A versão da
+# tabela é sondada como em cache_alunos.py (COUNT, MAX(id), MAX(atualizado_em)); só as linhas
+# alteradas são buscadas de novo, e exclusões não explicadas pela aplicação forçam recarga completa.
+# Alunos arquivados (alunos_arquivo) continuam donos do CPF/e-mail, como em db_handler._conflito_arquivo:
+# as chaves deles ficam em coleções à parte, recarregadas por inteiro quando a sonda do arquivo
+# (COUNT, MAX(id)) muda. Arquivar ou restaurar também mexe em alunos fora de _exclusoes_locais,
+# então a carga incremental não fecha a conta e a recarga completa pega as duas tabelas juntas.
+
+TABELA_ARQUIVO = "alunos_arquivo" # Mesmo nome de db_handler.TABELA_ARQUIVO (db_handler importa este módulo)
+SQL_CARGA = "SELECT id, cpf, email FROM alunos"
+SQL_VERSAO = "SELECT COUNT(*), MAX(id), MAX(atualizado_em) FROM alunos"
+SQL_CARGA_ARQUIVO = f"SELECT id, cpf, email FROM {TABELA_ARQUIVO}"
+SQL_VERSAO_ARQUIVO = f"SELECT COUNT(*), MAX(id) FROM {TABELA_ARQUIVO}"
+TAMANHO_LOTE_CARGA = 5000
+TAMANHO_BLOCO_ORDENACAO = 65536 # Pares ordenados por vez na carga (pico de memória limitado a um bloco)
+LIMITE_ALTERACOES = 20000 # Alterações/exclusões pendentes antes de reconstruir os arrays
+RECARGA_COMPLETA_APOS_S = 600 # Recarga completa periódica: cobre commits fora da ordem de atualizado_em
+_NAO_DIGITOS = re.compile(r"\D")
+
+def chave_cpf(cpf):
+    """CPF (com ou sem máscara) como inteiro de 11 dígitos, ou None."""
+    if not cpf: return None
+    digitos = _NAO_DIGITOS.sub("", cpf)
+    return int(digitos) if len(digitos) == 11 else None
+
+def chave_email(email):
+    """Hash de 64 bits (com sinal, cabe em array('q')) do e-mail normalizado, ou None. O MySQL compara e-mails sem caixa."""
+    email = (email or "").strip().lower()
+    if not email: return None
+    return int.from_bytes(hashlib.blake2b(email.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+def _ordenar_pares(chaves, ids):
+    """Arrays (chaves, ids) ordenados por chave: ordena blocos de TAMANHO_BLOCO_ORDENACAO e intercala (heapq.merge)."""
+    blocos = []
+    for inicio in range(0, len(chaves), TAMANHO_BLOCO_ORDENACAO):
+        pares = sorted(zip(chaves[inicio:inicio + TAMANHO_BLOCO_ORDENACAO], ids[inicio:inicio + TAMANHO_BLOCO_ORDENACAO]))
+        blocos.append((array('q', [c for c, _ in pares]), array('q', [i for _, i in pares])))
+    del chaves[:], ids[:] # Entrada consumida: libera antes de montar a saída
+    chaves_ordenadas = array('q'); ids_ordenados = array('q')
+    for chave, id_aluno in heapq.merge(*(zip(c, i) for c, i in blocos)):
+        chaves_ordenadas.append(chave); ids_ordenados.append(id_aluno)
+    return chaves_ordenadas, ids_ordenados
+
+class _Colecao:
+    """Chaves de um tipo (CPF ou e-mail): base ordenada + alterações desde a última reconstrução."""
+
+    def __init__(self, chaves=None, ids=None):
+        self.chaves = chaves if chaves is not None else array('q')
+        self.ids = ids if ids is not None else array('q')
+        self.recentes = {} # chave -> id, de linhas alteradas/inseridas depois da base
+
+    def dono(self, chave, alterados, excluidos):
+        """Id do aluno que usa 'chave', ou None. Entradas da base de ids alterados/excluídos estão vencidas."""
+        id_aluno = self.recentes.get(chave)
+        if id_aluno is not None and id_aluno not in excluidos: return id_aluno
+        posicao = bisect.bisect_left(self.chaves, chave)
+        while posicao < len(self.chaves) and self.chaves[posicao] == chave: # Mais de um só em colisão de hash
+            id_aluno = self.ids[posicao]
+            if id_aluno not in alterados and id_aluno not in excluidos: return id_aluno
+            posicao += 1
+        return None
+
+    def reconstruir(self, alterados, excluidos):
+        """Incorpora as alterações aos arrays ordenados (base válida + recentes, já ordenados, intercalados)."""
+        base = ((c, i) for c, i in zip(self.chaves, self.ids) if i not in alterados and i not in excluidos)
+        recentes = sorted((c, i) for c, i in self.recentes.items() if i not in excluidos)
+        chaves = array('q'); ids = array('q')
+        for chave, id_aluno in heapq.merge(base, recentes): chaves.append(chave); ids.append(id_aluno)
+        self.chaves, self.ids, self.recentes = chaves, ids, {}
+
+    def memoria_bytes(self):
+        return (self.chaves.itemsize * len(self.chaves) + self.ids.itemsize * len(self.ids) + sys.getsizeof(self.recentes))
+
+class IndiceUnicidade:
+    """
+    Índice de CPFs/e-mails em uso (alunos ativos e arquivados). dono_cpf()/dono_email()/verificar()
+    só consultam a memória; sincronizar() (ou sincronizar_em_segundo_plano()) acompanha as tabelas.
+    """
+
+    def __init__(self, verificar_apos_s):
+        self.verificar_apos_s = verificar_apos_s
+        self._trava = threading.Lock() # Protege as estruturas; nunca fica presa durante consultas ao banco
+        self._sincronizando = threading.Lock() # Um thread sincroniza por vez
+        self._cpfs = _Colecao(); self._emails = _Colecao()
+        self._cpfs_arquivo = _Colecao(); self._emails_arquivo = _Colecao() # Só base: mudam apenas na recarga completa
+        self._alterados = {} # id -> (chave_cpf, chave_email) das linhas alteradas/inseridas depois da base
+        self._excluidos = set()
+        self._versao = None # (contagem, max_id, max_atualizado_em) da última sincronização
+        self._versao_arquivo = None # (contagem, max_id) de alunos_arquivo, ou None sem a tabela
+        self._exclusoes_locais = 0 # Exclusões informadas pela aplicação desde a última sincronização
+        self._verificado_em = 0.0; self._carregado_em = 0.0
+        self._desatualizado = True
+        self.desativado_motivo = None
+        self.metricas = {"consultas": 0, "duplicados": 0, "verificacoes": 0, "cargas_completas": 0,
+                         "cargas_incrementais": 0, "reconstrucoes": 0, "linhas_buscadas": 0}
+
+    @property
+    def pronto(self):
+        """True depois da primeira carga; antes disso as consultas não acusam nada."""
+        return self._versao is not None
+
+    # --- Consultas (só memória) ---
+    def dono_cpf(self, cpf):
+        chave = chave_cpf(cpf)
+        if chave is None: return None
+        with self._trava: return self._cpfs.dono(chave, self._alterados, self._excluidos)
+
+    def dono_email(self, email):
+        chave = chave_email(email)
+        if chave is None: return None
+        with self._trava: return self._emails.dono(chave, self._alterados, self._excluidos)
+
+    def dono_arquivado_cpf(self, cpf):
+        chave = chave_cpf(cpf)
+        if chave is None: return None
+        with self._trava: return self._cpfs_arquivo.dono(chave, {}, ())
+
+    def dono_arquivado_email(self, email):
+        chave = chave_email(email)
+        if chave is None: return None
+        with self._trava: return self._emails_arquivo.dono(chave, {}, ())
+
+    def verificar(self, cpf=None, email=None, ignorar_id=None):
+        """
+        (True, "") se CPF e e-mail estão livres (ou pertencem a 'ignorar_id', o aluno em edição);
+        senão (False, msg), com as mensagens de db_handler para o erro 1062 e para o aluno arquivado.
+        """
+        self.metricas["consultas"] += 1
+        for rotulo, dono in (("CPF", self.dono_cpf(cpf)), ("Email", self.dono_email(email))):
+            if dono is not None and dono != ignorar_id:
+                self.metricas["duplicados"] += 1
+                if ignorar_id is None: return False, f"Erro: {rotulo} já cadastrado (aluno ID {dono})."
+                return False, f"Erro: {rotulo} já pertence a outro aluno (ID {dono})."
+        for rotulo, dono in (("CPF", self.dono_arquivado_cpf(cpf)), ("Email", self.dono_arquivado_email(email))):
+            if dono is not None and dono != ignorar_id:
+                self.metricas["duplicados"] += 1
+                if ignorar_id is None: return False, f"Erro: {rotulo} já cadastrado (aluno arquivado ID {dono})."
+                return False, f"Erro: {rotulo} já pertence a um aluno arquivado (ID {dono})."
+        return True, ""
+
+    # --- Escritas da própria aplicação (visíveis antes da próxima sincronização) ---
+    def _aplicar(self, id_aluno, cpf_int, email_int):
+        """Registra o estado atual de uma linha nas alterações. Chamar com _trava."""
+        anterior = self._alterados.get(id_aluno)
+        if anterior is not None:
+            for colecao, chave in zip((self._cpfs, self._emails), anterior):
+                if chave is not None and colecao.recentes.get(chave) == id_aluno: del colecao.recentes[chave]
+        self._alterados[id_aluno] = (cpf_int, email_int)
+        self._excluidos.discard(id_aluno)
+        if cpf_int is not None: self._cpfs.recentes[cpf_int] = id_aluno
+        if email_int is not None: self._emails.recentes[email_int] = id_aluno
+
+    def _reconstruir_se_necessario(self):
+        """Chamar com _trava. Custo O(n), pago a cada LIMITE_ALTERACOES alterações."""
+        if len(self._alterados) + len(self._excluidos) < LIMITE_ALTERACOES: return
+        self._cpfs.reconstruir(self._alterados, self._excluidos); self._emails.reconstruir(self._alterados, self._excluidos)
+        self._alterados = {}; self._excluidos = set()
+        self.metricas["reconstrucoes"] += 1
+
+    def registrar(self, id_aluno, cpf, email):
+        """Chamado após cadastrar/atualizar um aluno com sucesso."""
+        with self._trava:
+            self._aplicar(id_aluno, chave_cpf(cpf), chave_email(email)); self._reconstruir_se_necessario()
+
+    def registrar_exclusao(self, ids_alunos):
+        """Chamado após deletar alunos com sucesso (ids que existiam)."""
+        with self._trava:
+            for id_aluno in ids_alunos:
+                if id_aluno in self._excluidos: continue
+                self._excluidos.add(id_aluno); self._exclusoes_locais += 1
+                anterior = self._alterados.pop(id_aluno, None)
+                if anterior is None: continue
+                for colecao, chave in zip((self._cpfs, self._emails), anterior):
+                    if chave is not None and colecao.recentes.get(chave) == id_aluno: del colecao.recentes[chave]
+            self._reconstruir_se_necessario()
+
+    def marcar_desatualizado(self):
+        self._desatualizado = True
+
+    # --- Carga de linhas (id, cpf, email) ---
+    @staticmethod
+    def _montar_colecoes(linhas):
+        """(coleção de CPFs, coleção de e-mails, linhas lidas) a partir de um iterável de (id, cpf, email)."""
+        cpfs, ids_cpf, emails, ids_email = array('q'), array('q'), array('q'), array('q')
+        lidas = 0
+        for id_aluno, cpf, email in linhas:
+            lidas += 1
+            chave = chave_cpf(cpf)
+            if chave is not None: cpfs.append(chave); ids_cpf.append(id_aluno)
+            chave = chave_email(email)
+            if chave is not None: emails.append(chave); ids_email.append(id_aluno)
+        return _Colecao(*_ordenar_pares(cpfs, ids_cpf)), _Colecao(*_ordenar_pares(emails, ids_email)), lidas
+
+    def carregar_linhas(self, linhas, arquivadas=()):
+        """Substitui o conteúdo por 'linhas' (ativos) e 'arquivadas' (iteráveis de (id, cpf, email)). Retorna quantas foram lidas."""
+        colecao_cpfs, colecao_emails, lidas = self._montar_colecoes(linhas)
+        arquivo_cpfs, arquivo_emails, lidas_arquivo = self._montar_colecoes(arquivadas)
+        with self._trava: # Troca de uma vez: consultas nunca veem uma carga pela metade
+            self._cpfs, self._emails = colecao_cpfs, colecao_emails
+            self._cpfs_arquivo, self._emails_arquivo = arquivo_cpfs, arquivo_emails
+            self._alterados = {}; self._excluidos = set(); self._exclusoes_locais = 0
+        return lidas + lidas_arquivo
+
+    def _linhas_do_cursor(self, cursor):
+        while True:
+            lote = cursor.fetchmany(TAMANHO_LOTE_CARGA)
+            if not lote: return
+            self.metricas["linhas_buscadas"] += len(lote)
+            yield from lote
+
+    @staticmethod
+    def _sondar_arquivo(cursor):
+        """Versão (contagem, max_id) de alunos_arquivo, ou None se a tabela não existe."""
+        try:
+            cursor.execute(SQL_VERSAO_ARQUIVO)
+        except mysql.connector.Error as err:
+            if err.errno == 1146: return None # Instalação sem alunos_arquivo (schema.sql anterior ao arquivamento)
+            raise
+        return tuple(cursor.fetchone())
+
+    def _carga_completa(self, cursor, versao_arquivo):
+        inicio = time.perf_counter()
+        arquivadas = []
+        if versao_arquivo is not None: # Lidas antes: o cursor só percorre um resultado por vez
+            cursor.execute(SQL_CARGA_ARQUIVO)
+            arquivadas = list(self._linhas_do_cursor(cursor))
+        cursor.execute(SQL_CARGA)
+        lidas = self.carregar_linhas(self._linhas_do_cursor(cursor), arquivadas)
+        self.metricas["cargas_completas"] += 1; self._carregado_em = time.monotonic()
+        logger.info(f"Índice de unicidade: carga completa de {lidas} aluno(s) ({len(arquivadas)} arquivado(s)) em {time.perf_counter() - inicio:.2f}s "
+                    f"({self.memoria_bytes() / 1024 / 1024:.1f} MiB).")
+
+    def _carga_incremental(self, cursor, versao):
+        """Aplica as linhas alteradas desde a última versão. Retorna False se a contagem não fechar (exclusão externa)."""
+        contagem_anterior, max_id_anterior, max_atualizado = self._versao
+        if max_atualizado is None: return False
+        # ">=" porque várias linhas podem compartilhar o mesmo instante de atualização
+        cursor.execute(SQL_CARGA + " WHERE atualizado_em >= %s", (max_atualizado,))
+        linhas = list(self._linhas_do_cursor(cursor))
+        novos = sum(1 for linha in linhas if max_id_anterior is None or linha[0] > max_id_anterior)
+        with self._trava:
+            if versao[0] != contagem_anterior + novos - self._exclusoes_locais: return False
+            for id_aluno, cpf, email in linhas: self._aplicar(id_aluno, chave_cpf(cpf), chave_email(email))
+            self._exclusoes_locais = 0
+            self._reconstruir_se_necessario()
+        self.metricas["cargas_incrementais"] += 1
+        logger.debug("Índice de unicidade: carga incremental (%s linha(s)).", len(linhas))
+        return True
+
+    def sincronizar(self, forcar=False):
+        """Acompanha a tabela alunos (no máximo a cada verificar_apos_s, salvo após escritas). Retorna False se não puder."""
+        if self.desativado_motivo: return False
+        agora = time.monotonic()
+        if not forcar and not self._desatualizado and self.pronto and agora - self._verificado_em < self.verificar_apos_s: return True
+        if not self._sincronizando.acquire(blocking=False): return self.pronto # Outro thread já está sincronizando
+        try:
+            with db_pool.conexao() as conexao:
+                if not conexao: return False
+                cursor = conexao.cursor()
+                try:
+                    self._desatualizado = False # Antes da sonda: escritas durante a sincronização pedem outra
+                    cursor.execute(SQL_VERSAO)
+                    versao = tuple(cursor.fetchone())
+                    versao_arquivo = self._sondar_arquivo(cursor)
+                    self.metricas["verificacoes"] += 1
+                    if not self.pronto or agora - self._carregado_em > RECARGA_COMPLETA_APOS_S: self._carga_completa(cursor, versao_arquivo)
+                    elif versao_arquivo != self._versao_arquivo:
+                        logger.info("Índice de unicidade: arquivo de alunos alterado; recarregando tudo.")
+                        self._carga_completa(cursor, versao_arquivo)
+                    elif versao != self._versao and not self._carga_incremental(cursor, versao):
+                        logger.info("Índice de unicidade: alunos excluídos fora da aplicação; recarregando tudo.")
+                        self._carga_completa(cursor, versao_arquivo)
+                except mysql.connector.Error as err:
+                    if err.errno == 1054: # Coluna desconhecida: banco sem a migração 002 (atualizado_em)
+                        self.desativado_motivo = "coluna atualizado_em ausente (ver migração 002 em database/schema.sql)"
+                        logger.warning(f"Índice de unicidade desativado: {self.desativado_motivo}.")
+                    else:
+                        logger.error(f"Erro SQL ao sincronizar índice de unicidade: {err}", exc_info=True)
+                    self._desatualizado = True
+                    return False
+                finally:
+                    cursor.close()
+            self._versao = versao; self._versao_arquivo = versao_arquivo; self._verificado_em = agora
+            return True
+        finally:
+            self._sincronizando.release()
+
+    def sincronizar_em_segundo_plano(self):
+        """Dispara sincronizar() num thread daemon (sem ocupar o executor da GUI), se já não houver um rodando."""
+        if self.desativado_motivo or self._sincronizando.locked(): return
+        threading.Thread(target=self.sincronizar, name="indice-unicidade", daemon=True).start()
+
+    def memoria_bytes(self):
+        """Memória das estruturas do índice (arrays + dicts de alterações), sem contar os objetos int dos dicts."""
+        with self._trava:
+            return (self._cpfs.memoria_bytes() + self._emails.memoria_bytes()
+                    + self._cpfs_arquivo.memoria_bytes() + self._emails_arquivo.memoria_bytes()
+                    + sys.getsizeof(self._alterados) + sys.getsizeof(self._excluidos))
+
+    def estatisticas(self):
+        return dict(self.metricas, chaves_cpf=len(self._cpfs.chaves) + len(self._cpfs.recentes),
+                    chaves_email=len(self._emails.chaves) + len(self._emails.recentes),
+                    chaves_arquivadas=len(self._cpfs_arquivo.chaves) + len(self._emails_arquivo.chaves),
+                    alteracoes_pendentes=len(self._alterados) + len(self._excluidos),
+                    memoria_bytes=self.memoria_bytes(), desativado=self.desativado_motivo)
+
+# --- Índice global da aplicação (criado sob demanda a partir do db_config) ---
+_indice = None
+_indice_lock = threading.Lock()
+
+def obter_indice():
+    """Retorna o índice global, ou None se desativado (INDICE_UNICIDADE_ATIVO=0) ou fora do backend MySQL."""
+    global _indice
+    if not db_config.INDICE_UNICIDADE_ATIVO or db_config.DB_BACKEND != "mysql": return None
+    if _indice is None:
+        with _indice_lock:
+            if _indice is None: _indice = IndiceUnicidade(db_config.INDICE_UNICIDADE_VERIFICAR_APOS)
+    return _indice
+
+def registrar(id_aluno, cpf, email):
+    if _indice is not None: _indice.registrar(id_aluno, cpf, email); _indice.marcar_desatualizado()
+
+def registrar_exclusao(ids_alunos):
+    if _indice is not None: _indice.registrar_exclusao(ids_alunos); _indice.marcar_desatualizado()
+
+def marcar_desatualizado():
+    if _indice is not None: _indice.marcar_desatualizado()
+
+def estatisticas():
+    return _indice.estatisticas() if _indice is not None else {}
@@ -0,0 +1,154 @@
+# database/instrucoes.py
+import time
+import threading
+import logging
+from collections import OrderedDict, namedtuple
+import mysql.connector
+from . import db_config
+from utils import instrumentacao
+
+logger = logging.getLogger(__name__)
+
+# Camada de instruções do db_handler. Cada "forma" de consulta (ex.: listagem filtrada por CPF
+# exato, ordenada por nome ASC) tem um texto SQL fixo; com DB_PREPARED_STATEMENTS=1 ela é
+# preparada uma única vez por conexão do pool (MySQLCursorPrepared) e reexecutada só com novos
+# parâmetros. Leituras grandes usam um cursor sem buffer (transmitir), que traz as linhas do
+# servidor em lotes em vez de materializar o resultado inteiro no cliente.
+
+MAX_PREPARADAS_POR_CONEXAO = 64 # Acima disso a instrução menos usada é desalocada no servidor
+ERROS_INSTRUCAO_PERDIDA = (1243,) # Unknown prepared statement handler: servidor esqueceu o preparo
+
+Resultado = namedtuple("Resultado", "linhas rowcount lastrowid")
+
+class _MetricasForma:
+    """Tempos de uma forma de instrução. Preparo = primeira execução na conexão (parse + plano + execução)."""
+    __slots__ = ("preparos", "s_preparo", "execucoes", "s_execucao", "max_execucao", "linhas")
+
+    def __init__(self):
+        self.preparos = 0; self.s_preparo = 0.0
+        self.execucoes = 0; self.s_execucao = 0.0; self.max_execucao = 0.0
+        self.linhas = 0
+
+    def resumo(self):
+        media_execucao = self.s_execucao / self.execucoes if self.execucoes else 0.0
+        media_preparo = self.s_preparo / self.preparos if self.preparos else 0.0
+        return {"preparos": self.preparos, "ms_preparo_medio": round(media_preparo * 1000, 3),
+                "execucoes": self.execucoes, "ms_execucao_medio": round(media_execucao * 1000, 3),
+                "ms_execucao_max": round(self.max_execucao * 1000, 3), "linhas": self.linhas,
+                # Custo estimado de parse/plano: quanto a 1ª execução custa a mais que as seguintes
+                "ms_parse_estimado": round(max(0.0, media_preparo - media_execucao) * 1000, 3) if self.execucoes else None}
+
+_metricas = {}
+_metricas_lock = threading.Lock()
+
+def _registrar(forma, segundos, preparo, linhas):
+    with _metricas_lock:
+        metricas = _metricas.get(forma)
+        if metricas is None: metricas = _metricas[forma] = _MetricasForma()
+        if preparo: metricas.preparos += 1; metricas.s_preparo += segundos
+        else:
+            metricas.execucoes += 1; metricas.s_execucao += segundos
+            if segundos > metricas.max_execucao: metricas.max_execucao = segundos
+        metricas.linhas += linhas
+
+def _cursores_preparados(conexao):
+    """Cursores preparados desta conexão (sql -> cursor), do menos ao mais usado recentemente."""
+    cache = getattr(conexao, "_instrucoes_preparadas", None)
+    if cache is None:
+        cache = OrderedDict()
+        conexao._instrucoes_preparadas = cache # Vive e morre com a conexão física do pool
+    return cache
+
+def _fechar_cursor(cursor):
+    try: cursor.close() # Em cursores preparados, também desaloca a instrução no servidor
+    except Exception: pass # noqa - conexão pode já estar quebrada
+
+def _cursor_preparado(conexao, sql):
+    """Retorna (cursor, novo). 'novo' indica que a próxima execução inclui o preparo."""
+    cache = _cursores_preparados(conexao)
+    cursor = cache.get(sql)
+    if cursor is not None:
+        cache.move_to_end(sql)
+        return cursor, False
+    cursor = conexao.cursor(prepared=True)
+    cache[sql] = cursor
+    while len(cache) > MAX_PREPARADAS_POR_CONEXAO: _fechar_cursor(cache.popitem(last=False)[1])
+    return cursor, True
+
+def _executar_cursor(cursor, forma, sql, params, buscar):
+    params = tuple(params)
+    detalhe = lambda: f"forma={forma}, {len(params)} parâmetro(s)" # Só formatado se a operação for lenta
+    with instrumentacao.Medir("bd.executar", detalhe): cursor.execute(sql, params)
+    if not buscar: return Resultado(None, cursor.rowcount, cursor.lastrowid)
+    with instrumentacao.Medir("bd.buscar", detalhe): linhas = cursor.fetchall() # Consome tudo: o cursor será reutilizado
+    return Resultado(linhas, cursor.rowcount, cursor.lastrowid)
+
+def executar(conexao, forma, sql, params=(), buscar=False):
+    """
+    Executa 'sql' (forma identificada por 'forma', para as métricas) e retorna
+    Resultado(linhas, rowcount, lastrowid); linhas só é preenchido com buscar=True.
+    Erros do MySQL são propagados para o tratamento habitual do chamador.
+    """
+    if not db_config.DB_PREPARED_STATEMENTS:
+        cursor = conexao.cursor()
+        inicio = time.perf_counter()
+        try:
+            resultado = _executar_cursor(cursor, forma, sql, params, buscar)
+        finally:
+            cursor.close()
+        _registrar(forma, time.perf_counter() - inicio, False, len(resultado.linhas or ()))
+        return resultado
+
+    cursor, novo = _cursor_preparado(conexao, sql)
+    inicio = time.perf_counter()
+    try:
+        resultado = _executar_cursor(cursor, forma, sql, params, buscar)
+    except mysql.connector.Error as err:
+        _cursores_preparados(conexao).pop(sql, None); _fechar_cursor(cursor)
+        if err.errno not in ERROS_INSTRUCAO_PERDIDA: raise
+        logger.warning(f"Instrução preparada '{forma}' perdida no servidor; preparando novamente.")
+        cursor, novo = _cursor_preparado(conexao, sql)
+        inicio = time.perf_counter()
+        resultado = _executar_cursor(cursor, forma, sql, params, buscar)
+    _registrar(forma, time.perf_counter() - inicio, novo, len(resultado.linhas or ()))
+    return resultado
+
+def transmitir(conexao, forma, sql, params=(), tamanho_lote=1000):
+    """
+    Gera lotes de linhas (fetchmany) de um cursor sem buffer: o resultado vem do servidor aos
+    poucos e a memória fica limitada a um lote. O gerador deve ser consumido até o fim ou
+    fechado; em caso de interrupção o restante do resultado é descartado.
+    """
+    cursor = conexao.cursor(buffered=False)
+    inicio = time.perf_counter(); total = 0
+    detalhe = lambda: f"forma={forma}, {len(params)} parâmetro(s), {total} linha(s) até aqui"
+    try:
+        with instrumentacao.Medir("bd.executar", detalhe): cursor.execute(sql, tuple(params))
+        while True:
+            with instrumentacao.Medir("bd.buscar", detalhe): lote = cursor.fetchmany(tamanho_lote)
+            if not lote: break
+            total += len(lote)
+            yield lote
+    finally:
+        try:
+            if conexao.unread_result: conexao.consume_results() # Interrompido no meio: libera a conexão
+        except mysql.connector.Error as err:
+            logger.warning(f"Falha ao descartar o restante do resultado de '{forma}': {err}")
+        cursor.close()
+        _registrar(forma, time.perf_counter() - inicio, False, total)
+
+def confirmar(conexao):
+    """conexao.commit() medido como 'bd.commit'."""
+    with instrumentacao.Medir("bd.commit"): conexao.commit()
+
+def estatisticas():
+    """Métricas por forma de instrução: preparos, execuções, tempos médios e parse estimado."""
+    with _metricas_lock:
+        return {forma: metricas.resumo() for forma, metricas in sorted(_metricas.items())}
+
+def relatorio():
+    """Linhas de texto com as métricas por forma, das mais caras às mais baratas (para o log)."""
+    itens = sorted(estatisticas().items(), key=lambda item: item[1]["execucoes"] * item[1]["ms_execucao_medio"], reverse=True)
+    return [f"{forma}: {m['execucoes']} exec. ({m['ms_execucao_medio']} ms méd., {m['ms_execucao_max']} ms máx.), "
+            f"{m['preparos']} preparo(s) ({m['ms_preparo_medio']} ms méd., parse ~{m['ms_parse_estimado']} ms)"
+            for forma, m in itens]
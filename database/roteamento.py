@@ -0,0 +1,191 @@
+# database/roteamento.py
+import itertools
+import threading
+import time
+import logging
+from contextlib import contextmanager
+import mysql.connector
+from . import db_config
+from . import db_pool
+from utils import instrumentacao
+
+logger = logging.getLogger(__name__)
+
+# Separação leitura/escrita: escritas sempre no primário (db_pool); leituras do db_handler vão
+# para as réplicas de DB_REPLICAS em rodízio. Cada réplica tem o próprio pool e é verificada a
+# cada DB_REPLICA_CHECK_INTERVAL segundos (conexão + atraso da replicação). Réplicas fora do ar,
+# com replicação parada ou atrasadas mais que DB_REPLICA_MAX_LAG ficam de fora até a próxima
+# verificação; sem nenhuma disponível, a leitura cai no primário. Depois de uma escrita, as
+# leituras ficam no primário por DB_READ_YOUR_WRITES segundos, para quem acabou de salvar um
+# aluno vê-lo na lista mesmo que a réplica ainda não o tenha recebido.
+
+SQL_STATUS_REPLICA = ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS") # MySQL 8.0.22+ / versões anteriores
+COLUNAS_ATRASO = ("Seconds_Behind_Source", "Seconds_Behind_Master")
+ERRNO_SINTAXE = 1064
+
+def medir_atraso(conexao):
+    """
+    Atraso da replicação em segundos: 0 se a instância não replica de ninguém (ex.: segunda
+    instância local de teste); None se a replicação estiver parada (SQL/IO thread fora).
+    """
+    cursor = conexao.cursor(dictionary=True)
+    try:
+        linhas = []
+        for sql in SQL_STATUS_REPLICA:
+            try:
+                cursor.execute(sql); linhas = cursor.fetchall(); break
+            except mysql.connector.Error as err:
+                if err.errno != ERRNO_SINTAXE: raise # Servidor antigo: tenta a forma anterior
+        if not linhas: return 0
+        for coluna in COLUNAS_ATRASO:
+            if coluna in linhas[0]: return linhas[0][coluna]
+        return None
+    finally:
+        cursor.close()
+
+class Replica:
+    """Réplica de leitura: pool próprio e o resultado da última verificação de saúde."""
+
+    def __init__(self, host, porta, pool):
+        self.rotulo = f"{host}:{porta}"
+        self.pool = pool
+        self.disponivel = True # Otimista até a primeira verificação (feita no primeiro uso)
+        self.atraso_s = None
+        self.motivo = ""
+        self.verificada_em = None
+        self.leituras = 0
+        self._verificando = threading.Lock()
+
+class RoteadorLeituras:
+    """Escolhe onde cada leitura roda: réplica disponível (rodízio) ou primário."""
+
+    def __init__(self, replicas, atraso_max_s, verificar_apos_s, janela_escrita_s):
+        self.replicas = replicas
+        self.atraso_max_s = atraso_max_s
+        self.verificar_apos_s = verificar_apos_s
+        self.janela_escrita_s = janela_escrita_s
+        self._rodizio = itertools.count()
+        self._ultima_escrita = None # time.monotonic() da última escrita confirmada no primário
+        self._lock = threading.Lock()
+        self._stats = {"leituras_replica": 0, "primario_escrita_recente": 0, "primario_sem_replica": 0, "falhas_replica": 0}
+
+    def _contar(self, chave):
+        with self._lock: self._stats[chave] += 1
+
+    def marcar_escrita(self):
+        """Chamado após cada commit no primário: inicia a janela de leitura das próprias escritas."""
+        self._ultima_escrita = time.monotonic()
+
+    def _escrita_recente(self, agora):
+        return self._ultima_escrita is not None and agora - self._ultima_escrita < self.janela_escrita_s
+
+    def _verificar(self, replica):
+        """Testa conexão e atraso da réplica. Só um thread verifica por vez; os demais usam o último resultado."""
+        if not replica._verificando.acquire(blocking=False): return
+        try:
+            atraso, motivo = None, ""
+            with instrumentacao.Medir("bd.verificar_replica", replica.rotulo):
+                try:
+                    with replica.pool.conexao() as conexao:
+                        if conexao is None: motivo = "sem conexão"
+                        else: atraso = medir_atraso(conexao)
+                except mysql.connector.Error as err:
+                    motivo = f"erro ao consultar o status ({err})"
+            if not motivo and atraso is None: motivo = "replicação parada"
+            elif not motivo and atraso > self.atraso_max_s: motivo = f"atraso de {atraso}s (máximo {self.atraso_max_s}s)"
+            disponivel = not motivo
+            if disponivel != replica.disponivel:
+                if disponivel: logger.info(f"Réplica {replica.rotulo} voltou a receber leituras (atraso {atraso}s).")
+                else: logger.warning(f"Réplica {replica.rotulo} fora do rodízio de leituras: {motivo}.")
+            replica.disponivel, replica.atraso_s, replica.motivo = disponivel, atraso, motivo
+            replica.verificada_em = time.monotonic()
+        finally:
+            replica._verificando.release()
+
+    def escolher(self):
+        """Próxima réplica disponível no rodízio, ou None para ler do primário."""
+        if not self.replicas: return None
+        agora = time.monotonic()
+        if self._escrita_recente(agora): self._contar("primario_escrita_recente"); return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._rodizio) % len(self.replicas)]
+            if replica.verificada_em is None or agora - replica.verificada_em >= self.verificar_apos_s:
+                self._verificar(replica)
+            if replica.disponivel: return replica
+        self._contar("primario_sem_replica")
+        return None
+
+    @contextmanager
+    def conexao(self):
+        """Como db_pool.conexao(), mas para leituras: réplica quando possível, senão o primário."""
+        replica = self.escolher()
+        if replica is not None:
+            with replica.pool.conexao() as conexao:
+                if conexao is not None:
+                    replica.leituras += 1; self._contar("leituras_replica")
+                    try:
+                        yield conexao
+                    except mysql.connector.Error:
+                        replica.verificada_em = None # Força nova verificação na próxima leitura
+                        raise
+                    return
+            # Sem conexão com a réplica: tira do rodízio até a próxima verificação e lê do primário
+            replica.disponivel, replica.motivo, replica.verificada_em = False, "sem conexão", time.monotonic()
+            self._contar("falhas_replica")
+            logger.warning(f"Réplica {replica.rotulo} indisponível; leitura redirecionada ao primário.")
+        with db_pool.conexao() as conexao:
+            yield conexao
+
+    def aquecer(self):
+        """Verifica todas as réplicas (abrindo a primeira conexão de cada). Retorna quantas estão disponíveis."""
+        for replica in self.replicas: self._verificar(replica)
+        return sum(1 for replica in self.replicas if replica.disponivel)
+
+    def estatisticas(self):
+        with self._lock: stats = dict(self._stats)
+        stats["replicas"] = {replica.rotulo: {"disponivel": replica.disponivel, "atraso_s": replica.atraso_s,
+                                              "motivo": replica.motivo, "leituras": replica.leituras}
+                             for replica in self.replicas}
+        return stats
+
+    def fechar(self):
+        for replica in self.replicas: replica.pool.fechar()
+
+# --- Roteador global da aplicação (criado sob demanda a partir do db_config) ---
+_roteador = None
+_roteador_lock = threading.Lock()
+
+def _criar_roteador():
+    replicas = []
+    for host, porta in db_config.DB_REPLICAS:
+        rotulo = f"{db_config.DB_NAME}@{host}:{porta}"
+        pool = db_pool.PoolConexoes(db_config.DB_REPLICA_POOL_SIZE, db_config.DB_POOL_TIMEOUT, db_config.DB_POOL_RECYCLE,
+                                    db_config.DB_POOL_PING_AFTER, fabrica=lambda h=host, p=porta: db_pool.criar_conexao(h, p), rotulo=rotulo)
+        replicas.append(Replica(host, porta, pool))
+    return RoteadorLeituras(replicas, db_config.DB_REPLICA_MAX_LAG, db_config.DB_REPLICA_CHECK_INTERVAL, db_config.DB_READ_YOUR_WRITES)
+
+def obter_roteador():
+    global _roteador
+    if _roteador is None:
+        with _roteador_lock:
+            if _roteador is None: _roteador = _criar_roteador()
+    return _roteador
+
+def conexao_leitura():
+    """Conexão para consultas (réplica ou primário). Sem réplicas configuradas, é o próprio db_pool.conexao()."""
+    if not db_config.DB_REPLICAS: return db_pool.conexao()
+    return obter_roteador().conexao()
+
+def marcar_escrita():
+    if db_config.DB_REPLICAS: obter_roteador().marcar_escrita()
+
+def aquecer():
+    return obter_roteador().aquecer() if db_config.DB_REPLICAS else 0
+
+def estatisticas():
+    return obter_roteador().estatisticas() if db_config.DB_REPLICAS else {}
+
+def fechar():
+    global _roteador
+    with _roteador_lock:
+        if _roteador is not None: _roteador.fechar(); _roteador = None
@@ -2,19 +2,102 @@ CREATE DATABASE IF NOT EXISTS facsenac DEFAULT CHARACTER SET utf8mb4 COLLATE utf
 
 USE facsenac;
 
+-- O índice FULLTEXT ngram precisa ser criado sem stopwords: com a lista padrão, qualquer
+-- token que contenha "a", "de", "la"... é descartado, o que inutiliza a busca por nomes.
+SET SESSION innodb_ft_enable_stopword = OFF;
+
 CREATE TABLE IF NOT EXISTS alunos (
     id INT AUTO_INCREMENT PRIMARY KEY,
     nome VARCHAR(100) NOT NULL,
     sobrenome VARCHAR(100) NOT NULL,
     telefone VARCHAR(20),
     email VARCHAR(100) UNIQUE,
-    cpf VARCHAR(14) UNIQUE,     
-    data_nascimento DATE,        
+    cpf VARCHAR(14) UNIQUE,
+    data_nascimento DATE,
     cidade VARCHAR(100) DEFAULT 'Brasília',
     uf VARCHAR(2) DEFAULT 'DF',
-    curso ENUM('ADS', 'GTI', 'CD', 'IA', 'BI', 'SI') NOT NULL
+    curso ENUM('ADS', 'GTI', 'CD', 'IA', 'BI', 'SI') NOT NULL,
+    -- Instante da última escrita; usado pelo cache local (database/cache_alunos.py) para buscar só o que mudou
+    atualizado_em TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    -- Apenas os dígitos do CPF, para buscas exatas/prefixo por índice independentemente da máscara
+    cpf_digitos CHAR(11) AS (REPLACE(REPLACE(cpf, '.', ''), '-', '')) STORED,
+    UNIQUE INDEX idx_alunos_cpf_digitos (cpf_digitos),
+    INDEX idx_alunos_nome_sobrenome (nome, sobrenome),
+    INDEX idx_alunos_sobrenome_nome (sobrenome, nome),
+    INDEX idx_alunos_cidade (cidade),
+    INDEX idx_alunos_uf (uf),
+    INDEX idx_alunos_curso (curso),
+    INDEX idx_alunos_data_nascimento (data_nascimento),
+    INDEX idx_alunos_atualizado_em (atualizado_em),
+    FULLTEXT INDEX ft_alunos_nome_completo (nome, sobrenome) WITH PARSER ngram
+);
+
+-- Arquivo de alunos inativos (ver database/arquivamento.py): mesmas colunas de alunos, particionado
+-- pelo ano da última alteração (ano_referencia), para que cada ano arquivado fique num bloco à parte.
+-- O id é mantido ao arquivar. Em tabela particionada toda chave única precisa incluir a coluna de
+-- partição, então o banco só garante CPF/email únicos entre os ativos: o cadastro/atualização confere
+-- o arquivo antes de gravar (db_handler.SQL_CONFLITO_ARQUIVO), e a importação/sincronização, por lote
+-- (db_handler.SQL_CONFLITOS_ARQUIVO_LOTE). Também não há FULLTEXT (a busca
+-- "Nome completo" usa prefixo do nome no arquivo). Anos novos caem em p_futuro; para separá-los:
+-- ALTER TABLE alunos_arquivo REORGANIZE PARTITION p_futuro INTO
+--     (PARTITION p2027 VALUES LESS THAN (2028), PARTITION p_futuro VALUES LESS THAN MAXVALUE);
+CREATE TABLE IF NOT EXISTS alunos_arquivo (
+    id INT NOT NULL,
+    nome VARCHAR(100) NOT NULL,
+    sobrenome VARCHAR(100) NOT NULL,
+    telefone VARCHAR(20),
+    email VARCHAR(100),
+    cpf VARCHAR(14),
+    data_nascimento DATE,
+    cidade VARCHAR(100),
+    uf VARCHAR(2),
+    curso ENUM('ADS', 'GTI', 'CD', 'IA', 'BI', 'SI') NOT NULL,
+    atualizado_em TIMESTAMP(6) NOT NULL,
+    arquivado_em TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ano_referencia SMALLINT NOT NULL,
+    cpf_digitos CHAR(11) AS (REPLACE(REPLACE(cpf, '.', ''), '-', '')) STORED,
+    PRIMARY KEY (id, ano_referencia),
+    INDEX idx_arquivo_id (id),
+    INDEX idx_arquivo_cpf_digitos (cpf_digitos),
+    INDEX idx_arquivo_email (email),
+    INDEX idx_arquivo_nome_sobrenome (nome, sobrenome),
+    INDEX idx_arquivo_sobrenome_nome (sobrenome, nome),
+    INDEX idx_arquivo_cidade (cidade),
+    INDEX idx_arquivo_uf (uf),
+    INDEX idx_arquivo_curso (curso),
+    INDEX idx_arquivo_data_nascimento (data_nascimento)
+) PARTITION BY RANGE (ano_referencia) (
+    PARTITION p_antigos VALUES LESS THAN (2020),
+    PARTITION p2020 VALUES LESS THAN (2021),
+    PARTITION p2021 VALUES LESS THAN (2022),
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION p_futuro VALUES LESS THAN MAXVALUE
 );
 
+-- Migração 001 (busca indexada): executar UMA vez em bancos criados antes da coluna cpf_digitos.
+-- Lembre-se do "SET SESSION innodb_ft_enable_stopword = OFF;" acima antes do FULLTEXT.
+-- ALTER TABLE alunos
+--     ADD COLUMN cpf_digitos CHAR(11) AS (REPLACE(REPLACE(cpf, '.', ''), '-', '')) STORED,
+--     ADD UNIQUE INDEX idx_alunos_cpf_digitos (cpf_digitos),
+--     ADD INDEX idx_alunos_nome_sobrenome (nome, sobrenome),
+--     ADD INDEX idx_alunos_sobrenome_nome (sobrenome, nome),
+--     ADD INDEX idx_alunos_cidade (cidade),
+--     ADD INDEX idx_alunos_uf (uf),
+--     ADD INDEX idx_alunos_curso (curso),
+--     ADD INDEX idx_alunos_data_nascimento (data_nascimento);
+-- ALTER TABLE alunos ADD FULLTEXT INDEX ft_alunos_nome_completo (nome, sobrenome) WITH PARSER ngram;
+-- Depois, confira os planos com: python -m database.busca
+
+-- Migração 002 (cache local de alunos): executar UMA vez em bancos criados antes da coluna atualizado_em.
+-- Sem ela o cache se desativa sozinho e todas as consultas vão ao servidor.
+-- ALTER TABLE alunos
+--     ADD COLUMN atualizado_em TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+--     ADD INDEX idx_alunos_atualizado_em (atualizado_em);
+
 -- Inserir alguns dados de exemplo:
 -- INSERT INTO alunos (nome, sobrenome, telefone, email, cpf, data_nascimento, cidade, uf, curso) VALUES
 -- ('Ana', 'Silva', '61999998888', 'ana.silva@email.com', '111.222.333-44', '2000-10-15', 'Brasília', 'DF', 'ADS'),
@@ -0,0 +1,262 @@
+# database/sincronizador.py
+import csv
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import date
+import mysql.connector
+from . import db_pool
+from . import db_handler
+from . import instrucoes
+from . import cache_alunos
+from . import indice_unicidade
+from . import roteamento
+from . import importador_csv
+from utils import validators
+
+logger = logging.getLogger(__name__)
+
+# Re-sincronização de alunos a partir de uma lista externa (CSV ';' no layout da exportação).
+# Cada linha é casada com o aluno existente pela chave (CPF ou e-mail): alunos novos são
+# inseridos, os alterados são atualizados e os idênticos ficam como estão, tudo com
+# INSERT ... ON DUPLICATE KEY UPDATE em lotes. Antes de escrever, os alunos existentes são
+# lidos uma única vez (streaming) para um índice em memória chave -> (id, dados), de onde sai
+# o diff novo / alterado / inalterado; no modo simulação só o diff é calculado. Linhas com
+# CPF/e-mail de aluno arquivado (que a UNIQUE de alunos não vê) saem do diff como conflito.
+
+CHAVES_SINCRONIZACAO = ("cpf", "email")
+TAMANHO_LOTE_PADRAO = 1000
+CAMPOS_DADOS = ("nome", "sobrenome", "telefone", "email", "cpf", "data_nascimento", "cidade", "uf", "curso")
+_INDICE_CAMPO = {campo: i for i, campo in enumerate(CAMPOS_DADOS)}
+SQL_LER_EXISTENTES = f"SELECT id, {', '.join(CAMPOS_DADOS)} FROM alunos"
+# VALUES(col) em vez do alias "AS novo" (MySQL 8.0.19+) para funcionar também em versões/MariaDB mais antigas
+SQL_UPSERT = importador_csv.SQL_INSERIR_ALUNO.rstrip() + "\n    ON DUPLICATE KEY UPDATE " + \
+             ", ".join(f"{campo} = VALUES({campo})" for campo in CAMPOS_DADOS)
+CABECALHOS_RELATORIO = ("Linha", "Situação", "Chave", "ID", "Campos alterados / Motivo")
+_ROTULOS_CHAVE = {"cpf": "CPF", "email": "E-mail"}
+
+def _normalizar_chave(campo, valor):
+    """A coluna tem collation case-insensitive: e-mails que só diferem em maiúsculas são o mesmo aluno."""
+    if not valor: return None
+    return valor.lower() if campo == "email" else valor
+
+def _linha_do_banco(linha):
+    """Linha lida do banco -> (id, dados) no mesmo formato das tuplas de inserção (data AAAA-MM-DD)."""
+    id_aluno, *dados = linha
+    dados[_INDICE_CAMPO["data_nascimento"]] = dados[_INDICE_CAMPO["data_nascimento"]].isoformat() if dados[_INDICE_CAMPO["data_nascimento"]] else None
+    return id_aluno, tuple(dados)
+
+class IndiceAlunos:
+    """
+    Índice em memória dos alunos existentes pela chave de sincronização (dict = tabela hash),
+    mais o dono de cada valor da outra coluna única, para detectar conflitos: ON DUPLICATE KEY
+    dispara em QUALQUER índice único, então um e-mail de outro aluno atualizaria o aluno errado.
+    """
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.outra = "email" if chave == "cpf" else "cpf"
+        self.por_chave = {} # chave normalizada -> (id, dados)
+        self.dono_outra = {} # valor normalizado da outra coluna única -> (chave normalizada, id) do aluno; chave None se ele não tiver
+
+    def carregar(self, conexao, tamanho_lote=TAMANHO_LOTE_PADRAO):
+        i_chave = _INDICE_CAMPO[self.chave]; i_outra = _INDICE_CAMPO[self.outra]
+        for linhas in instrucoes.transmitir(conexao, "sincronizar_indice", SQL_LER_EXISTENTES, (), tamanho_lote):
+            for linha in linhas:
+                id_aluno, dados = _linha_do_banco(linha)
+                chave = _normalizar_chave(self.chave, dados[i_chave])
+                if chave is not None: self.por_chave[chave] = (id_aluno, dados) # Sem a chave, nunca casa com a lista externa...
+                outra = _normalizar_chave(self.outra, dados[i_outra])
+                if outra: self.dono_outra[outra] = (chave, id_aluno) # ...mas a outra coluna única continua sendo dele
+        logger.info(f"Índice de sincronização carregado: {len(self.por_chave)} aluno(s) por {self.chave}.")
+        return self
+
+    def chaves(self, dados):
+        """Valores únicos da linha (chave e outra coluna), marcados pela coluna, para detectar linhas dependentes."""
+        chave = _normalizar_chave(self.chave, dados[_INDICE_CAMPO[self.chave]])
+        outra = _normalizar_chave(self.outra, dados[_INDICE_CAMPO[self.outra]])
+        return {(self.chave, chave), (self.outra, outra)} if outra else {(self.chave, chave)}
+
+    def classificar(self, dados):
+        """
+        Retorna (situacao, id_existente, detalhe): situacao é 'novo', 'alterado', 'inalterado'
+        ou 'conflito'; detalhe lista os campos alterados ou o motivo do conflito.
+        """
+        chave = _normalizar_chave(self.chave, dados[_INDICE_CAMPO[self.chave]])
+        outra = _normalizar_chave(self.outra, dados[_INDICE_CAMPO[self.outra]])
+        chave_dono, id_dono = self.dono_outra.get(outra, (chave, None)) if outra else (chave, None)
+        if chave_dono != chave:
+            dono = f"ID {id_dono}" if id_dono is not None else "linha anterior do arquivo"
+            return "conflito", id_dono, f"{_ROTULOS_CHAVE[self.outra]} já pertence a outro aluno ({dono})."
+        existente = self.por_chave.get(chave)
+        if existente is None: return "novo", None, ""
+        id_aluno, dados_atuais = existente
+        alterados = [campo for campo, atual, novo in zip(CAMPOS_DADOS, dados_atuais, dados) if atual != novo]
+        if not alterados: return "inalterado", id_aluno, ""
+        return "alterado", id_aluno, ", ".join(alterados)
+
+    def registrar(self, dados, id_aluno=None):
+        """Atualiza o índice após aceitar uma linha (linhas repetidas no arquivo viram 'alterado'/'inalterado')."""
+        chave = _normalizar_chave(self.chave, dados[_INDICE_CAMPO[self.chave]])
+        anterior = self.por_chave.get(chave)
+        if anterior:
+            outra_anterior = _normalizar_chave(self.outra, anterior[1][_INDICE_CAMPO[self.outra]])
+            if outra_anterior and self.dono_outra.get(outra_anterior, (None,))[0] == chave: del self.dono_outra[outra_anterior]
+        id_aluno = id_aluno if id_aluno is not None else (anterior[0] if anterior else None)
+        self.por_chave[chave] = (id_aluno, dados)
+        outra = _normalizar_chave(self.outra, dados[_INDICE_CAMPO[self.outra]])
+        if outra: self.dono_outra[outra] = (chave, id_aluno)
+
+def _aplicar_lote(conexao, lote):
+    """
+    Grava [(numero_linha, dados, valores)] com INSERT ... ON DUPLICATE KEY UPDATE (executemany vira
+    um INSERT de várias linhas) em uma transação. ON DUPLICATE KEY não enxerga alunos_arquivo: as
+    linhas com CPF/email de aluno arquivado são recusadas antes, na mesma transação. Se o lote falhar,
+    refaz linha a linha para identificar as rejeitadas. Retorna (gravadas, [(numero_linha, valores, erro)]).
+    """
+    cursor = conexao.cursor()
+    try:
+        try:
+            validos, rejeitadas = importador_csv.separar_arquivados(conexao, lote)
+            if validos: cursor.executemany(SQL_UPSERT, [dados for _, dados, _ in validos])
+            conexao.commit(); cache_alunos.marcar_desatualizado(); indice_unicidade.marcar_desatualizado(); roteamento.marcar_escrita()
+            return len(validos), rejeitadas
+        except mysql.connector.Error as err:
+            conexao.rollback()
+            if err.errno == 1146: raise
+            logger.info(f"Lote de sincronização com {len(lote)} linhas falhou ({err.msg}); reprocessando linha a linha.")
+        validos, rejeitadas = importador_csv.separar_arquivados(conexao, lote) # O rollback soltou as travas: confere de novo
+        gravadas = 0
+        for numero_linha, dados, valores in validos:
+            try:
+                cursor.execute(SQL_UPSERT, dados)
+                gravadas += 1
+            except mysql.connector.Error as err:
+                rejeitadas.append((numero_linha, valores, importador_csv._mensagem_erro_insercao(err)))
+        conexao.commit(); cache_alunos.marcar_desatualizado(); indice_unicidade.marcar_desatualizado(); roteamento.marcar_escrita()
+        return gravadas, rejeitadas
+    finally:
+        cursor.close()
+
+def sincronizar_csv(caminho_csv, chave="cpf", simular=False, caminho_relatorio=None, tamanho_lote=TAMANHO_LOTE_PADRAO, ao_progresso=None):
+    """
+    Sincroniza os alunos do banco com o CSV, casando pela 'chave' ('cpf' ou 'email').
+    simular=True só calcula o diff, sem escrever. 'caminho_relatorio' (opcional) recebe um CSV
+    com a situação de cada linha não inalterada. Retorna (resumo, msg); resumo é None em falha.
+    """
+    if chave not in CHAVES_SINCRONIZACAO: return None, f"Chave de sincronização inválida '{chave}' (válidas: {', '.join(CHAVES_SINCRONIZACAO)})."
+    logger.info(f"Sincronizando '{caminho_csv}' por {chave} ({'simulação' if simular else 'gravando'}, lote={tamanho_lote}).")
+    resumo = {"lidas": 0, "novos": 0, "alterados": 0, "inalterados": 0, "rejeitadas": 0, "gravadas": 0,
+              "segundos": 0.0, "simulacao": simular, "caminho_relatorio": caminho_relatorio}
+    inicio = time.perf_counter()
+    hoje = date.today()
+    i_chave = _INDICE_CAMPO[chave]
+    arquivo_relatorio = open(caminho_relatorio, 'w', newline='', encoding='utf-8') if caminho_relatorio else None
+    relatorio = csv.writer(arquivo_relatorio, delimiter=importador_csv.DELIMITADOR_CSV) if arquivo_relatorio else None
+    if relatorio: relatorio.writerow(CABECALHOS_RELATORIO)
+
+    def anotar(numero_linha, situacao, dados, id_aluno, detalhe):
+        if relatorio: relatorio.writerow((numero_linha, situacao, dados[i_chave], id_aluno or "", detalhe))
+
+    def rejeitar(numero_linha, valores, erro):
+        resumo["rejeitadas"] += 1
+        if relatorio: relatorio.writerow((numero_linha, "rejeitada", "", "", erro))
+
+    gravar = [] # (numero_linha, dados, valores, situacao, id_aluno, detalhe) aguardando o lote
+    chaves_no_lote = set() # Chave e outra coluna única das linhas em 'gravar'
+
+    try:
+        with open(caminho_csv, newline='', encoding='utf-8-sig') as arquivo, db_pool.conexao() as conexao:
+            if not conexao: return None, "Falha na conexão com o banco de dados."
+            indice = IndiceAlunos(chave).carregar(conexao)
+
+            def gravar_pendentes():
+                """Grava o lote; só as linhas que o banco aceitou contam no resumo e entram no índice."""
+                if not gravar: return
+                recusadas = set()
+                if not simular:
+                    gravadas, rejeitadas = _aplicar_lote(conexao, [(numero_linha, dados, valores) for numero_linha, dados, valores, *_ in gravar])
+                    resumo["gravadas"] += gravadas
+                    for numero_linha, valores, erro in rejeitadas: recusadas.add(numero_linha); rejeitar(numero_linha, valores, erro)
+                for numero_linha, dados, valores, situacao, id_aluno, detalhe in gravar:
+                    if numero_linha in recusadas: continue
+                    resumo["novos" if situacao == "novo" else "alterados"] += 1
+                    anotar(numero_linha, situacao, dados, id_aluno, detalhe)
+                    indice.registrar(dados, id_aluno)
+                gravar.clear(); chaves_no_lote.clear()
+
+            def processar(lote):
+                convertidos = []
+                for numero_linha, registro, valores in lote:
+                    dados, erro = importador_csv.converter_registro(registro)
+                    if dados is None: rejeitar(numero_linha, valores, erro)
+                    elif not dados[i_chave]: rejeitar(numero_linha, valores, f"Sem {chave}: a linha não pode ser casada com um aluno.")
+                    else: convertidos.append((numero_linha, dados, valores))
+                # Dono arquivado de cada CPF/e-mail (ON DUPLICATE KEY não o vê): também na simulação, para o diff não dar "novo"
+                arquivados = db_handler._conflitos_arquivo_lote(conexao, [d for _, d, _ in convertidos]) if convertidos else []
+                for (numero_linha, dados, valores), (valido, erro), arquivado in zip(convertidos, validators.validar_lote([d for _, d, _ in convertidos], hoje), arquivados):
+                    if not valido: rejeitar(numero_linha, valores, erro); continue
+                    chaves_linha = indice.chaves(dados)
+                    # Linha que depende de outra ainda no lote (CPF/e-mail repetido no arquivo): grava o
+                    # lote antes, para que ela seja classificada contra o que o banco de fato aceitou
+                    if not chaves_no_lote.isdisjoint(chaves_linha): gravar_pendentes()
+                    situacao, id_aluno, detalhe = indice.classificar(dados)
+                    if situacao == "conflito": rejeitar(numero_linha, valores, detalhe); continue
+                    if situacao == "inalterado": resumo["inalterados"] += 1; continue
+                    if arquivado: rejeitar(numero_linha, valores, db_handler._msg_conflito_arquivo(arquivado, situacao == "alterado")); continue
+                    gravar.append((numero_linha, dados, valores, situacao, id_aluno, detalhe)); chaves_no_lote.update(chaves_linha)
+                gravar_pendentes()
+                resumo["segundos"] = time.perf_counter() - inicio
+                if ao_progresso: ao_progresso(dict(resumo))
+
+            lote = []
+            for item in importador_csv.ler_linhas_csv(arquivo):
+                lote.append(item); resumo["lidas"] += 1
+                if len(lote) >= tamanho_lote: processar(lote); lote = []
+            if lote: processar(lote)
+    except (IOError, UnicodeDecodeError, csv.Error) as e:
+        logger.error(f"Erro ao ler/gravar arquivos da sincronização: {e}", exc_info=True)
+        return None, f"Erro ao ler o arquivo CSV: {e}"
+    except mysql.connector.Error as err:
+        logger.error(f"Erro SQL durante a sincronização: {err}", exc_info=True)
+        if err.errno == 1146: return None, "Erro: Tabela 'alunos' não existe."
+        return None, f"Erro no BD durante a sincronização: {err.msg}"
+    finally:
+        if arquivo_relatorio: arquivo_relatorio.close()
+
+    resumo["segundos"] = time.perf_counter() - inicio
+    acao = "Simulação" if simular else "Sincronização"
+    msg = (f"{acao} concluída em {resumo['segundos']:.1f}s: {resumo['novos']} novo(s), {resumo['alterados']} alterado(s), "
+           f"{resumo['inalterados']} inalterado(s), {resumo['rejeitadas']} rejeitada(s) de {resumo['lidas']} linha(s)"
+           + ("." if simular else f"; {resumo['gravadas']} gravada(s)."))
+    logger.info(msg)
+    return resumo, msg
+
+def main(argv=None):
+    """Ponto de entrada sem interface gráfica: python -m database.sincronizador lista.csv --chave cpf --simular"""
+    parser = argparse.ArgumentParser(description="Sincroniza os alunos do banco com um CSV ';' (insere novos, atualiza alterados).")
+    parser.add_argument("arquivo", help="CSV no layout da exportação (ID;Nome;Sobrenome;...;Curso); a coluna ID é ignorada")
+    parser.add_argument("--chave", choices=CHAVES_SINCRONIZACAO, default="cpf", help="Coluna que identifica o aluno (padrão: cpf)")
+    parser.add_argument("--simular", action="store_true", help="Só calcula o diff (novo/alterado/inalterado), sem gravar")
+    parser.add_argument("--relatorio", help="CSV de saída com a situação de cada linha (padrão: <arquivo>_sincronizacao.csv)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help=f"Linhas por transação (padrão: {TAMANHO_LOTE_PADRAO})")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    caminho_relatorio = args.relatorio or f"{os.path.splitext(args.arquivo)[0]}_sincronizacao.csv"
+
+    def mostrar_progresso(resumo):
+        print(f"  {resumo['lidas']} lidas: {resumo['novos']} novos, {resumo['alterados']} alterados, "
+              f"{resumo['inalterados']} inalterados, {resumo['rejeitadas']} rejeitadas", file=sys.stderr)
+
+    try:
+        resumo, msg = sincronizar_csv(args.arquivo, args.chave, args.simular, caminho_relatorio, max(1, args.lote), ao_progresso=mostrar_progresso)
+    finally:
+        db_pool.fechar()
+    print(msg)
+    if resumo: print(f"Relatório por linha gravado em: {caminho_relatorio}")
+    return 0 if resumo is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# gui/cache_busca.py
+import time
+import logging
+from collections import OrderedDict
+from database import busca
+
+logger = logging.getLogger(__name__)
+
+CAPACIDADE_CACHE_BUSCA = 32 # Consultas (primeira página) mantidas em memória
+VALIDADE_CACHE_BUSCA_S = 60 # Protege contra escritas feitas por outros clientes do banco
+
+class CacheBuscas:
+    """
+    Cache LRU das primeiras páginas de consulta da tabela, por (campo, termo, coluna, direção).
+    Quando o termo novo estende um termo já em cache cujo resultado veio completo (sem mais
+    páginas), o resultado é obtido filtrando esse superconjunto em memória (busca.predicado_local).
+    Deve ser invalidado a cada escrita no banco feita pela aplicação.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_CACHE_BUSCA, validade_s=VALIDADE_CACHE_BUSCA_S):
+        self.capacidade = capacidade
+        self.validade_s = validade_s
+        self._entradas = OrderedDict() # chave -> (instante, pagina)
+        self.acertos = 0; self.refinamentos = 0; self.faltas = 0
+        self.versao = 0 # Incrementada a cada invalidação; descarta resultados de consultas iniciadas antes dela
+
+    @staticmethod
+    def chave(search_field, search_term, sort_by_column, sort_direction):
+        termo = (search_term or "").strip()
+        if not termo: search_field = None # Sem termo = sem filtro, qualquer que seja o campo
+        return (search_field, busca.normalizar_texto(termo), sort_by_column, sort_direction)
+
+    def _valida(self, chave):
+        entrada = self._entradas.get(chave)
+        if entrada is None: return None
+        instante, pagina = entrada
+        if time.monotonic() - instante > self.validade_s: del self._entradas[chave]; return None
+        return pagina
+
+    def obter(self, search_field, search_term, sort_by_column, sort_direction):
+        """Retorna a página em cache (ou refinada em memória a partir de um superconjunto), ou None."""
+        chave = self.chave(search_field, search_term, sort_by_column, sort_direction)
+        pagina = self._valida(chave)
+        if pagina is not None:
+            self._entradas.move_to_end(chave); self.acertos += 1
+            logger.debug("Cache de busca: acerto para %s.", chave)
+            return pagina
+        pagina = self._refinar(search_field, search_term, sort_by_column, sort_direction)
+        if pagina is not None:
+            self.refinamentos += 1; self.guardar(search_field, search_term, sort_by_column, sort_direction, pagina)
+            return pagina
+        self.faltas += 1
+        return None
+
+    def _refinar(self, search_field, search_term, sort_by_column, sort_direction):
+        predicado = busca.predicado_local(search_field, search_term)
+        if predicado is None: return None
+        # Superconjunto mais específico: maior termo em cache que o termo novo estende
+        # (a lista sem filtro também serve, se estiver completa)
+        candidatas = [c for c in list(self._entradas) if c[2:] == (sort_by_column, sort_direction)
+                      and (c[0] is None or (c[0] == search_field and busca.termo_refina(c[1], search_term)))]
+        for chave in sorted(candidatas, key=lambda c: len(c[1]), reverse=True):
+            superconjunto = self._valida(chave)
+            if superconjunto is None or superconjunto["ha_mais"]: continue # Incompleto: faltariam linhas
+            pares = [(linha, chave_linha) for linha, chave_linha in zip(superconjunto["linhas"], superconjunto["chaves"]) if predicado(linha)]
+            logger.debug("Cache de busca: '%s' refinado em memória a partir de %s (%s de %s linhas).",
+                         search_term, chave, len(pares), len(superconjunto["linhas"]))
+            return {"linhas": [l for l, _ in pares], "chaves": [c for _, c in pares], "ha_mais": False,
+                    "proximo_cursor": None}
+        return None
+
+    def guardar(self, search_field, search_term, sort_by_column, sort_direction, pagina, versao=None):
+        if versao is not None and versao != self.versao: return # Consulta anterior a uma escrita
+        chave = self.chave(search_field, search_term, sort_by_column, sort_direction)
+        self._entradas[chave] = (time.monotonic(), pagina); self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.capacidade: self._entradas.popitem(last=False)
+
+    def invalidar(self):
+        if self._entradas: logger.debug("Cache de busca invalidado (%s consultas descartadas).", len(self._entradas))
+        self._entradas.clear(); self.versao += 1
+
+    def estatisticas(self):
+        return {"entradas": len(self._entradas), "acertos": self.acertos, "refinamentos": self.refinamentos, "faltas": self.faltas}
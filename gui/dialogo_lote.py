@@ -0,0 +1,48 @@
+# gui/dialogo_lote.py
+import tkinter as tk
+from tkinter import ttk, messagebox
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DialogoAlteracaoLote:
+    """
+    Janela modal para alterar curso e/ou cidade/UF de vários alunos selecionados de uma vez.
+    Campos deixados em branco não são alterados. Após fechar, 'resultado' tem o dict
+    {campo: valor} para db_handler.atualizar_campos_alunos_db, ou None se cancelado.
+    """
+
+    def __init__(self, parent, quantidade, opcoes_curso):
+        self.resultado = None
+        self.janela = tk.Toplevel(parent)
+        self.janela.title("Alterar Alunos em Lote")
+        self.janela.transient(parent); self.janela.resizable(False, False)
+        frame = ttk.Frame(self.janela, padding=(15, 10)); frame.pack(fill="both", expand=True)
+        ttk.Label(frame, text=f"{quantidade} aluno(s) selecionado(s). Campos em branco não serão alterados.").grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky="w")
+        ttk.Label(frame, text="Curso:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        self.curso_var = tk.StringVar()
+        ttk.Combobox(frame, textvariable=self.curso_var, values=[""] + list(opcoes_curso), state="readonly", width=27).grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+        ttk.Label(frame, text="Cidade:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.cidade_var = tk.StringVar()
+        self.entry_cidade = ttk.Entry(frame, textvariable=self.cidade_var, width=30); self.entry_cidade.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+        ttk.Label(frame, text="UF:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.uf_var = tk.StringVar()
+        ttk.Entry(frame, textvariable=self.uf_var, width=5).grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        frame_botoes = ttk.Frame(frame); frame_botoes.grid(row=4, column=0, columnspan=2, pady=(10, 0), sticky="e")
+        ttk.Button(frame_botoes, text="Aplicar", command=self._confirmar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botoes, text="Cancelar", command=self.janela.destroy).pack(side=tk.LEFT, padx=5)
+        self.janela.bind("<Return>", lambda e: self._confirmar()); self.janela.bind("<Escape>", lambda e: self.janela.destroy())
+        self.janela.grab_set(); self.entry_cidade.focus_set()
+
+    def _confirmar(self):
+        alteracoes = {campo: var.get().strip() for campo, var in (("curso", self.curso_var), ("cidade", self.cidade_var), ("uf", self.uf_var)) if var.get().strip()}
+        if not alteracoes: messagebox.showwarning("Nada a Alterar", "Preencha ao menos um campo.", parent=self.janela); return
+        if "uf" in alteracoes: alteracoes["uf"] = alteracoes["uf"].upper()
+        logger.debug(f"Alteração em lote confirmada: {alteracoes}")
+        self.resultado = alteracoes
+        self.janela.destroy()
+
+    def mostrar(self):
+        """Bloqueia até a janela fechar e retorna o resultado."""
+        self.janela.wait_window()
+        return self.resultado
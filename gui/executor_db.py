@@ -0,0 +1,126 @@
+# gui/executor_db.py
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class TarefaDB:
+    """Chamada ao banco submetida ao ExecutorDB. Pode ser cancelada enquanto não terminou."""
+    __slots__ = ("descricao", "chave", "cancelada", "_future")
+
+    def __init__(self, descricao, chave):
+        self.descricao = descricao
+        self.chave = chave
+        self.cancelada = False
+        self._future = None
+
+    def cancelar(self):
+        """Cancela a tarefa. Se já estiver rodando, o resultado será descartado ao chegar."""
+        self.cancelada = True
+        if self._future is not None: self._future.cancel()
+
+class ExecutorDB:
+    """
+    Executa chamadas do db_handler fora do thread do Tkinter e entrega os resultados
+    de volta ao mainloop via root.after. Tarefas com a mesma 'chave' se substituem:
+    submeter uma nova busca cancela a anterior ainda pendente.
+    """
+
+    def __init__(self, root, max_workers=2, intervalo_ms=30, ao_mudar_ocupado=None):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.ao_mudar_ocupado = ao_mudar_ocupado # callback(ocupado: bool, em_andamento: int), chamado no thread do Tk
+        self._pool_threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="executor-db")
+        self._resultados = queue.Queue() # (callback, args) a executar no thread do Tk
+        self._tarefas_por_chave = {}
+        self._em_andamento = 0 # Só é alterado no thread do Tk
+        self._id_after = None
+        self._encerrado = False
+
+    def submeter(self, funcao, *args, ao_concluir=None, ao_falhar=None, chave=None, descricao=None, **kwargs):
+        """
+        Agenda funcao(*args, **kwargs) em um thread de trabalho. 'ao_concluir(resultado)' ou
+        'ao_falhar(excecao)' são chamados no thread do Tk. Deve ser chamado do thread do Tk.
+        """
+        if self._encerrado: logger.warning("ExecutorDB já encerrado; tarefa ignorada."); return None
+        tarefa = TarefaDB(descricao or getattr(funcao, "__name__", "tarefa"), chave)
+        if chave is not None:
+            anterior = self._tarefas_por_chave.get(chave)
+            if anterior is not None and not anterior.cancelada:
+                logger.debug("Tarefa '%s' (chave '%s') substituída por uma mais nova.", anterior.descricao, chave)
+                anterior.cancelar()
+            self._tarefas_por_chave[chave] = tarefa
+
+        def executar():
+            callback, valor = None, None # Cancelada depois de sair da fila: só finaliza (contador e chave)
+            try:
+                if not tarefa.cancelada:
+                    try:
+                        callback, valor = ao_concluir, funcao(*args, **kwargs)
+                    except Exception as e: # noqa - a exceção é repassada para o thread do Tk
+                        logger.exception(f"Erro inesperado na tarefa de BD '{tarefa.descricao}'.")
+                        callback, valor = ao_falhar, e
+            finally: # Toda execução finaliza exatamente uma vez
+                self._resultados.put((self._finalizar, (tarefa, callback, valor)))
+
+        self._alterar_em_andamento(+1)
+        tarefa._future = self._pool_threads.submit(executar)
+        # Future cancelado nunca chega a rodar executar(), então este é o único _finalizar dele
+        # (um future que começou a rodar não pode mais ser cancelado: os dois casos se excluem)
+        tarefa._future.add_done_callback(lambda f: f.cancelled() and self._resultados.put((self._finalizar, (tarefa, None, None))))
+        self._agendar_processamento()
+        return tarefa
+
+    def notificar(self, callback, *args):
+        """Thread-safe: agenda callback(*args) no thread do Tk (ex.: progresso de uma tarefa longa)."""
+        self._resultados.put((callback, args))
+
+    def cancelar(self, chave):
+        tarefa = self._tarefas_por_chave.get(chave)
+        if tarefa is not None: tarefa.cancelar()
+
+    @property
+    def ocupado(self):
+        return self._em_andamento > 0
+
+    def _finalizar(self, tarefa, callback, valor):
+        self._alterar_em_andamento(-1)
+        if tarefa.chave is not None and self._tarefas_por_chave.get(tarefa.chave) is tarefa:
+            del self._tarefas_por_chave[tarefa.chave]
+        if tarefa.cancelada:
+            logger.debug("Resultado da tarefa cancelada '%s' descartado.", tarefa.descricao)
+            return
+        if callback is not None: callback(valor)
+
+    def _alterar_em_andamento(self, delta):
+        ocupado_antes = self._em_andamento > 0
+        self._em_andamento = max(0, self._em_andamento + delta)
+        ocupado_agora = self._em_andamento > 0
+        if self.ao_mudar_ocupado and (ocupado_antes != ocupado_agora or ocupado_agora):
+            self.ao_mudar_ocupado(ocupado_agora, self._em_andamento)
+
+    def _agendar_processamento(self):
+        if self._id_after is None and not self._encerrado:
+            self._id_after = self.root.after(self.intervalo_ms, self._processar_resultados)
+
+    def _processar_resultados(self):
+        """Roda no thread do Tk: executa os callbacks enfileirados pelos threads de trabalho."""
+        self._id_after = None
+        while True:
+            try: callback, args = self._resultados.get_nowait()
+            except queue.Empty: break
+            try: callback(*args)
+            except Exception: logger.exception("Erro ao processar resultado de tarefa de BD na interface.") # noqa
+        if self._em_andamento > 0 or not self._resultados.empty(): self._agendar_processamento()
+
+    def encerrar(self):
+        """Cancela tarefas pendentes e libera os threads (as que já estão rodando terminam sozinhas)."""
+        self._encerrado = True
+        for tarefa in list(self._tarefas_por_chave.values()): tarefa.cancelar()
+        if self._id_after is not None:
+            try: self.root.after_cancel(self._id_after)
+            except Exception: pass # noqa - janela já destruída
+            self._id_after = None
+        self._pool_threads.shutdown(wait=False, cancel_futures=True)
+        logger.info("ExecutorDB encerrado.")
@@ -1,18 +1,36 @@
 # gui/main_window.py
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
-from database import db_handler
+from database import db_handler, db_config, busca, diario_escritas, indice_unicidade
+from gui.executor_db import ExecutorDB
+from gui.modelo_tabela import ModeloTabelaAlunos
+from gui.cache_busca import CacheBuscas
+from gui.recursos import GerenciadorRecursos
 from utils import validators 
-from datetime import datetime
-import os 
+from utils import instrumentacao
+from datetime import datetime, date
+import time
 import logging
 import re 
 
 logger = logging.getLogger(__name__)
 
+# Paginação da tabela: linhas buscadas por vez e máximo de linhas mantidas no Treeview
+TAMANHO_PAGINA_TABELA = 200
+MAX_LINHAS_MATERIALIZADAS = 3 * TAMANHO_PAGINA_TABELA
+LIMIAR_ROLAGEM_PAGINA = 0.9 # Fração da barra de rolagem que dispara a carga da próxima página
+WORKERS_EXECUTOR_DB = 2 # Threads que executam as chamadas ao banco fora do mainloop
+ATRASO_BUSCA_DIGITACAO_MS = 300 # Pausa na digitação que dispara a busca automática
+ATRASO_PRECARREGAR_TEMA_MS = 2000 # Após a abertura, carrega o tema escuro em segundo plano (ocioso)
+# Colunas na ordem das linhas da tabela (SQL_SELECT_ALUNOS), para montar localmente a linha de uma escrita do diário
+COLUNAS_LINHA_TABELA = ("id", "nome", "sobrenome", "telefone", "email", "cpf", "data_nascimento", "cidade", "uf", "curso")
+
 class AplicacaoAlunos:
-    def __init__(self, root):
+    def __init__(self, root, ao_primeiros_dados=None, ao_falhar_conexao=None):
+        """
+        'ao_primeiros_dados(ok)' é chamado uma vez, quando a primeira página estiver na tabela (ou falhar);
+        'ao_falhar_conexao()' se o teste de conexão em segundo plano falhar (padrão: aviso na barra de status).
+        """
         self.root = root
         self.root.title("Cadastro de Alunos - FacSenac")
         self.root.geometry("1250x750") 
@@ -23,14 +41,28 @@ class AplicacaoAlunos:
         self.light_theme = "arc"   
         self.dark_theme = "equilux" 
 
+        self.recursos = GerenciadorRecursos(self.root) # Ícones e estilos por tema, em cache
         self.configurar_estilos_widgets()
         self.carregar_icones() 
 
         self.coluna_ordenacao_atual = "nome" 
-        self.direcao_ordenacao_atual_asc = True 
+        self.direcao_ordenacao_atual_asc = True
 
         self._is_formatting_cpf_programmatically = False
 
+        # Estado da paginação da tabela (ver carregar_alunos_na_tabela)
+        self._consulta_tabela = {}
+        self._incluir_arquivados_tabela = False # Se a consulta atual da tabela inclui alunos_arquivo
+        self._ha_mais_abaixo = False; self._ha_mais_acima = False
+        self._carregando_pagina = False
+        self._geracao_tabela = 0 # Incrementado a cada recarga; descarta páginas de consultas antigas
+        self._id_after_status = None
+        self.cache_buscas = CacheBuscas() # Primeiras páginas de consultas recentes; invalidado a cada escrita
+        self._id_after_busca = None
+        self._ao_primeiros_dados = ao_primeiros_dados; self._ao_falhar_conexao = ao_falhar_conexao
+        # CPFs/e-mails em uso, em memória: duplicidade acusada no FocusOut sem ir ao banco (None se desativado)
+        self.indice_unicidade = indice_unicidade.obter_indice()
+
         # --- Definição dos Comandos de Validação ---
         self.vcmd_cpf_char_control = (self.root.register(self.validar_char_cpf_digitacao), '%S', '%d')
         # GARANTIR QUE A LINHA ABAIXO ESTEJA CORRETA E PRESENTE:
@@ -45,32 +77,56 @@ class AplicacaoAlunos:
         self.criar_widgets_tabela()
         self.criar_barra_status()
 
-        self.carregar_alunos_na_tabela()
+        # Todas as chamadas ao banco passam pelo executor para não bloquear o mainloop
+        self.executor_db = ExecutorDB(self.root, max_workers=WORKERS_EXECUTOR_DB, ao_mudar_ocupado=self.atualizar_indicador_ocupado)
+        self.root.protocol("WM_DELETE_WINDOW", self.ao_fechar_janela)
+        self.root.bind("<F12>", self.mostrar_estatisticas_desempenho)
+
+        # Com DB_DIARIO_ATIVO, cadastros/atualizações terminam no diário local e seguem ao banco em segundo plano
+        self.diario = diario_escritas.obter_diario() if db_config.DB_BACKEND == "mysql" else None
+        if self.diario: self.diario.iniciar(ao_gravar=lambda *args: self.executor_db.notificar(self._ao_gravar_diario, *args))
+
+        self._iniciar_carga_inicial()
+        self.root.after(ATRASO_PRECARREGAR_TEMA_MS, lambda: self.root.after_idle(self.recursos.precarregar_tema, self.dark_theme))
+
+    def _iniciar_carga_inicial(self):
+        """Testa a conexão (aquecendo o pool) em segundo plano e só então busca a primeira página da tabela."""
+        self.atualizar_status("Conectando ao banco de dados...", duracao_ms=0)
+        def ao_concluir(pool_ok):
+            if pool_ok:
+                logger.info(f"Pool de conexões pronto. Estatísticas: {db_handler.estatisticas_pool()}"); self.carregar_alunos_na_tabela()
+                self._sincronizar_indice_unicidade() # Carga do índice fora do executor: não disputa com a primeira página
+                return
+            logger.critical("Falha CRÍTICA na conexão inicial com o BD (detalhes no log anterior).")
+            self._notificar_primeiros_dados(False)
+            if self._ao_falhar_conexao: self._ao_falhar_conexao()
+            else: self.atualizar_status("Sem conexão com o banco de dados.", sucesso=False, duracao_ms=0)
+        self.executor_db.submeter(db_handler.aquecer_pool, descricao="aquecer_pool", ao_concluir=ao_concluir, ao_falhar=lambda e: ao_concluir(False))
+
+    def _notificar_primeiros_dados(self, ok):
+        callback, self._ao_primeiros_dados = self._ao_primeiros_dados, None
+        if callback: callback(ok)
+
+    def aplicar_tema(self, nome):
+        """Aplica um tema do ttkthemes em uma única atualização, voltando os campos do formulário ao estilo Normal."""
+        campos = [getattr(self, nome_campo, None) for nome_campo in ('entry_nome', 'entry_sobrenome', 'entry_email', 'entry_cpf',
+                                                                   'entry_data_nasc', 'entry_telefone', 'entry_cidade', 'entry_uf')]
+        return self.recursos.aplicar_tema(nome, [campo for campo in campos if isinstance(campo, ttk.Entry)])
+
+    def ao_fechar_janela(self):
+        logger.info("Fechando janela principal; encerrando executor de BD.")
+        self.executor_db.encerrar()
+        if self.diario: self.diario = None; diario_escritas.encerrar() # Último envio; o restante fica no arquivo
+        if self.indice_unicidade: logger.info(f"Índice de unicidade: {self.indice_unicidade.estatisticas()}")
+        self.root.destroy()
 
     def configurar_estilos_widgets(self):
-        style = ttk.Style()
-        style.configure("Valid.TEntry", fieldbackground="lightgreen")
-        style.configure("Invalid.TEntry", fieldbackground="#FFCDD2") 
-        try:
-            default_entry_bg = style.lookup('TEntry', 'fieldbackground')
-            style.configure("Normal.TEntry", fieldbackground=default_entry_bg)
-        except tk.TclError:
-             style.configure("Normal.TEntry", fieldbackground="white")
-        logger.debug("Estilos de TEntry para validação configurados.")
+        # Valid/Invalid/Normal.TEntry no tema ativo (configurados uma vez por tema, ver gui/recursos.py)
+        self.recursos.configurar_estilos()
 
     def carregar_icones(self):
         logger.debug("Carregando ícones...")
-        base_path = os.path.join(os.path.dirname(__file__), "assets")
-        icon_files = { 
-            "add": "add.png", "edit": "edit.png", "delete": "delete.png",
-            "clear": "clear.png", "theme": "theme_icon.png",
-            "export_csv": "export_csv.png"
-        }
-        self.icons = {}
-        for name, filename in icon_files.items():
-            path = os.path.join(base_path, filename)
-            try: self.icons[name] = tk.PhotoImage(file=path)
-            except tk.TclError: logger.warning(f"Ícone '{filename}' não encontrado: {path}"); self.icons[name] = None
+        self.icons = self.recursos.icones() # Lidos do disco uma vez por processo, já na escala da tela
     
     def criar_widgets_barra_superior(self):
         logger.debug("Criando widgets da barra superior.")
@@ -86,23 +142,7 @@ class AplicacaoAlunos:
         new_theme = self.dark_theme if self.is_dark_theme else self.light_theme
         logger.info(f"Tentando alterar tema para: {new_theme}")
         try:
-            self.root.set_theme(new_theme)
-            style = ttk.Style() 
-            try:
-                default_entry_bg = style.lookup('TEntry', 'fieldbackground')
-                style.configure("Normal.TEntry", fieldbackground=default_entry_bg)
-            except tk.TclError:
-                style.configure("Normal.TEntry", fieldbackground="white") 
-            
-            fields_to_reset_style = [ 
-                getattr(self, 'entry_nome', None), getattr(self, 'entry_sobrenome', None),
-                getattr(self, 'entry_email', None), getattr(self, 'entry_cpf', None),
-                getattr(self, 'entry_data_nasc', None), getattr(self, 'entry_telefone', None),
-                getattr(self, 'entry_cidade', None), getattr(self, 'entry_uf', None)
-            ]
-            for field in fields_to_reset_style:
-                if field and isinstance(field, ttk.Entry): field.configure(style="Normal.TEntry")
-
+            if not self.aplicar_tema(new_theme): raise tk.TclError("pacote ttkthemes indisponível")
             self.atualizar_status(f"Tema alterado para {new_theme}.", duracao_ms=3000)
             logger.info(f"Tema alterado com sucesso para {new_theme}.")
         except tk.TclError as e:
@@ -119,7 +159,7 @@ class AplicacaoAlunos:
                 current_digits = "".join(filter(str.isdigit, self.entry_cpf_var.get()))
                 if len(current_digits) < 11: return True
                 else: logger.debug("Máximo de 11 dígitos para CPF atingido."); return False
-            else: logger.debug(f"Caractere não dígito '{char_inserido}' bloqueado no CPF."); return False 
+            else: logger.debug("Caractere não dígito '%s' bloqueado no CPF.", char_inserido); return False 
         return True
 
     def formatar_cpf_em_tempo_real(self, event=None):
@@ -158,7 +198,7 @@ class AplicacaoAlunos:
         except tk.TclError: logger.debug("Não foi possível definir cursor no CPF (sem foco).")
         
         self.root.after_idle(self._reset_cpf_formatting_flag)
-        logger.debug(f"CPF formatado para: {cpf_formatado}, cursor em: {nova_pos_cursor} (tentativa)")
+        logger.debug("CPF formatado para: %s, cursor em: %s (tentativa)", cpf_formatado, nova_pos_cursor)
 
     def _reset_cpf_formatting_flag(self):
         self._is_formatting_cpf_programmatically = False
@@ -221,6 +261,16 @@ class AplicacaoAlunos:
             return False
         return True
 
+    def _sincronizar_indice_unicidade(self, event=None):
+        """Atualiza o índice de unicidade em segundo plano (ao entrar no CPF/Email), para o FocusOut consultar dados recentes."""
+        if self.indice_unicidade: self.indice_unicidade.sincronizar_em_segundo_plano()
+
+    def _verificar_unicidade(self, cpf=None, email=None):
+        """Confere no índice em memória se o CPF/Email já é de outro aluno. Retorna (valido, msg); sem índice, sempre válido."""
+        if not self.indice_unicidade or not self.indice_unicidade.pronto: return True, ""
+        id_atual = self.entry_id_var.get().strip()
+        return self.indice_unicidade.verificar(cpf, email, ignorar_id=int(id_atual) if id_atual.isdigit() else None)
+
     def validar_email_e_atualizar_feedback(self, event=None):
         email_str = self.entry_email_var.get().strip()
         widget = getattr(self, 'entry_email', None)
@@ -228,8 +278,11 @@ class AplicacaoAlunos:
 
         if not email_str: widget.configure(style="Normal.TEntry"); return
         valido, msg = validators.validar_email_formato(email_str)
-        if valido: widget.configure(style="Valid.TEntry"); logger.debug(f"Email '{email_str}' ok (FocusOut).")
-        else: widget.configure(style="Invalid.TEntry"); logger.warning(f"Email '{email_str}' inválido (FocusOut): {msg}")
+        if valido:
+            valido, msg = self._verificar_unicidade(email=email_str)
+            if not valido: self.atualizar_status(msg, sucesso=False)
+        if valido: widget.configure(style="Valid.TEntry"); logger.debug("Email '%s' ok (FocusOut).", email_str)
+        else: widget.configure(style="Invalid.TEntry"); logger.warning("Email '%s' inválido (FocusOut): %s", email_str, msg)
 
     def validar_campo_final_e_atualizar_feedback(self, event, nome_campo):
         widget = None; val_str = ""; valido = True; msg_erro = ""
@@ -241,6 +294,9 @@ class AplicacaoAlunos:
                     valido = False; msg_erro = "CPF: Formato final inválido (###.###.###-##)."
                 else: 
                     valido, msg_erro = validators.validar_cpf_completo(val_str)
+                    if valido:
+                        valido, msg_erro = self._verificar_unicidade(cpf=val_str)
+                        if not valido: self.atualizar_status(msg_erro, sucesso=False)
         elif nome_campo == 'data_nasc':
             widget = self.entry_data_nasc; val_str = self.entry_data_nasc_var.get().strip()
             if val_str:
@@ -262,10 +318,10 @@ class AplicacaoAlunos:
                  widget.configure(style="Normal.TEntry")
             elif valido: 
                 widget.configure(style="Valid.TEntry")
-                logger.debug(f"Campo '{nome_campo}' ('{val_str}') OK (FocusOut).")
+                logger.debug("Campo '%s' ('%s') OK (FocusOut).", nome_campo, val_str)
             else: 
                 widget.configure(style="Invalid.TEntry")
-                logger.warning(f"Campo '{nome_campo}' ('{val_str}') Inválido (FocusOut): {msg_erro}")
+                logger.warning("Campo '%s' ('%s') Inválido (FocusOut): %s", nome_campo, val_str, msg_erro)
     
     def criar_widgets_formulario(self):
         logger.debug("Criando widgets do formulário.")
@@ -292,6 +348,7 @@ class AplicacaoAlunos:
                                    validate="key", validatecommand=self.vcmd_cpf_char_control, style="Normal.TEntry")
         self.entry_cpf.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
         self.entry_cpf.bind("<KeyRelease>", self.formatar_cpf_em_tempo_real) 
+        self.entry_cpf.bind("<FocusIn>", self._sincronizar_indice_unicidade)
         self.entry_cpf.bind("<FocusOut>", lambda event, field_name="cpf": self.validar_campo_final_e_atualizar_feedback(event, field_name))
 
         ttk.Label(self.frame_formulario, text="Data Nasc. (DD/MM/AAAA):").grid(row=2, column=2, padx=5, pady=5, sticky="w")
@@ -312,6 +369,7 @@ class AplicacaoAlunos:
         self.entry_email_var = tk.StringVar()
         self.entry_email = ttk.Entry(self.frame_formulario, textvariable=self.entry_email_var, width=40, style="Normal.TEntry")
         self.entry_email.grid(row=3, column=3, padx=5, pady=5, sticky="ew")
+        self.entry_email.bind("<FocusIn>", self._sincronizar_indice_unicidade)
         self.entry_email.bind("<FocusOut>", self.validar_email_e_atualizar_feedback)
 
         ttk.Label(self.frame_formulario, text="Cidade:").grid(row=4, column=0, padx=5, pady=5, sticky="w")
@@ -337,7 +395,7 @@ class AplicacaoAlunos:
         self.frame_busca = ttk.LabelFrame(self.root, text="Busca e Filtro", padding=(10,5))
         self.frame_busca.pack(padx=10, pady=(0,5), fill="x", side=tk.TOP)
         ttk.Label(self.frame_busca, text="Buscar por:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        self.search_field_options = ["Nome", "Sobrenome", "CPF", "Email", "Curso", "Cidade", "UF"]
+        self.search_field_options = list(db_handler.CAMPOS_BUSCA_PERMITIDOS)
         self.search_field_var = tk.StringVar(value=self.search_field_options[0])
         self.combo_search_field = ttk.Combobox(self.frame_busca, textvariable=self.search_field_var, values=self.search_field_options, state="readonly", width=15)
         self.combo_search_field.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
@@ -346,10 +404,15 @@ class AplicacaoAlunos:
         self.entry_search_term = ttk.Entry(self.frame_busca, textvariable=self.search_term_var, width=30)
         self.entry_search_term.grid(row=0, column=3, padx=5, pady=5, sticky="ew")
         self.entry_search_term.bind("<Return>", self.executar_busca)
+        self.search_term_var.trace_add("write", self._agendar_busca_digitacao) # Busca enquanto digita (com debounce)
+        self.combo_search_field.bind("<<ComboboxSelected>>", self._agendar_busca_digitacao)
         self.btn_buscar = ttk.Button(self.frame_busca, text="Buscar", command=self.executar_busca)
         self.btn_buscar.grid(row=0, column=4, padx=5, pady=5)
         self.btn_limpar_busca = ttk.Button(self.frame_busca, text="Limpar Busca", command=self.limpar_busca)
         self.btn_limpar_busca.grid(row=0, column=5, padx=5, pady=5)
+        self.incluir_arquivados_var = tk.BooleanVar(value=False) # Também busca em alunos_arquivo (mais lento)
+        self.check_incluir_arquivados = ttk.Checkbutton(self.frame_busca, text="Incluir arquivados", variable=self.incluir_arquivados_var, command=self._ao_alternar_arquivados)
+        self.check_incluir_arquivados.grid(row=0, column=6, padx=5, pady=5)
         self.frame_busca.columnconfigure(3, weight=1)
 
     def criar_widgets_botoes(self):
@@ -363,10 +426,14 @@ class AplicacaoAlunos:
         self.btn_atualizar.pack(side=tk.LEFT, padx=5, pady=5)
         self.btn_deletar = ttk.Button(self.frame_botoes, text="Deletar", image=self.icons.get("delete"), compound=compound_pos, command=self.deletar_aluno_selecionado, style="TButton")
         self.btn_deletar.pack(side=tk.LEFT, padx=5, pady=5)
+        self.btn_alterar_lote = ttk.Button(self.frame_botoes, text="Alterar em Lote", command=self.alterar_selecionados_em_lote, style="TButton")
+        self.btn_alterar_lote.pack(side=tk.LEFT, padx=5, pady=5)
         self.btn_limpar = ttk.Button(self.frame_botoes, text="Limpar Campos", image=self.icons.get("clear"), compound=compound_pos, command=self.limpar_campos_formulario, style="TButton")
         self.btn_limpar.pack(side=tk.LEFT, padx=5, pady=5)
         self.btn_exportar_csv = ttk.Button(self.frame_botoes, text="Exportar CSV", image=self.icons.get("export_csv"), compound=compound_pos, command=self.exportar_para_csv, style="TButton")
         self.btn_exportar_csv.pack(side=tk.LEFT, padx=15, pady=5)
+        self.btn_importar_csv = ttk.Button(self.frame_botoes, text="Importar CSV", command=self.importar_de_csv, style="TButton")
+        self.btn_importar_csv.pack(side=tk.LEFT, padx=5, pady=5)
 
     def criar_widgets_tabela(self):
         logger.debug("Criando widget da tabela (Treeview).")
@@ -374,7 +441,7 @@ class AplicacaoAlunos:
         self.frame_tabela.pack(padx=10, pady=5, fill="both", expand=True, side=tk.TOP)
         self.map_coluna_cabecalho = { "id": "ID", "nome": "Nome", "sobrenome": "Sobrenome", "telefone": "Telefone", "email": "E-mail", "cpf": "CPF", "data_nascimento_formatada": "Data Nasc.", "cidade": "Cidade", "uf": "UF", "curso": "Curso" }
         self.colunas_visuais_treeview = ["id", "nome", "sobrenome", "cpf", "data_nascimento_formatada", "telefone", "email", "curso", "cidade", "uf"]
-        self.tree_alunos = ttk.Treeview(self.frame_tabela, columns=self.colunas_visuais_treeview, show="headings", height=15)
+        self.tree_alunos = ttk.Treeview(self.frame_tabela, columns=self.colunas_visuais_treeview, show="headings", height=15, selectmode="extended") # Ctrl/Shift+clique: várias linhas para operações em lote
         for col_key in self.colunas_visuais_treeview:
             display_text = self.map_coluna_cabecalho.get(col_key, col_key.capitalize())
             db_sort_col = "data_nascimento" if col_key == "data_nascimento_formatada" else col_key
@@ -390,37 +457,79 @@ class AplicacaoAlunos:
             elif col_key == "uf": self.tree_alunos.column(col_key, width=40, anchor=tk.CENTER)
             elif col_key == "curso": self.tree_alunos.column(col_key, width=70, anchor=tk.CENTER)
             else: self.tree_alunos.column(col_key, width=100)
-        scrollbar_y = ttk.Scrollbar(self.frame_tabela, orient=tk.VERTICAL, command=self.tree_alunos.yview)
-        self.tree_alunos.configure(yscroll=scrollbar_y.set); scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar_y_tabela = ttk.Scrollbar(self.frame_tabela, orient=tk.VERTICAL, command=self.tree_alunos.yview)
+        self.tree_alunos.configure(yscroll=self._ao_rolar_tabela); self.scrollbar_y_tabela.pack(side=tk.RIGHT, fill=tk.Y)
         scrollbar_x = ttk.Scrollbar(self.frame_tabela, orient=tk.HORIZONTAL, command=self.tree_alunos.xview)
         self.tree_alunos.configure(xscroll=scrollbar_x.set); scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
         self.tree_alunos.pack(fill="both", expand=True)
         self.tree_alunos.bind("<<TreeviewSelect>>", self.ao_selecionar_item_tabela)
+        self.modelo_tabela = ModeloTabelaAlunos(self.root, self.tree_alunos) # iid de cada linha = id do aluno
 
     def criar_barra_status(self):
         logger.debug("Criando barra de status.")
         self.status_var = tk.StringVar(); self.status_var.set("Pronto")
-        self.status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=2, pady=2)
+        self.frame_status = ttk.Frame(self.root)
+        self.frame_status.pack(side=tk.BOTTOM, fill=tk.X, padx=2, pady=2)
+        self.progresso_ocupado = ttk.Progressbar(self.frame_status, mode="indeterminate", length=120)
+        self.status_bar = ttk.Label(self.frame_status, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
     def atualizar_status(self, mensagem, sucesso=True, duracao_ms=5000):
-        logger.info(f"Atualizando status: '{mensagem}' (Sucesso: {sucesso})")
+        logger.debug("Atualizando status: '%s' (Sucesso: %s)", mensagem, sucesso)
         self.status_var.set(mensagem)
-        if duracao_ms > 0: self.root.after(duracao_ms, lambda: self.status_var.set("Pronto"))
+        # Cancela o "Pronto" agendado por mensagens anteriores para não apagar esta antes da hora
+        if self._id_after_status is not None: self.root.after_cancel(self._id_after_status); self._id_after_status = None
+        if duracao_ms > 0: self._id_after_status = self.root.after(duracao_ms, self._restaurar_status_pronto)
+
+    def _restaurar_status_pronto(self):
+        self._id_after_status = None
+        self.status_var.set("Processando..." if self.executor_db.ocupado else "Pronto")
+
+    def atualizar_indicador_ocupado(self, ocupado, em_andamento):
+        """Callback do ExecutorDB: mostra/esconde o indicador de atividade na barra de status."""
+        if ocupado:
+            if not self.progresso_ocupado.winfo_ismapped():
+                self.progresso_ocupado.pack(side=tk.RIGHT, padx=(5,0)); self.progresso_ocupado.start(15)
+                if self._id_after_status is None: self.atualizar_status("Processando...", duracao_ms=0)
+        else:
+            self.progresso_ocupado.stop(); self.progresso_ocupado.pack_forget()
+            if self._id_after_status is None: self.status_var.set("Pronto")
+
+    def _agendar_busca_digitacao(self, *args):
+        """Reinicia a janela de debounce a cada tecla; a busca só roda após uma pausa na digitação."""
+        self._cancelar_busca_agendada()
+        self._id_after_busca = self.root.after(ATRASO_BUSCA_DIGITACAO_MS, self._executar_busca_digitacao)
+
+    def _cancelar_busca_agendada(self):
+        if self._id_after_busca is not None: self.root.after_cancel(self._id_after_busca); self._id_after_busca = None
+
+    def _executar_busca_digitacao(self):
+        self._id_after_busca = None
+        campo = self.search_field_var.get(); termo = self.search_term_var.get().strip()
+        consulta = self._consulta_tabela
+        if termo == (consulta.get("search_term") or "") and (not termo or campo == consulta.get("search_field")): return # Nada mudou
+        self.executar_busca()
 
     def executar_busca(self, event=None):
+        self._cancelar_busca_agendada()
         campo = self.search_field_var.get(); termo = self.search_term_var.get().strip()
-        logger.info(f"Executando busca: Campo='{campo}', Termo='{termo}'")
+        logger.info("Executando busca: Campo='%s', Termo='%s'", campo, termo)
         if not termo: self.limpar_busca(); return
         self.carregar_alunos_na_tabela(search_field=campo, search_term=termo, sort_by_column=self.coluna_ordenacao_atual, sort_direction='ASC' if self.direcao_ordenacao_atual_asc else 'DESC')
         self.atualizar_status(f"Buscando por '{termo}' em '{campo}'.")
 
     def limpar_busca(self):
         logger.info("Limpando busca.")
-        self.search_term_var.set("")
+        self.search_term_var.set(""); self._cancelar_busca_agendada()
         self.carregar_alunos_na_tabela(sort_by_column=self.coluna_ordenacao_atual, sort_direction='ASC' if self.direcao_ordenacao_atual_asc else 'DESC')
         self.atualizar_status("Busca limpa. Exibindo todos os alunos."); self.entry_search_term.focus_set()
 
+    def _ao_alternar_arquivados(self):
+        incluir = self.incluir_arquivados_var.get()
+        logger.info(f"Incluir alunos arquivados na tabela: {incluir}.")
+        self.carregar_alunos_na_tabela(**self._consulta_tabela)
+        self.atualizar_status("Exibindo também alunos arquivados." if incluir else "Exibindo apenas alunos ativos.")
+
     def ordenar_coluna_tabela(self, coluna_clicada_db):
         if coluna_clicada_db == self.coluna_ordenacao_atual: self.direcao_ordenacao_atual_asc = not self.direcao_ordenacao_atual_asc
         else: self.coluna_ordenacao_atual = coluna_clicada_db; self.direcao_ordenacao_atual_asc = True
@@ -452,7 +561,7 @@ class AplicacaoAlunos:
         if not item_selecionado: return
         valores_linha = self.tree_alunos.item(item_selecionado, "values")
         if valores_linha and len(valores_linha) == 10:
-            logger.debug(f"Item selecionado na tabela: ID={valores_linha[0]}, Nome='{valores_linha[1]}'")
+            logger.debug("Item selecionado na tabela: ID=%s, Nome='%s'", valores_linha[0], valores_linha[1])
             self.entry_id_var.set(str(valores_linha[0])); self.entry_nome_var.set(str(valores_linha[1]))
             self.entry_sobrenome_var.set(str(valores_linha[2])); self.entry_telefone_var.set(str(valores_linha[3]))
             self.entry_email_var.set(str(valores_linha[4])); self.entry_cpf_var.set(str(valores_linha[5]))
@@ -466,22 +575,114 @@ class AplicacaoAlunos:
             self.limpar_campos_formulario(focar_nome=False)
 
     def carregar_alunos_na_tabela(self, search_field=None, search_term=None, sort_by_column=None, sort_direction='ASC'):
-        logger.info(f"Carregando alunos: busca='{search_field}':'{search_term}', ordenar='{sort_by_column}':'{sort_direction}'")
-        for i in self.tree_alunos.get_children(): self.tree_alunos.delete(i)
+        logger.info("Carregando alunos: busca='%s':'%s', ordenar='%s':'%s'", search_field, search_term, sort_by_column, sort_direction)
         if sort_by_column is None:
             sort_by_column = self.coluna_ordenacao_atual
             sort_direction = 'ASC' if self.direcao_ordenacao_atual_asc else 'DESC'
-        resultados, msg_status_db = db_handler.visualizar_alunos_db(search_field=search_field, search_term=search_term, sort_by_column=sort_by_column, sort_direction=sort_direction)
-        if resultados is not None:
-            logger.debug(f"{len(resultados)} alunos retornados do DB.")
-            for aluno in resultados: self.tree_alunos.insert("", tk.END, values=aluno)
-            if "Erro" not in msg_status_db : self.atualizar_status(msg_status_db if msg_status_db else f"{len(resultados)} alunos carregados.")
+        self._consulta_tabela = {"search_field": search_field, "search_term": search_term, "sort_by_column": sort_by_column, "sort_direction": sort_direction}
+        self._incluir_arquivados_tabela = self.incluir_arquivados_var.get()
+        self._geracao_tabela += 1; geracao = self._geracao_tabela
+        self.executor_db.cancelar("pagina_tabela") # Páginas da consulta anterior não interessam mais
+        consulta = self._consulta_tabela
+        if self._incluir_arquivados_tabela: # Consulta com o arquivo não passa pelo cache de buscas
+            self.executor_db.submeter(db_handler.visualizar_alunos_pagina_db, tamanho_pagina=TAMANHO_PAGINA_TABELA, chave="tabela",
+                                      ao_concluir=lambda resultado: self._ao_carregar_primeira_pagina(resultado, geracao),
+                                      ao_falhar=lambda e: self._ao_carregar_primeira_pagina((None, f"Erro inesperado ao carregar alunos: {e}"), geracao),
+                                      incluir_arquivados=True, **consulta)
+            return
+        pagina_cache = self.cache_buscas.obter(**consulta)
+        if pagina_cache is not None:
+            self.executor_db.cancelar("tabela") # Uma consulta ainda em andamento ficou obsoleta
+            self._ao_carregar_primeira_pagina((pagina_cache, f"{len(pagina_cache['linhas'])} aluno(s) carregado(s) (cache)."), geracao)
+            return
+        versao_cache = self.cache_buscas.versao
+        def ao_concluir(resultado):
+            if resultado[0] is not None: self.cache_buscas.guardar(pagina=resultado[0], versao=versao_cache, **consulta)
+            self._ao_carregar_primeira_pagina(resultado, geracao)
+        self.executor_db.submeter(db_handler.visualizar_alunos_pagina_db, tamanho_pagina=TAMANHO_PAGINA_TABELA, chave="tabela",
+                                  ao_concluir=ao_concluir,
+                                  ao_falhar=lambda e: self._ao_carregar_primeira_pagina((None, f"Erro inesperado ao carregar alunos: {e}"), geracao),
+                                  **self._consulta_tabela)
+
+    def _ao_carregar_primeira_pagina(self, resultado, geracao):
+        if geracao != self._geracao_tabela: return
+        pagina, msg_status_db = resultado
+        if pagina is not None:
+            logger.debug("%s alunos retornados do DB (primeira página).", len(pagina['linhas']))
+            self._ha_mais_acima = False; self._ha_mais_abaixo = pagina["ha_mais"]
+            # Recarga por diff contra o que já está na tela; páginas vizinhas esperam o diff terminar
+            self._carregando_pagina = True; inicio_diff = time.perf_counter()
+            def ao_concluir_diff():
+                instrumentacao.registrar("ui.popular_tabela", time.perf_counter() - inicio_diff, f"{len(pagina['linhas'])} linha(s)")
+                if geracao == self._geracao_tabela: self._carregando_pagina = False
+                self._notificar_primeiros_dados(True)
+            self.modelo_tabela.substituir(pagina["linhas"], pagina["chaves"], ao_concluir=ao_concluir_diff)
+            self.tree_alunos.yview_moveto(0)
+            if "Erro" not in msg_status_db : self.atualizar_status(msg_status_db if msg_status_db else f"{len(pagina['linhas'])} alunos carregados.")
             else: self.atualizar_status(msg_status_db, sucesso=False)
         else:
             logger.error(f"Falha ao carregar alunos do DB: {msg_status_db}")
+            self._notificar_primeiros_dados(False)
             messagebox.showerror("Erro ao Carregar Alunos", msg_status_db)
             self.atualizar_status(msg_status_db if msg_status_db else "Falha ao carregar alunos.", sucesso=False)
 
+    def _ao_rolar_tabela(self, primeiro, ultimo):
+        """yscrollcommand da tabela: atualiza a barra e carrega páginas vizinhas perto das bordas."""
+        self.scrollbar_y_tabela.set(primeiro, ultimo)
+        if self._carregando_pagina or not len(self.modelo_tabela): return
+        if float(ultimo) >= LIMIAR_ROLAGEM_PAGINA and self._ha_mais_abaixo:
+            self._carregando_pagina = True; self.root.after_idle(self._carregar_pagina_vizinha, True)
+        elif float(primeiro) <= 1 - LIMIAR_ROLAGEM_PAGINA and self._ha_mais_acima:
+            self._carregando_pagina = True; self.root.after_idle(self._carregar_pagina_vizinha, False)
+
+    def _carregar_pagina_vizinha(self, abaixo):
+        """Busca (em segundo plano) a página seguinte (abaixo=True) ou a anterior da consulta atual."""
+        filhos = self.modelo_tabela.iids()
+        if not filhos: self._carregando_pagina = False; return
+        if abaixo: cursor_pagina = {"apos_cursor": self.modelo_tabela.chaves[filhos[-1]]}
+        else: cursor_pagina = {"antes_cursor": self.modelo_tabela.chaves[filhos[0]]}
+        geracao = self._geracao_tabela
+        def ao_concluir(resultado):
+            if geracao != self._geracao_tabela: return
+            self._carregando_pagina = False
+            pagina, msg = resultado
+            if pagina is None: logger.error(f"Falha ao carregar página da tabela: {msg}"); self.atualizar_status(msg, sucesso=False); return
+            self._aplicar_pagina_vizinha(pagina, abaixo)
+        def ao_falhar(e):
+            if geracao == self._geracao_tabela: self._carregando_pagina = False
+            self.atualizar_status(f"Erro inesperado ao carregar página: {e}", sucesso=False)
+        self.executor_db.submeter(db_handler.visualizar_alunos_pagina_db, tamanho_pagina=TAMANHO_PAGINA_TABELA, chave="pagina_tabela",
+                                  ao_concluir=ao_concluir, ao_falhar=ao_falhar, incluir_arquivados=self._incluir_arquivados_tabela,
+                                  **cursor_pagina, **self._consulta_tabela)
+
+    def _aplicar_pagina_vizinha(self, pagina, abaixo):
+        """Insere a página vizinha e mantém no máximo MAX_LINHAS_MATERIALIZADAS linhas no Treeview."""
+        total_antes = len(self.modelo_tabela); primeira_fracao = self.tree_alunos.yview()[0]
+        with instrumentacao.Medir("ui.anexar_pagina", f"{len(pagina['linhas'])} linha(s)"):
+            inseridas = self.modelo_tabela.anexar_pagina(pagina["linhas"], pagina["chaves"], no_fim=abaixo)
+        if abaixo: self._ha_mais_abaixo = pagina["ha_mais"]
+        else: self._ha_mais_acima = pagina["ha_mais"]
+        filhos = self.modelo_tabela.iids()
+        excesso = len(filhos) - MAX_LINHAS_MATERIALIZADAS; removidas_acima = 0
+        if excesso > 0:
+            self.modelo_tabela.remover(filhos[:excesso] if abaixo else filhos[-excesso:])
+            if abaixo: self._ha_mais_acima = True; removidas_acima = excesso
+            else: self._ha_mais_abaixo = True
+        # Mantém no topo da área visível a mesma linha de antes da troca de páginas
+        indice_topo = primeira_fracao * total_antes + (0 if abaixo else inseridas) - removidas_acima
+        total_depois = len(self.modelo_tabela)
+        if total_depois: self.tree_alunos.yview_moveto(max(0.0, indice_topo / total_depois))
+        logger.debug("Página %s carregada (%s linhas); %s linhas materializadas.", 'seguinte' if abaixo else 'anterior', inseridas, total_depois)
+
+    def _aplicar_aluno_na_tabela(self, id_aluno, aluno):
+        """Após uma escrita, insere/reposiciona a linha do aluno (ou a remove, se saiu do filtro atual)."""
+        if aluno is None: self.modelo_tabela.remover_linha(id_aluno); return
+        direcao = self._consulta_tabela.get("sort_direction") or 'ASC'
+        coluna = self._consulta_tabela.get("sort_by_column") or self.coluna_ordenacao_atual
+        visivel = self.modelo_tabela.inserir_linha(aluno["linha"], aluno["chave"], direcao, ha_mais_acima=self._ha_mais_acima, ha_mais_abaixo=self._ha_mais_abaixo,
+                                                   coluna=coluna)
+        if visivel: self.tree_alunos.see(str(id_aluno))
+
     def validar_campos_obrigatorios(self):
         logger.debug("Executando validação final de campos obrigatórios e formatos.")
         def aplicar_feedback_e_falhar(widget_attr_name, mensagem_erro, nome_campo_log): # Helper
@@ -537,14 +738,112 @@ class AplicacaoAlunos:
             try: datetime.strptime(data_str_ddmmyyyy, '%Y-%m-%d'); return data_str_ddmmyyyy
             except ValueError: logger.warning(f"Data '{data_str_ddmmyyyy}' não pôde ser formatada para o BD."); return None
 
+    def _executar_escrita(self, funcao, *args, ao_sucesso, ao_erro):
+        """Executa uma escrita no BD em segundo plano com os botões de CRUD desabilitados até o resultado chegar."""
+        botoes = [self.btn_cadastrar, self.btn_atualizar, self.btn_deletar, self.btn_alterar_lote]
+        for botao in botoes: botao.state(["disabled"])
+        def concluir(resultado):
+            for botao in botoes: botao.state(["!disabled"])
+            sucesso, msg = resultado[:2]
+            if sucesso: self.cache_buscas.invalidar() # Qualquer consulta em cache pode ter mudado
+            if sucesso: ao_sucesso(msg, *resultado[2:]) # Extras (ex.: linha do aluno relida) vão para ao_sucesso
+            else: ao_erro(msg)
+        def falhar(e):
+            for botao in botoes: botao.state(["!disabled"])
+            ao_erro(f"Erro inesperado: {e}")
+        self.executor_db.submeter(funcao, *args, ao_concluir=concluir, ao_falhar=falhar)
+
+    def _aluno_local(self, id_aluno, dados_aluno):
+        """Linha + chave de ordenação de um aluno escrito no diário, sem ir ao banco; None se estiver fora do filtro atual."""
+        consulta = self._consulta_tabela
+        linha = diario_escritas.linha_tabela(id_aluno, dados_aluno)
+        predicado = busca.predicado_local(consulta.get("search_field"), consulta.get("search_term"))
+        if predicado is not None and not predicado(linha): return None
+        coluna = consulta.get("sort_by_column") or self.coluna_ordenacao_atual
+        valor = linha[COLUNAS_LINHA_TABELA.index(coluna)] if coluna in COLUNAS_LINHA_TABELA else linha[1]
+        if coluna == "data_nascimento" and dados_aluno[5]: valor = date.fromisoformat(dados_aluno[5]) # Chave como no banco (date)
+        return {"linha": linha, "chave": (valor, id_aluno)}
+
+    def _escrever_no_diario(self, resultado, dados_aluno, ao_sucesso, ao_erro, id_aluno=None):
+        """Conclui uma escrita feita no diário: o resultado é local (sem ida ao banco) e a linha é montada aqui."""
+        sucesso, msg = resultado[:2]
+        if not sucesso: ao_erro(msg); return
+        id_aluno = int(id_aluno) if id_aluno is not None else resultado[2]
+        self.cache_buscas.invalidar()
+        ao_sucesso(msg, id_aluno, self._aluno_local(id_aluno, dados_aluno))
+        self._mostrar_pendentes_diario()
+
+    def _mostrar_pendentes_diario(self):
+        pendentes = self.diario.pendentes() if self.diario else 0
+        if pendentes: self.atualizar_status(f"{pendentes} escrita(s) aguardando gravação no banco.", duracao_ms=0)
+
+    def _ao_gravar_diario(self, id_exibido, id_real, erro):
+        """Thread do Tk: uma operação do diário chegou ao banco (ou foi recusada, ex.: CPF duplicado)."""
+        self.cache_buscas.invalidar()
+        if self.diario: self.diario.confirmar_entrega(id_exibido) # Antes de qualquer return: libera o id provisório
+        if erro:
+            logger.error(f"Escrita do diário recusada pelo banco (ID {id_exibido}): {erro}")
+            messagebox.showwarning("Conflito na Gravação", f"A escrita do aluno ID {id_exibido} não pôde ser gravada no banco:\n{erro}")
+            self.atualizar_status(erro, sucesso=False)
+            if id_exibido < 0: self.modelo_tabela.remover_linha(id_exibido); return # Cadastro recusado: sai da tabela
+        elif id_exibido != id_real: # Cadastro gravado: troca o id provisório pelo real
+            self.modelo_tabela.remover_linha(id_exibido)
+            if self.entry_id_var.get() == str(id_exibido): self.entry_id_var.set(str(id_real))
+        if id_real is None: return
+        consulta = dict(self._consulta_tabela) # Relê a linha gravada (ou a versão do banco, no conflito de atualização)
+        self.executor_db.submeter(db_handler.obter_aluno_db, id_real, consulta.get("search_field"), consulta.get("search_term"), consulta.get("sort_by_column"),
+                                  descricao="obter_aluno_diario", ao_concluir=lambda resultado: self._aplicar_aluno_na_tabela(id_real, resultado[0]))
+        if not erro and self.diario and not self.diario.pendentes(): self.atualizar_status("Escritas pendentes gravadas no banco.", sucesso=True)
+
+    @staticmethod
+    def _cadastrar_e_obter_aluno(dados_aluno, consulta):
+        """Roda no executor: cadastra e relê o aluno no formato da tabela. Retorna (sucesso, msg, id, aluno)."""
+        sucesso, msg, aluno_id = db_handler.cadastrar_aluno_db(dados_aluno, retornar_id=True)
+        if not sucesso: return sucesso, msg
+        aluno, _ = db_handler.obter_aluno_db(aluno_id, consulta.get("search_field"), consulta.get("search_term"), consulta.get("sort_by_column"))
+        return sucesso, msg, aluno_id, aluno
+
+    @staticmethod
+    def _atualizar_e_obter_aluno(id_aluno, dados_aluno, consulta):
+        """Roda no executor: atualiza e relê o aluno no formato da tabela. Retorna (sucesso, msg, id, aluno)."""
+        sucesso, msg = db_handler.atualizar_aluno_db(id_aluno, dados_aluno)
+        if not sucesso: return sucesso, msg
+        aluno, _ = db_handler.obter_aluno_db(id_aluno, consulta.get("search_field"), consulta.get("search_term"), consulta.get("sort_by_column"))
+        return sucesso, msg, id_aluno, aluno
+
+    @staticmethod
+    def _deletar_lote(ids_alunos):
+        """Roda no executor: deleta em lote. Retorna (sucesso, msg, resultados por id)."""
+        resultados, msg = db_handler.deletar_alunos_db(ids_alunos)
+        return resultados is not None, msg, resultados
+
+    @staticmethod
+    def _alterar_lote(ids_alunos, alteracoes):
+        """Roda no executor: altera campos em lote. Retorna (sucesso, msg, resultados por id)."""
+        resultados, msg = db_handler.atualizar_campos_alunos_db(ids_alunos, alteracoes)
+        return resultados is not None, msg, resultados
+
+    def _ids_selecionados(self):
+        """Ids dos alunos selecionados; cadastros do diário ainda não gravados (id provisório < 0) ficam de fora."""
+        return [int(iid) for iid in self.tree_alunos.selection() if int(iid) > 0]
+
+    @staticmethod
+    def _resumo_falhas_lote(resultados, limite=10):
+        """Texto com os ids que falharam em uma operação em lote (no máximo 'limite' listados)."""
+        falhas = [f"ID {id_aluno}: {msg}" for id_aluno, (ok, msg) in resultados.items() if not ok]
+        if not falhas: return ""
+        extra = f"\n... e mais {len(falhas) - limite}." if len(falhas) > limite else ""
+        return "\n\nNão processados:\n" + "\n".join(falhas[:limite]) + extra
+
     def cadastrar_aluno(self):
         logger.info("Botão 'Cadastrar Aluno' clicado.")
         if not self.validar_campos_obrigatorios(): logger.warning("Cadastro abortado: falha na validação da GUI."); return
         dados_aluno = ( self.entry_nome_var.get().strip(), self.entry_sobrenome_var.get().strip(), self.entry_telefone_var.get().strip() or None, self.entry_email_var.get().strip() or None, self.entry_cpf_var.get().strip() or None, self._formatar_data_para_db(self.entry_data_nasc_var.get().strip()), self.entry_cidade_var.get().strip() or 'Brasília', self.entry_uf_var.get().strip().upper() or 'DF', self.combo_curso_var.get() )
         logger.debug(f"Dados para cadastro: {dados_aluno}")
-        sucesso, msg = db_handler.cadastrar_aluno_db(dados_aluno)
-        if sucesso: logger.info(f"Aluno cadastrado: {msg}"); messagebox.showinfo("Sucesso", msg); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario(); self.carregar_alunos_na_tabela()
-        else: logger.error(f"Falha ao cadastrar (DB): {msg}"); messagebox.showerror("Erro ao Cadastrar", msg); self.atualizar_status(msg, sucesso=False)
+        def ao_sucesso(msg, aluno_id, aluno): logger.info(f"Aluno cadastrado: {msg}"); messagebox.showinfo("Sucesso", msg); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario(); self._aplicar_aluno_na_tabela(aluno_id, aluno)
+        def ao_erro(msg): logger.error(f"Falha ao cadastrar (DB): {msg}"); messagebox.showerror("Erro ao Cadastrar", msg); self.atualizar_status(msg, sucesso=False)
+        if self.diario: self._escrever_no_diario(self.diario.registrar_cadastro(dados_aluno), dados_aluno, ao_sucesso, ao_erro); return
+        self._executar_escrita(self._cadastrar_e_obter_aluno, dados_aluno, dict(self._consulta_tabela), ao_sucesso=ao_sucesso, ao_erro=ao_erro)
 
     def atualizar_aluno_selecionado(self):
         logger.info("Botão 'Atualizar Aluno' clicado.")
@@ -554,37 +853,104 @@ class AplicacaoAlunos:
         if not id_aluno: logger.error("Atualização sem ID."); messagebox.showerror("Erro", "ID do aluno não encontrado."); return
         dados_aluno_atualizado = ( self.entry_nome_var.get().strip(), self.entry_sobrenome_var.get().strip(), self.entry_telefone_var.get().strip() or None, self.entry_email_var.get().strip() or None, self.entry_cpf_var.get().strip() or None, self._formatar_data_para_db(self.entry_data_nasc_var.get().strip()), self.entry_cidade_var.get().strip() or 'Brasília', self.entry_uf_var.get().strip().upper() or 'DF', self.combo_curso_var.get() )
         logger.debug(f"Dados para atualização (ID: {id_aluno}): {dados_aluno_atualizado}")
-        sucesso, msg = db_handler.atualizar_aluno_db(id_aluno, dados_aluno_atualizado)
-        if sucesso: logger.info(f"Aluno ID {id_aluno} atualizado: {msg}"); messagebox.showinfo("Sucesso", msg); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario(); self.carregar_alunos_na_tabela()
-        else: logger.error(f"Falha ao atualizar ID {id_aluno} (DB): {msg}"); messagebox.showerror("Erro ao Atualizar", msg); self.atualizar_status(msg, sucesso=False)
+        def ao_sucesso(msg, _, aluno): logger.info(f"Aluno ID {id_aluno} atualizado: {msg}"); messagebox.showinfo("Sucesso", msg); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario(); self._aplicar_aluno_na_tabela(id_aluno, aluno)
+        def ao_erro(msg): logger.error(f"Falha ao atualizar ID {id_aluno} (DB): {msg}"); messagebox.showerror("Erro ao Atualizar", msg); self.atualizar_status(msg, sucesso=False)
+        if self.diario: self._escrever_no_diario(self.diario.registrar_atualizacao(id_aluno, dados_aluno_atualizado), dados_aluno_atualizado, ao_sucesso, ao_erro, id_aluno); return
+        self._executar_escrita(self._atualizar_e_obter_aluno, id_aluno, dados_aluno_atualizado, dict(self._consulta_tabela), ao_sucesso=ao_sucesso, ao_erro=ao_erro)
 
     def deletar_aluno_selecionado(self):
         logger.info("Botão 'Deletar Aluno' clicado.")
+        if len(self.tree_alunos.selection()) > 1: self.deletar_selecionados_em_lote(); return
         if not self.tree_alunos.focus(): messagebox.showwarning("Nenhuma Seleção", "Selecione um aluno."); return
         if not messagebox.askyesno("Confirmar Exclusão", "Tem certeza? Esta ação não pode ser desfeita."): logger.info("Deleção cancelada."); return
         id_aluno = self.entry_id_var.get()
         if not id_aluno: logger.error("Deleção sem ID."); messagebox.showerror("Erro", "ID do aluno não encontrado."); return
+        if int(id_aluno) < 0: messagebox.showwarning("Aguardando Gravação", "Este aluno ainda está sendo gravado no banco. Tente novamente em instantes."); return
         logger.debug(f"Tentando deletar aluno ID: {id_aluno}")
-        sucesso, msg = db_handler.deletar_aluno_db(id_aluno)
-        if sucesso: logger.info(f"Aluno ID {id_aluno} deletado: {msg}"); messagebox.showinfo("Sucesso", msg); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario(); self.carregar_alunos_na_tabela()
-        else: logger.error(f"Falha ao deletar ID {id_aluno} (DB): {msg}"); messagebox.showerror("Erro ao Deletar", msg); self.atualizar_status(msg, sucesso=False)
+        def ao_sucesso(msg): logger.info(f"Aluno ID {id_aluno} deletado: {msg}"); messagebox.showinfo("Sucesso", msg); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario(); self.modelo_tabela.remover_linha(id_aluno)
+        def ao_erro(msg): logger.error(f"Falha ao deletar ID {id_aluno} (DB): {msg}"); messagebox.showerror("Erro ao Deletar", msg); self.atualizar_status(msg, sucesso=False)
+        self._executar_escrita(db_handler.deletar_aluno_db, id_aluno, ao_sucesso=ao_sucesso, ao_erro=ao_erro)
+
+    def deletar_selecionados_em_lote(self):
+        ids = self._ids_selecionados()
+        if not messagebox.askyesno("Confirmar Exclusão em Lote", f"Deletar {len(ids)} aluno(s) selecionado(s)? Esta ação não pode ser desfeita."): logger.info("Deleção em lote cancelada."); return
+        logger.debug(f"Tentando deletar {len(ids)} aluno(s) em lote.")
+        def ao_sucesso(msg, resultados):
+            self.modelo_tabela.remover([str(id_aluno) for id_aluno, (ok, _) in resultados.items() if ok])
+            logger.info(f"Deleção em lote: {msg}"); messagebox.showinfo("Deleção em Lote", msg + self._resumo_falhas_lote(resultados)); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario()
+        def ao_erro(msg): logger.error(f"Falha na deleção em lote (DB): {msg}"); messagebox.showerror("Erro ao Deletar em Lote", msg); self.atualizar_status(msg, sucesso=False)
+        self._executar_escrita(self._deletar_lote, ids, ao_sucesso=ao_sucesso, ao_erro=ao_erro)
+
+    def alterar_selecionados_em_lote(self):
+        logger.info("Botão 'Alterar em Lote' clicado.")
+        ids = self._ids_selecionados()
+        if not ids: messagebox.showwarning("Nenhuma Seleção", "Selecione um ou mais alunos (Ctrl/Shift+clique)."); return
+        from gui.dialogo_lote import DialogoAlteracaoLote # Importado no primeiro uso
+        alteracoes = DialogoAlteracaoLote(self.root, len(ids), self.opcoes_curso).mostrar()
+        if not alteracoes: logger.info("Alteração em lote cancelada."); return
+        def ao_sucesso(msg, resultados):
+            logger.info(f"Alteração em lote: {msg}"); messagebox.showinfo("Alteração em Lote", msg + self._resumo_falhas_lote(resultados)); self.atualizar_status(msg, sucesso=True); self.limpar_campos_formulario()
+            self.carregar_alunos_na_tabela(**self._consulta_tabela) # Recarga por diff: só as linhas alteradas mudam na tela
+        def ao_erro(msg): logger.error(f"Falha na alteração em lote (DB): {msg}"); messagebox.showerror("Erro ao Alterar em Lote", msg); self.atualizar_status(msg, sucesso=False)
+        self._executar_escrita(self._alterar_lote, ids, alteracoes, ao_sucesso=ao_sucesso, ao_erro=ao_erro)
 
     def exportar_para_csv(self):
         logger.info("Botão 'Exportar CSV' clicado.")
         caminho_arquivo = filedialog.asksaveasfilename( defaultextension=".csv", filetypes=[("Arquivo CSV", "*.csv"), ("Todos os arquivos", "*.*")], title="Salvar lista de alunos como CSV", initialfile="alunos_exportados.csv" )
         if not caminho_arquivo: logger.info("Exportação CSV cancelada."); self.atualizar_status("Exportação cancelada.", duracao_ms=3000); return
-        try:
-            if not self.tree_alunos.get_children(): messagebox.showinfo("Exportar CSV", "Não há dados para exportar."); logger.info("Exportar CSV: sem dados."); return
-            ordem_dados_db = ["id", "nome", "sobrenome", "telefone", "email", "cpf", "data_nascimento_formatada", "cidade", "uf", "curso"]
-            cabecalhos = [self.map_coluna_cabecalho.get(col_key, col_key.capitalize()) for col_key in ordem_dados_db]
-            alunos_para_exportar = [[str(v) if v is not None else "" for v in self.tree_alunos.item(item_id)["values"]] for item_id in self.tree_alunos.get_children()]
-            if not alunos_para_exportar: messagebox.showinfo("Exportar CSV", "Não há dados para exportar."); return
-            with open(caminho_arquivo, 'w', newline='', encoding='utf-8') as arquivo_csv:
-                escritor_csv = csv.writer(arquivo_csv, delimiter=';')
-                escritor_csv.writerow(cabecalhos); logger.debug(f"Exportando cabeçalhos CSV: {cabecalhos}")
-                for aluno_tupla in alunos_para_exportar: escritor_csv.writerow(aluno_tupla)
+        # Exporta direto do banco (não do Treeview), respeitando o filtro, a ordenação e os arquivados atuais
+        consulta = dict(self._consulta_tabela, incluir_arquivados=self._incluir_arquivados_tabela)
+        self.btn_exportar_csv.state(["disabled"]); inicio = time.perf_counter()
+        def mostrar_progresso(exportadas): self.atualizar_status(f"Exportando... {exportadas} aluno(s) gravado(s).", duracao_ms=0)
+        def ao_concluir(resultado):
+            self.btn_exportar_csv.state(["!disabled"])
+            total, msg = resultado
+            instrumentacao.registrar("ui.exportar_csv", time.perf_counter() - inicio, lambda: f"{total} aluno(s), consulta={consulta}")
+            if total is None: logger.error(f"Falha ao exportar CSV: {msg}"); messagebox.showerror("Erro de Exportação", msg); self.atualizar_status("Falha ao exportar CSV.", sucesso=False); return
+            if total == 0: messagebox.showinfo("Exportar CSV", "Não há dados para exportar (arquivo gerado apenas com cabeçalho)."); self.atualizar_status(msg); return
             logger.info(f"Dados exportados para CSV: {caminho_arquivo}")
-            messagebox.showinfo("Exportação Concluída", f"Alunos exportados para:\n{caminho_arquivo}"); self.atualizar_status("Dados exportados para CSV!", sucesso=True)
-        except IOError as e: logger.error(f"Erro de E/S ao exportar CSV: {e}", exc_info=True); messagebox.showerror("Erro de Exportação", f"Não foi possível salvar o arquivo CSV.\nDetalhe: {e}"); self.atualizar_status("Falha ao exportar CSV.", sucesso=False)
-        except Exception as e: logger.exception(f"Erro inesperado ao exportar CSV"); messagebox.showerror("Erro Inesperado", f"Ocorreu um erro inesperado.\nDetalhe: {e}"); self.atualizar_status("Erro na exportação.", sucesso=False)
+            messagebox.showinfo("Exportação Concluída", f"{msg}\nArquivo:\n{caminho_arquivo}"); self.atualizar_status("Dados exportados para CSV!", sucesso=True)
+        def ao_falhar(e):
+            self.btn_exportar_csv.state(["!disabled"])
+            messagebox.showerror("Erro Inesperado", f"Ocorreu um erro inesperado.\nDetalhe: {e}"); self.atualizar_status("Erro na exportação.", sucesso=False)
+        from database import exportador_csv # Importado no primeiro uso (csv fora da inicialização)
+        self.executor_db.submeter(exportador_csv.exportar_csv, caminho_arquivo, descricao="exportar_csv",
+                                  ao_progresso=lambda exportadas: self.executor_db.notificar(mostrar_progresso, exportadas),
+                                  ao_concluir=ao_concluir, ao_falhar=ao_falhar, **consulta)
+
+    def mostrar_estatisticas_desempenho(self, event=None):
+        """F12: grava os histogramas de latência no log e os exibe em uma janela."""
+        linhas = instrumentacao.relatorio()
+        for linha in linhas: logger.info(f"Latência {linha}")
+        janela = tk.Toplevel(self.root); janela.title("Estatísticas de Desempenho"); janela.transient(self.root)
+        texto = tk.Text(janela, width=140, height=min(30, len(linhas) + 3), font="TkFixedFont", wrap="none")
+        texto.insert("1.0", f"Limite de operação lenta: {instrumentacao.LIMITE_LENTO_MS:.0f} ms (percentis aproximados pela faixa do histograma)\n\n")
+        texto.insert("end", "\n".join(linhas) if linhas else "Nenhuma operação medida ainda.")
+        texto.configure(state="disabled"); texto.pack(fill="both", expand=True, padx=10, pady=10)
+        janela.bind("<Escape>", lambda e: janela.destroy())
+        self.atualizar_status("Estatísticas de desempenho gravadas no log.", duracao_ms=3000)
+
+    def importar_de_csv(self):
+        logger.info("Botão 'Importar CSV' clicado.")
+        caminho_arquivo = filedialog.askopenfilename( filetypes=[("Arquivo CSV", "*.csv"), ("Todos os arquivos", "*.*")], title="Importar alunos de CSV (delimitado por ';')" )
+        if not caminho_arquivo: logger.info("Importação CSV cancelada."); self.atualizar_status("Importação cancelada.", duracao_ms=3000); return
+        self.btn_importar_csv.state(["disabled"])
+        def mostrar_progresso(resumo):
+            self.atualizar_status(f"Importando... {resumo['lidas']} lidas, {resumo['inseridas']} inseridas, {resumo['rejeitadas']} rejeitadas ({resumo['linhas_por_segundo']:.0f} linhas/s).", duracao_ms=0)
+        def ao_concluir(resultado):
+            self.btn_importar_csv.state(["!disabled"])
+            self.cache_buscas.invalidar() # Mesmo uma importação com falha pode ter inserido lotes
+            resumo, msg = resultado
+            if resumo is None: logger.error(f"Falha na importação CSV: {msg}"); messagebox.showerror("Erro na Importação", msg); self.atualizar_status(msg, sucesso=False); return
+            detalhe = f"\n\nLinhas rejeitadas (com o motivo) em:\n{resumo['caminho_rejeitados']}" if resumo["rejeitadas"] else ""
+            messagebox.showinfo("Importação Concluída", msg + detalhe); self.atualizar_status(msg, sucesso=True)
+            self.carregar_alunos_na_tabela()
+        def ao_falhar(e):
+            self.btn_importar_csv.state(["!disabled"])
+            messagebox.showerror("Erro Inesperado", f"Ocorreu um erro inesperado na importação.\nDetalhe: {e}"); self.atualizar_status("Erro na importação.", sucesso=False)
+        # O progresso chega de um thread de trabalho: notificar() o repassa ao thread do Tk
+        from database import importador_csv # Importado no primeiro uso
+        self.executor_db.submeter(importador_csv.importar_csv, caminho_arquivo, descricao="importar_csv",
+                                  ao_progresso=lambda resumo: self.executor_db.notificar(mostrar_progresso, resumo),
+                                  ao_concluir=ao_concluir, ao_falhar=ao_falhar)
 # --- Fim da classe AplicacaoAlunos ---
\ No newline at end of file
@@ -0,0 +1,138 @@
+# gui/modelo_tabela.py
+import bisect
+import logging
+from database.busca import normalizar_valor_ordenacao
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_BLOCO_INSERCAO = 150 # Linhas aplicadas por ciclo do mainloop numa recarga completa
+
+class ModeloTabelaAlunos:
+    """
+    Mantém o Treeview de alunos indexado pelo id do aluno (iid = str(id)), guardando os
+    valores exibidos e a chave de ordenação de cada linha para aplicar mudanças no lugar
+    em vez de apagar e reinserir a tabela inteira.
+    """
+
+    def __init__(self, root, tree, tamanho_bloco=TAMANHO_BLOCO_INSERCAO):
+        self.root = root
+        self.tree = tree
+        self.tamanho_bloco = tamanho_bloco
+        self.valores = {} # iid -> tupla de valores exibidos
+        self.chaves = {} # iid -> cursor (valor_ordenacao, id) usado na paginação por keyset
+        self._id_after_diff = None
+
+    @staticmethod
+    def iid_de(linha):
+        return str(linha[0])
+
+    def iids(self):
+        return self.tree.get_children()
+
+    def __len__(self):
+        return len(self.valores)
+
+    # --- Recarga completa por diff ---
+    def substituir(self, linhas, chaves, ao_concluir=None):
+        """
+        Faz a tabela exibir exatamente 'linhas' (na ordem), calculando a diferença para o que já
+        está na tela: remove o que saiu, atualiza só linhas alteradas, move as que mudaram de
+        posição e insere as novas. O trabalho é dividido em blocos agendados com after.
+        """
+        self.cancelar_substituicao()
+        novos = [(self.iid_de(linha), tuple(linha), chave) for linha, chave in zip(linhas, chaves)]
+        ids_novos = {iid for iid, _, _ in novos}
+        removidos = [iid for iid in self.tree.get_children() if iid not in ids_novos]
+        if removidos:
+            self.tree.delete(*removidos)
+            for iid in removidos: self.valores.pop(iid, None); self.chaves.pop(iid, None)
+        atual = list(self.tree.get_children()) # Espelho da ordem do Treeview, atualizado a cada operação
+        estatisticas = {"inseridas": 0, "atualizadas": 0, "movidas": 0, "removidas": len(removidos)}
+
+        def aplicar_bloco(inicio):
+            self._id_after_diff = None
+            fim = min(inicio + self.tamanho_bloco, len(novos))
+            for indice in range(inicio, fim):
+                iid, valores, chave = novos[indice]
+                self.chaves[iid] = chave
+                if iid in self.valores:
+                    if self.valores[iid] != valores:
+                        self.tree.item(iid, values=valores); self.valores[iid] = valores; estatisticas["atualizadas"] += 1
+                    if indice >= len(atual) or atual[indice] != iid:
+                        self.tree.move(iid, "", indice); atual.remove(iid); atual.insert(indice, iid); estatisticas["movidas"] += 1
+                else:
+                    self.tree.insert("", indice, iid=iid, values=valores); self.valores[iid] = valores
+                    atual.insert(indice, iid); estatisticas["inseridas"] += 1
+            if fim < len(novos):
+                self._id_after_diff = self.root.after(1, aplicar_bloco, fim)
+                return
+            logger.debug("Diff da tabela aplicado: %s", estatisticas)
+            if ao_concluir: ao_concluir()
+
+        aplicar_bloco(0)
+
+    def cancelar_substituicao(self):
+        if self._id_after_diff is not None:
+            self.root.after_cancel(self._id_after_diff); self._id_after_diff = None
+
+    # --- Páginas (rolagem) ---
+    def anexar_pagina(self, linhas, chaves, no_fim):
+        """Insere uma página no fim ou no início. Linhas já exibidas (ex.: inseridas no lugar) são ignoradas."""
+        posicao = "end" if no_fim else 0
+        pares = list(zip(linhas, chaves))
+        if not no_fim: pares.reverse() # Inserir sempre no índice 0 inverte a ordem
+        inseridas = 0
+        for linha, chave in pares:
+            iid = self.iid_de(linha)
+            if iid in self.valores: continue
+            self.tree.insert("", posicao, iid=iid, values=tuple(linha))
+            self.valores[iid] = tuple(linha); self.chaves[iid] = chave; inseridas += 1
+        return inseridas
+
+    def remover(self, iids):
+        iids = [iid for iid in iids if iid in self.valores]
+        if not iids: return
+        self.tree.delete(*iids)
+        for iid in iids: self.valores.pop(iid, None); self.chaves.pop(iid, None)
+
+    def limpar(self):
+        self.cancelar_substituicao()
+        self.tree.delete(*self.tree.get_children())
+        self.valores.clear(); self.chaves.clear()
+
+    # --- Alterações de uma linha após escrita no BD ---
+    def _posicao_para_chave(self, chave, direcao, coluna=None, ignorar_iid=None):
+        """Índice onde uma linha com esta chave deve ficar na ordem atual da tabela (ordenada por 'coluna')."""
+        iids = [iid for iid in self.tree.get_children() if iid != ignorar_iid]
+        sinal = 1 if direcao == 'ASC' else -1
+        def comparavel(c): return (normalizar_valor_ordenacao(c[0], coluna), c[1])
+        alvo = comparavel(chave)
+        if sinal > 0:
+            chaves_ordenadas = [comparavel(self.chaves[iid]) for iid in iids]
+            return bisect.bisect_left(chaves_ordenadas, alvo), len(iids)
+        # DESC: a tabela está em ordem decrescente; busca na lista invertida
+        chaves_invertidas = [comparavel(self.chaves[iid]) for iid in reversed(iids)]
+        return len(iids) - bisect.bisect_right(chaves_invertidas, alvo), len(iids)
+
+    def inserir_linha(self, linha, chave, direcao, ha_mais_acima=False, ha_mais_abaixo=False, coluna=None):
+        """
+        Insere (ou reposiciona) uma linha na posição correta da ordem atual. Se a posição cair
+        fora da janela carregada (antes da primeira ou depois da última linha, havendo mais
+        páginas), a linha não é materializada: aparecerá quando a página for carregada.
+        Retorna True se a linha ficou visível na tabela.
+        """
+        iid = self.iid_de(linha)
+        posicao, total = self._posicao_para_chave(chave, direcao, coluna, ignorar_iid=iid)
+        fora_da_janela = (posicao == 0 and ha_mais_acima and total > 0) or (posicao == total and ha_mais_abaixo)
+        if fora_da_janela:
+            self.remover([iid])
+            return False
+        if iid in self.valores:
+            self.tree.item(iid, values=tuple(linha)); self.tree.move(iid, "", posicao)
+        else:
+            self.tree.insert("", posicao, iid=iid, values=tuple(linha))
+        self.valores[iid] = tuple(linha); self.chaves[iid] = chave
+        return True
+
+    def remover_linha(self, id_aluno):
+        self.remover([str(id_aluno)])
@@ -0,0 +1,110 @@
+# gui/recursos.py
+import os
+import tkinter as tk
+from tkinter import ttk
+import logging
+from functools import lru_cache
+from gui import temas
+from utils import instrumentacao
+
+logger = logging.getLogger(__name__)
+
+# Ícones e temas da janela principal. Os PNGs de gui/assets são lidos do disco uma vez por processo
+# e convertidos em PhotoImage uma vez por janela, já na escala da tela (2x/3x em HiDPI, via zoom
+# inteiro). Os estilos próprios (Valid/Invalid/Normal.TEntry) são configurados uma única vez por
+# tema: no ttk, 'style.configure' vale só para o tema ativo, então voltar a um tema já visitado
+# não precisa recalcular nada. A troca de tema aplica tudo de uma vez e redesenha uma só vez.
+
+DIR_ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+ARQUIVOS_ICONES = {
+    "add": "add.png", "edit": "edit.png", "delete": "delete.png",
+    "clear": "clear.png", "theme": "theme_icon.png",
+    "export_csv": "export_csv.png"
+}
+DPI_BASE = 96 # DPI para o qual os PNGs foram desenhados
+CORES_VALIDACAO = {"Valid.TEntry": "lightgreen", "Invalid.TEntry": "#FFCDD2"}
+
+@lru_cache(maxsize=None)
+def _ler_icone(nome_arquivo):
+    """Bytes do PNG (None se ausente). Cacheado por processo: novas janelas não voltam ao disco."""
+    caminho = os.path.join(DIR_ASSETS, nome_arquivo)
+    try:
+        with open(caminho, "rb") as arquivo: return arquivo.read()
+    except OSError:
+        logger.warning(f"Ícone '{nome_arquivo}' não encontrado: {caminho}")
+        return None
+
+class GerenciadorRecursos:
+    """Cache de ícones (por escala) e de estilos por tema de uma janela Tk."""
+
+    def __init__(self, root):
+        self.root = root
+        self._icones = {} # (nome, escala) -> PhotoImage (mantém a referência viva)
+        self._estilos_por_tema = {} # tema -> {estilo: opções aplicadas}
+        self._escala = None
+
+    def escala(self):
+        """Fator inteiro de ampliação dos ícones: 1 em telas comuns, 2 ou mais em HiDPI."""
+        if self._escala is None:
+            try: dpi = self.root.winfo_fpixels("1i")
+            except tk.TclError: dpi = DPI_BASE
+            self._escala = max(1, int(round(dpi / DPI_BASE)))
+            logger.debug("Escala dos ícones: %sx (%.0f DPI).", self._escala, dpi)
+        return self._escala
+
+    def icone(self, nome, escala=None):
+        """PhotoImage do ícone na escala pedida (padrão: a da tela), ou None se o arquivo não existir."""
+        escala = escala or self.escala()
+        chave = (nome, escala)
+        if chave in self._icones: return self._icones[chave]
+        if escala == 1:
+            dados = _ler_icone(ARQUIVOS_ICONES[nome])
+            try: imagem = tk.PhotoImage(master=self.root, data=dados) if dados else None
+            except tk.TclError as e: logger.warning(f"Ícone '{nome}' inválido: {e}"); imagem = None
+        else:
+            base = self.icone(nome, 1)
+            imagem = base.zoom(escala) if base is not None else None # Pré-escalado uma vez, reaproveitado depois
+        self._icones[chave] = imagem
+        return imagem
+
+    def icones(self):
+        """Pré-carrega todos os ícones na escala da tela. Retorna {nome: PhotoImage ou None}."""
+        with instrumentacao.Medir("ui.carregar_icones"):
+            return {nome: self.icone(nome) for nome in ARQUIVOS_ICONES}
+
+    def _estilos_do_tema(self, estilo):
+        """Opções dos estilos próprios para o tema ativo (o fundo 'Normal' segue o campo padrão do tema)."""
+        opcoes = {nome: {"fieldbackground": cor} for nome, cor in CORES_VALIDACAO.items()}
+        try: fundo_padrao = estilo.lookup("TEntry", "fieldbackground") or "white"
+        except tk.TclError: fundo_padrao = "white"
+        opcoes["Normal.TEntry"] = {"fieldbackground": fundo_padrao}
+        return opcoes
+
+    def configurar_estilos(self, tema=None):
+        """Configura Valid/Invalid/Normal.TEntry no tema ativo, só na primeira vez que o tema é usado."""
+        estilo = ttk.Style(self.root)
+        tema = tema or estilo.theme_use()
+        if tema in self._estilos_por_tema: return False
+        opcoes = self._estilos_por_tema[tema] = self._estilos_do_tema(estilo)
+        for nome, valores in opcoes.items(): estilo.configure(nome, **valores)
+        logger.debug("Estilos de TEntry configurados para o tema '%s'.", tema)
+        return True
+
+    def precarregar_tema(self, nome):
+        """Carrega o pacote Tcl do tema sem ativá-lo (ex.: em tempo ocioso), para a primeira troca ser rápida."""
+        with instrumentacao.Medir("ui.precarregar_tema", nome):
+            return temas.precarregar_tema(self.root, nome)
+
+    def aplicar_tema(self, nome, campos=()):
+        """
+        Troca o tema e reaplica os estilos em lote: ativa o tema, configura os estilos próprios (se
+        o tema for novo), volta 'campos' ao estilo Normal e só então redesenha, uma única vez.
+        Retorna False se o ttkthemes não estiver disponível; tk.TclError se o tema não existir.
+        """
+        with instrumentacao.Medir("ui.alternar_tema", nome):
+            if not temas.aplicar_tema(self.root, nome): return False
+            self.configurar_estilos(nome)
+            for campo in campos:
+                if str(campo.cget("style")) != "Normal.TEntry": campo.configure(style="Normal.TEntry")
+            self.root.update_idletasks()
+        return True
@@ -0,0 +1,37 @@
+# gui/temas.py
+import tkinter as tk
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Temas do ttkthemes aplicados sobre uma janela tk.Tk comum. O pacote (e os arquivos Tcl do tema)
+# só é importado/carregado na primeira troca de tema, depois que a janela já foi exibida, em vez
+# de na criação da janela (ThemedTk).
+
+def _estilo(root):
+    estilo = getattr(root, "_estilo_temas", None) # Um ThemedStyle por janela, guardado nela
+    if estilo is None:
+        try:
+            from ttkthemes import ThemedStyle # Importação adiada: custo pago só quando um tema é aplicado
+        except ImportError as e:
+            logger.warning(f"Pacote ttkthemes indisponível ({e}); mantendo o tema padrão do Tkinter.")
+            return None
+        estilo = root._estilo_temas = ThemedStyle(root)
+    return estilo
+
+def aplicar_tema(root, nome):
+    """Aplica o tema 'nome' do ttkthemes. Retorna False (e loga) se o pacote ou o tema não estiverem disponíveis."""
+    estilo = _estilo(root)
+    if estilo is None: return False
+    estilo.set_theme(nome) # tk.TclError se o tema não existir: tratado pelo chamador
+    return True
+
+def precarregar_tema(root, nome):
+    """Carrega (package require) o tema sem ativá-lo. Retorna False se não foi possível."""
+    if _estilo(root) is None: return False
+    try:
+        root.tk.call("package", "require", f"ttk::theme::{nome}")
+        return True
+    except tk.TclError as e:
+        logger.debug("Tema '%s' não pôde ser pré-carregado: %s", nome, e) # Carregado normalmente na troca
+        return False
@@ -0,0 +1,262 @@
+# servidor_api.py
+import os
+import sys
+import csv
+import json
+import base64
+import hashlib
+import logging
+import argparse
+import tempfile
+from datetime import date, datetime
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from database import db_handler, db_config, importador_csv
+
+logger = logging.getLogger(__name__)
+
+# Serviço HTTP/JSON sem interface gráfica sobre o db_handler (mesmo pool, mesmas validações).
+#   GET    /alunos?campo=&termo=&ordem=&direcao=&tamanho=&apos=&antes=&arquivados=1   página por keyset
+#   GET    /alunos/<id>                                                  um aluno
+#   POST   /alunos                                                       cadastra (JSON)
+#   PUT    /alunos/<id>                                                  atualiza (JSON, todos os campos)
+#   DELETE /alunos/<id>                                                  deleta
+#   POST   /alunos/importar                                              importa CSV ';' (corpo text/csv)
+# Respostas de leitura têm ETag; com If-None-Match igual, a resposta é 304 sem corpo.
+
+API_HOST = os.getenv("API_HOST", "127.0.0.1") # db_config já carregou o .env
+API_PORT = int(os.getenv("API_PORT", "8080"))
+# Cada worker atende uma conexão TCP do início ao fim (keep-alive incluso), mas só segura uma
+# conexão do pool do BD durante a consulta; o resto é HTTP, JSON e espera pelo cliente. Por isso o
+# padrão é WORKERS_POR_CONEXAO_BD workers por conexão do pool. Bem acima disso, as requisições só
+# fazem fila no pool (até DB_POOL_TIMEOUT) em vez de rodar em paralelo: aumente DB_POOL_SIZE junto.
+WORKERS_POR_CONEXAO_BD = 3
+API_WORKERS = int(os.getenv("API_WORKERS", str(WORKERS_POR_CONEXAO_BD * db_config.DB_POOL_SIZE))) # Conexões atendidas em paralelo
+TAMANHO_PAGINA_MAX = 1000
+TAMANHO_CORPO_MAX = 50 * 1024 * 1024 # Limite para o corpo de uma importação CSV
+TIMEOUT_CONEXAO_S = float(os.getenv("API_KEEPALIVE_S", "5")) # Conexão keep-alive ociosa libera o worker após esse tempo
+CAMPOS_ALUNO = ("id", "nome", "sobrenome", "telefone", "email", "cpf", "data_nascimento", "cidade", "uf", "curso")
+CAMPOS_BUSCA_API = {campo.lower().replace(" ", "_"): campo for campo in db_handler.CAMPOS_BUSCA_PERMITIDOS} # nome_completo -> "Nome completo"
+
+class ErroAPI(Exception):
+    """Erro com status HTTP, convertido em resposta JSON {"erro": msg}."""
+    def __init__(self, status, msg):
+        super().__init__(msg)
+        self.status = status; self.msg = msg
+
+# --- Conversões ---
+def _linha_para_json(linha):
+    return dict(zip(CAMPOS_ALUNO, linha))
+
+def _codificar_cursor(chave):
+    """Cursor (valor_ordenacao, id) -> token opaco para a URL. Datas viram {"d": "AAAA-MM-DD"}."""
+    valor, id_aluno = chave
+    if isinstance(valor, (date, datetime)): valor = {"d": valor.isoformat()}
+    return base64.urlsafe_b64encode(json.dumps([valor, id_aluno]).encode()).decode().rstrip("=")
+
+def _decodificar_cursor(token):
+    try:
+        valor, id_aluno = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if isinstance(valor, dict): valor = date.fromisoformat(valor["d"])
+        return valor, int(id_aluno)
+    except (ValueError, TypeError, KeyError):
+        raise ErroAPI(400, "Cursor de paginação inválido.")
+
+def _dados_aluno_do_json(corpo):
+    """Corpo JSON -> tupla dados_aluno do db_handler, com os mesmos padrões da importação CSV."""
+    if not isinstance(corpo, dict): raise ErroAPI(400, "Corpo deve ser um objeto JSON com os campos do aluno.")
+    registro = {campo: str(corpo[campo]).strip() for campo in CAMPOS_ALUNO[1:] if corpo.get(campo) not in (None, "")}
+    dados_aluno, msg = importador_csv.converter_registro(registro)
+    if dados_aluno is None: raise ErroAPI(400, msg)
+    return dados_aluno
+
+def _status_de_falha(msg):
+    """Status HTTP para um (False, msg) do db_handler."""
+    if msg.startswith("Falha na conexão"): return 503
+    if msg.startswith("Nenhum aluno") or "não encontrado" in msg: return 404
+    if msg.startswith("Erro: ") and (" já " in msg or "duplicados" in msg): return 409
+    if msg.startswith("Erro"): return 500
+    return 400 # Validação
+
+def _inteiro(parametros, nome, padrao, minimo, maximo):
+    try: valor = int(parametros.get(nome, [padrao])[0])
+    except ValueError: raise ErroAPI(400, f"Parâmetro '{nome}' deve ser inteiro.")
+    return max(minimo, min(maximo, valor))
+
+# --- Operações ---
+def listar_alunos(parametros):
+    campo = parametros.get("campo", [None])[0]; termo = parametros.get("termo", [None])[0]
+    if campo is not None and campo not in CAMPOS_BUSCA_API and campo not in db_handler.CAMPOS_BUSCA_PERMITIDOS:
+        raise ErroAPI(400, f"Campo de busca inválido (válidos: {', '.join(CAMPOS_BUSCA_API)}).")
+    ordem = parametros.get("ordem", [None])[0]
+    if ordem is not None and ordem not in db_handler.COLUNAS_ORDENACAO_PERMITIDAS:
+        raise ErroAPI(400, f"Ordenação inválida (válidas: {', '.join(db_handler.COLUNAS_ORDENACAO_PERMITIDAS)}).")
+    apos = parametros.get("apos", [None])[0]; antes = parametros.get("antes", [None])[0]
+    pagina, msg = db_handler.visualizar_alunos_pagina_db(
+        search_field=CAMPOS_BUSCA_API.get(campo, campo), search_term=termo, sort_by_column=ordem,
+        sort_direction=parametros.get("direcao", ["ASC"])[0],
+        tamanho_pagina=_inteiro(parametros, "tamanho", db_handler.TAMANHO_PAGINA_PADRAO, 1, TAMANHO_PAGINA_MAX),
+        apos_cursor=_decodificar_cursor(apos) if apos else None, antes_cursor=_decodificar_cursor(antes) if antes else None,
+        incluir_arquivados=parametros.get("arquivados", ["0"])[0] in ("1", "true"))
+    if pagina is None: raise ErroAPI(_status_de_falha(msg), msg)
+    voltando = antes is not None
+    proximo = _codificar_cursor(pagina["proximo_cursor"]) if pagina["proximo_cursor"] else None
+    # Cursores das duas pontas, para navegar nos dois sentidos a partir desta página
+    return 200, {"alunos": [_linha_para_json(l) for l in pagina["linhas"]], "ha_mais": pagina["ha_mais"],
+                 "proximo": None if voltando else proximo, "anterior": proximo if voltando else None,
+                 "primeiro_cursor": _codificar_cursor(pagina["chaves"][0]) if pagina["chaves"] else None,
+                 "ultimo_cursor": _codificar_cursor(pagina["chaves"][-1]) if pagina["chaves"] else None}
+
+def obter_aluno(id_aluno):
+    resultado, msg = db_handler.obter_aluno_db(id_aluno)
+    if resultado is None: raise ErroAPI(_status_de_falha(msg), msg)
+    return 200, _linha_para_json(resultado["linha"])
+
+def cadastrar_aluno(corpo):
+    sucesso, msg, aluno_id = db_handler.cadastrar_aluno_db(_dados_aluno_do_json(corpo), retornar_id=True)
+    if not sucesso: raise ErroAPI(_status_de_falha(msg), msg)
+    return 201, obter_aluno(aluno_id)[1]
+
+def atualizar_aluno(id_aluno, corpo):
+    sucesso, msg = db_handler.atualizar_aluno_db(id_aluno, _dados_aluno_do_json(corpo))
+    if not sucesso and not msg.startswith("Nenhum aluno"): raise ErroAPI(_status_de_falha(msg), msg)
+    return obter_aluno(id_aluno) # rowcount 0 também ocorre com dados idênticos: 404 só se o aluno não existir
+
+def deletar_aluno(id_aluno):
+    sucesso, msg = db_handler.deletar_aluno_db(id_aluno)
+    if not sucesso: raise ErroAPI(_status_de_falha(msg), msg)
+    return 200, {"mensagem": msg}
+
+def importar_alunos(corpo_csv):
+    """Grava o CSV recebido em arquivo temporário e reaproveita importador_csv (lotes + rejeitados)."""
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "importacao.csv"); caminho_rejeitados = os.path.join(pasta, "rejeitados.csv")
+        with open(caminho, "wb") as arquivo: arquivo.write(corpo_csv)
+        resumo, msg = importador_csv.importar_csv(caminho, caminho_rejeitados)
+        if resumo is None: raise ErroAPI(_status_de_falha(msg), msg)
+        rejeitados = []
+        if resumo["rejeitadas"]:
+            with open(caminho_rejeitados, newline="", encoding="utf-8") as arquivo:
+                leitor = csv.reader(arquivo, delimiter=importador_csv.DELIMITADOR_CSV); next(leitor, None) # Cabeçalho
+                rejeitados = [{"linha": int(linha[0]), "erro": linha[-1]} for linha in leitor]
+    resumo.pop("caminho_rejeitados", None)
+    return 200, {"mensagem": msg, "resumo": resumo, "rejeitados": rejeitados}
+
+# --- HTTP ---
+class ManipuladorAPI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive: o cliente reaproveita a conexão TCP
+    timeout = TIMEOUT_CONEXAO_S
+    disable_nagle_algorithm = True # Cabeçalhos e corpo saem em writes separados: sem isso, ~40 ms de atraso por resposta
+    server_version = "AlunosAPI/1.0"
+
+    def _id_da_rota(self, partes):
+        try: return int(partes[1])
+        except ValueError: raise ErroAPI(404, "Recurso não encontrado.")
+
+    def _ler_corpo(self, limite=TAMANHO_CORPO_MAX):
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        if tamanho > limite: raise ErroAPI(413, "Corpo da requisição muito grande.")
+        return self.rfile.read(tamanho) if tamanho else b""
+
+    def _ler_json(self):
+        try: return json.loads(self._ler_corpo(1024 * 1024) or b"null")
+        except (ValueError, UnicodeDecodeError): raise ErroAPI(400, "JSON inválido.")
+
+    def _responder(self, status, conteudo, com_etag=False):
+        corpo = json.dumps(conteudo, ensure_ascii=False, default=str).encode("utf-8")
+        etag = None
+        if com_etag:
+            etag = f'"{hashlib.blake2b(corpo, digest_size=12).hexdigest()}"'
+            if etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+                self.send_response(304); self.send_header("ETag", etag); self.send_header("Content-Length", "0")
+                self.end_headers(); return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        if etag: self.send_header("ETag", etag); self.send_header("Cache-Control", "no-cache") # Sempre revalida
+        if status == 201 and isinstance(conteudo, dict): self.send_header("Location", f"/alunos/{conteudo.get('id')}")
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _despachar(self, metodo):
+        url = urlsplit(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        try:
+            if not partes or partes[0] != "alunos" or len(partes) > 2: raise ErroAPI(404, "Recurso não encontrado.")
+            if len(partes) == 1:
+                if metodo == "GET": return self._responder(*listar_alunos(parse_qs(url.query)), com_etag=True)
+                if metodo == "POST": return self._responder(*cadastrar_aluno(self._ler_json()))
+            elif partes[1] == "importar":
+                if metodo == "POST": return self._responder(*importar_alunos(self._ler_corpo()))
+            else:
+                id_aluno = self._id_da_rota(partes)
+                if metodo == "GET": return self._responder(*obter_aluno(id_aluno), com_etag=True)
+                if metodo == "PUT": return self._responder(*atualizar_aluno(id_aluno, self._ler_json()))
+                if metodo == "DELETE": return self._responder(*deletar_aluno(id_aluno))
+            raise ErroAPI(405, f"Método {metodo} não permitido em {url.path}.")
+        except ErroAPI as erro:
+            self._responder(erro.status, {"erro": erro.msg})
+        except Exception:
+            logger.exception(f"Erro inesperado em {metodo} {self.path}")
+            self._responder(500, {"erro": "Erro interno do servidor."})
+
+    def do_GET(self): self._despachar("GET")
+    def do_POST(self): self._despachar("POST")
+    def do_PUT(self): self._despachar("PUT")
+    def do_DELETE(self): self._despachar("DELETE")
+
+    def log_message(self, formato, *args):
+        logger.debug(f"{self.address_string()} - {formato % args}") # Acesso só em DEBUG: INFO por requisição pesa sob carga
+
+class ServidorAPI(HTTPServer):
+    """HTTPServer que atende cada conexão em um pool fixo de threads (limita a concorrência ao pool do BD)."""
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, endereco, workers=API_WORKERS):
+        super().__init__(endereco, ManipuladorAPI)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._processar, request, client_address)
+
+    def _processar(self, request, client_address):
+        try: self.finish_request(request, client_address)
+        except Exception: self.handle_error(request, client_address)
+        finally: self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+def main(argv=None):
+    """Uso: python servidor_api.py --porta 8080 --workers 15"""
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON do cadastro de alunos (sem interface gráfica).")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--porta", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS,
+                        help=f"Conexões atendidas em paralelo (padrão: {WORKERS_POR_CONEXAO_BD} x DB_POOL_SIZE = {API_WORKERS})")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if not db_handler.aquecer_pool():
+        logger.critical(f"Não foi possível conectar ao banco '{db_config.DB_NAME}'. Serviço não iniciado.")
+        return 1
+    if args.workers > WORKERS_POR_CONEXAO_BD * db_config.DB_POOL_SIZE:
+        logger.warning(f"{args.workers} workers para {db_config.DB_POOL_SIZE} conexões no pool: acima de {WORKERS_POR_CONEXAO_BD} por conexão, "
+                       f"as requisições esperam pelo pool (até {db_config.DB_POOL_TIMEOUT}s). Aumente DB_POOL_SIZE ou reduza --workers.")
+    servidor = ServidorAPI((args.host, args.porta), args.workers)
+    logger.info(f"Serviço de alunos em http://{args.host}:{args.porta}/alunos ({args.workers} workers, pool de {db_config.DB_POOL_SIZE} conexões).")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Encerrando serviço (Ctrl+C).")
+    finally:
+        servidor.server_close()
+        for linha in db_handler.relatorio_instrucoes(): logger.info(f"Instrução {linha}")
+        db_handler.fechar_conexoes()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# utils/instrumentacao.py
+import os
+import time
+import bisect
+import logging
+import threading
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+# Instrumentação leve de latência: cada operação medida (ex.: "bd.executar", "db.cadastrar_aluno_db",
+# "ui.popular_tabela") acumula um histograma em memória com faixas fixas em ms. Operações acima do
+# limite de lentidão são logadas com o detalhe informado (forma da SQL, nº de parâmetros...).
+# Os histogramas são despejados no log ao sair e sob demanda (F12 na janela principal).
+
+INSTRUMENTACAO_ATIVA = os.getenv("INSTRUMENTACAO_ATIVA", "1").lower() not in ("0", "false", "nao", "não")
+LIMITE_LENTO_MS = float(os.getenv("INSTRUMENTACAO_LENTO_MS", "250")) # 0 desativa o log de operações lentas
+
+# Limites superiores (ms) das faixas do histograma; a última faixa é aberta (> 10 s)
+FAIXAS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+if not INSTRUMENTACAO_ATIVA: logger.info("Instrumentação de latência DESATIVADA (INSTRUMENTACAO_ATIVA=0).")
+
+class Histograma:
+    """Contagens por faixa de latência, com total, mínimo e máximo exatos. Percentis são aproximados pela faixa."""
+    __slots__ = ("contagens", "n", "total_ms", "min_ms", "max_ms", "lentas")
+
+    def __init__(self):
+        self.contagens = [0] * (len(FAIXAS_MS) + 1)
+        self.n = 0; self.total_ms = 0.0; self.min_ms = float("inf"); self.max_ms = 0.0; self.lentas = 0
+
+    def adicionar(self, ms, lenta=False):
+        self.contagens[bisect.bisect_left(FAIXAS_MS, ms)] += 1
+        self.n += 1; self.total_ms += ms
+        if ms < self.min_ms: self.min_ms = ms
+        if ms > self.max_ms: self.max_ms = ms
+        if lenta: self.lentas += 1
+
+    def percentil(self, p):
+        """Limite superior da faixa que contém o percentil p (0-100); o máximo real na faixa aberta."""
+        if not self.n: return 0.0
+        alvo = self.n * p / 100.0; acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo: return min(FAIXAS_MS[indice], self.max_ms) if indice < len(FAIXAS_MS) else self.max_ms
+        return self.max_ms
+
+    def resumo(self):
+        return {"n": self.n, "ms_medio": round(self.total_ms / self.n, 3) if self.n else 0.0,
+                "ms_min": round(self.min_ms, 3) if self.n else 0.0, "ms_max": round(self.max_ms, 3),
+                "p50": self.percentil(50), "p95": self.percentil(95), "p99": self.percentil(99),
+                "lentas": self.lentas, "ms_total": round(self.total_ms, 1)}
+
+_histogramas = {}
+_lock = threading.Lock()
+
+def configurar(ativa=None, limite_lento_ms=None):
+    """Altera em tempo de execução a ativação e/ou o limite de operação lenta (ms)."""
+    global INSTRUMENTACAO_ATIVA, LIMITE_LENTO_MS
+    if ativa is not None: INSTRUMENTACAO_ATIVA = ativa
+    if limite_lento_ms is not None: LIMITE_LENTO_MS = float(limite_lento_ms)
+
+def registrar(nome, segundos, detalhe=None):
+    """Acumula uma medição de 'segundos' em 'nome'. 'detalhe' (str ou callable) só é usado se a operação for lenta."""
+    if not INSTRUMENTACAO_ATIVA: return
+    ms = segundos * 1000.0
+    lenta = LIMITE_LENTO_MS > 0 and ms >= LIMITE_LENTO_MS
+    with _lock:
+        histograma = _histogramas.get(nome)
+        if histograma is None: histograma = _histogramas[nome] = Histograma()
+        histograma.adicionar(ms, lenta)
+    if lenta:
+        if callable(detalhe): detalhe = detalhe()
+        logger.warning("Operação lenta: %s levou %.1f ms (limite %.0f ms)%s", nome, ms, LIMITE_LENTO_MS, f" - {detalhe}" if detalhe else "")
+
+class Medir:
+    """Context manager: 'with Medir("bd.commit"):'. O detalhe é formatado só se a operação for lenta."""
+    __slots__ = ("nome", "detalhe", "inicio")
+
+    def __init__(self, nome, detalhe=None):
+        self.nome = nome; self.detalhe = detalhe
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registrar(self.nome, time.perf_counter() - self.inicio, self.detalhe)
+        return False
+
+def cronometrado(nome=None):
+    """Decorador: mede cada chamada da função (nome padrão: o da função)."""
+    def decorar(funcao):
+        nome_medicao = nome or funcao.__name__
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not INSTRUMENTACAO_ATIVA: return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registrar(nome_medicao, time.perf_counter() - inicio)
+        return envoltorio
+    return decorar
+
+def estatisticas():
+    """Resumo por operação: n, média, mín., máx., p50/p95/p99 (aprox.) e nº de operações lentas."""
+    with _lock:
+        return {nome: histograma.resumo() for nome, histograma in sorted(_histogramas.items())}
+
+def relatorio():
+    """Linhas de texto com as operações medidas, das de maior tempo total às de menor."""
+    itens = sorted(estatisticas().items(), key=lambda item: item[1]["ms_total"], reverse=True)
+    return [f"{nome:<34} n={r['n']:<7} méd={r['ms_medio']:>9.2f} ms  p50<={r['p50']:>8.2f}  p95<={r['p95']:>8.2f}  "
+            f"p99<={r['p99']:>8.2f}  máx={r['ms_max']:>9.2f} ms  lentas={r['lentas']}"
+            for nome, r in itens]
+
+def zerar():
+    with _lock: _histogramas.clear()
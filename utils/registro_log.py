@@ -0,0 +1,84 @@
+# utils/registro_log.py
+import os
+import queue
+import atexit
+import logging
+import logging.handlers
+
+# Pipeline de logging assíncrono: os loggers só enfileiram o registro (QueueHandler) e um thread
+# de fundo (QueueListener) formata e grava no console/arquivo. Assim a E/S de arquivo e a
+# formatação completa (data, módulo, linha) saem do thread do Tk. Os níveis vêm do .env:
+#   LOG_NIVEL_ARQUIVO=DEBUG  LOG_NIVEL_CONSOLE=INFO
+#   LOG_NIVEIS=gui.main_window=INFO,utils.validators=WARNING   (níveis por módulo)
+# Mensagens de caminhos quentes usam formatação preguiçosa com % (logger.debug("x=%s", x)):
+# se o nível estiver desligado, nem o registro nem a string chegam a ser criados.
+
+FORMATO_LOG = '%(asctime)s - %(name)s - %(module)s.%(funcName)s:%(lineno)d - %(levelname)s - %(message)s'
+FORMATO_DATA = '%Y-%m-%d %H:%M:%S'
+TAMANHO_MAX_ARQUIVO = 5 * 1024 * 1024 # Tamanho máximo do arquivo de log antes da rotação (5MB)
+ARQUIVOS_BACKUP = 2 # app_alunos.log.1, app_alunos.log.2
+
+_ouvinte = None
+
+def _nivel(valor, padrao):
+    """'DEBUG'/'info'/'10' -> nível numérico; valores desconhecidos usam o padrão."""
+    if not valor: return padrao
+    valor = valor.strip().upper()
+    if valor.isdigit(): return int(valor)
+    nivel = logging.getLevelName(valor)
+    return nivel if isinstance(nivel, int) else padrao
+
+def niveis_por_modulo(especificacao):
+    """'gui.main_window=INFO,utils.validators=WARNING' -> {'gui.main_window': 20, 'utils.validators': 30}."""
+    niveis = {}
+    for item in (especificacao or "").split(","):
+        nome, _, valor = item.partition("=")
+        if nome.strip() and valor.strip(): niveis[nome.strip()] = _nivel(valor, logging.NOTSET)
+    return niveis
+
+def criar_handlers(caminho_arquivo, nivel_arquivo, nivel_console, fluxo_console=None):
+    """Handlers finais (console e arquivo com rotação), que rodam no thread do QueueListener."""
+    formatter = logging.Formatter(FORMATO_LOG, datefmt=FORMATO_DATA)
+    console_handler = logging.StreamHandler(fluxo_console)
+    console_handler.setLevel(nivel_console); console_handler.setFormatter(formatter)
+    file_handler = logging.handlers.RotatingFileHandler(caminho_arquivo, maxBytes=TAMANHO_MAX_ARQUIVO, backupCount=ARQUIVOS_BACKUP, encoding='utf-8')
+    file_handler.setLevel(nivel_arquivo); file_handler.setFormatter(formatter)
+    return [console_handler, file_handler]
+
+def iniciar_fila(handlers, logger_raiz=None):
+    """
+    Troca os handlers do logger raiz por um QueueHandler e inicia o QueueListener que repassa
+    os registros aos 'handlers' (cada um respeita o próprio nível). Retorna o listener.
+    """
+    global _ouvinte
+    logger_raiz = logger_raiz or logging.getLogger()
+    fila = queue.SimpleQueue()
+    for handler in list(logger_raiz.handlers): logger_raiz.removeHandler(handler)
+    logger_raiz.addHandler(logging.handlers.QueueHandler(fila))
+    _ouvinte = logging.handlers.QueueListener(fila, *handlers, respect_handler_level=True)
+    _ouvinte.start()
+    atexit.register(encerrar) # Garante que a fila seja esvaziada mesmo em saídas inesperadas
+    return _ouvinte
+
+def encerrar():
+    """Esvazia a fila e para o thread de gravação. Chamadas repetidas são ignoradas."""
+    global _ouvinte
+    if _ouvinte is None: return
+    ouvinte, _ouvinte = _ouvinte, None
+    ouvinte.stop()
+    for handler in ouvinte.handlers: handler.close()
+
+def configurar(caminho_arquivo):
+    """
+    Configura o logging da aplicação a partir do .env (ver topo do módulo). O logger raiz fica no
+    menor nível entre arquivo e console, para que mensagens que nenhum handler gravaria sejam
+    descartadas já no logger, sem criar o registro. Retorna (nivel_arquivo, nivel_console, niveis_modulos).
+    """
+    nivel_arquivo = _nivel(os.getenv("LOG_NIVEL_ARQUIVO"), logging.DEBUG)
+    nivel_console = _nivel(os.getenv("LOG_NIVEL_CONSOLE"), logging.INFO)
+    niveis_modulos = niveis_por_modulo(os.getenv("LOG_NIVEIS"))
+    logger_raiz = logging.getLogger()
+    logger_raiz.setLevel(min(nivel_arquivo, nivel_console))
+    for nome, nivel in niveis_modulos.items(): logging.getLogger(nome).setLevel(nivel)
+    iniciar_fila(criar_handlers(caminho_arquivo, nivel_arquivo, nivel_console), logger_raiz)
+    return nivel_arquivo, nivel_console, niveis_modulos
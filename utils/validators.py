@@ -1,7 +1,8 @@
 # utils/validators.py
 import re
 from datetime import date, datetime
-from validate_docbr import CPF 
+from functools import lru_cache
+from operator import mul
 import logging
 import os
 
@@ -9,6 +10,15 @@ logger = logging.getLogger(__name__)
 
 # --- Constantes ---
 IDADE_MINIMA_ALUNO = 17
+TAMANHO_CACHE_VALIDACAO = 4096 # Resultados memorizados por validador (GUI e backend validam os mesmos valores)
+
+# Padrões pré-compilados (antes eram recompilados/consultados no cache do 're' a cada chamada)
+_RE_CPF_MASCARA = re.compile(r"\d{3}\.\d{3}\.\d{3}-\d{2}")
+_RE_EMAIL = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_RE_TELEFONE = re.compile(r"^\(\d{2}\) (?:9\d{4}-\d{4}|\d{4}-\d{4})$") # Celular com 9 dígitos ou fixo com 8 após o DDD
+_RE_DATA_ISO = re.compile(r"\d{4}-\d{2}-\d{2}")
+_PESOS_DV1 = tuple(range(10, 1, -1)) # Pesos do 1º dígito verificador do CPF (10..2)
+_PESOS_DV2 = tuple(range(11, 1, -1)) # Pesos do 2º dígito verificador (11..2)
 
 # --- Configuração da Validação de CPF ---
 # Lê a flag do .env. Assume validação rigorosa (True) se não definida ou se o valor não for 'false'.
@@ -18,83 +28,117 @@ VALIDAR_CPF_RIGOROSAMENTE = VALIDAR_CPF_RIGOROSAMENTE_STR.lower() == 'true'
 if not VALIDAR_CPF_RIGOROSAMENTE:
     logger.warning("Validação rigorosa de dígitos do CPF DESATIVADA (VALIDATE_CPF_STRICTLY=False).")
 
+def cpf_digitos_validos(digitos):
+    """Confere os dois dígitos verificadores de um CPF com 11 dígitos (sem máscara)."""
+    if len(digitos) != 11 or not digitos.isdigit() or digitos == digitos[0] * 11: return False # 111.111.111-11 etc. são inválidos
+    numeros = list(map(int, digitos))
+    dv1 = sum(map(mul, numeros[:9], _PESOS_DV1)) * 10 % 11 % 10
+    if dv1 != numeros[9]: return False
+    return sum(map(mul, numeros[:10], _PESOS_DV2)) * 10 % 11 % 10 == numeros[10]
+
+@lru_cache(maxsize=TAMANHO_CACHE_VALIDACAO)
 def validar_cpf_completo(cpf_string):
     """
     Valida um CPF. Verifica o formato da máscara e, se VALIDAR_CPF_RIGOROSAMENTE for True,
-    usa validate-docbr para verificar os dígitos.
+    confere os dígitos verificadores.
     Retorna (True, "") se válido, ou (False, "mensagem de erro") se inválido.
     """
-    if not cpf_string: 
+    if not cpf_string:
         return True, "" # Considera CPF vazio como válido (opcional)
 
     # Validação do formato da máscara (###.###.###-##)
-    if not re.fullmatch(r"\d{3}\.\d{3}\.\d{3}-\d{2}", cpf_string):
-        logger.debug(f"Formato de máscara do CPF '{cpf_string}' é inválido.")
+    if not _RE_CPF_MASCARA.fullmatch(cpf_string):
+        logger.debug("Formato de máscara do CPF '%s' é inválido.", cpf_string)
         return False, "CPF: Formato inválido (esperado ###.###.###-##)."
 
     if not VALIDAR_CPF_RIGOROSAMENTE:
-        logger.info(f"Validação de dígitos do CPF desativada. CPF '{cpf_string}' aceito (formato máscara OK).")
         return True, "Validação de dígitos do CPF desativada (modo de teste)."
 
-    # Validação rigorosa dos dígitos com validate-docbr
-    cpf_validator_obj = CPF()
-    if cpf_validator_obj.validate(cpf_string):
-        logger.debug(f"CPF '{cpf_string}' validado com sucesso (validate-docbr).")
+    if cpf_digitos_validos(cpf_string[0:3] + cpf_string[4:7] + cpf_string[8:11] + cpf_string[12:14]):
         return True, ""
-    else:
-        logger.debug(f"Validação de dígitos do CPF (validate-docbr) falhou para: '{cpf_string}'")
-        return False, "CPF inválido (dígitos verificadores não conferem)."
+    logger.debug("Dígitos verificadores do CPF não conferem: '%s'", cpf_string)
+    return False, "CPF inválido (dígitos verificadores não conferem)."
 
+@lru_cache(maxsize=TAMANHO_CACHE_VALIDACAO)
 def validar_email_formato(email_string):
     """Valida o formato básico de um endereço de e-mail."""
-    if not email_string: return True, "" 
-    
-    # Regex padrão para formatos comuns de email
-    padrao_email = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    if re.match(padrao_email, email_string): 
+    if not email_string: return True, ""
+    if _RE_EMAIL.match(email_string):
         return True, ""
-    else: 
-        logger.debug(f"Formato de e-mail inválido: '{email_string}'")
-        return False, "E-mail: Formato inválido."
+    logger.debug("Formato de e-mail inválido: '%s'", email_string)
+    return False, "E-mail: Formato inválido."
 
+@lru_cache(maxsize=TAMANHO_CACHE_VALIDACAO)
 def validar_telefone_formato(telefone_string):
     """Valida o formato do telefone para (XX) XXXXX-XXXX ou (XX) XXXX-XXXX."""
     if not telefone_string: return True, ""
-        
-    telefone_limpo = telefone_string.strip()
-    # Aceita celular com 9 dígitos ou fixo com 8 dígitos após o DDD
-    padrao_telefone = r"^\(\d{2}\) (?:9\d{4}-\d{4}|\d{4}-\d{4})$" 
-    
-    if re.fullmatch(padrao_telefone, telefone_limpo):
+    if _RE_TELEFONE.fullmatch(telefone_string.strip()):
         return True, ""
-    else:
-        logger.debug(f"Formato de telefone inválido: '{telefone_string}'")
-        return False, "Telefone: Formato inválido. Use (XX) XXXXX-XXXX ou (XX) XXXX-XXXX."
+    logger.debug("Formato de telefone inválido: '%s'", telefone_string)
+    return False, "Telefone: Formato inválido. Use (XX) XXXXX-XXXX ou (XX) XXXX-XXXX."
 
-def validar_data_nascimento_e_idade(data_nasc_str_yyyy_mm_dd):
+def validar_data_nascimento_e_idade(data_nasc_str_yyyy_mm_dd, hoje=None):
     """
     Valida se a data de nascimento é uma data real (formato YYYY-MM-DD),
-    não é futura, e se o aluno atende à idade mínima.
+    não é futura, e se o aluno atende à idade mínima. 'hoje' pode ser passado
+    para validar muitas datas com uma única chamada a date.today().
     """
-    if not data_nasc_str_yyyy_mm_dd: return True, "" 
+    if not data_nasc_str_yyyy_mm_dd: return True, ""
+    return _validar_data_nascimento(data_nasc_str_yyyy_mm_dd, hoje or date.today())
 
+@lru_cache(maxsize=TAMANHO_CACHE_VALIDACAO)
+def _validar_data_nascimento(data_nasc_str_yyyy_mm_dd, hoje):
     try:
-        data_nasc = datetime.strptime(data_nasc_str_yyyy_mm_dd, '%Y-%m-%d').date()
+        if _RE_DATA_ISO.fullmatch(data_nasc_str_yyyy_mm_dd): data_nasc = date.fromisoformat(data_nasc_str_yyyy_mm_dd) # Caminho rápido
+        else: data_nasc = datetime.strptime(data_nasc_str_yyyy_mm_dd, '%Y-%m-%d').date() # Aceita mês/dia com 1 dígito
     except ValueError: # Erro na conversão da string para data
         logger.warning(f"Data Nasc.: Formato inválido para backend ('{data_nasc_str_yyyy_mm_dd}'), esperado YYYY-MM-DD.")
         return False, "Data Nasc.: Formato inválido para processamento."
 
-    hoje = date.today()
     if data_nasc > hoje: # Data de nascimento não pode ser no futuro
         logger.warning(f"Data de nascimento futura informada: {data_nasc}")
         return False, "Data de nascimento não pode ser uma data futura."
 
     # Cálculo preciso da idade
     idade = hoje.year - data_nasc.year - ((hoje.month, hoje.day) < (data_nasc.month, data_nasc.day))
-    logger.debug(f"Validação de Idade: DataNasc='{data_nasc}', Hoje='{hoje}', IdadeCalc='{idade}', Mínima='{IDADE_MINIMA_ALUNO}'")
-
     if idade < IDADE_MINIMA_ALUNO:
         logger.info(f"Validação de idade falhou: Aluno com {idade} anos (mínimo {IDADE_MINIMA_ALUNO}). Data Nasc: {data_nasc_str_yyyy_mm_dd}")
         return False, f"Aluno deve ter pelo menos {IDADE_MINIMA_ALUNO} anos. Idade calculada: {idade}."
-        
-    return True, ""
\ No newline at end of file
+
+    return True, ""
+
+# --- Validação de registros completos ---
+def _validar_registro(dados_aluno, hoje, validar_cpf, validar_email, validar_telefone):
+    _, _, telefone, email, cpf, data_nasc, _, _, _ = dados_aluno
+    valido, msg = validar_cpf(cpf)
+    if not valido: return False, msg
+    valido, msg = validar_email(email)
+    if not valido: return False, msg
+    valido, msg = validar_telefone(telefone)
+    if not valido: return False, msg
+    return validar_data_nascimento_e_idade(data_nasc, hoje)
+
+def validar_aluno(dados_aluno, hoje=None):
+    """
+    Valida os campos opcionais de um aluno no formato de db_handler
+    (nome, sobrenome, telefone, email, cpf, data_nasc_yyyy_mm_dd, cidade, uf, curso).
+    Retorna (True, "") ou (False, mensagem da primeira validação que falhou).
+    """
+    return _validar_registro(dados_aluno, hoje, validar_cpf_completo, validar_email_formato, validar_telefone_formato)
+
+def validar_lote(lista_dados_alunos, hoje=None):
+    """
+    Valida muitos alunos de uma vez (ex.: importação CSV). Retorna uma lista com
+    (valido, msg) para cada registro, na mesma ordem da entrada. CPF, e-mail e telefone
+    são quase sempre únicos num lote, então passam ao largo dos caches (só as datas,
+    que se repetem muito, são memorizadas).
+    """
+    hoje = hoje or date.today()
+    validar_cpf = validar_cpf_completo.__wrapped__; validar_email = validar_email_formato.__wrapped__
+    validar_telefone = validar_telefone_formato.__wrapped__
+    return [_validar_registro(dados_aluno, hoje, validar_cpf, validar_email, validar_telefone) for dados_aluno in lista_dados_alunos]
+
+def limpar_caches():
+    """Descarta os resultados memorizados (ex.: após alterar VALIDAR_CPF_RIGOROSAMENTE)."""
+    for funcao in (validar_cpf_completo, validar_email_formato, validar_telefone_formato, _validar_data_nascimento):
+        funcao.cache_clear()